@@ -0,0 +1 @@
+"""Benchmarks de l'enregistreur audio (exécutables hors ligne)."""
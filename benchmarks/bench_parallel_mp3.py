@@ -0,0 +1,173 @@
+"""
+Benchmark de l'encodage MP3 à l'arrêt : appel unique contre morceaux parallèles.
+
+Pour chaque durée, un PCM synthétique (bruit et sinusoïdes, stéréo 16 bits
+44,1 kHz) est écrit dans un MP3Encoder bufferisé, puis la durée de close()
+est mesurée :
+- "single" : encodage en un seul appel FFmpeg via pydub (comportement par défaut) ;
+- "parallel" : encodage par morceaux dans --jobs processus FFmpeg
+  (voir src/parallel_mp3.py).
+
+Le PCM reste en mémoire comme en mode --buffered : une heure de stéréo
+représente environ 635 Mo, le chemin "single" en copie une partie en plus.
+Nécessite FFmpeg avec libmp3lame ; le benchmark est ignoré sinon.
+
+Utilisation :
+    uv run python -m benchmarks.bench_parallel_mp3 --output parallel.json
+    uv run python -m benchmarks.bench_parallel_mp3 --hours 0.1 --jobs 4
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from benchmarks.bench_startup import summarize
+
+# Version du format JSON émis
+SCHEMA_VERSION = 1
+
+SAMPLE_RATE = 44100
+CHANNELS = 2
+SAMPLE_WIDTH = 2
+
+# Durée du motif synthétique répété pour former l'enregistrement
+PATTERN_SECONDS = 10
+
+
+def build_pattern(seed: int = 0) -> bytes:
+    """
+    Construit un motif PCM stéréo mêlant bruit et sinusoïdes.
+
+    Le bruit empêche l'encodeur de profiter d'un signal trivial ; le motif
+    est répété pour former des enregistrements de plusieurs heures.
+
+    Args:
+        seed: Graine du générateur aléatoire
+
+    Returns:
+        PCM entrelacé de PATTERN_SECONDS secondes
+    """
+    rng = np.random.default_rng(seed)
+    time_axis = np.arange(PATTERN_SECONDS * SAMPLE_RATE) / SAMPLE_RATE
+    left = 0.3 * np.sin(2 * np.pi * 440.0 * time_axis) + 0.1 * rng.standard_normal(time_axis.size)
+    right = 0.3 * np.sin(2 * np.pi * 660.0 * time_axis) + 0.1 * rng.standard_normal(time_axis.size)
+    stereo = np.clip(np.stack([left, right], axis=1), -1.0, 1.0)
+    return (stereo * 32767).astype('<i2').tobytes()
+
+
+def encode_once(pattern: bytes, hours: float, output_file: Path, parallel_jobs: Optional[int]) -> float:
+    """
+    Remplit un MP3Encoder bufferisé puis chronomètre sa finalisation.
+
+    Args:
+        pattern: Motif PCM répété
+        hours: Durée de l'enregistrement simulé en heures
+        output_file: Fichier MP3 produit
+        parallel_jobs: Nombre de morceaux parallèles (None = appel unique)
+
+    Returns:
+        Durée de close() en secondes
+    """
+    from src.mp3_encoder import MP3Encoder
+
+    encoder = MP3Encoder(
+        output_file=output_file,
+        sample_rate=SAMPLE_RATE,
+        channels=CHANNELS,
+        sample_width=SAMPLE_WIDTH,
+        encode_jobs=parallel_jobs
+    )
+    remaining = int(hours * 3600 * SAMPLE_RATE) * CHANNELS * SAMPLE_WIDTH
+    while remaining > 0:
+        block = pattern[:remaining]
+        encoder.write_frames(block)
+        remaining -= len(block)
+
+    start = time.perf_counter()
+    encoder.close()
+    return time.perf_counter() - start
+
+
+def bench_parallel(hours_list: List[float], jobs: int, repeat: int, output_dir: Path) -> Dict[str, Dict]:
+    """
+    Compare les deux chemins d'encodage pour chaque durée.
+
+    Args:
+        hours_list: Durées simulées en heures
+        jobs: Nombre de processus FFmpeg du chemin parallèle
+        repeat: Mesures par scénario
+        output_dir: Répertoire des fichiers produits
+
+    Returns:
+        Résumés par durée : single, parallel, speedup et tailles produites
+    """
+    pattern = build_pattern()
+    results: Dict[str, Dict] = {}
+    for hours in hours_list:
+        entry: Dict[str, Dict] = {}
+        for name, parallel_jobs in (('single', None), ('parallel', jobs)):
+            output_file = output_dir / f"{name}-{hours:g}h.mp3"
+            samples = [encode_once(pattern, hours, output_file, parallel_jobs) for _ in range(repeat)]
+            entry[name] = summarize(samples)
+            entry[name]['output_bytes'] = output_file.stat().st_size
+            output_file.unlink()
+        entry['speedup'] = entry['single']['median_s'] / entry['parallel']['median_s']
+        results[f"{hours:g}h"] = entry
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark de l'encodage MP3 parallèle par morceaux")
+    parser.add_argument(
+        '--hours', type=float, nargs='+', default=[1.0, 4.0, 8.0],
+        help="Durées simulées en heures (défaut: 1 4 8)"
+    )
+    parser.add_argument(
+        '--jobs', type=int, default=os.cpu_count() or 1,
+        help="Processus FFmpeg du chemin parallèle (défaut: nombre de cœurs)"
+    )
+    parser.add_argument('--repeat', type=int, default=1, help="Mesures par scénario (défaut: 1)")
+    parser.add_argument('--output', type=Path, help="Fichier JSON de sortie (défaut: stdout)")
+    args = parser.parse_args(argv)
+
+    from pydub import AudioSegment
+
+    result = {
+        'schema': SCHEMA_VERSION,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {
+            'hours': args.hours,
+            'jobs': args.jobs,
+            'repeat': args.repeat,
+            'cpu_count': os.cpu_count(),
+        },
+    }
+    if shutil.which(AudioSegment.converter) is None:
+        result['skipped'] = "FFmpeg introuvable"
+    else:
+        with tempfile.TemporaryDirectory(prefix="audio-recorder-bench-") as output_dir:
+            result['results'] = bench_parallel(args.hours, args.jobs, args.repeat, Path(output_dir))
+
+    payload = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n")
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
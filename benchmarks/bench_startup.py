@@ -0,0 +1,423 @@
+"""
+Benchmark de la latence de démarrage et d'arrêt de l'enregistreur.
+
+Mesure, avec pyaudio et pulsectl simulés (voir benchmarks/fakes) :
+- le temps d'import à froid des modules (sous-processus dédiés) ;
+- le démarrage à froid de la CLI pour --help, --list-devices et l'enregistrement ;
+- le temps de détection du périphérique loopback (à froid et à chaud) ;
+- la latence de start_recording() ;
+- la latence de stop_recording() (encodage compris) selon la durée enregistrée,
+  en mode streaming et en mode bufferisé (nécessite FFmpeg, sinon ignoré).
+
+Les résultats sont émis en JSON. Avec --baseline, les médianes sont comparées
+à un résultat précédent et le code de sortie vaut 1 en cas de régression.
+
+Utilisation :
+    uv run python -m benchmarks.bench_startup --output bench.json
+    uv run python -m benchmarks.bench_startup --baseline bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+FAKES_DIR = Path(__file__).resolve().parent / "fakes"
+
+# Version du format JSON émis
+SCHEMA_VERSION = 1
+
+IMPORT_MODULES = ["src.audio_devices", "src.mp3_encoder", "src.audio_recorder", "src.main"]
+
+
+def fake_environment(**overrides: str) -> Dict[str, str]:
+    """
+    Construit l'environnement d'un sous-processus utilisant les modules simulés.
+
+    Args:
+        **overrides: Variables d'environnement supplémentaires
+
+    Returns:
+        Copie de l'environnement avec PYTHONPATH pointant vers les simulations
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([str(FAKES_DIR), str(REPO_ROOT)])
+    env.update(overrides)
+    return env
+
+
+def install_fakes():
+    """Place les modules simulés en tête de sys.path pour les mesures en processus."""
+    for path in (str(REPO_ROOT), str(FAKES_DIR)):
+        if path in sys.path:
+            sys.path.remove(path)
+        sys.path.insert(0, path)
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """
+    Résume une série de mesures.
+
+    Args:
+        samples: Durées en secondes
+
+    Returns:
+        Dictionnaire contenant: median_s, min_s, max_s, runs
+    """
+    return {
+        'median_s': statistics.median(samples),
+        'min_s': min(samples),
+        'max_s': max(samples),
+        'runs': len(samples),
+    }
+
+
+def measure(function: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """
+    Mesure plusieurs exécutions d'une fonction.
+
+    Args:
+        function: Fonction à chronométrer
+        repeat: Nombre d'exécutions
+
+    Returns:
+        Résumé des durées (voir summarize)
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def bench_imports(repeat: int) -> Dict[str, Dict]:
+    """
+    Mesure le temps d'import à froid de chaque module dans un nouveau processus.
+
+    Args:
+        repeat: Nombre de processus lancés par module
+
+    Returns:
+        Résumé des durées par module
+    """
+    results = {}
+    for module in IMPORT_MODULES:
+        script = (
+            "import time; start = time.perf_counter(); "
+            f"import {module}; print(time.perf_counter() - start)"
+        )
+        samples = []
+        for _ in range(repeat):
+            output = subprocess.run(
+                [sys.executable, '-c', script],
+                env=fake_environment(),
+                cwd=str(REPO_ROOT),
+                capture_output=True,
+                text=True,
+                check=True
+            )
+            samples.append(float(output.stdout.strip().splitlines()[-1]))
+        results[module] = summarize(samples)
+    return results
+
+
+def bench_cli(repeat: int, output_dir: Path) -> Dict[str, Dict]:
+    """
+    Mesure le démarrage à froid de la CLI (processus complet) par sous-commande.
+
+    - help : `python -m src.main --help` jusqu'à la fin du processus
+    - list_devices : `python -m src.main --list-devices` jusqu'à la fin du processus
+    - record : `python -m src.main` jusqu'à l'affichage de "Enregistrement démarré"
+
+    Args:
+        repeat: Nombre de processus lancés par sous-commande
+        output_dir: Répertoire de sortie des enregistrements
+
+    Returns:
+        Résumé des durées par sous-commande
+    """
+    env = fake_environment(PYTHONUNBUFFERED='1')
+    base_command = [sys.executable, '-m', 'src.main']
+    results = {}
+
+    for name, extra_args in (('help', ['--help']), ('list_devices', ['--list-devices'])):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run(
+                base_command + extra_args,
+                env=env,
+                cwd=str(REPO_ROOT),
+                capture_output=True,
+                check=True
+            )
+            samples.append(time.perf_counter() - start)
+        results[name] = summarize(samples)
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            base_command + ['--output', str(output_dir)],
+            env=env,
+            cwd=str(REPO_ROOT),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True
+        )
+        for line in process.stdout:
+            if "Enregistrement démarré" in line:
+                samples.append(time.perf_counter() - start)
+                break
+        process.communicate("exit\n", timeout=30)
+    if samples:
+        results['record'] = summarize(samples)
+    return results
+
+
+def bench_device_detection(repeat: int) -> Dict[str, Dict]:
+    """
+    Mesure find_loopback_device() avec un registre vide (à froid) puis rempli (à chaud).
+
+    Args:
+        repeat: Nombre de mesures
+
+    Returns:
+        Résumé des durées à froid et à chaud
+    """
+    from src.audio_devices import find_loopback_device, get_device_registry
+
+    registry = get_device_registry()
+
+    def cold():
+        registry.invalidate()
+        find_loopback_device()
+
+    cold_stats = measure(cold, repeat)
+    find_loopback_device()
+    warm_stats = measure(find_loopback_device, repeat)
+    return {'cold': cold_stats, 'warm': warm_stats}
+
+
+def _ffmpeg_available() -> bool:
+    """Indique si le convertisseur FFmpeg utilisé par pydub est disponible."""
+    from pydub import AudioSegment
+    return shutil.which(AudioSegment.converter) is not None
+
+
+def _wait_until_drained(recorder, audio_bytes: int, timeout: float = 600.0):
+    """Attend que l'audio simulé ait été capturé puis entièrement transmis à l'encodeur."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        stats = recorder.get_buffer_stats()
+        captured = recorder.capture_wakeups * recorder.chunk_size * recorder.channels * recorder.sample_width
+        if stats and captured >= audio_bytes and stats['fill_level'] == 0:
+            return
+        time.sleep(0.01)
+    raise TimeoutError("L'encodeur n'a pas rattrapé la capture simulée")
+
+
+def bench_start_stop(lengths: List[float], repeat: int, output_dir: Path) -> Dict[str, Dict]:
+    """
+    Mesure start_recording() puis stop_recording() pour plusieurs durées enregistrées.
+
+    Le flux simulé délivre instantanément `length` secondes d'audio puis continue
+    en temps réel ; l'arrêt est mesuré une fois l'encodeur à jour, comme après
+    une vraie capture de cette durée.
+
+    Args:
+        lengths: Durées enregistrées simulées en secondes
+        repeat: Nombre de mesures par durée et par mode
+        output_dir: Répertoire des fichiers produits
+
+    Returns:
+        Résumés des latences start/stop par mode et par durée
+    """
+    import pyaudio
+    from src.audio_recorder import AudioRecorder
+
+    results: Dict[str, Dict] = {'start_recording': {}, 'stop_recording': {}}
+    if not _ffmpeg_available():
+        skipped = {'skipped': "FFmpeg introuvable"}
+        return {'start_recording': skipped, 'stop_recording': skipped}
+
+    pyaudio.PyAudio.realtime_streams = True
+    try:
+        for mode, streaming in (('streaming', True), ('buffered', False)):
+            start_samples: List[float] = []
+            stop_results = {}
+            for length in lengths:
+                stop_samples = []
+                for _ in range(repeat):
+                    recorder = AudioRecorder(
+                        output_dir=str(output_dir),
+                        streaming=streaming,
+                        buffer_seconds=length + 5
+                    )
+                    audio_bytes = int(length * recorder.sample_rate) * recorder.channels * 2
+                    pyaudio.Stream.burst_bytes = audio_bytes
+
+                    start = time.perf_counter()
+                    recorder.start_recording()
+                    start_samples.append(time.perf_counter() - start)
+
+                    _wait_until_drained(recorder, audio_bytes)
+
+                    start = time.perf_counter()
+                    recorder.stop_recording()
+                    stop_samples.append(time.perf_counter() - start)
+                stop_results[f"{length:g}s"] = summarize(stop_samples)
+            results['start_recording'][mode] = summarize(start_samples)
+            results['stop_recording'][mode] = stop_results
+    finally:
+        pyaudio.PyAudio.realtime_streams = False
+        pyaudio.Stream.burst_bytes = 0
+    return results
+
+
+def flatten_medians(results: Dict, prefix: str = "") -> Dict[str, float]:
+    """
+    Extrait les médianes d'un résultat sous forme de chemins à plat.
+
+    Args:
+        results: Résultats imbriqués
+        prefix: Préfixe du chemin courant
+
+    Returns:
+        Dictionnaire chemin -> médiane en secondes
+    """
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            if 'median_s' in value:
+                flat[path] = value['median_s']
+            else:
+                flat.update(flatten_medians(value, path))
+    return flat
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float, floor: float) -> List[str]:
+    """
+    Compare deux résultats et liste les régressions.
+
+    Une mesure régresse si sa médiane dépasse celle de référence de plus de
+    `tolerance` (relatif) et de plus de `floor` secondes (absolu).
+
+    Args:
+        current: Résultat courant
+        baseline: Résultat de référence
+        tolerance: Écart relatif toléré (0.2 = +20 %)
+        floor: Écart absolu ignoré en secondes
+
+    Returns:
+        Descriptions des régressions détectées
+    """
+    current_medians = flatten_medians(current['results'])
+    baseline_medians = flatten_medians(baseline['results'])
+    regressions = []
+    for path, reference in sorted(baseline_medians.items()):
+        value = current_medians.get(path)
+        if value is None:
+            continue
+        if value - reference > floor and value > reference * (1 + tolerance):
+            regressions.append(f"{path}: {reference * 1000:.1f} ms → {value * 1000:.1f} ms")
+    return regressions
+
+
+def run(args: argparse.Namespace) -> Dict:
+    """
+    Exécute les benchmarks sélectionnés.
+
+    Args:
+        args: Arguments de la ligne de commande
+
+    Returns:
+        Résultat complet prêt à être sérialisé en JSON
+    """
+    os.environ['FAKE_PORTAUDIO_INIT_DELAY'] = str(args.init_delay)
+    os.environ['FAKE_PULSE_MONITORS'] = str(args.monitors)
+    install_fakes()
+
+    results: Dict[str, Dict] = {}
+    if 'imports' in args.only:
+        results['import'] = bench_imports(args.repeat)
+    if 'cli' in args.only:
+        with tempfile.TemporaryDirectory(prefix="audio-recorder-bench-") as output_dir:
+            results['cli'] = bench_cli(args.repeat, Path(output_dir))
+    if 'detection' in args.only:
+        results['device_detection'] = bench_device_detection(args.repeat)
+    if 'recording' in args.only:
+        with tempfile.TemporaryDirectory(prefix="audio-recorder-bench-") as output_dir:
+            results.update(bench_start_stop(args.lengths, args.repeat, Path(output_dir)))
+
+    return {
+        'schema': SCHEMA_VERSION,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {
+            'repeat': args.repeat,
+            'init_delay_s': args.init_delay,
+            'monitors': args.monitors,
+            'lengths_s': args.lengths,
+        },
+        'results': results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark de démarrage/arrêt de l'enregistreur")
+    parser.add_argument('--repeat', type=int, default=5, help="Mesures par scénario (défaut: 5)")
+    parser.add_argument(
+        '--init-delay', type=float, default=0.05,
+        help="Durée simulée d'une initialisation de PortAudio en secondes (défaut: 0.05)"
+    )
+    parser.add_argument('--monitors', type=int, default=7, help="Monitors PulseAudio simulés (défaut: 7)")
+    parser.add_argument(
+        '--lengths', type=float, nargs='+', default=[10.0, 60.0, 300.0],
+        help="Durées enregistrées simulées en secondes (défaut: 10 60 300)"
+    )
+    parser.add_argument(
+        '--only', nargs='+', choices=['imports', 'cli', 'detection', 'recording'],
+        default=['imports', 'cli', 'detection', 'recording'],
+        help="Scénarios à exécuter"
+    )
+    parser.add_argument('--output', type=Path, help="Fichier JSON de sortie (défaut: stdout)")
+    parser.add_argument('--baseline', type=Path, help="Résultat JSON de référence à comparer")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Régression relative tolérée (défaut: 0.25)")
+    parser.add_argument('--floor', type=float, default=0.005, help="Écart absolu ignoré en secondes (défaut: 0.005)")
+    args = parser.parse_args(argv)
+
+    result = run(args)
+    payload = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n")
+    else:
+        print(payload)
+
+    if args.baseline:
+        regressions = compare(result, json.loads(args.baseline.read_text()), args.tolerance, args.floor)
+        if regressions:
+            print("Régressions détectées:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
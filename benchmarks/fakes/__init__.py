@@ -0,0 +1,12 @@
+"""
+Modules factices remplaçant pyaudio et pulsectl pendant les benchmarks.
+
+Ce répertoire est placé en tête de sys.path (ou de PYTHONPATH pour les
+sous-processus) afin que `import pyaudio` et `import pulsectl` chargent ces
+simulations au lieu des vraies bibliothèques.
+
+Variables d'environnement :
+    FAKE_PORTAUDIO_INIT_DELAY: Durée simulée de l'initialisation de PortAudio (s)
+    FAKE_PYAUDIO_DEVICES: Nombre de périphériques PyAudio simulés
+    FAKE_PULSE_MONITORS: Nombre de sources Monitor PulseAudio simulées
+"""
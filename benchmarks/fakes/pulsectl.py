@@ -0,0 +1,64 @@
+"""Simulation minimale de pulsectl pour les benchmarks (aucun serveur PulseAudio)."""
+
+import os
+
+
+class PulseError(Exception):
+    """Erreur PulseAudio simulée."""
+
+
+class _Object:
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+
+def _model():
+    """Construit les sinks et sources simulés (un Monitor par sink)."""
+    count = int(os.environ.get('FAKE_PULSE_MONITORS', '7'))
+    sinks, sources = [], []
+    for i in range(count):
+        kind = 'hdmi-stereo' if i % 3 == 2 else 'analog-stereo'
+        sink_name = f"alsa_output.pci-0000_00_1f.3.{kind}-{i}"
+        sinks.append(_Object(name=sink_name, index=i, description=f"Sortie {kind} {i}"))
+        sources.append(_Object(
+            name=f"{sink_name}.monitor",
+            index=100 + i,
+            description=f"Monitor of Sortie {kind} {i}",
+            monitor_of_sink=i,
+            proplist={'device.class': 'monitor'},
+        ))
+    sources.append(_Object(
+        name="alsa_input.pci-0000_00_1f.3.analog-stereo",
+        index=100 + count,
+        description="Microphone interne",
+        monitor_of_sink=None,
+        proplist={'device.class': 'sound'},
+    ))
+    return sinks, sources
+
+
+class Pulse:
+    """Connexion PulseAudio simulée."""
+
+    def __init__(self, client_name=None, **kwargs):
+        self._sinks, self._sources = _model()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def close(self):
+        pass
+
+    def server_info(self):
+        default = self._sinks[0].name if self._sinks else None
+        return _Object(default_sink_name=default, default_source_name=None)
+
+    def sink_list(self):
+        return list(self._sinks)
+
+    def source_list(self):
+        return list(self._sources)
@@ -0,0 +1,102 @@
+"""Simulation minimale de PyAudio pour les benchmarks (aucun accès matériel)."""
+
+import os
+import time
+
+paInt16 = 8
+paInt32 = 2
+paContinue = 0
+paComplete = 1
+paAbort = 2
+paInputUnderflow = 1
+paInputOverflow = 2
+paInputOverflowed = -9981
+
+_SAMPLE_SIZES = {paInt16: 2, paInt32: 4}
+
+
+def get_sample_size(audio_format):
+    """Retourne la largeur d'échantillon d'un format."""
+    return _SAMPLE_SIZES[audio_format]
+
+
+def _device_names():
+    """Noms des périphériques simulés : matériel ALSA puis plugins."""
+    count = int(os.environ.get('FAKE_PYAUDIO_DEVICES', '12'))
+    names = [f"HDA Intel PCH: ALC257 Analog (hw:0,{i})" for i in range(max(0, count - 3))]
+    return names + ['pipewire', 'pulse', 'default'][:count]
+
+
+class Stream:
+    """
+    Flux d'entrée simulé produisant du silence.
+
+    Les burst_bytes premiers octets sont délivrés instantanément, puis le flux
+    suit le temps réel si realtime est actif.
+    """
+
+    burst_bytes = 0
+
+    def __init__(self, rate, channels, audio_format, frames_per_buffer,
+                 stream_callback=None, start=True, realtime=False):
+        self.rate = rate
+        self.frame_size = channels * get_sample_size(audio_format)
+        self.frames_per_buffer = frames_per_buffer
+        self.stream_callback = stream_callback
+        self.realtime = realtime
+        self.active = start
+        self.delivered = 0
+
+    def read(self, num_frames, exception_on_overflow=True):
+        size = num_frames * self.frame_size
+        if self.realtime and self.delivered >= self.burst_bytes:
+            time.sleep(num_frames / self.rate)
+        self.delivered += size
+        return bytes(size)
+
+    def start_stream(self):
+        self.active = True
+
+    def stop_stream(self):
+        self.active = False
+
+    def close(self):
+        self.active = False
+
+
+class PyAudio:
+    """Instance PyAudio simulée ; l'initialisation coûte FAKE_PORTAUDIO_INIT_DELAY."""
+
+    # Flux "temps réel" (read() bloque la durée du chunk) si True
+    realtime_streams = False
+
+    def __init__(self):
+        time.sleep(float(os.environ.get('FAKE_PORTAUDIO_INIT_DELAY', '0.05')))
+        self._names = _device_names()
+
+    def get_device_count(self):
+        return len(self._names)
+
+    def get_device_info_by_index(self, index):
+        name = self._names[index]
+        return {
+            'index': index,
+            'name': name,
+            'maxInputChannels': 32 if name in ('pulse', 'pipewire', 'default') else 2,
+            'maxOutputChannels': 2,
+            'defaultSampleRate': 44100.0,
+            'defaultLowInputLatency': 0.008,
+            'defaultHighInputLatency': 0.032,
+        }
+
+    def get_sample_size(self, audio_format):
+        return get_sample_size(audio_format)
+
+    def open(self, format, channels, rate, input=False, input_device_index=None,
+             frames_per_buffer=1024, stream_callback=None, start=True, **kwargs):
+        return Stream(rate, channels, format, frames_per_buffer,
+                      stream_callback=stream_callback, start=start,
+                      realtime=self.realtime_streams)
+
+    def terminate(self):
+        pass
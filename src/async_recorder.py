@@ -0,0 +1,310 @@
+"""Module pour l'utilisation de l'enregistreur depuis asyncio."""
+
+import asyncio
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.audio_recorder import AudioRecorder
+from src.encode_pool import EncodeBatch
+from src.ring_buffer import RingBuffer
+
+
+class AudioChunkStream:
+    """
+    Flux asynchrone du PCM d'un enregistrement (voir AsyncAudioRecorder.chunks()).
+
+    Chaque flux a son propre buffer circulaire borné, rempli par le thread
+    d'encodage sans jamais le bloquer : un consommateur trop lent perd les
+    blocs qui ne tiennent plus dans le buffer (comptés dans dropped_frames)
+    sans ralentir la capture ni les autres flux. La boucle d'événements n'est
+    réveillée que lorsque le consommateur attend des données : tant qu'il a
+    du retard, les blocs s'accumulent sans aucun appel inter-threads.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        buffer_seconds: float,
+        max_bytes: Optional[int] = None,
+        on_close=None
+    ):
+        """
+        Initialise le flux (le buffer est alloué quand le format est connu).
+
+        Args:
+            loop: Boucle d'événements du consommateur
+            buffer_seconds: Durée d'audio que le flux peut accumuler
+            max_bytes: Taille maximale d'un chunk en octets (optionnel)
+            on_close: Appelée avec le flux quand il est fermé (optionnel)
+        """
+        self.buffer_seconds = buffer_seconds
+        self.max_bytes = max_bytes
+        self.byte_rate: Optional[int] = None
+        self._loop = loop
+        self._on_close = on_close
+        self._ring_buffer: Optional[RingBuffer] = None
+        self._wakeup = asyncio.Event()
+        self._waiting = False
+        self._ended = False
+
+    def _open(self, sample_rate: int, frame_size: int):
+        """Alloue le buffer au format de l'enregistrement (thread d'encodage, premier bloc)."""
+        self.byte_rate = sample_rate * frame_size
+        self._ring_buffer = RingBuffer(
+            capacity=max(frame_size, int(sample_rate * self.buffer_seconds) * frame_size),
+            frame_size=frame_size
+        )
+
+    def _push(self, data):
+        """Copie un bloc dans le buffer sans bloquer (thread d'encodage)."""
+        ring_buffer = self._ring_buffer
+        view = memoryview(data).cast('B')
+        room = ring_buffer.free_space
+        if len(view) > room:
+            # Garder le début du bloc : la fin est rejetée et comptée
+            ring_buffer.write(view[:room])
+            view = view[room:]
+        ring_buffer.write(view)
+        self._wake()
+
+    def _end(self):
+        """Signale la fin de l'audio (n'importe quel thread)."""
+        self._ended = True
+        self._wake()
+
+    def _wake(self):
+        """Réveille le consommateur s'il attend des données."""
+        if not self._waiting:
+            return
+        self._waiting = False
+        try:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            # Boucle d'événements déjà fermée
+            pass
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> bytes:
+        """
+        Retourne le prochain chunk de PCM, en attendant qu'il soit capturé.
+
+        Returns:
+            Copie des données disponibles (frames entières)
+
+        Raises:
+            StopAsyncIteration: À la fin de l'enregistrement, une fois le
+                                buffer vidé, ou après close()
+            asyncio.CancelledError: Si le consommateur est annulé pendant
+                                    l'attente (le flux est alors fermé)
+        """
+        while True:
+            # Lire la fin avant le buffer : les derniers blocs la précèdent
+            ended = self._ended
+            ring_buffer = self._ring_buffer
+            if ring_buffer is not None and ring_buffer.fill_level:
+                view = ring_buffer.peek(self.max_bytes)
+                chunk = bytes(view)
+                view.release()
+                ring_buffer.advance(len(chunk))
+                return chunk
+            if ended:
+                self.close()
+                raise StopAsyncIteration
+
+            self._wakeup.clear()
+            self._waiting = True
+            # Revérifier après avoir signalé l'attente pour ne pas manquer une écriture concurrente
+            if self._ended or (self._ring_buffer is not None and self._ring_buffer.fill_level):
+                self._waiting = False
+                continue
+            try:
+                await self._wakeup.wait()
+            except asyncio.CancelledError:
+                # Consommateur annulé : plus personne ne lira ce flux
+                self.close()
+                raise
+            finally:
+                self._waiting = False
+
+    def close(self):
+        """Désabonne le flux : les chunks suivants ne sont plus conservés."""
+        self._ended = True
+        if self._on_close is not None:
+            on_close, self._on_close = self._on_close, None
+            on_close(self)
+
+    @property
+    def lag(self) -> float:
+        """Retard du consommateur : audio en attente de lecture, en secondes."""
+        if self._ring_buffer is None:
+            return 0.0
+        return self._ring_buffer.fill_level / self.byte_rate
+
+    def get_stats(self) -> Dict:
+        """
+        Retourne les compteurs du flux.
+
+        Returns:
+            Dictionnaire contenant: lag (secondes), et les compteurs du buffer
+            (voir RingBuffer.get_stats) une fois l'enregistrement démarré
+        """
+        stats = {'lag': self.lag}
+        if self._ring_buffer is not None:
+            stats.update(self._ring_buffer.get_stats())
+        return stats
+
+
+class _ChunkFanout:
+    """Consommateur de l'audio encodé (voir AudioRecorder.add_tap) alimentant les flux."""
+
+    def __init__(self):
+        self.streams: List[AudioChunkStream] = []
+        self.sample_rate: Optional[int] = None
+        self.frame_size: Optional[int] = None
+
+    def add(self, stream: AudioChunkStream):
+        # Liste remplacée plutôt que modifiée : le thread d'encodage la parcourt sans verrou
+        self.streams = self.streams + [stream]
+
+    def remove(self, stream: AudioChunkStream):
+        self.streams = [other for other in self.streams if other is not stream]
+
+    def start(self, sample_rate: int, channels: int, sample_width: int = 2):
+        self.sample_rate = sample_rate
+        self.frame_size = channels * sample_width
+
+    def write(self, data):
+        for stream in self.streams:
+            if stream._ring_buffer is None:
+                stream._open(self.sample_rate, self.frame_size)
+            stream._push(data)
+
+    def finish(self):
+        streams, self.streams = self.streams, []
+        for stream in streams:
+            stream._end()
+
+
+class AsyncAudioRecorder:
+    """
+    Façade asyncio de AudioRecorder.
+
+    Le démarrage et l'arrêt, bloquants (ouverture du périphérique,
+    finalisation des fichiers), s'exécutent dans un thread sans bloquer la
+    boucle d'événements. Le PCM transmis à l'encodeur est aussi remis aux
+    coroutines qui le demandent (transfert réseau, transcription...) :
+
+        recorder = AsyncAudioRecorder(output_dir="~/audio", output_format="flac")
+        await recorder.start()
+        async for chunk in recorder.chunks():
+            await upload(chunk)
+
+    Les flux se terminent à l'arrêt de l'enregistrement, après avoir remis
+    l'audio déjà capturé.
+    """
+
+    def __init__(self, recorder: Optional[AudioRecorder] = None, buffer_seconds: float = 10.0, **options):
+        """
+        Initialise la façade.
+
+        Args:
+            recorder: Enregistreur à piloter (optionnel)
+            buffer_seconds: Durée d'audio que chaque flux peut accumuler avant
+                            de perdre des chunks si son consommateur prend du retard
+            **options: Sans recorder, arguments de AudioRecorder
+        """
+        self.recorder = recorder or AudioRecorder(**options)
+        self.buffer_seconds = buffer_seconds
+        self._fanout = _ChunkFanout()
+        self.recorder.add_tap(self._fanout)
+
+    @property
+    def is_recording(self) -> bool:
+        """Indique si la capture est en cours."""
+        return self.recorder.is_recording
+
+    @property
+    def streams(self) -> List[AudioChunkStream]:
+        """Flux abonnés à l'enregistrement (voir chunks())."""
+        return list(self._fanout.streams)
+
+    async def start(self) -> Optional[Path]:
+        """
+        Démarre l'enregistrement sans bloquer la boucle d'événements.
+
+        Si la coroutine est annulée, l'enregistrement démarré entre-temps est
+        arrêté avant la propagation de l'annulation.
+
+        Returns:
+            Chemin du fichier en cours d'enregistrement (voir AudioRecorder.start_recording)
+
+        Raises:
+            RuntimeError: Si l'enregistrement est déjà en cours
+            OSError: Si le périphérique audio n'est pas accessible
+        """
+        future = asyncio.get_running_loop().run_in_executor(None, self.recorder.start_recording)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # Le thread de démarrage ne peut pas être interrompu
+            try:
+                await future
+            except Exception:
+                pass
+            else:
+                await asyncio.to_thread(self.recorder.stop_recording)
+            raise
+
+    async def stop(self) -> Optional[EncodeBatch]:
+        """
+        Arrête l'enregistrement et finalise les fichiers sans bloquer la boucle d'événements.
+
+        L'arrêt se poursuit jusqu'au bout même si la coroutine est annulée.
+
+        Returns:
+            Voir AudioRecorder.stop_recording
+        """
+        future = asyncio.get_running_loop().run_in_executor(None, self.recorder.stop_recording)
+        return await asyncio.shield(future)
+
+    def chunks(
+        self,
+        max_bytes: Optional[int] = None,
+        buffer_seconds: Optional[float] = None
+    ) -> AudioChunkStream:
+        """
+        Ouvre un flux du PCM de l'enregistrement en cours (ou du prochain).
+
+        Le PCM est celui transmis à l'encodeur (format des fichiers, voir
+        recorder.sample_rate, output_channels et sample_width). Plusieurs
+        flux peuvent être ouverts : chacun reçoit tout l'audio à partir de
+        son ouverture. Un flux abandonné avant la fin doit être fermé
+        (close()) pour ne plus recevoir de chunks.
+
+        Args:
+            max_bytes: Taille maximale d'un chunk en octets (optionnel)
+            buffer_seconds: Durée d'audio que ce flux peut accumuler (par
+                            défaut celle de la façade)
+
+        Returns:
+            Itérateur asynchrone de chunks (bytes)
+        """
+        stream = AudioChunkStream(
+            asyncio.get_running_loop(),
+            buffer_seconds or self.buffer_seconds,
+            max_bytes,
+            on_close=self._fanout.remove
+        )
+        self._fanout.add(stream)
+        return stream
+
+    async def __aenter__(self):
+        """Support du context manager asynchrone."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Arrêt automatique à la sortie du context manager."""
+        await self.stop()
+        return False
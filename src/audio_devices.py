@@ -1,29 +1,124 @@
 """Module pour la détection et gestion des périphériques audio."""
 
-import pyaudio
 import platform
+import threading
 from typing import Optional, List, Dict
 
-# Import conditionnel pour PulseAudio sur Linux
-try:
-    import pulsectl
-    PULSECTL_AVAILABLE = True
-except ImportError:
-    PULSECTL_AVAILABLE = False
+from src.device_matcher import DeviceMatch, DeviceNameIndex, best_match
 
+# pyaudio (PortAudio) et pulsectl (libpulse) sont coûteux à charger : ils ne
+# sont importés qu'au premier besoin, pour que --help reste instantané.
+_pulsectl_module = None
+_pulsectl_checked = False
 
-def list_audio_devices() -> List[Dict]:
+
+def _load_pyaudio():
+    """Importe pyaudio à la demande."""
+    import pyaudio
+    return pyaudio
+
+
+def _load_pulsectl():
     """
-    Liste tous les périphériques audio disponibles.
+    Importe pulsectl à la demande.
 
     Returns:
-        Liste de dictionnaires contenant les informations des périphériques
-        Chaque dictionnaire contient: index, name, maxInputChannels, defaultSampleRate
+        Module pulsectl, ou None s'il n'est pas disponible
     """
-    devices = []
-    p = pyaudio.PyAudio()
+    global _pulsectl_module, _pulsectl_checked
+    if not _pulsectl_checked:
+        try:
+            import pulsectl
+            _pulsectl_module = pulsectl
+        except (ImportError, OSError):
+            # OSError : bibliothèque libpulse absente du système
+            _pulsectl_module = None
+        _pulsectl_checked = True
+    return _pulsectl_module
+
+
+def __getattr__(name: str):
+    """Expose pyaudio, pulsectl et PULSECTL_AVAILABLE comme attributs chargés à la demande."""
+    if name == 'pyaudio':
+        return _load_pyaudio()
+    if name == 'pulsectl':
+        module = _load_pulsectl()
+        if module is None:
+            raise AttributeError(name)
+        return module
+    if name == 'PULSECTL_AVAILABLE':
+        return _load_pulsectl() is not None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class DeviceRegistry:
+    """
+    Registre partagé des périphériques audio PyAudio.
 
-    try:
+    Une seule instance PyAudio est créée et les périphériques ne sont énumérés
+    qu'une fois, puis indexés par index et par nom. L'instance PyAudio est
+    partagée avec AudioRecorder : acquire()/release() comptent les utilisateurs
+    afin qu'invalidate() ne termine jamais PortAudio sous un flux ouvert.
+    """
+
+    def __init__(self):
+        """Initialise un registre vide (l'énumération est faite à la demande)."""
+        self._lock = threading.RLock()
+        self._pyaudio: Optional['pyaudio.PyAudio'] = None
+        self._devices: Optional[List[Dict]] = None
+        self._by_index: Dict[int, Dict] = {}
+        self._by_name: Dict[str, List[Dict]] = {}
+        # Nombre d'utilisateurs par instance PyAudio (clé: id de l'instance)
+        self._users: Dict[int, int] = {}
+        # Instances invalidées encore utilisées, terminées au dernier release()
+        self._retired: Dict[int, 'pyaudio.PyAudio'] = {}
+
+    def get_pyaudio(self) -> 'pyaudio.PyAudio':
+        """
+        Retourne l'instance PyAudio partagée (créée au premier appel).
+
+        Returns:
+            Instance PyAudio initialisée
+        """
+        with self._lock:
+            if self._pyaudio is None:
+                self._pyaudio = _load_pyaudio().PyAudio()
+            return self._pyaudio
+
+    def acquire(self) -> 'pyaudio.PyAudio':
+        """
+        Réserve l'instance PyAudio partagée pour ouvrir un flux.
+
+        Returns:
+            Instance PyAudio à rendre avec release()
+        """
+        with self._lock:
+            instance = self.get_pyaudio()
+            self._users[id(instance)] = self._users.get(id(instance), 0) + 1
+            return instance
+
+    def release(self, instance: 'pyaudio.PyAudio'):
+        """
+        Rend une instance obtenue avec acquire().
+
+        Args:
+            instance: Instance PyAudio à rendre
+        """
+        with self._lock:
+            key = id(instance)
+            remaining = self._users.get(key, 0) - 1
+            if remaining > 0:
+                self._users[key] = remaining
+                return
+            self._users.pop(key, None)
+            retired = self._retired.pop(key, None)
+            if retired is not None:
+                retired.terminate()
+
+    def _enumerate(self):
+        """Énumère les périphériques et construit les index (appelé sous verrou)."""
+        p = self.get_pyaudio()
+        devices = []
         device_count = p.get_device_count()
         for i in range(device_count):
             try:
@@ -32,15 +127,130 @@ def list_audio_devices() -> List[Dict]:
                     'index': i,
                     'name': info.get('name', ''),
                     'maxInputChannels': info.get('maxInputChannels', 0),
-                    'defaultSampleRate': info.get('defaultSampleRate', 0)
+                    'maxOutputChannels': info.get('maxOutputChannels', 0),
+                    'defaultSampleRate': info.get('defaultSampleRate', 0),
+                    'defaultLowInputLatency': info.get('defaultLowInputLatency', 0),
+                    'defaultHighInputLatency': info.get('defaultHighInputLatency', 0),
                 })
             except Exception:
                 # Ignorer les périphériques inaccessibles
                 continue
-    finally:
-        p.terminate()
 
-    return devices
+        self._devices = devices
+        self._by_index = {device['index']: device for device in devices}
+        self._by_name = {}
+        for device in devices:
+            self._by_name.setdefault(device['name'].lower(), []).append(device)
+
+    def list_devices(self) -> List[Dict]:
+        """
+        Retourne la liste des périphériques (énumérée une seule fois).
+
+        Returns:
+            Liste de dictionnaires décrivant les périphériques
+        """
+        with self._lock:
+            if self._devices is None:
+                self._enumerate()
+            return list(self._devices)
+
+    def get_device(self, device_index: int) -> Optional[Dict]:
+        """
+        Retourne un périphérique par son index.
+
+        Args:
+            device_index: Index PyAudio du périphérique
+
+        Returns:
+            Dictionnaire du périphérique, ou None s'il n'existe pas
+        """
+        with self._lock:
+            if self._devices is None:
+                self._enumerate()
+            return self._by_index.get(device_index)
+
+    def find_by_name(self, name: str) -> List[Dict]:
+        """
+        Retourne les périphériques dont le nom correspond exactement (sans casse).
+
+        Args:
+            name: Nom du périphérique
+
+        Returns:
+            Liste des périphériques correspondants (éventuellement vide)
+        """
+        with self._lock:
+            if self._devices is None:
+                self._enumerate()
+            return list(self._by_name.get(name.lower(), []))
+
+    def invalidate(self):
+        """
+        Oublie les périphériques énumérés et réinitialise PortAudio au prochain accès.
+
+        Nécessaire pour voir les périphériques branchés après l'énumération.
+        L'instance PyAudio courante est terminée immédiatement si aucun flux ne
+        l'utilise, sinon au dernier release().
+        """
+        with self._lock:
+            self._devices = None
+            self._by_index = {}
+            self._by_name = {}
+            if self._pyaudio is not None:
+                instance = self._pyaudio
+                self._pyaudio = None
+                if self._users.get(id(instance), 0) > 0:
+                    self._retired[id(instance)] = instance
+                else:
+                    instance.terminate()
+
+
+# Registre partagé par défaut
+_device_registry = DeviceRegistry()
+
+
+def get_device_registry() -> DeviceRegistry:
+    """
+    Retourne le registre de périphériques partagé par le programme.
+
+    Returns:
+        Instance DeviceRegistry partagée
+    """
+    return _device_registry
+
+
+def list_audio_devices(registry: Optional[DeviceRegistry] = None) -> List[Dict]:
+    """
+    Liste tous les périphériques audio disponibles.
+
+    Les périphériques sont lus depuis le registre partagé : PortAudio n'est
+    initialisé et interrogé qu'une fois (voir DeviceRegistry.invalidate()).
+
+    Args:
+        registry: Registre de périphériques (par défaut le registre partagé)
+
+    Returns:
+        Liste de dictionnaires contenant les informations des périphériques
+        Chaque dictionnaire contient: index, name, maxInputChannels, defaultSampleRate
+    """
+    return (registry or get_device_registry()).list_devices()
+
+
+def source_format(source) -> Dict:
+    """
+    Extrait le format natif d'une source PulseAudio.
+
+    Args:
+        source: Source retournée par pulsectl
+
+    Returns:
+        Dictionnaire contenant: sample_rate, channels (None si inconnus)
+    """
+    sample_spec = getattr(source, 'sample_spec', None)
+    return {
+        'sample_rate': getattr(sample_spec, 'rate', None),
+        'channels': getattr(sample_spec, 'channels', None),
+    }
 
 
 def find_default_sink_monitor() -> Optional[Dict]:
@@ -52,12 +262,14 @@ def find_default_sink_monitor() -> Optional[Dict]:
 
     Returns:
         Dictionnaire avec les informations du Monitor par défaut, ou None si non trouvé
-        Format: {'name': str, 'description': str, 'index': int, 'monitor_of_sink': int}
+        Format: {'name': str, 'description': str, 'index': int, 'monitor_of_sink': int,
+                 'sample_rate': int, 'channels': int}
     """
-    if not PULSECTL_AVAILABLE:
+    if platform.system() != 'Linux':
         return None
 
-    if platform.system() != 'Linux':
+    pulsectl = _load_pulsectl()
+    if pulsectl is None:
         return None
 
     try:
@@ -87,7 +299,8 @@ def find_default_sink_monitor() -> Optional[Dict]:
                         'description': source.description,
                         'index': source.index,
                         'monitor_of_sink': source.monitor_of_sink,
-                        'is_default': True
+                        'is_default': True,
+                        **source_format(source)
                     }
     except Exception as e:
         # Si PulseAudio n'est pas disponible, retourner None
@@ -107,12 +320,14 @@ def get_pulseaudio_monitor_devices() -> List[Dict]:
 
     Returns:
         Liste de dictionnaires avec les informations des Monitor sources
-        Format: [{'name': str, 'description': str, 'index': int, 'is_monitor': bool}, ...]
+        Format: [{'name': str, 'description': str, 'index': int, 'is_monitor': bool,
+                  'sample_rate': int, 'channels': int}, ...]
     """
-    if not PULSECTL_AVAILABLE:
+    if platform.system() != 'Linux':
         return []
 
-    if platform.system() != 'Linux':
+    pulsectl = _load_pulsectl()
+    if pulsectl is None:
         return []
 
     monitors = []
@@ -145,7 +360,8 @@ def get_pulseaudio_monitor_devices() -> List[Dict]:
                         'description': source.description,
                         'index': source.index,
                         'monitor_of_sink': monitor_of_sink,
-                        'is_hdmi': 'hdmi' in source.description.lower() or 'displayport' in source.description.lower()
+                        'is_hdmi': 'hdmi' in source.description.lower() or 'displayport' in source.description.lower(),
+                        **source_format(source)
                     })
     except Exception as e:
         # Si PulseAudio n'est pas disponible, retourner une liste vide
@@ -156,72 +372,101 @@ def get_pulseaudio_monitor_devices() -> List[Dict]:
     return monitors
 
 
-def map_pulseaudio_to_pyaudio(pulse_source_name: str, pulse_description: str = "") -> Optional[int]:
+# Index des noms PyAudio (clé: liste des périphériques indexés)
+_name_index_cache = None
+
+
+def get_device_name_index(registry: Optional[DeviceRegistry] = None) -> DeviceNameIndex:
     """
-    Trouve l'index PyAudio correspondant à un périphérique PulseAudio.
+    Retourne l'index des noms PyAudio, reconstruit uniquement si la liste change.
 
-    Cette fonction utilise plusieurs stratégies de correspondance pour améliorer
-    la fiabilité du mapping entre PulseAudio et PyAudio.
+    Args:
+        registry: Registre de périphériques (par défaut le registre partagé)
+
+    Returns:
+        Index précalculé des noms de périphériques
+    """
+    global _name_index_cache
+    devices = list_audio_devices(registry)
+    key = tuple((device['index'], device['name'], device['maxInputChannels']) for device in devices)
+    if _name_index_cache is None or _name_index_cache[0] != key:
+        _name_index_cache = (key, DeviceNameIndex(devices))
+    return _name_index_cache[1]
+
+
+def rank_pyaudio_candidates(
+    pulse_source_name: str,
+    pulse_description: str = "",
+    registry: Optional[DeviceRegistry] = None
+) -> List[DeviceMatch]:
+    """
+    Classe les périphériques PyAudio pouvant correspondre à une source PulseAudio.
+
+    Stratégies, de la plus fiable à la moins fiable : nom exact, nom PulseAudio
+    contenu dans le nom PyAudio, nom PyAudio contenu dans le nom PulseAudio,
+    mots-clés de la description, puis fallback vers un périphérique "pulse".
 
     Args:
         pulse_source_name: Nom du périphérique PulseAudio
         pulse_description: Description du périphérique PulseAudio (optionnel)
+        registry: Registre de périphériques (par défaut le registre partagé)
 
     Returns:
-        Index PyAudio du périphérique, ou None si non trouvé
+        Candidats (index, score, stratégie) triés par score décroissant
     """
-    import logging
-    devices = list_audio_devices()
+    return get_device_name_index(registry).rank(pulse_source_name, pulse_description)
 
-    pulse_name_lower = pulse_source_name.lower()
-    pulse_desc_lower = pulse_description.lower() if pulse_description else ""
 
-    logging.debug(f"Tentative de mapping: PulseAudio '{pulse_source_name}' vers PyAudio")
+def map_pulseaudio_sources(
+    sources: List[Dict],
+    registry: Optional[DeviceRegistry] = None
+) -> Dict[str, List[DeviceMatch]]:
+    """
+    Résout en un seul lot plusieurs sources PulseAudio vers leurs candidats PyAudio.
 
-    # Stratégie 1 : Correspondance exacte du nom
-    for device in devices:
-        device_name = device['name'].lower()
-        if pulse_name_lower == device_name:
-            logging.debug(f"  ✓ Correspondance exacte trouvée: index {device['index']}")
-            return device['index']
+    Args:
+        sources: Sources PulseAudio (voir get_pulseaudio_monitor_devices)
+        registry: Registre de périphériques (par défaut le registre partagé)
 
-    # Stratégie 2 : Le nom PulseAudio est contenu dans le nom PyAudio
-    for device in devices:
-        device_name = device['name'].lower()
-        if pulse_name_lower in device_name:
-            logging.debug(f"  ✓ Nom PulseAudio trouvé dans PyAudio: index {device['index']}")
-            return device['index']
+    Returns:
+        Dictionnaire nom PulseAudio -> candidats triés par score décroissant
+    """
+    import logging
+    results = get_device_name_index(registry).match(
+        (source['name'], source.get('description', '')) for source in sources
+    )
+    mapping = dict(zip((source['name'] for source in sources), results))
+    for name, candidates in mapping.items():
+        if candidates:
+            top = candidates[0]
+            logging.debug(f"  {name} → index {top.index} ({top.strategy}, score {top.score:.2f})")
+        else:
+            logging.debug(f"  {name} → aucune correspondance")
+    return mapping
 
-    # Stratégie 3 : Le nom PyAudio est contenu dans le nom PulseAudio
-    for device in devices:
-        device_name = device['name'].lower()
-        if device_name in pulse_name_lower:
-            logging.debug(f"  ✓ Nom PyAudio trouvé dans PulseAudio: index {device['index']}")
-            return device['index']
 
-    # Stratégie 4 : Correspondance partielle par description
-    if pulse_desc_lower:
-        for device in devices:
-            device_name = device['name'].lower()
-            # Extraire des mots-clés de la description
-            desc_keywords = pulse_desc_lower.split()
-            matches = sum(1 for keyword in desc_keywords if len(keyword) > 3 and keyword in device_name)
-            if matches >= 2:  # Au moins 2 mots-clés correspondent
-                logging.debug(f"  ✓ Correspondance par description: index {device['index']}")
-                return device['index']
+def map_pulseaudio_to_pyaudio(
+    pulse_source_name: str,
+    pulse_description: str = "",
+    registry: Optional[DeviceRegistry] = None
+) -> Optional[int]:
+    """
+    Trouve l'index PyAudio correspondant à un périphérique PulseAudio.
 
-    # Stratégie 5 : Fallback vers le premier périphérique avec "pulse" dans le nom
-    # ET qui peut capturer de l'audio
-    for device in devices:
-        if device['maxInputChannels'] > 0 and 'pulse' in device['name'].lower():
-            logging.debug(f"  ⚠ Fallback vers périphérique Pulse: index {device['index']}")
-            return device['index']
+    Raccourci vers le meilleur candidat de rank_pyaudio_candidates().
 
-    logging.debug(f"  ✗ Aucune correspondance trouvée")
-    return None
+    Args:
+        pulse_source_name: Nom du périphérique PulseAudio
+        pulse_description: Description du périphérique PulseAudio (optionnel)
+        registry: Registre de périphériques (par défaut le registre partagé)
 
+    Returns:
+        Index PyAudio du périphérique, ou None si non trouvé
+    """
+    return best_match(rank_pyaudio_candidates(pulse_source_name, pulse_description, registry))
 
-def find_loopback_device() -> Optional[int]:
+
+def find_loopback_device(registry: Optional[DeviceRegistry] = None) -> Optional[int]:
     """
     Trouve le périphérique de loopback/monitor système pour la capture audio.
 
@@ -235,13 +480,16 @@ def find_loopback_device() -> Optional[int]:
     Sur Windows, recherche les périphériques WASAPI Loopback.
     Sur macOS, recherche Soundflower ou BlackHole.
 
+    Args:
+        registry: Registre de périphériques (par défaut le registre partagé)
+
     Returns:
         Index du périphérique de loopback, ou None si aucun n'est trouvé
     """
     import logging
 
     # Sur Linux, essayer d'abord avec PulseAudio
-    if platform.system() == 'Linux' and PULSECTL_AVAILABLE:
+    if platform.system() == 'Linux' and _load_pulsectl() is not None:
         logging.debug("Détection du périphérique loopback sur Linux avec PulseAudio/PipeWire")
 
         # Stratégie 1 : Utiliser le Monitor du sink par défaut (RECOMMANDÉ)
@@ -251,7 +499,8 @@ def find_loopback_device() -> Optional[int]:
             logging.debug(f"    ✓ Monitor par défaut trouvé: {default_monitor['description']}")
             pyaudio_index = map_pulseaudio_to_pyaudio(
                 default_monitor['name'],
-                default_monitor['description']
+                default_monitor['description'],
+                registry
             )
             if pyaudio_index is not None:
                 logging.debug(f"    ✓ Mappé vers PyAudio index: {pyaudio_index}")
@@ -265,16 +514,16 @@ def find_loopback_device() -> Optional[int]:
         if monitors:
             logging.debug(f"    {len(monitors)} Monitor(s) détecté(s)")
 
+            # Résoudre tous les Monitors en un seul lot
+            mapping = map_pulseaudio_sources(monitors, registry)
+
             # Prioriser les Monitors non-HDMI
             non_hdmi_monitors = [m for m in monitors if not m.get('is_hdmi', False)]
             if non_hdmi_monitors:
                 logging.debug(f"    {len(non_hdmi_monitors)} Monitor(s) non-HDMI")
                 for monitor in non_hdmi_monitors:
                     logging.debug(f"      Tentative: {monitor['description']}")
-                    pyaudio_index = map_pulseaudio_to_pyaudio(
-                        monitor['name'],
-                        monitor['description']
-                    )
+                    pyaudio_index = best_match(mapping[monitor['name']])
                     if pyaudio_index is not None:
                         logging.debug(f"      ✓ Mappé vers PyAudio index: {pyaudio_index}")
                         return pyaudio_index
@@ -283,17 +532,14 @@ def find_loopback_device() -> Optional[int]:
             logging.debug("    Tentative avec tous les Monitors (y compris HDMI)")
             for monitor in monitors:
                 logging.debug(f"      Tentative: {monitor['description']}")
-                pyaudio_index = map_pulseaudio_to_pyaudio(
-                    monitor['name'],
-                    monitor['description']
-                )
+                pyaudio_index = best_match(mapping[monitor['name']])
                 if pyaudio_index is not None:
                     logging.debug(f"      ✓ Mappé vers PyAudio index: {pyaudio_index}")
                     return pyaudio_index
 
     # Stratégie 3 : Fallback via recherche par mots-clés dans PyAudio
     logging.debug("  Stratégie 3: Recherche par mots-clés dans PyAudio")
-    devices = list_audio_devices()
+    devices = list_audio_devices(registry)
 
     # Mots-clés pour identifier les périphériques de loopback selon la plateforme
     loopback_keywords = [
@@ -323,33 +569,22 @@ def find_loopback_device() -> Optional[int]:
     return None
 
 
-def get_device_info(device_index: int) -> Optional[Dict]:
+def get_device_info(device_index: int, registry: Optional[DeviceRegistry] = None) -> Optional[Dict]:
     """
     Récupère les informations détaillées d'un périphérique audio.
 
     Args:
         device_index: Index du périphérique
+        registry: Registre de périphériques (par défaut le registre partagé)
 
     Returns:
         Dictionnaire avec les informations du périphérique, ou None si non trouvé
     """
-    p = pyaudio.PyAudio()
-
     try:
-        info = p.get_device_info_by_index(device_index)
-        return {
-            'index': device_index,
-            'name': info.get('name', ''),
-            'maxInputChannels': info.get('maxInputChannels', 0),
-            'maxOutputChannels': info.get('maxOutputChannels', 0),
-            'defaultSampleRate': info.get('defaultSampleRate', 0),
-            'defaultLowInputLatency': info.get('defaultLowInputLatency', 0),
-            'defaultHighInputLatency': info.get('defaultHighInputLatency', 0),
-        }
+        device = (registry or get_device_registry()).get_device(device_index)
     except Exception:
         return None
-    finally:
-        p.terminate()
+    return dict(device) if device is not None else None
 
 
 def print_available_devices():
@@ -358,7 +593,7 @@ def print_available_devices():
     Utile pour le débogage et la configuration.
     """
     # Afficher les Monitors PulseAudio si disponible
-    if platform.system() == 'Linux' and PULSECTL_AVAILABLE:
+    if platform.system() == 'Linux' and _load_pulsectl() is not None:
         print("🔍 Détection PulseAudio/PipeWire")
         print("-" * 80)
 
@@ -382,17 +617,17 @@ def print_available_devices():
         if monitors:
             print(f"Tous les périphériques Monitor PulseAudio/PipeWire ({len(monitors)} trouvé(s)):")
             print("-" * 80)
+            mapping = map_pulseaudio_sources(monitors)
             for monitor in monitors:
                 hdmi_marker = " [HDMI/DisplayPort]" if monitor.get('is_hdmi', False) else ""
                 print(f"[PulseAudio #{monitor['index']}] {monitor['description']}{hdmi_marker}")
                 print(f"    Nom: {monitor['name']}")
-                # Essayer de mapper vers PyAudio
-                pyaudio_index = map_pulseaudio_to_pyaudio(
-                    monitor['name'],
-                    monitor['description']
-                )
-                if pyaudio_index is not None:
-                    print(f"    → Mappé vers PyAudio index: {pyaudio_index}")
+                # Meilleur candidat PyAudio
+                candidates = mapping[monitor['name']]
+                if candidates:
+                    top = candidates[0]
+                    print(f"    → Mappé vers PyAudio index: {top.index} "
+                          f"({top.strategy}, score {top.score:.2f})")
                 else:
                     print(f"    → Non accessible via PyAudio directement")
                 print()
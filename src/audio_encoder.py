@@ -0,0 +1,76 @@
+"""Module définissant l'interface commune des encodeurs audio."""
+
+from pathlib import Path
+
+FFMPEG_MISSING_MESSAGE = (
+    "FFmpeg n'est pas installé ou n'est pas dans le PATH. "
+    "Installez FFmpeg pour encoder l'audio:\n"
+    "  - Ubuntu/Debian: sudo apt-get install ffmpeg\n"
+    "  - macOS: brew install ffmpeg\n"
+    "  - Fedora: sudo dnf install ffmpeg"
+)
+
+
+class AudioEncoder:
+    """
+    Interface commune des encodeurs consommés par AudioRecorder.
+
+    Un encodeur reçoit du PCM brut entrelacé via write_frames() et finalise
+    son fichier de sortie à l'appel de close(). Les sous-classes définissent
+    l'extension des fichiers produits.
+    """
+
+    # Extension des fichiers produits (sans le point)
+    extension = ""
+
+    def __init__(
+        self,
+        output_file: Path,
+        sample_rate: int = 44100,
+        channels: int = 2,
+        sample_width: int = 2
+    ):
+        """
+        Initialise l'encodeur.
+
+        Args:
+            output_file: Chemin du fichier de sortie
+            sample_rate: Taux d'échantillonnage en Hz (par défaut 44100)
+            channels: Nombre de canaux audio (1=mono, 2=stéréo)
+            sample_width: Largeur d'échantillon en octets (2 pour 16-bit)
+        """
+        self.output_file = output_file
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self._is_closed = False
+
+    def write_frames(self, frames: bytes):
+        """
+        Transmet des frames audio à l'encodeur.
+
+        Args:
+            frames: Données audio brutes (bytes, bytearray ou memoryview)
+
+        Raises:
+            RuntimeError: Si l'encodeur a déjà été fermé
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Finalise l'encodage et le fichier de sortie.
+
+        Raises:
+            RuntimeError: Si l'encodage échoue
+        """
+        raise NotImplementedError
+
+    def __enter__(self):
+        """Support du context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Ferme automatiquement l'encodeur lors de la sortie du context."""
+        self.close()
+        return False
@@ -1,14 +1,48 @@
 """Module pour l'enregistrement audio en continu."""
 
 import os
+import time
 import pyaudio
 import threading
+from concurrent.futures import Future
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 
-from src.audio_devices import find_loopback_device, get_device_info
+from src.audio_devices import (
+    DeviceRegistry,
+    find_default_sink_monitor,
+    find_loopback_device,
+    get_device_info,
+    get_device_registry
+)
+from src.audio_encoder import AudioEncoder
+from src.encode_pool import DeferredEncoder, EncodeBatch, EncodePool
+from src.encoders import (
+    DEFAULT_BITRATES,
+    create_encoder,
+    estimate_byte_rate,
+    get_encoder_class
+)
+from src.level_meter import DEFAULT_SILENCE_THRESHOLD_DB, LevelMeter
 from src.mp3_encoder import MP3Encoder
+from src.pcm_buffer import BUFFER_BACKENDS
+from src.pcm_spool import PCMSpool
+from src.pipeline import FanoutStage, PipelineSink
+from src.pulse_capture import CAPTURE_BACKENDS, DEFAULT_FRAGMENT_SECONDS, PulseCapture
+from src.pulse_monitor import DeviceChange, PulseDeviceMonitor
+from src.replay_buffer import ReplayBuffer
+from src.resample import Resampler
+from src.ring_buffer import RingBuffer
+from src.stream_mixer import MIX_MODES, SAMPLE_DTYPES, StreamMixer
+from src.transcription import StreamingTranscriber
+from src.vad import REGION_END, REGION_START, VoiceGate
+
+# Taux d'échantillonnage utilisé quand celui du périphérique est inconnu
+DEFAULT_SAMPLE_RATE = 44100
+
+# Moteurs de capture PyAudio disponibles
+CAPTURE_MODES = ("blocking", "callback")
 
 
 class AudioRecorder:
@@ -17,46 +51,276 @@ class AudioRecorder:
     def __init__(
         self,
         output_dir: str = "~/audio/enregistrements",
-        sample_rate: int = 44100,
+        sample_rate: Optional[int] = None,
         channels: int = 2,
         chunk_size: int = 1024,
         audio_format: int = pyaudio.paInt16,
         use_system_audio: bool = True,
-        bitrate: str = "128k",
-        device_index: Optional[int] = None
+        bitrate: Optional[str] = None,
+        device_index: Optional[int] = None,
+        streaming: bool = True,
+        parallel_encode: Optional[int] = None,
+        buffer_backend: str = "memory",
+        buffer_seconds: float = 10.0,
+        capture_mode: str = "blocking",
+        count_xruns: bool = False,
+        segment_duration: Optional[float] = None,
+        segment_max_bytes: Optional[int] = None,
+        device_registry: Optional[DeviceRegistry] = None,
+        device_indexes: Optional[List[int]] = None,
+        mix_mode: str = "mix",
+        output_format: str = "mp3",
+        spool: bool = False,
+        spool_sync_interval: float = 1.0,
+        encode_pool: Optional[EncodePool] = None,
+        metering: bool = True,
+        silence_threshold_db: float = DEFAULT_SILENCE_THRESHOLD_DB,
+        gate_threshold_db: Optional[float] = None,
+        gate_hangover: float = 1.5,
+        gate_preroll: float = 0.3,
+        transcriber: Optional[StreamingTranscriber] = None,
+        capture_backend: str = "pyaudio",
+        pulse_source: Optional[str] = None,
+        fragment_seconds: float = DEFAULT_FRAGMENT_SECONDS,
+        device_monitor: Optional[PulseDeviceMonitor] = None,
+        max_reroute_gap: float = 5.0,
+        replay_seconds: Optional[float] = None
     ):
         """
         Initialise l'enregistreur audio.
 
         Args:
             output_dir: Répertoire de sortie pour les fichiers audio
-            sample_rate: Taux d'échantillonnage en Hz (par défaut 44100)
-            channels: Nombre de canaux audio (1=mono, 2=stéréo)
+            sample_rate: Taux d'échantillonnage des fichiers en Hz (optionnel).
+                         La capture se fait toujours au taux natif du
+                         périphérique (defaultSampleRate), sans conversion par
+                         le serveur audio ; si le taux demandé diffère, le PCM
+                         est converti dans le pipeline (voir Resampler). Par
+                         défaut, les fichiers gardent le taux natif (44100 Hz
+                         si celui-ci est inconnu).
+            channels: Nombre maximal de canaux audio (1=mono, 2=stéréo). Un
+                      périphérique offrant moins de canaux est capturé et
+                      enregistré avec ses propres canaux.
             chunk_size: Taille des chunks de lecture audio
             audio_format: Format audio PyAudio (par défaut paInt16)
             use_system_audio: Utiliser la capture système (loopback) au lieu du microphone
-            bitrate: Bitrate pour l'encodage MP3 (par défaut "128k")
+            bitrate: Bitrate des formats avec perte (par défaut "128k" en MP3,
+                     "32k" en Opus ; ignoré en FLAC et WAV)
             device_index: Index du périphérique audio à utiliser (optionnel).
                          Si spécifié, remplace la détection automatique.
                          Utilisez --list-devices pour voir les périphériques disponibles.
+            streaming: Encoder en continu pendant la capture (mémoire bornée,
+                       arrêt quasi instantané). Si False, tout le PCM est conservé
+                       en mémoire et encodé à l'arrêt.
+            parallel_encode: Avec streaming=False en MP3, nombre de processus
+                             FFmpeg encodant à l'arrêt le PCM par morceaux en
+                             parallèle (optionnel)
+            buffer_backend: Emplacement du PCM accumulé avec streaming=False en
+                            MP3, et de la fenêtre de relecture : "memory" ou
+                            "mmap" (fichier temporaire du répertoire de
+                            sortie, mémoire résidente bornée)
+            buffer_seconds: Durée d'audio que le buffer circulaire entre la capture
+                            et l'encodeur peut absorber si l'encodeur prend du retard
+            capture_mode: Moteur de capture PyAudio : "blocking" (boucle de lecture
+                          dans un thread Python) ou "callback" (PortAudio appelle
+                          directement la copie dans le buffer circulaire)
+            count_xruns: En mode "blocking", compter les débordements d'entrée
+                         PortAudio pour comparer les moteurs de capture. Le
+                         chunk lu lors d'un débordement est alors perdu en
+                         entier : sans cette option, seuls les échantillons
+                         débordés le sont (et les débordements ne sont pas
+                         comptés). Le mode "callback" les compte toujours.
+            segment_duration: Durée maximale d'un fichier en secondes (optionnel).
+                              Au-delà, l'enregistrement continue dans un nouveau
+                              fichier sans perte d'échantillon.
+            segment_max_bytes: Taille maximale estimée d'un fichier en octets
+                               (optionnel), déduite du bitrate
+            device_registry: Registre de périphériques fournissant l'instance PyAudio
+                             (par défaut le registre partagé du programme)
+            device_indexes: Index de plusieurs périphériques à capturer simultanément
+                            (optionnel, remplace device_index). Les flux sont
+                            alignés, corrigés de leur dérive d'horloge et combinés
+                            en un seul fichier.
+            mix_mode: Combinaison des sources multiples : "mix" (somme sur
+                      `channels` canaux) ou "interleave" (canaux des sources
+                      juxtaposés dans le fichier)
+            output_format: Format des fichiers produits : "mp3", "opus", "flac"
+                           ou "wav" (PCM écrit directement, sans encodage)
+            spool: Copier aussi le PCM sur le disque (`<fichier>.spool`) pour
+                   pouvoir récupérer l'enregistrement après un arrêt brutal
+                   (voir recover_spool). Le spool est supprimé une fois le
+                   fichier final encodé.
+            spool_sync_interval: Intervalle maximal entre deux synchronisations
+                                 (fsync) du spool sur le disque, en secondes
+            encode_pool: Pool de processus chargé de l'encodage (optionnel). Le
+                         PCM est alors seulement écrit dans un spool pendant la
+                         capture ; chaque fichier est encodé en arrière-plan dès
+                         qu'il est terminé et stop_recording() n'attend pas la
+                         fin de l'encodage.
+            metering: Mesurer les niveaux (RMS, crête, écrêtage, silence) de
+                      l'audio transmis à l'encodeur (voir get_levels())
+            silence_threshold_db: Niveau RMS (dBFS) sous lequel l'audio est
+                                  considéré comme silencieux
+            gate_threshold_db: Active la détection d'activité (optionnel) :
+                               niveau RMS (dBFS) ouvrant une région. Les
+                               silences ne sont pas encodés et chaque région
+                               d'activité produit son propre fichier, nommé
+                               d'après l'heure de son début (voir VoiceGate).
+            gate_hangover: Silence en secondes avant de clore une région
+            gate_preroll: Audio en secondes conservé avant le début d'une région
+            transcriber: Transcripteur alimenté pendant la capture avec l'audio
+                         encodé (optionnel, PCM 16 bits). Il est démarré avec
+                         l'enregistrement ; stop_recording() signale la fin de
+                         l'audio sans attendre les derniers résultats
+                         (voir StreamingTranscriber.wait()).
+            capture_backend: Moteur de capture : "pyaudio" (PortAudio) ou
+                             "pulse" (source PulseAudio/PipeWire ouverte
+                             directement par son nom, voir PulseCapture)
+            pulse_source: Avec le moteur "pulse", nom de la source à capturer
+                          (optionnel). Par défaut, le Monitor de la sortie par
+                          défaut si use_system_audio, sinon la source par défaut.
+            fragment_seconds: Avec le moteur "pulse", durée d'audio remise par
+                              le serveur de son à chaque réveil de la capture
+            device_monitor: Avec le moteur "pulse", suivi des périphériques
+                            déjà démarré (optionnel). La source est alors lue
+                            dans son modèle et la capture est redirigée, sans
+                            changer de fichier, vers le Monitor par défaut si
+                            la source disparaît ou, sans pulse_source, si la
+                            sortie par défaut change (voir switch_pulse_source)
+            max_reroute_gap: Durée maximale en secondes d'une interruption de
+                             la capture en attente d'une nouvelle source ;
+                             l'intervalle perdu est comblé par du silence
+            replay_seconds: Active le mode relecture (optionnel) : durée en
+                            secondes de la fenêtre conservée. La capture
+                            démarre en veille, sans fichier ni encodage : seul
+                            le PCM des dernières `replay_seconds` secondes est
+                            gardé (voir ReplayBuffer). save_replay() encode
+                            cette fenêtre dans un fichier, puis l'audio suivant
+                            jusqu'à stop_recording().
+
+        Raises:
+            ValueError: Si le mode ou le moteur de capture, de mixage, le
+                        format ou le backend de buffer est inconnu
         """
+        if capture_mode not in CAPTURE_MODES:
+            raise ValueError(
+                f"Mode de capture inconnu: {capture_mode} "
+                f"(valeurs possibles: {', '.join(CAPTURE_MODES)})"
+            )
+        if capture_backend not in CAPTURE_BACKENDS:
+            raise ValueError(
+                f"Backend de capture inconnu: {capture_backend} "
+                f"(valeurs possibles: {', '.join(CAPTURE_BACKENDS)})"
+            )
+        self.encoder_class = get_encoder_class(output_format)
+        if buffer_backend not in BUFFER_BACKENDS:
+            raise ValueError(
+                f"Backend de buffer inconnu: {buffer_backend} "
+                f"(valeurs possibles: {', '.join(BUFFER_BACKENDS)})"
+            )
+        if mix_mode not in MIX_MODES:
+            raise ValueError(
+                f"Mode de mixage inconnu: {mix_mode} "
+                f"(valeurs possibles: {', '.join(MIX_MODES)})"
+            )
+
         self.output_dir = Path(output_dir).expanduser()
-        self.sample_rate = sample_rate
+        self.requested_sample_rate = sample_rate
+        self.sample_rate = sample_rate or DEFAULT_SAMPLE_RATE
         self.channels = channels
         self.chunk_size = chunk_size
         self.audio_format = audio_format
         self.use_system_audio = use_system_audio
-        self.bitrate = bitrate
+        self.output_format = output_format
+        self.use_spool = spool
+        self.spool_sync_interval = spool_sync_interval
+        self.encode_pool = encode_pool
+        self.bitrate = bitrate or DEFAULT_BITRATES.get(output_format)
         self.manual_device_index = device_index
+        self.streaming = streaming
+        self.parallel_encode = parallel_encode
+        self.buffer_backend = buffer_backend
+        self.buffer_seconds = buffer_seconds
+        self.capture_mode = capture_mode
+        self.count_xruns = count_xruns
+        self.segment_duration = segment_duration
+        self.segment_max_bytes = segment_max_bytes
+        self.device_registry = device_registry or get_device_registry()
+        self.device_indexes = list(device_indexes) if device_indexes else None
+        if self.device_indexes and len(self.device_indexes) == 1:
+            self.manual_device_index = self.device_indexes[0]
+        self.mix_mode = mix_mode
+        self.metering = metering
+        self.silence_threshold_db = silence_threshold_db
+        self.gate_threshold_db = gate_threshold_db
+        self.gate_hangover = gate_hangover
+        self.gate_preroll = gate_preroll
+        self.transcriber = transcriber
+        self.capture_backend = capture_backend
+        self.pulse_source = pulse_source
+        self.fragment_seconds = fragment_seconds
+        self.device_monitor = device_monitor
+        self.max_reroute_gap = max_reroute_gap
+        self.replay_seconds = replay_seconds
 
         # État interne
         self.is_recording = False
         self.pyaudio_instance: Optional[pyaudio.PyAudio] = None
         self.stream: Optional[pyaudio.Stream] = None
-        self.mp3_encoder: Optional[MP3Encoder] = None
+        self.encoder: Optional[AudioEncoder] = None
+        self.spool: Optional[PCMSpool] = None
+        # Encodages soumis au pool, par fichier de segment
+        self.encode_jobs: Dict[Path, Future] = {}
+        self.ring_buffer: Optional[RingBuffer] = None
         self.recording_thread: Optional[threading.Thread] = None
+        self.encoder_thread: Optional[threading.Thread] = None
         self.device_index: Optional[int] = None
         self.device_name: Optional[str] = None
+        self.sample_width: Optional[int] = None
+        self.output_channels = channels
+
+        # Format de capture négocié avec le périphérique et conversion vers
+        # le format des fichiers
+        self.capture_rate = self.sample_rate
+        self.capture_channels = channels
+        self.resampler: Optional[Resampler] = None
+
+        # Capture PulseAudio directe (moteur "pulse") et changements de source
+        self.pulse_capture: Optional[PulseCapture] = None
+        self._pulse_switch = threading.Condition()
+        self.reroutes: List[Dict] = []
+
+        # Capture multi-source : un flux et un thread de capture par périphérique
+        self.streams: List[pyaudio.Stream] = []
+        self.recording_threads: List[threading.Thread] = []
+        self.mixer: Optional[StreamMixer] = None
+
+        # Mesure des niveaux de l'audio encodé
+        self.level_meter: Optional[LevelMeter] = None
+        # Détection d'activité (régions d'activité écrites, silences écartés)
+        self.voice_gate: Optional[VoiceGate] = None
+        # Mode relecture : fenêtre de PCM tenue en veille, et fichier demandé
+        # par save_replay() en attente du thread d'encodage
+        self.replay_buffer: Optional[ReplayBuffer] = None
+        self._replay_file: Optional[Path] = None
+        # Consommateurs supplémentaires de l'audio encodé (voir add_tap), dont
+        # l'étage distribuant l'audio aux consommateurs à file (voir add_sink)
+        self.taps: List = []
+        self.pipeline: Optional[FanoutStage] = None
+        # Fin déjà signalée aux consommateurs pour l'enregistrement en cours
+        self._taps_finished = False
+
+        # Segmentation : fichiers produits et finalisations en arrière-plan
+        self.segment_files: List[Path] = []
+        self._segment_bytes = 0
+        self._segment_limit: Optional[int] = None
+        self._rotate_requested = False
+        self._finalizer_threads: List[threading.Thread] = []
+
+        # Statistiques de capture (comparaison des modes blocking/callback)
+        self.xrun_count = 0
+        self.capture_wakeups = 0
+        self.capture_cpu_time = 0.0
 
     def _generate_filename(self) -> Path:
         """
@@ -66,9 +330,152 @@ class AudioRecorder:
             Chemin complet du fichier audio à créer
         """
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        filename = f"{timestamp}.mp3"
+        filename = f"{timestamp}.{self.encoder_class.extension}"
         return self.output_dir / filename
 
+    def _next_segment_filename(self) -> Path:
+        """
+        Génère le nom du fichier du segment suivant.
+
+        Returns:
+            Chemin horodaté, suffixé par le numéro du segment s'il est déjà utilisé
+        """
+        path = self._generate_filename()
+        if path in self.segment_files or path.exists():
+            path = path.with_name(f"{path.stem}_{len(self.segment_files):03d}{path.suffix}")
+        return path
+
+    def _compute_segment_limit(self, frame_size: int) -> Optional[int]:
+        """
+        Calcule la taille maximale d'un segment en octets PCM (multiple de frame_size).
+
+        Args:
+            frame_size: Taille d'une frame en octets
+
+        Returns:
+            Limite en octets PCM, ou None si la segmentation est désactivée
+        """
+        limits = []
+        if self.segment_duration:
+            limits.append(self.segment_duration)
+        if self.segment_max_bytes:
+            # Estimer la durée correspondant à la taille demandée d'après le débit du format
+            byte_rate = estimate_byte_rate(
+                self.output_format, self.sample_rate * frame_size, self.bitrate
+            )
+            limits.append(self.segment_max_bytes / byte_rate)
+        if not limits:
+            return None
+
+        frames = max(1, int(min(limits) * self.sample_rate))
+        return frames * frame_size
+
+    def _create_encoder(self, output_file: Path) -> AudioEncoder:
+        """
+        Crée l'encodeur d'un fichier de sortie avec les paramètres de l'enregistrement.
+
+        Args:
+            output_file: Fichier de sortie
+
+        Returns:
+            Encodeur prêt à recevoir des frames
+        """
+        if self.encode_pool is not None:
+            return DeferredEncoder(
+                output_file=output_file,
+                encode_pool=self.encode_pool,
+                output_format=self.output_format,
+                sample_rate=self.sample_rate,
+                channels=self.output_channels,
+                sample_width=self.sample_width,
+                bitrate=self.bitrate,
+                sync_interval=self.spool_sync_interval
+            )
+        if self.output_format == "mp3":
+            return MP3Encoder(
+                output_file=output_file,
+                sample_rate=self.sample_rate,
+                channels=self.output_channels,
+                sample_width=self.sample_width,
+                bitrate=self.bitrate,
+                streaming=self.streaming,
+                encode_jobs=self.parallel_encode,
+                buffer_backend=self.buffer_backend
+            )
+        return create_encoder(
+            self.output_format,
+            output_file=output_file,
+            sample_rate=self.sample_rate,
+            channels=self.output_channels,
+            sample_width=self.sample_width,
+            bitrate=self.bitrate
+        )
+
+    def _create_spool(self, output_file: Path) -> Optional[PCMSpool]:
+        """
+        Crée le spool accompagnant l'encodeur d'un fichier de sortie.
+
+        Args:
+            output_file: Fichier de sortie de l'encodeur
+
+        Returns:
+            Spool, ou None si le spool est désactivé
+        """
+        # L'encodage différé écrit déjà le PCM dans un spool
+        if not self.use_spool or self.encode_pool is not None:
+            return None
+        return PCMSpool(
+            output_file,
+            metadata={
+                'output_format': self.output_format,
+                'sample_rate': self.sample_rate,
+                'channels': self.output_channels,
+                'sample_width': self.sample_width,
+                'bitrate': self.bitrate,
+            },
+            sync_interval=self.spool_sync_interval
+        )
+
+    def _create_level_meter(self) -> Optional[LevelMeter]:
+        """
+        Crée le mesureur de niveaux de l'enregistrement.
+
+        Returns:
+            Mesureur, ou None si la mesure est désactivée ou si la largeur
+            d'échantillon n'est pas supportée
+        """
+        if not self.metering or self.sample_width not in SAMPLE_DTYPES:
+            return None
+        return LevelMeter(
+            channels=self.output_channels,
+            sample_width=self.sample_width,
+            sample_rate=self.sample_rate,
+            silence_threshold_db=self.silence_threshold_db,
+            block_frames=self.chunk_size
+        )
+
+    def _create_voice_gate(self) -> Optional[VoiceGate]:
+        """
+        Crée la porte de détection d'activité de l'enregistrement.
+
+        Returns:
+            Porte fermée, ou None si la détection est désactivée
+
+        Raises:
+            ValueError: Si la largeur d'échantillon n'est pas supportée
+        """
+        if self.gate_threshold_db is None:
+            return None
+        return VoiceGate(
+            channels=self.output_channels,
+            sample_width=self.sample_width,
+            sample_rate=self.sample_rate,
+            threshold_db=self.gate_threshold_db,
+            hangover=self.gate_hangover,
+            preroll=self.gate_preroll,
+            block_frames=self.chunk_size
+        )
+
     def _ensure_output_dir(self):
         """Crée le répertoire de sortie s'il n'existe pas."""
         try:
@@ -78,12 +485,13 @@ class AudioRecorder:
                 f"Impossible de créer le répertoire {self.output_dir}: {e}"
             )
 
-    def start_recording(self) -> Path:
+    def start_recording(self) -> Optional[Path]:
         """
         Démarre l'enregistrement audio.
 
         Returns:
-            Chemin du fichier en cours d'enregistrement
+            Chemin du fichier en cours d'enregistrement, ou None en mode
+            relecture (aucun fichier avant save_replay())
 
         Raises:
             RuntimeError: Si l'enregistrement est déjà en cours ou si aucun périphérique loopback n'est trouvé
@@ -95,33 +503,31 @@ class AudioRecorder:
         # Créer le répertoire de sortie
         self._ensure_output_dir()
 
-        # Générer le nom de fichier
-        output_file = self._generate_filename()
+        # Générer le nom de fichier (en mode relecture, il n'est connu qu'à
+        # l'appel de save_replay())
+        output_file = None if self.replay_seconds else self._generate_filename()
 
+        self.mixer = None
         try:
-            # Initialiser PyAudio
-            self.pyaudio_instance = pyaudio.PyAudio()
+            if self.capture_backend == "pulse":
+                return self._start_pulse(output_file)
+
+            # Réserver l'instance PyAudio partagée (PortAudio déjà initialisé)
+            self.pyaudio_instance = self.device_registry.acquire()
 
             # Détecter le périphérique à utiliser
+            if self.device_indexes and len(self.device_indexes) > 1:
+                # Capture simultanée de plusieurs périphériques
+                return self._start_multi_source(output_file)
+
             if self.manual_device_index is not None:
                 # Utiliser le périphérique spécifié manuellement
                 self.device_index = self.manual_device_index
-                device_info = get_device_info(self.device_index)
-                if device_info is None:
-                    raise ValueError(
-                        f"Le périphérique avec l'index {self.device_index} n'existe pas.\n"
-                        f"Utilisez --list-devices pour voir les périphériques disponibles."
-                    )
-                if device_info['maxInputChannels'] == 0:
-                    raise ValueError(
-                        f"Le périphérique '{device_info['name']}' (index {self.device_index}) "
-                        f"ne peut pas capturer d'audio (maxInputChannels = 0).\n"
-                        f"Utilisez --list-devices pour voir les périphériques disponibles."
-                    )
+                device_info = self._get_capture_device(self.device_index)
                 self.device_name = device_info['name']
             elif self.use_system_audio:
                 # Détection automatique du périphérique loopback
-                self.device_index = find_loopback_device()
+                self.device_index = find_loopback_device(self.device_registry)
                 if self.device_index is None:
                     raise RuntimeError(
                         "Aucun périphérique de capture système (loopback) trouvé.\n"
@@ -133,41 +539,52 @@ class AudioRecorder:
                         "     - Windows: Activez 'Stereo Mix' dans les paramètres audio\n"
                         "     - macOS: Installez Soundflower ou BlackHole"
                     )
-                device_info = get_device_info(self.device_index)
+                device_info = get_device_info(self.device_index, self.device_registry)
                 if device_info:
                     self.device_name = device_info['name']
             else:
                 # Utiliser le périphérique d'entrée par défaut (microphone)
                 self.device_index = None
                 self.device_name = "Microphone par défaut"
+                device_info = None
+            self._negotiate_format(device_info)
 
-            # Ouvrir le flux audio
+            # Ouvrir le flux audio (en mode callback, il n'est démarré qu'une
+            # fois le buffer circulaire prêt)
+            self.xrun_count = 0
+            self.capture_wakeups = 0
+            self.capture_cpu_time = 0.0
+            stream_options = {}
+            if self.capture_mode == "callback":
+                stream_options = {'stream_callback': self._stream_callback, 'start': False}
             self.stream = self.pyaudio_instance.open(
                 format=self.audio_format,
-                channels=self.channels,
-                rate=self.sample_rate,
+                channels=self.capture_channels,
+                rate=self.capture_rate,
                 input=True,
                 input_device_index=self.device_index,
-                frames_per_buffer=self.chunk_size
+                frames_per_buffer=self.chunk_size,
+                **stream_options
             )
 
-            # Créer l'encodeur MP3
-            sample_width = self.pyaudio_instance.get_sample_size(self.audio_format)
-            self.mp3_encoder = MP3Encoder(
-                output_file=output_file,
-                sample_rate=self.sample_rate,
-                channels=self.channels,
-                sample_width=sample_width,
-                bitrate=self.bitrate
-            )
+            self.sample_width = self.pyaudio_instance.get_sample_size(self.audio_format)
+            self._start_pipeline(output_file)
 
-            # Démarrer l'enregistrement dans un thread séparé
+            # Démarrer la capture et l'encodage dans des threads séparés
             self.is_recording = True
-            self.recording_thread = threading.Thread(
-                target=self._record_audio,
+            self.encoder_thread = threading.Thread(
+                target=self._encode_audio,
                 daemon=True
             )
-            self.recording_thread.start()
+            self.encoder_thread.start()
+            if self.capture_mode == "callback":
+                self.stream.start_stream()
+            else:
+                self.recording_thread = threading.Thread(
+                    target=self._record_audio,
+                    daemon=True
+                )
+                self.recording_thread.start()
 
             return output_file
 
@@ -178,35 +595,1027 @@ class AudioRecorder:
             self._cleanup()
             raise
 
+    def _start_pipeline(self, output_file: Optional[Path]):
+        """
+        Prépare la conversion, l'encodeur et le buffer circulaire d'une
+        capture mono-source (format de capture déjà négocié).
+
+        Args:
+            output_file: Fichier du premier segment, ou None en mode relecture
+        """
+        self.output_channels = self.capture_channels
+        self.resampler = self._create_resampler()
+        frame_size = self.capture_channels * self.sample_width
+        self._start_output(output_file, frame_size)
+
+        # Buffer circulaire entre la capture et l'encodeur (format de capture)
+        self._segment_limit = self._compute_segment_limit(self.output_channels * self.sample_width)
+        self.ring_buffer = RingBuffer(
+            capacity=int(self.capture_rate * self.buffer_seconds) * frame_size,
+            frame_size=frame_size
+        )
+
+    def _start_pulse(self, output_file: Optional[Path]) -> Optional[Path]:
+        """
+        Ouvre la source PulseAudio par son nom et démarre la capture directe.
+
+        Args:
+            output_file: Fichier du premier segment, ou None en mode relecture
+
+        Returns:
+            Chemin du fichier en cours d'enregistrement (None en mode relecture)
+
+        Raises:
+            ValueError: Si plusieurs périphériques sont demandés
+            RuntimeError: Si aucun Monitor n'est trouvé ou si parec est introuvable
+        """
+        if self.device_indexes and len(self.device_indexes) > 1:
+            raise ValueError("Le moteur de capture \"pulse\" n'enregistre qu'une seule source")
+
+        # Avec le suivi des périphériques, le modèle en mémoire évite une
+        # nouvelle connexion au serveur de son
+        monitor = self.device_monitor
+        source_info = None
+        if self.pulse_source:
+            source_name = self.pulse_source
+            if monitor is not None:
+                source_info = monitor.get_source(source_name)
+        elif self.use_system_audio:
+            source_info = monitor.default_monitor() if monitor else find_default_sink_monitor()
+            if source_info is None:
+                raise RuntimeError(
+                    "Aucune source Monitor PulseAudio trouvée.\n"
+                    "Utilisez --pulse-source NOM (voir pactl list short sources)"
+                )
+            source_name = source_info['name']
+        else:
+            source_name = None
+        self.device_index = None
+        self.device_name = source_name or "Source PulseAudio par défaut"
+
+        # Format natif de la source : le serveur de son ne convertit rien
+        source_info = source_info or {}
+        self._negotiate_format({
+            'defaultSampleRate': source_info.get('sample_rate'),
+            'maxInputChannels': source_info.get('channels'),
+        })
+        self.xrun_count = 0
+        self.capture_wakeups = 0
+        self.capture_cpu_time = 0.0
+
+        self.sample_width = pyaudio.get_sample_size(self.audio_format)
+        self.pulse_capture = PulseCapture(
+            source=source_name,
+            sample_rate=self.capture_rate,
+            channels=self.capture_channels,
+            sample_width=self.sample_width,
+            fragment_seconds=self.fragment_seconds
+        )
+        self.pulse_capture.start()
+        self._start_pipeline(output_file)
+        self.reroutes = []
+
+        self.is_recording = True
+        self.encoder_thread = threading.Thread(
+            target=self._encode_audio,
+            daemon=True
+        )
+        self.encoder_thread.start()
+        self.recording_thread = threading.Thread(
+            target=self._record_pulse,
+            daemon=True
+        )
+        self.recording_thread.start()
+        if monitor is not None:
+            monitor.add_listener(self._on_device_change)
+
+        return output_file
+
+    def switch_pulse_source(self, source: str):
+        """
+        Redirige la capture PulseAudio vers une autre source, sans changer de fichier.
+
+        La nouvelle source est ouverte au même format avant l'arrêt de
+        l'ancienne, dont l'audio déjà reçu est encore écrit : le fichier, la
+        conversion et l'encodeur sont conservés. Un intervalle sans audio entre
+        les deux flux est comblé par du silence (voir `reroutes`).
+
+        Args:
+            source: Nom de la nouvelle source PulseAudio
+
+        Raises:
+            RuntimeError: Si aucune capture PulseAudio n'est en cours ou si
+                          parec est introuvable
+        """
+        with self._pulse_switch:
+            previous = self.pulse_capture
+            if not self.is_recording or previous is None:
+                raise RuntimeError("Aucune capture PulseAudio en cours")
+            capture = PulseCapture(
+                source=source,
+                sample_rate=previous.sample_rate,
+                channels=previous.channels,
+                sample_width=previous.sample_width,
+                fragment_seconds=self.fragment_seconds
+            )
+            capture.start()
+            self.pulse_capture = capture
+            self.device_name = source
+            self._pulse_switch.notify_all()
+        # Fin du flux précédent : le thread de capture passe au nouveau
+        previous.stop()
+
+    def _on_device_change(self, change: DeviceChange):
+        """
+        Suit le Monitor par défaut quand la source disparaît ou que la sortie change.
+
+        Args:
+            change: Changement signalé par le suivi des périphériques
+        """
+        capture = self.pulse_capture
+        if not self.is_recording or capture is None:
+            return
+        current = capture.source
+        lost = current in change.removed_sources
+        follows_default = (self.pulse_source is None and self.use_system_audio
+                           and change.default_monitor != current)
+        target = change.default_monitor
+        if not (lost or follows_default) or target is None or target == current:
+            return
+        try:
+            self.switch_pulse_source(target)
+        except Exception as e:
+            print(f"Erreur lors du changement de source vers {target}: {e}")
+
+    def _negotiate_format(self, device_info: Optional[Dict]):
+        """
+        Choisit le format de capture natif du périphérique et le taux des fichiers.
+
+        Args:
+            device_info: Informations du périphérique (defaultSampleRate,
+                         maxInputChannels), ou None si inconnues : le format
+                         demandé est alors capturé tel quel
+        """
+        device_info = device_info or {}
+        native_rate = int(device_info.get('defaultSampleRate') or 0)
+        self.capture_rate = native_rate or self.requested_sample_rate or DEFAULT_SAMPLE_RATE
+        self.sample_rate = self.requested_sample_rate or self.capture_rate
+        max_channels = device_info.get('maxInputChannels')
+        self.capture_channels = min(self.channels, max_channels) if max_channels else self.channels
+
+    def _create_resampler(self) -> Optional[Resampler]:
+        """
+        Crée la conversion du taux de capture vers le taux des fichiers.
+
+        Returns:
+            Convertisseur, ou None si les deux taux sont égaux
+
+        Raises:
+            ValueError: Si la largeur d'échantillon n'est pas supportée
+        """
+        if self.capture_rate == self.sample_rate:
+            return None
+        return Resampler(
+            input_rate=self.capture_rate,
+            output_rate=self.sample_rate,
+            input_channels=self.capture_channels,
+            sample_width=self.sample_width
+        )
+
+    def _get_capture_device(self, device_index: int) -> Dict:
+        """
+        Vérifie qu'un périphérique choisi manuellement peut capturer de l'audio.
+
+        Args:
+            device_index: Index PyAudio du périphérique
+
+        Returns:
+            Informations du périphérique (voir get_device_info)
+
+        Raises:
+            ValueError: Si le périphérique n'existe pas ou n'a aucun canal d'entrée
+        """
+        device_info = get_device_info(device_index, self.device_registry)
+        if device_info is None:
+            raise ValueError(
+                f"Le périphérique avec l'index {device_index} n'existe pas.\n"
+                f"Utilisez --list-devices pour voir les périphériques disponibles."
+            )
+        if device_info['maxInputChannels'] == 0:
+            raise ValueError(
+                f"Le périphérique '{device_info['name']}' (index {device_index}) "
+                f"ne peut pas capturer d'audio (maxInputChannels = 0).\n"
+                f"Utilisez --list-devices pour voir les périphériques disponibles."
+            )
+        return device_info
+
+    def _start_output(self, output_file: Optional[Path], frame_size: int):
+        """
+        Démarre l'encodeur du premier segment, ou la veille du mode relecture.
+
+        Args:
+            output_file: Fichier du premier segment, ou None en mode relecture
+            frame_size: Taille en octets d'une frame transmise à _write_audio()
+        """
+        if output_file is not None:
+            self._start_encoder(output_file)
+            return
+
+        # Veille : aucun encodeur, ni mesure, ni détection d'activité avant
+        # save_replay(), seulement la copie dans la fenêtre de relecture
+        self.encoder = None
+        self.spool = None
+        self.level_meter = None
+        self.voice_gate = None
+        self._reset_segments()
+        self._replay_file = None
+        self.replay_buffer = ReplayBuffer(
+            capacity=int(self.capture_rate * self.replay_seconds) * frame_size,
+            frame_size=frame_size,
+            backend=self.buffer_backend,
+            directory=self.output_dir
+        )
+
+    def _start_encoder(self, output_file: Path):
+        """
+        Crée l'encodeur du premier segment et réinitialise l'état de la segmentation.
+
+        Args:
+            output_file: Fichier du premier segment
+        """
+        self.encoder = self._create_encoder(output_file)
+        self.spool = self._create_spool(output_file)
+        self.level_meter = self._create_level_meter()
+        self.voice_gate = self._create_voice_gate()
+        if self.transcriber:
+            self.transcriber.start(self.sample_rate, self.output_channels, self.sample_width)
+        for tap in self.taps:
+            tap.start(self.sample_rate, self.output_channels, self.sample_width)
+        self._taps_finished = False
+        self._reset_segments()
+        self.segment_files.append(output_file)
+
+    def _reset_segments(self):
+        """Réinitialise l'état de la segmentation (aucun fichier produit)."""
+        self.encode_jobs = {}
+        self.segment_files = []
+        self._finalizer_threads = []
+        self._segment_bytes = 0
+        self._rotate_requested = False
+
+    def _start_multi_source(self, output_file: Optional[Path]) -> Optional[Path]:
+        """
+        Ouvre un flux par périphérique et démarre la capture multi-source.
+
+        Chaque flux capture avec au plus `channels` canaux (un microphone mono
+        reste mono) ; le mixeur aligne les flux et les combine.
+
+        Args:
+            output_file: Fichier du premier segment, ou None en mode relecture
+
+        Returns:
+            Chemin du fichier en cours d'enregistrement (None en mode relecture)
+        """
+        self.xrun_count = 0
+        self.capture_wakeups = 0
+        self.capture_cpu_time = 0.0
+
+        names = []
+        source_channels = []
+        native_rates = []
+        for device_index in self.device_indexes:
+            device_info = self._get_capture_device(device_index)
+            names.append(device_info['name'])
+            source_channels.append(min(self.channels, device_info['maxInputChannels']))
+            native_rates.append(int(device_info.get('defaultSampleRate') or 0))
+        self.device_index = self.device_indexes[0]
+        self.device_name = " + ".join(names)
+
+        # Toutes les sources sont capturées au même taux : le taux demandé,
+        # sinon le taux natif du premier périphérique
+        self.sample_rate = self.requested_sample_rate or native_rates[0] or DEFAULT_SAMPLE_RATE
+        self.capture_rate = self.sample_rate
+        self.capture_channels = self.channels
+        self.resampler = None
+
+        self.sample_width = self.pyaudio_instance.get_sample_size(self.audio_format)
+        self.mixer = StreamMixer(
+            source_channels=source_channels,
+            channels=self.channels,
+            sample_rate=self.sample_rate,
+            sample_width=self.sample_width,
+            mode=self.mix_mode,
+            buffer_seconds=self.buffer_seconds,
+            block_frames=self.chunk_size
+        )
+        self.output_channels = self.mixer.output_channels
+
+        # Les flux sont tous ouverts avant d'être démarrés pour limiter leur décalage
+        for source, device_index in enumerate(self.device_indexes):
+            stream_options = {'start': False}
+            if self.capture_mode == "callback":
+                stream_options['stream_callback'] = self._make_source_callback(source)
+            self.streams.append(self.pyaudio_instance.open(
+                format=self.audio_format,
+                channels=source_channels[source],
+                rate=self.sample_rate,
+                input=True,
+                input_device_index=device_index,
+                frames_per_buffer=self.chunk_size,
+                **stream_options
+            ))
+
+        self._start_output(output_file, self.mixer.frame_size)
+        self._segment_limit = self._compute_segment_limit(self.mixer.frame_size)
+
+        self.is_recording = True
+        self.encoder_thread = threading.Thread(
+            target=self._encode_mixed_audio,
+            daemon=True
+        )
+        self.encoder_thread.start()
+        for source, stream in enumerate(self.streams):
+            stream.start_stream()
+            if self.capture_mode == "blocking":
+                thread = threading.Thread(
+                    target=self._record_source,
+                    args=(source, stream),
+                    daemon=True
+                )
+                self.recording_threads.append(thread)
+                thread.start()
+
+        return output_file
+
     def _record_audio(self):
-        """Boucle d'enregistrement audio (exécutée dans un thread séparé)."""
+        """Boucle de capture audio (exécutée dans un thread séparé)."""
+        ring_buffer = self.ring_buffer
+        cpu_start = time.thread_time()
         try:
-            while self.is_recording and self.stream and self.mp3_encoder:
+            while self.is_recording and self.stream and ring_buffer:
                 # Lire les données audio
-                data = self.stream.read(self.chunk_size, exception_on_overflow=False)
-                # Écrire dans l'encodeur MP3
-                self.mp3_encoder.write_frames(data)
+                data = self._read_chunk(self.stream)
+                if data is None:
+                    continue
+                self.capture_wakeups += 1
+                # Transmettre au thread d'encodage sans jamais bloquer la capture
+                ring_buffer.write(data)
         except Exception as e:
             print(f"Erreur pendant l'enregistrement: {e}")
             self.is_recording = False
+        finally:
+            self.capture_cpu_time += time.thread_time() - cpu_start
+            if ring_buffer:
+                ring_buffer.close()
 
-    def stop_recording(self):
-        """Arrête l'enregistrement et nettoie les ressources."""
-        if not self.is_recording:
+    def _read_chunk(self, stream) -> Optional[bytes]:
+        """
+        Lit un chunk d'un flux PyAudio en mode "blocking".
+
+        Args:
+            stream: Flux PyAudio à lire
+
+        Returns:
+            Données lues, ou None si un débordement compté (count_xruns) a fait perdre le chunk
+        """
+        if not self.count_xruns:
+            return stream.read(self.chunk_size, exception_on_overflow=False)
+        try:
+            return stream.read(self.chunk_size, exception_on_overflow=True)
+        except OSError as e:
+            if e.errno != pyaudio.paInputOverflowed:
+                raise
+            # Débordement d'entrée PortAudio : le chunk est perdu
+            self.xrun_count += 1
+            return None
+
+    def _record_pulse(self):
+        """Boucle de capture PulseAudio directe (exécutée dans un thread séparé)."""
+        capture = self.pulse_capture
+        ring_buffer = self.ring_buffer
+        frame_size = capture.frame_size
+        captured_frames = 0
+        gap_start = None
+        cpu_start = time.thread_time()
+        try:
+            while self.is_recording and ring_buffer:
+                # Un réveil par fragment complet remis par le serveur de son
+                fragment = capture.read_fragment()
+                if not fragment:
+                    if not self.is_recording:
+                        break
+                    # Fin du flux : source remplacée, ou perdue en attendant
+                    # que le suivi des périphériques en choisisse une autre
+                    if gap_start is None:
+                        gap_start = time.monotonic()
+                    replacement = self._wait_pulse_switch(capture)
+                    if replacement is None:
+                        if not self.is_recording:
+                            break
+                        reason = capture.error_message() or "fin du flux"
+                        raise RuntimeError(f"Flux PulseAudio interrompu: {reason}")
+                    capture.close()
+                    capture = replacement
+                    continue
+
+                self.capture_wakeups += 1
+                frames = len(fragment) // frame_size
+                if gap_start is not None:
+                    # Silence à la place de l'audio perdu : le fragment reçu
+                    # couvre déjà la fin de l'interruption
+                    gap = time.monotonic() - gap_start
+                    silence = int(max(0.0, min(gap, self.max_reroute_gap) - frames / self.capture_rate)
+                                  * self.capture_rate)
+                    ring_buffer.write(bytes(silence * frame_size))
+                    self.reroutes.append({
+                        'source': capture.source,
+                        'position': captured_frames / self.capture_rate,
+                        'gap': gap,
+                        'silence': silence / self.capture_rate,
+                    })
+                    captured_frames += silence
+                    gap_start = None
+                ring_buffer.write(fragment)
+                captured_frames += frames
+        except Exception as e:
+            print(f"Erreur pendant l'enregistrement: {e}")
+            self.is_recording = False
+        finally:
+            self.capture_cpu_time += time.thread_time() - cpu_start
+            if ring_buffer:
+                ring_buffer.close()
+
+    def _wait_pulse_switch(self, capture: PulseCapture) -> Optional[PulseCapture]:
+        """
+        Attend le remplacement d'une capture PulseAudio terminée.
+
+        Args:
+            capture: Capture dont le flux est terminé
+
+        Returns:
+            Nouvelle capture, ou None si aucune n'a été ouverte à temps (ou si
+            l'enregistrement s'arrête)
+        """
+        # Sans suivi des périphériques, seul un changement déjà fait est possible
+        timeout = self.max_reroute_gap if self.device_monitor is not None else 0
+        with self._pulse_switch:
+            self._pulse_switch.wait_for(
+                lambda: self.pulse_capture is not capture or not self.is_recording,
+                timeout=timeout
+            )
+            if self.is_recording and self.pulse_capture is not capture:
+                return self.pulse_capture
+        return None
+
+    def _stream_callback(self, in_data, frame_count, time_info, status_flags):
+        """
+        Callback PortAudio du mode "callback" (exécuté dans le thread audio).
+
+        Copie les données dans le buffer circulaire préalloué, sans autre allocation.
+        """
+        cpu_start = time.thread_time()
+        self.capture_wakeups += 1
+        if status_flags & pyaudio.paInputOverflow:
+            self.xrun_count += 1
+
+        ring_buffer = self.ring_buffer
+        if not self.is_recording or ring_buffer is None:
+            return (None, pyaudio.paComplete)
+
+        ring_buffer.write(in_data)
+        self.capture_cpu_time += time.thread_time() - cpu_start
+        return (None, pyaudio.paContinue)
+
+    def _record_source(self, source: int, stream):
+        """
+        Boucle de capture d'une source du mode multi-source (exécutée dans un thread séparé).
+
+        Args:
+            source: Numéro de la source dans le mixeur
+            stream: Flux PyAudio de la source
+        """
+        mixer = self.mixer
+        cpu_start = time.thread_time()
+        try:
+            while self.is_recording:
+                data = self._read_chunk(stream)
+                if data is None:
+                    continue
+                self.capture_wakeups += 1
+                mixer.push(source, data, time.monotonic())
+        except Exception as e:
+            print(f"Erreur pendant l'enregistrement (source {source}): {e}")
+            self.is_recording = False
+        finally:
+            self.capture_cpu_time += time.thread_time() - cpu_start
+            mixer.close(source)
+
+    def _make_source_callback(self, source: int):
+        """
+        Crée le callback PortAudio d'une source du mode multi-source.
+
+        Args:
+            source: Numéro de la source dans le mixeur
+
+        Returns:
+            Callback à passer à PyAudio.open()
+        """
+        def callback(in_data, frame_count, time_info, status_flags):
+            cpu_start = time.thread_time()
+            self.capture_wakeups += 1
+            if status_flags & pyaudio.paInputOverflow:
+                self.xrun_count += 1
+
+            mixer = self.mixer
+            if not self.is_recording or mixer is None:
+                return (None, pyaudio.paComplete)
+
+            mixer.push(source, in_data, time.monotonic())
+            self.capture_cpu_time += time.thread_time() - cpu_start
+            return (None, pyaudio.paContinue)
+
+        return callback
+
+    def _encode_mixed_audio(self):
+        """Boucle d'encodage du mode multi-source (exécutée dans un thread séparé)."""
+        mixer = self.mixer
+        try:
+            while mixer and (self.encoder or self.replay_buffer):
+                if not mixer.wait_for_data(timeout=0.1):
+                    if mixer.closed:
+                        break
+                    continue
+                block = mixer.read()
+                if len(block) == 0:
+                    if mixer.closed and not mixer.wait_for_data(timeout=0):
+                        break
+                    # Attendre que toutes les sources aient rattrapé la plus lente
+                    time.sleep(self.chunk_size / self.sample_rate / 4)
+                    continue
+                self._write_audio(block)
+        except Exception as e:
+            print(f"Erreur pendant l'encodage: {e}")
+            self.is_recording = False
+        finally:
+            self._finish_taps()
+
+    def _encode_audio(self):
+        """Boucle d'encodage (exécutée dans un thread séparé) alimentée par le buffer circulaire."""
+        ring_buffer = self.ring_buffer
+        try:
+            while ring_buffer and (self.encoder or self.replay_buffer):
+                if not ring_buffer.wait_for_data(timeout=0.1):
+                    if ring_buffer.closed:
+                        break
+                    continue
+                view = ring_buffer.peek()
+                self._write_audio(view)
+                ring_buffer.advance(len(view))
+                view.release()
+        except Exception as e:
+            print(f"Erreur pendant l'encodage: {e}")
+            self.is_recording = False
+        finally:
+            self._finish_taps()
+
+    def _finish_taps(self):
+        """
+        Signale la fin de l'audio aux consommateurs (fin du thread d'encodage).
+
+        Une relecture demandée juste avant l'arrêt est encore à écrire par
+        stop_recording() : la fin n'est alors signalée qu'après. Appelée par
+        le thread d'encodage puis par stop_recording(), elle ne signale la
+        fin qu'une fois par enregistrement.
+        """
+        if self._replay_file is not None or self._taps_finished:
+            return
+        self._taps_finished = True
+        for tap in self.taps:
+            try:
+                tap.finish()
+            except Exception as e:
+                print(f"Erreur d'un consommateur de l'audio: {e}")
+
+    def _write_audio(self, view: memoryview):
+        """
+        Convertit et mesure des frames capturées, puis transmet à l'encodeur celles à conserver.
+
+        Args:
+            view: Frames audio capturées (format de capture)
+        """
+        if self.replay_buffer is not None:
+            if self._replay_file is None:
+                # Veille du mode relecture : aucun traitement avant save_replay()
+                self.replay_buffer.write(view)
+                return
+            self._flush_replay()
+
+        if self.resampler:
+            view = memoryview(self.resampler.process(view))
+            if len(view) == 0:
+                return
+
+        if self.level_meter:
+            self.level_meter.process(view)
+
+        if self.voice_gate is None:
+            self._write_segmented(view)
+            return
+
+        for event, data in self.voice_gate.process(view):
+            if event == REGION_START:
+                self._start_region()
+            elif event == REGION_END:
+                # Finaliser aussitôt le fichier de la région terminée
+                self._rotate_segment()
+            else:
+                self._write_segmented(data)
+
+    def add_tap(self, tap):
+        """
+        Ajoute un consommateur de l'audio encodé, appelé depuis le thread d'encodage.
+
+        Le consommateur suit l'interface de StreamingTranscriber : start()
+        reçoit le format à l'ouverture du premier fichier, write() chaque bloc
+        de PCM transmis à l'encodeur (il ne doit pas bloquer, le bloc n'est
+        valide que pendant l'appel) et finish() la fin de l'audio.
+
+        Args:
+            tap: Objet offrant start(sample_rate, channels, sample_width),
+                 write(data) et finish()
+        """
+        # Liste remplacée plutôt que modifiée : le thread d'encodage la parcourt sans verrou
+        self.taps = self.taps + [tap]
+
+    def remove_tap(self, tap):
+        """
+        Retire un consommateur ajouté avec add_tap().
+
+        Args:
+            tap: Consommateur à retirer
+        """
+        self.taps = [other for other in self.taps if other is not tap]
+
+    def add_sink(
+        self,
+        consumer,
+        name: Optional[str] = None,
+        policy: str = "drop-oldest",
+        max_seconds: float = 10.0,
+        block_timeout: float = 1.0
+    ) -> PipelineSink:
+        """
+        Ajoute un consommateur de l'audio encodé disposant de sa propre file et de son thread.
+
+        Contrairement à add_tap(), le consommateur peut être lent (envoi
+        réseau, transcription...) : seule sa file se remplit, et la politique
+        choisie s'applique quand elle est pleine (voir PipelineSink). Les
+        blocs sont partagés sans copie entre tous les consommateurs.
+
+        Args:
+            consumer: Objet offrant write(data), et éventuellement
+                      start(sample_rate, channels, sample_width) et finish()
+            name: Nom dans les statistiques (voir get_sink_stats)
+            policy: "drop-oldest", "drop-newest" ou "block". Avec "block",
+                    l'encodage (fichier compris) attend que la file du
+                    consommateur ait de la place, au plus `block_timeout`
+                    par bloc : aucune perte tant que le consommateur suit ;
+                    s'il reste bloqué, ses blocs sont perdus (comptés) sans
+                    attente jusqu'à ce que sa file se vide. La capture
+                    n'attend jamais : le buffer circulaire absorbe le retard
+                    de l'encodage (voir buffer_seconds).
+            max_seconds: Durée d'audio maximale en attente dans la file
+            block_timeout: Avec "block", attente maximale par bloc en secondes
+
+        Returns:
+            Consommateur ajouté
+
+        Raises:
+            ValueError: Si la politique est inconnue ou si le nom est déjà utilisé
+        """
+        if self.pipeline is None:
+            self.pipeline = FanoutStage()
+            self.add_tap(self.pipeline)
+        return self.pipeline.add_sink(consumer, name, policy, max_seconds, block_timeout)
+
+    def get_sink_stats(self) -> Optional[Dict[str, Dict]]:
+        """
+        Retourne le retard et les pertes de chaque consommateur ajouté avec add_sink().
+
+        Returns:
+            Dictionnaire {nom: statistiques (voir PipelineSink.get_stats)},
+            ou None si aucun consommateur n'a été ajouté
+        """
+        if self.pipeline is None:
+            return None
+        return self.pipeline.get_stats()
+
+    def save_replay(self) -> Path:
+        """
+        Enregistre la fenêtre de relecture, puis l'audio suivant, dans un fichier.
+
+        Le fichier est créé par le thread d'encodage dès le prochain chunk
+        capturé : il commence par les `replay_seconds` dernières secondes et
+        se poursuit sans trou jusqu'à stop_recording() (avec la segmentation
+        et la détection d'activité habituelles).
+
+        Returns:
+            Chemin du fichier (du premier segment)
+
+        Raises:
+            RuntimeError: Si aucune capture en mode relecture n'est en veille
+        """
+        if not self.is_recording or self.replay_buffer is None or self._replay_file is not None:
+            raise RuntimeError("Aucune relecture en attente d'enregistrement")
+        output_file = self._generate_filename()
+        self._replay_file = output_file
+        return output_file
+
+    def _flush_replay(self):
+        """Ouvre le fichier demandé par save_replay() et y encode la fenêtre de relecture."""
+        replay_buffer = self.replay_buffer
+        self.replay_buffer = None
+        self._start_encoder(self._replay_file)
+        self._replay_file = None
+        try:
+            for view in replay_buffer.views():
+                self._write_audio(view)
+                view.release()
+        finally:
+            replay_buffer.close()
+
+    def get_replay_stats(self) -> Optional[Dict]:
+        """
+        Retourne l'état de la fenêtre de relecture.
+
+        Returns:
+            Dictionnaire contenant: capacity, buffered, overwritten (en
+            secondes d'audio), ou None hors veille du mode relecture
+        """
+        replay_buffer = self.replay_buffer
+        if replay_buffer is None:
+            return None
+        byte_rate = self.capture_rate * replay_buffer.frame_size
+        stats = replay_buffer.get_stats()
+        return {
+            'capacity': stats['capacity'] / byte_rate,
+            'buffered': stats['size'] / byte_rate,
+            'overwritten': stats['overwritten'] / byte_rate,
+        }
+
+    def _start_region(self):
+        """
+        Prépare le fichier d'une nouvelle région d'activité (thread d'encodage).
+
+        L'encodeur courant n'a encore rien reçu : il est remplacé par un
+        encodeur dont le fichier porte l'heure du début de la région.
+        """
+        if self._segment_bytes:
+            return
+        unused_encoder, unused_spool = self.encoder, self.spool
+        self.segment_files.pop()
+        output_file = self._next_segment_filename()
+        self.encoder = self._create_encoder(output_file)
+        self.spool = self._create_spool(output_file)
+        self.segment_files.append(output_file)
+        unused_encoder.close()
+        if unused_spool:
+            unused_spool.discard()
+
+    def _write_segmented(self, view: memoryview):
+        """
+        Écrit des frames dans l'encodeur courant en changeant de segment si nécessaire.
+
+        La coupure se fait à l'octet près (aligné sur les frames) : les frames
+        suivantes vont directement dans le nouveau segment, sans trou.
+
+        Args:
+            view: Frames audio à encoder
+        """
+        if self.transcriber:
+            self.transcriber.write(view)
+        for tap in self.taps:
+            tap.write(view)
+
+        offset = 0
+        size = len(view)
+        while offset < size:
+            if self._rotate_requested:
+                self._rotate_segment()
+
+            length = size - offset
+            if self._segment_limit is not None:
+                room = self._segment_limit - self._segment_bytes
+                if room <= 0:
+                    self._rotate_segment()
+                    room = self._segment_limit
+                length = min(length, room)
+
+            chunk = view[offset:offset + length]
+            if self.spool:
+                self.spool.write(chunk)
+            self.encoder.write_frames(chunk)
+            self._segment_bytes += length
+            offset += length
+
+    def rotate_segment(self):
+        """Demande le passage à un nouveau fichier dès le prochain chunk encodé."""
+        if self.is_recording:
+            self._rotate_requested = True
+
+    def _rotate_segment(self):
+        """Ouvre le segment suivant et finalise le précédent en arrière-plan (thread d'encodage)."""
+        self._rotate_requested = False
+        if self._segment_bytes == 0:
+            return
+
+        previous_encoder = self.encoder
+        previous_spool = self.spool
+        output_file = self._next_segment_filename()
+        self.encoder = self._create_encoder(output_file)
+        self.spool = self._create_spool(output_file)
+        self.segment_files.append(output_file)
+        self._segment_bytes = 0
+
+        finalizer = threading.Thread(
+            target=self._finalize_encoder,
+            args=(previous_encoder, previous_spool),
+            daemon=True
+        )
+        self._finalizer_threads.append(finalizer)
+        finalizer.start()
+
+    def _finalize_encoder(self, encoder: AudioEncoder, spool: Optional[PCMSpool] = None):
+        """
+        Ferme l'encodeur d'un segment terminé (exécuté dans un thread séparé).
+
+        Le spool du segment est supprimé si l'encodage réussit, conservé sinon.
+
+        Args:
+            encoder: Encodeur du segment à finaliser
+            spool: Spool du segment (optionnel)
+        """
+        try:
+            encoder.close()
+        except Exception as e:
+            print(f"Erreur lors de la finalisation du segment {encoder.output_file}: {e}")
+            if spool:
+                try:
+                    spool.close()
+                    print(f"Audio conservé dans {spool.path} (récupérable avec --recover)")
+                except Exception:
+                    pass
             return
 
-        # Arrêter l'enregistrement
+        if isinstance(encoder, DeferredEncoder) and encoder.future is not None:
+            self.encode_jobs[encoder.output_file] = encoder.future
+
+        if spool:
+            try:
+                spool.discard()
+            except Exception:
+                pass
+
+    def get_buffer_stats(self) -> Optional[Dict]:
+        """
+        Retourne les compteurs du buffer circulaire de l'enregistrement en cours.
+
+        Returns:
+            Dictionnaire (voir RingBuffer.get_stats), ou None si aucun enregistrement
+        """
+        if self.mixer is not None:
+            return self.mixer.get_stats()
+        if self.ring_buffer is None:
+            return None
+        return self.ring_buffer.get_stats()
+
+    def get_capture_stats(self) -> Dict:
+        """
+        Retourne les statistiques du moteur de capture.
+
+        Returns:
+            Dictionnaire contenant: capture_backend, capture_mode, capture_rate, capture_channels,
+            sample_rate (taux des fichiers), xruns, wakeups, cpu_time (secondes
+            CPU passées dans la boucle de lecture ou le callback), dropped_frames,
+            reroutes (changements de source PulseAudio), reroute_gap (secondes
+            d'audio remplacées par du silence lors de ces changements),
+            stall_gap (secondes de silence ajoutées aux sources bloquées du
+            mode multi-source)
+        """
+        buffer_stats = self.get_buffer_stats()
+        return {
+            'capture_backend': self.capture_backend,
+            'capture_mode': self.capture_mode,
+            'capture_rate': self.capture_rate,
+            'capture_channels': self.capture_channels,
+            'sample_rate': self.sample_rate,
+            'xruns': self.xrun_count,
+            'wakeups': self.capture_wakeups,
+            'cpu_time': self.capture_cpu_time,
+            'dropped_frames': buffer_stats['dropped_frames'] if buffer_stats else 0,
+            'reroutes': len(self.reroutes),
+            'reroute_gap': sum(reroute['silence'] for reroute in self.reroutes),
+            'stall_gap': sum(buffer_stats.get('padded_frames', [])) / self.sample_rate
+            if buffer_stats else 0.0,
+        }
+
+    def get_levels(self) -> Optional[Dict]:
+        """
+        Retourne les niveaux de l'audio capturé (enregistrement en cours ou terminé).
+
+        Returns:
+            Dictionnaire (voir LevelMeter.get_levels), ou None si la mesure
+            est désactivée ou si aucun enregistrement n'a démarré
+        """
+        if self.level_meter is None:
+            return None
+        return self.level_meter.get_levels()
+
+    def get_gate_stats(self) -> Optional[Dict]:
+        """
+        Retourne les statistiques de la détection d'activité.
+
+        Returns:
+            Dictionnaire (voir VoiceGate.get_stats), ou None si la détection
+            est désactivée
+        """
+        if self.voice_gate is None:
+            return None
+        return self.voice_gate.get_stats()
+
+    def stop_recording(self) -> Optional[EncodeBatch]:
+        """
+        Arrête l'enregistrement et nettoie les ressources.
+
+        Returns:
+            Avec un pool d'encodage, le lot des encodages en cours (un par
+            segment) à attendre ou interroger ; sinon None (fichiers finalisés)
+        """
+        if (not self.is_recording and self.stream is None and not self.streams
+                and self.encoder is None and self.replay_buffer is None):
+            return None
+
+        # Arrêter l'enregistrement (la fin du flux parec réveille le thread de capture)
         self.is_recording = False
+        if self.device_monitor is not None:
+            self.device_monitor.remove_listener(self._on_device_change)
+        with self._pulse_switch:
+            self._pulse_switch.notify_all()
+        if self.pulse_capture:
+            self.pulse_capture.stop()
 
         # Attendre que le thread d'enregistrement se termine
         if self.recording_thread and self.recording_thread.is_alive():
             self.recording_thread.join(timeout=2.0)
+        for thread in self.recording_threads:
+            thread.join(timeout=2.0)
+        self.recording_threads = []
+
+        # Laisser l'encodeur vider le buffer circulaire. Sans délai : le
+        # buffer étant borné et fermé, l'attente finit, et l'encodeur comme
+        # la fenêtre de relecture ne doivent être fermés qu'une fois le
+        # thread d'encodage terminé
+        if self.ring_buffer:
+            self.ring_buffer.close()
+        if self.mixer:
+            self.mixer.close()
+        if self.encoder_thread and self.encoder_thread.is_alive():
+            self.encoder_thread.join()
+
+        # Relecture demandée juste avant l'arrêt, sans nouveau chunk capturé
+        if self._replay_file is not None and self.replay_buffer is not None:
+            self._flush_replay()
+
+        # Plus aucun audio pour la transcription (les derniers résultats
+        # arrivent en arrière-plan)
+        if self.transcriber:
+            self.transcriber.finish()
+        self._finish_taps()
+        # Laisser les consommateurs à file traiter l'audio déjà reçu
+        if self.pipeline:
+            self.pipeline.wait(timeout=5.0)
+
+        # Attendre la finalisation des segments précédents
+        for finalizer in self._finalizer_threads:
+            finalizer.join()
+        self._finalizer_threads = []
 
         # Nettoyer les ressources
         self._cleanup()
 
+        # Détection d'activité : l'encodeur attendant la région suivante n'a
+        # produit aucun fichier
+        if self.voice_gate is not None and self._segment_bytes == 0 and self.segment_files:
+            self.segment_files.pop()
+
+        if self.encode_pool is None:
+            return None
+        return EncodeBatch([
+            self.encode_jobs[path] for path in self.segment_files if path in self.encode_jobs
+        ])
+
     def _cleanup(self):
-        """Nettoie les ressources PyAudio et ferme les fichiers."""
+        """Nettoie les ressources audio et ferme les fichiers."""
         # Fermer le flux audio
         if self.stream:
             try:
@@ -217,19 +1626,35 @@ class AudioRecorder:
             finally:
                 self.stream = None
 
-        # Fermer l'encodeur MP3
-        if self.mp3_encoder:
+        for stream in self.streams:
             try:
-                self.mp3_encoder.close()
+                stream.stop_stream()
+                stream.close()
             except Exception:
                 pass
-            finally:
-                self.mp3_encoder = None
+        self.streams = []
+
+        if self.pulse_capture:
+            self.pulse_capture.close()
+            self.pulse_capture = None
+
+        # Fenêtre de relecture jamais enregistrée
+        if self.replay_buffer:
+            self.replay_buffer.close()
+            self.replay_buffer = None
+        self._replay_file = None
+
+        # Fermer l'encodeur (le spool n'est supprimé que si l'encodage réussit)
+        if self.encoder:
+            encoder, spool = self.encoder, self.spool
+            self.encoder = None
+            self.spool = None
+            self._finalize_encoder(encoder, spool)
 
-        # Terminer PyAudio
+        # Rendre l'instance PyAudio partagée au registre
         if self.pyaudio_instance:
             try:
-                self.pyaudio_instance.terminate()
+                self.device_registry.release(self.pyaudio_instance)
             except Exception:
                 pass
             finally:
@@ -0,0 +1,472 @@
+"""Module pour la transcription par lots des enregistrements archivés."""
+
+import asyncio
+import json
+import mimetypes
+import os
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from src.pcm_spool import SPOOL_SUFFIX
+from src.transcription import MAX_STREAM_SECONDS, load_speech
+
+# Extension des transcriptions écrites à côté de chaque enregistrement
+TRANSCRIPT_SUFFIX = ".txt"
+
+# Journal des enregistrements déjà transcrits (une ligne JSON par fichier)
+CHECKPOINT_NAME = ".transcriptions.jsonl"
+
+# Extensions des fichiers produits par les encodeurs (voir src/encoders.py)
+AUDIO_EXTENSIONS = (".mp3", ".opus", ".flac", ".wav")
+
+# Taux d'échantillonnage du PCM transmis à Google Speech-to-Text
+RECOGNITION_SAMPLE_RATE = 16000
+
+# Durée d'audio par requête d'un flux de reconnaissance
+REQUEST_SECONDS = 0.5
+
+
+def transcript_path(audio_file: Path) -> Path:
+    """
+    Retourne le chemin de la transcription d'un enregistrement.
+
+    Args:
+        audio_file: Enregistrement audio
+
+    Returns:
+        Fichier texte voisin (ex: 2025-10-10_14-30-45.txt)
+    """
+    return audio_file.with_suffix(TRANSCRIPT_SUFFIX)
+
+
+def find_recordings(directory: Path) -> List[Path]:
+    """
+    Liste les enregistrements terminés d'un répertoire et de ses sous-répertoires.
+
+    Les fichiers et répertoires cachés (temporaires d'encodage) ainsi que les
+    enregistrements accompagnés d'un spool (en cours ou interrompus) sont ignorés.
+
+    Args:
+        directory: Répertoire des enregistrements
+
+    Returns:
+        Chemins des enregistrements, triés
+    """
+    directory = Path(directory).expanduser()
+    recordings = []
+    for path in sorted(directory.rglob("*")):
+        relative = path.relative_to(directory)
+        if any(part.startswith('.') for part in relative.parts):
+            continue
+        if path.suffix.lower() not in AUDIO_EXTENSIONS or not path.is_file():
+            continue
+        if path.with_name(path.name + SPOOL_SUFFIX).exists():
+            continue
+        recordings.append(path)
+    return recordings
+
+
+def write_transcript(audio_file: Path, text: str) -> Path:
+    """
+    Écrit la transcription d'un enregistrement de façon atomique.
+
+    Args:
+        audio_file: Enregistrement audio
+        text: Texte transcrit
+
+    Returns:
+        Chemin de la transcription
+    """
+    path = transcript_path(audio_file)
+    temporary = path.with_name(f".{path.name}.tmp")
+    temporary.write_text(text + "\n" if text else "", encoding="utf-8")
+    os.replace(temporary, path)
+    return path
+
+
+class TranscriptionCheckpoint:
+    """
+    Journal de reprise de la transcription par lots.
+
+    Chaque enregistrement transcrit ajoute une ligne (nom relatif, taille et
+    date de modification) au journal, synchronisée sur le disque : un lot
+    interrompu reprend là où il s'était arrêté, et un enregistrement modifié
+    depuis sa transcription (ex: récupéré avec --recover) est retranscrit.
+    """
+
+    def __init__(self, path: Path, directory: Path):
+        """
+        Charge le journal existant.
+
+        Args:
+            path: Fichier du journal
+            directory: Répertoire des enregistrements (noms relatifs)
+        """
+        self.path = Path(path)
+        self.directory = Path(directory)
+        self._entries: Dict[str, List[int]] = {}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self._entries[entry['file']] = [entry['size'], entry['mtime_ns']]
+                    except (ValueError, KeyError):
+                        # Dernière ligne tronquée par un arrêt brutal
+                        continue
+        self._file = None
+
+    def _signature(self, audio_file: Path) -> List[int]:
+        """Taille et date de modification d'un enregistrement."""
+        stat = audio_file.stat()
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def is_done(self, audio_file: Path) -> bool:
+        """
+        Indique si un enregistrement a déjà été transcrit dans son état actuel.
+
+        Args:
+            audio_file: Enregistrement audio
+
+        Returns:
+            True si le journal le mentionne, inchangé, et que sa transcription existe
+        """
+        name = str(audio_file.relative_to(self.directory))
+        return (self._entries.get(name) == self._signature(audio_file)
+                and transcript_path(audio_file).exists())
+
+    def mark_done(self, audio_file: Path):
+        """
+        Enregistre la transcription d'un fichier dans le journal.
+
+        Args:
+            audio_file: Enregistrement transcrit
+        """
+        name = str(audio_file.relative_to(self.directory))
+        size, mtime_ns = self._entries[name] = self._signature(audio_file)
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps({'file': name, 'size': size, 'mtime_ns': mtime_ns}) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        """Ferme le journal."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class RateLimiter:
+    """Espacement des requêtes : au plus `rate` démarrages par seconde."""
+
+    def __init__(self, rate: float):
+        """
+        Initialise le limiteur.
+
+        Args:
+            rate: Nombre maximal de requêtes par seconde
+        """
+        self.interval = 1.0 / rate
+        self._next = 0.0
+
+    async def acquire(self):
+        """Attend le créneau de la prochaine requête."""
+        now = time.monotonic()
+        start = max(now, self._next)
+        self._next = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class AsyncRecognizer:
+    """
+    Interface commune des services de transcription de fichiers.
+
+    Une instance est partagée par toutes les requêtes concurrentes d'un lot
+    (une seule connexion ou un seul client).
+    """
+
+    async def transcribe(self, audio_file: Path) -> str:
+        """
+        Transcrit un enregistrement.
+
+        Args:
+            audio_file: Enregistrement audio
+
+        Returns:
+            Texte transcrit (vide si aucune parole)
+        """
+        raise NotImplementedError
+
+    async def close(self):
+        """Libère les connexions du service."""
+
+
+class GoogleAsyncRecognizer(AsyncRecognizer):
+    """
+    Transcription via Google Cloud Speech-to-Text (SpeechAsyncClient).
+
+    L'enregistrement est décodé par FFmpeg en PCM mono 16 kHz au fil de
+    l'eau et transmis en reconnaissance continue, par flux de moins de cinq
+    minutes : la durée des fichiers n'est pas limitée à la minute de
+    recognize() et le fichier n'est jamais chargé entièrement en mémoire.
+    """
+
+    def __init__(
+        self,
+        language_code: str = "fr-FR",
+        model: str = "default",
+        converter: str = "ffmpeg",
+        client=None
+    ):
+        """
+        Initialise le service (le client est créé à la première requête).
+
+        Args:
+            language_code: Langue de l'audio
+            model: Modèle de reconnaissance
+            converter: Exécutable FFmpeg utilisé pour le décodage
+            client: SpeechAsyncClient existant à réutiliser (optionnel)
+        """
+        self.language_code = language_code
+        self.model = model
+        self.converter = converter
+        self.client = client
+
+    async def transcribe(self, audio_file: Path) -> str:
+        """
+        Transcrit un enregistrement (voir AsyncRecognizer).
+
+        Raises:
+            RuntimeError: Si google-cloud-speech n'est pas installé ou si le
+                          décodage échoue
+        """
+        speech = load_speech()
+        if self.client is None:
+            self.client = speech.SpeechAsyncClient()
+        streaming_config = speech.StreamingRecognitionConfig(
+            config=speech.RecognitionConfig(
+                encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+                sample_rate_hertz=RECOGNITION_SAMPLE_RATE,
+                audio_channel_count=1,
+                language_code=self.language_code,
+                enable_automatic_punctuation=True,
+                model=self.model,
+            )
+        )
+
+        process = await asyncio.create_subprocess_exec(
+            self.converter, '-v', 'error', '-i', str(audio_file),
+            '-f', 's16le', '-ac', '1', '-ar', str(RECOGNITION_SAMPLE_RATE), '-',
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        texts: List[str] = []
+        try:
+            end_of_file = False
+            while not end_of_file:
+                end_of_file = await self._recognize_stream(speech, streaming_config, process.stdout, texts)
+            stderr = await process.stderr.read()
+            if await process.wait() != 0:
+                raise RuntimeError(
+                    f"Décodage impossible de {audio_file.name}: {stderr.decode(errors='replace').strip()}"
+                )
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+        return " ".join(texts)
+
+    async def _recognize_stream(self, speech, streaming_config, stdout, texts: List[str]) -> bool:
+        """
+        Transmet au plus MAX_STREAM_SECONDS d'audio dans un flux de reconnaissance.
+
+        Args:
+            speech: Module google.cloud.speech
+            streaming_config: Configuration du flux
+            stdout: Sortie PCM de FFmpeg
+            texts: Liste complétée avec les résultats définitifs
+
+        Returns:
+            True si la fin de l'audio a été atteinte
+        """
+        request_bytes = int(RECOGNITION_SAMPLE_RATE * REQUEST_SECONDS) * 2
+        stream_limit = int(RECOGNITION_SAMPLE_RATE * MAX_STREAM_SECONDS) * 2
+        state = {'end_of_file': False}
+
+        async def requests():
+            yield speech.StreamingRecognizeRequest(streaming_config=streaming_config)
+            sent = 0
+            while sent < stream_limit:
+                chunk = await stdout.read(min(request_bytes, stream_limit - sent))
+                if not chunk:
+                    state['end_of_file'] = True
+                    return
+                sent += len(chunk)
+                yield speech.StreamingRecognizeRequest(audio_content=chunk)
+
+        responses = await self.client.streaming_recognize(requests=requests())
+        async for response in responses:
+            for result in response.results:
+                if result.is_final and result.alternatives:
+                    texts.append(result.alternatives[0].transcript.strip())
+        return state['end_of_file']
+
+    async def close(self):
+        """Ferme le canal du client Speech-to-Text."""
+        if self.client is not None:
+            await self.client.transport.close()
+            self.client = None
+
+
+class HTTPRecognizer(AsyncRecognizer):
+    """
+    Transcription via un service HTTP (serveur local ou auto-hébergé).
+
+    Chaque enregistrement est envoyé tel quel dans le corps d'un POST
+    (Content-Type selon l'extension) ; le service répond en JSON avec le
+    texte dans le champ "text".
+    """
+
+    def __init__(self, url: str, timeout: float = 600.0, headers: Optional[Dict[str, str]] = None):
+        """
+        Initialise le service.
+
+        Args:
+            url: URL du point de transcription
+            timeout: Délai maximal d'une requête en secondes
+            headers: En-têtes HTTP supplémentaires (ex: authentification)
+        """
+        self.url = url
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+
+    def _post(self, audio_file: Path) -> str:
+        """Envoie un enregistrement et retourne le texte (exécuté dans un thread)."""
+        content_type = mimetypes.guess_type(audio_file.name)[0] or "application/octet-stream"
+        request = urllib.request.Request(
+            self.url,
+            data=audio_file.read_bytes(),
+            headers={'Content-Type': content_type, 'X-Filename': audio_file.name, **self.headers},
+            method="POST"
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                payload = json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            raise RuntimeError(f"Le service de transcription a répondu {e.code}: {e.reason}") from e
+        except ValueError as e:
+            raise RuntimeError(f"Réponse invalide du service de transcription: {e}") from e
+        return str(payload.get('text', "")).strip()
+
+    async def transcribe(self, audio_file: Path) -> str:
+        """Transcrit un enregistrement (voir AsyncRecognizer)."""
+        return await asyncio.to_thread(self._post, audio_file)
+
+
+async def transcribe_directory(
+    directory: Path,
+    recognizer: AsyncRecognizer,
+    concurrency: int = 4,
+    rate: Optional[float] = None,
+    retries: int = 2,
+    retry_delay: float = 2.0,
+    on_progress: Optional[Callable[[Path, Optional[Exception]], None]] = None
+) -> Dict:
+    """
+    Transcrit les enregistrements d'un répertoire qui ne l'ont pas encore été.
+
+    `concurrency` requêtes sont en cours simultanément, toutes via le même
+    service ; chaque transcription est écrite à côté de son enregistrement
+    (voir transcript_path) puis consignée dans le journal de reprise.
+
+    Args:
+        directory: Répertoire des enregistrements
+        recognizer: Service de transcription partagé
+        concurrency: Nombre de requêtes simultanées
+        rate: Nombre maximal de requêtes démarrées par seconde (optionnel)
+        retries: Nouvelles tentatives après l'échec d'une requête
+        retry_delay: Attente avant la première nouvelle tentative, doublée ensuite
+        on_progress: Fonction appelée après chaque enregistrement avec son
+                     chemin et l'erreur éventuelle
+
+    Returns:
+        Dictionnaire contenant: total, skipped, transcribed, failed, errors
+        (message par chemin)
+    """
+    directory = Path(directory).expanduser()
+    recordings = find_recordings(directory)
+    checkpoint = TranscriptionCheckpoint(directory / CHECKPOINT_NAME, directory)
+    pending = [path for path in recordings if not checkpoint.is_done(path)]
+    stats = {
+        'total': len(recordings),
+        'skipped': len(recordings) - len(pending),
+        'transcribed': 0,
+        'failed': 0,
+        'errors': {},
+    }
+    limiter = RateLimiter(rate) if rate else None
+    queue: asyncio.Queue = asyncio.Queue()
+    for path in pending:
+        queue.put_nowait(path)
+
+    async def transcribe_with_retries(path: Path) -> str:
+        delay = retry_delay
+        for attempt in range(retries + 1):
+            if limiter:
+                await limiter.acquire()
+            try:
+                return await recognizer.transcribe(path)
+            except Exception:
+                if attempt == retries:
+                    raise
+            await asyncio.sleep(delay)
+            delay *= 2
+
+    async def worker():
+        while not queue.empty():
+            path = queue.get_nowait()
+            error = None
+            try:
+                text = await transcribe_with_retries(path)
+                write_transcript(path, text)
+                checkpoint.mark_done(path)
+                stats['transcribed'] += 1
+            except Exception as e:
+                error = e
+                stats['failed'] += 1
+                stats['errors'][str(path)] = str(e)
+            if on_progress:
+                on_progress(path, error)
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, len(pending))))))
+    finally:
+        checkpoint.close()
+    return stats
+
+
+def transcribe_archive(directory: Path, recognizer: AsyncRecognizer, **options) -> Dict:
+    """
+    Transcrit un répertoire d'enregistrements (point d'entrée synchrone).
+
+    Args:
+        directory: Répertoire des enregistrements
+        recognizer: Service de transcription, fermé à la fin du lot
+        **options: Options de transcribe_directory
+
+    Returns:
+        Statistiques du lot (voir transcribe_directory)
+    """
+    async def run():
+        try:
+            return await transcribe_directory(directory, recognizer, **options)
+        finally:
+            await recognizer.close()
+
+    return asyncio.run(run())
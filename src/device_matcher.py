@@ -0,0 +1,228 @@
+"""Module pour la correspondance indexée entre noms PulseAudio et périphériques PyAudio."""
+
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# Scores des stratégies de correspondance (du plus fiable au moins fiable)
+SCORE_EXACT = 1.0
+SCORE_PULSE_IN_DEVICE = 0.9
+SCORE_DEVICE_IN_PULSE = 0.8
+SCORE_KEYWORDS_BASE = 0.5
+SCORE_KEYWORD_STEP = 0.05
+SCORE_KEYWORDS_MAX = 0.75
+SCORE_PULSE_FALLBACK = 0.1
+
+# Nombre minimal de mots-clés de la description présents dans le nom PyAudio
+MIN_KEYWORD_MATCHES = 2
+
+
+class DeviceMatch(NamedTuple):
+    """Candidat PyAudio pour une source PulseAudio."""
+
+    index: int
+    score: float
+    strategy: str
+
+
+class SubstringAutomaton:
+    """
+    Automate d'Aho-Corasick : trouve en une passe tous les motifs contenus dans un texte.
+
+    Chaque motif est associé à une liste d'identifiants retournés par search().
+    """
+
+    def __init__(self, patterns: Dict[str, List[int]]):
+        """
+        Construit l'automate.
+
+        Args:
+            patterns: Dictionnaire motif -> identifiants associés (motifs vides ignorés)
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for pattern, ids in patterns.items():
+            if not pattern:
+                continue
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                node = next_node
+            self._output[node].extend(ids)
+
+        # Liens d'échec calculés en largeur
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def search(self, text: str) -> Set[int]:
+        """
+        Retourne les identifiants de tous les motifs présents dans le texte.
+
+        Args:
+            text: Texte à analyser
+
+        Returns:
+            Ensemble des identifiants trouvés
+        """
+        found: Set[int] = set()
+        node = 0
+        for char in text:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            if self._output[node]:
+                found.update(self._output[node])
+        return found
+
+
+def _description_keywords(description: str) -> Set[str]:
+    """Extrait les mots-clés significatifs (plus de 3 caractères) d'une description."""
+    return {keyword for keyword in description.lower().split() if len(keyword) > 3}
+
+
+class DeviceNameIndex:
+    """
+    Index précalculé des noms de périphériques PyAudio.
+
+    Les noms sont mis en minuscules une seule fois, indexés dans une table de
+    correspondance exacte et dans un automate de sous-chaînes. La résolution de
+    plusieurs sources PulseAudio se fait en un seul lot (match()).
+    """
+
+    def __init__(self, devices: List[Dict]):
+        """
+        Construit l'index.
+
+        Args:
+            devices: Périphériques PyAudio (voir list_audio_devices)
+        """
+        self.devices = devices
+        self._names = [device['name'].lower() for device in devices]
+
+        self._exact: Dict[str, List[int]] = {}
+        for position, name in enumerate(self._names):
+            self._exact.setdefault(name, []).append(position)
+
+        # Automate des noms PyAudio : quels noms sont contenus dans un nom PulseAudio
+        self._device_automaton = SubstringAutomaton(self._exact)
+
+        # Périphériques de capture "pulse" pour le fallback
+        self._pulse_fallback = [
+            position for position, device in enumerate(devices)
+            if device['maxInputChannels'] > 0 and 'pulse' in self._names[position]
+        ]
+
+    def match(self, sources: Iterable[Tuple[str, str]]) -> List[List[DeviceMatch]]:
+        """
+        Classe les candidats PyAudio pour plusieurs sources PulseAudio en un seul lot.
+
+        Args:
+            sources: Couples (nom PulseAudio, description PulseAudio)
+
+        Returns:
+            Pour chaque source, la liste des candidats triés par score décroissant
+        """
+        sources = [(name.lower(), (description or "").lower()) for name, description in sources]
+
+        # Noms PulseAudio contenus dans les noms PyAudio : un automate pour tout le lot
+        pulse_patterns: Dict[str, List[int]] = {}
+        keyword_patterns: Dict[str, List[int]] = {}
+        keyword_sets: List[Set[str]] = []
+        for source_id, (name, description) in enumerate(sources):
+            pulse_patterns.setdefault(name, []).append(source_id)
+            keywords = _description_keywords(description)
+            keyword_sets.append(keywords)
+
+        keyword_ids: Dict[str, int] = {}
+        for keywords in keyword_sets:
+            for keyword in keywords:
+                if keyword not in keyword_ids:
+                    keyword_ids[keyword] = len(keyword_ids)
+                    keyword_patterns[keyword] = [keyword_ids[keyword]]
+
+        pulse_automaton = SubstringAutomaton(pulse_patterns)
+        keyword_automaton = SubstringAutomaton(keyword_patterns)
+
+        pulse_in_device: List[Set[int]] = [set() for _ in sources]
+        device_keywords: List[Set[int]] = []
+        for position, device_name in enumerate(self._names):
+            for source_id in pulse_automaton.search(device_name):
+                pulse_in_device[source_id].add(position)
+            device_keywords.append(keyword_automaton.search(device_name))
+
+        results = []
+        for source_id, (name, description) in enumerate(sources):
+            best: Dict[int, DeviceMatch] = {}
+
+            def propose(position: int, score: float, strategy: str):
+                current = best.get(position)
+                if current is None or score > current.score:
+                    best[position] = DeviceMatch(self.devices[position]['index'], score, strategy)
+
+            for position in self._exact.get(name, []):
+                propose(position, SCORE_EXACT, 'exact')
+            for position in pulse_in_device[source_id]:
+                propose(position, SCORE_PULSE_IN_DEVICE, 'pulse_in_device')
+            for position in self._device_automaton.search(name):
+                propose(position, SCORE_DEVICE_IN_PULSE, 'device_in_pulse')
+
+            wanted = {keyword_ids[keyword] for keyword in keyword_sets[source_id]}
+            if wanted:
+                for position, found in enumerate(device_keywords):
+                    matches = len(wanted & found)
+                    if matches >= MIN_KEYWORD_MATCHES:
+                        score = min(
+                            SCORE_KEYWORDS_BASE + SCORE_KEYWORD_STEP * matches,
+                            SCORE_KEYWORDS_MAX
+                        )
+                        propose(position, score, 'keywords')
+
+            for position in self._pulse_fallback:
+                propose(position, SCORE_PULSE_FALLBACK, 'pulse_fallback')
+
+            ranked = sorted(best.items(), key=lambda item: (-item[1].score, item[0]))
+            results.append([match for _, match in ranked])
+
+        return results
+
+    def rank(self, name: str, description: str = "") -> List[DeviceMatch]:
+        """
+        Classe les candidats PyAudio pour une seule source PulseAudio.
+
+        Args:
+            name: Nom PulseAudio
+            description: Description PulseAudio (optionnel)
+
+        Returns:
+            Liste des candidats triés par score décroissant
+        """
+        return self.match([(name, description)])[0]
+
+
+def best_match(candidates: List[DeviceMatch]) -> Optional[int]:
+    """
+    Retourne l'index du meilleur candidat.
+
+    Args:
+        candidates: Candidats triés (voir DeviceNameIndex.match)
+
+    Returns:
+        Index PyAudio, ou None si aucun candidat
+    """
+    return candidates[0].index if candidates else None
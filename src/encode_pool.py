@@ -0,0 +1,186 @@
+"""Module pour l'encodage en arrière-plan des enregistrements terminés."""
+
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import wait as wait_futures
+from pathlib import Path
+from typing import List, Optional
+
+from src.audio_encoder import AudioEncoder
+from src.pcm_spool import PCMSpool, recover_spool
+
+
+class EncodePool:
+    """
+    File de travaux d'encodage exécutés par un pool de processus.
+
+    Chaque travail est un spool PCM (voir PCMSpool) : les données ne
+    transitent pas entre processus, seul le chemin du spool est transmis.
+    Un travail interrompu laisse son spool sur le disque, récupérable
+    avec recover_spool().
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialise le pool (les processus ne sont lancés qu'au premier travail).
+
+        Args:
+            max_workers: Nombre maximal de processus (par défaut le nombre de cœurs)
+        """
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def submit(self, spool_path: Path) -> Future:
+        """
+        Ajoute l'encodage d'un spool à la file.
+
+        Args:
+            spool_path: Chemin du spool à encoder
+
+        Returns:
+            Future dont le résultat est le chemin du fichier encodé
+        """
+        with self._lock:
+            if self._executor is None:
+                # "spawn" : ne pas dupliquer par fork un processus contenant
+                # les threads de capture et PortAudio
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor.submit(recover_spool, Path(spool_path))
+
+    def shutdown(self, wait: bool = True):
+        """
+        Arrête le pool.
+
+        Args:
+            wait: Attendre la fin des travaux en cours
+        """
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        """Support du context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Attend la fin des travaux lors de la sortie du context manager."""
+        self.shutdown(wait=True)
+        return False
+
+
+class EncodeBatch:
+    """Ensemble des travaux d'encodage d'un enregistrement (un par segment)."""
+
+    def __init__(self, futures: List[Future]):
+        """
+        Initialise le lot.
+
+        Args:
+            futures: Travaux soumis au pool, dans l'ordre des segments
+        """
+        self.futures = list(futures)
+
+    def __len__(self) -> int:
+        """Nombre de fichiers à encoder."""
+        return len(self.futures)
+
+    def done(self) -> bool:
+        """Indique si tous les encodages sont terminés."""
+        return all(future.done() for future in self.futures)
+
+    def result(self, timeout: Optional[float] = None) -> List[Path]:
+        """
+        Attend la fin des encodages.
+
+        Args:
+            timeout: Délai maximal d'attente en secondes (None = illimité)
+
+        Returns:
+            Fichiers encodés, dans l'ordre des segments
+
+        Raises:
+            TimeoutError: Si les encodages ne sont pas terminés dans le délai
+            RuntimeError: Si un encodage a échoué (son spool est conservé)
+        """
+        _, pending = wait_futures(self.futures, timeout=timeout)
+        if pending:
+            raise TimeoutError("Encodage toujours en cours")
+        return [path for path in (future.result() for future in self.futures) if path is not None]
+
+
+class DeferredEncoder(AudioEncoder):
+    """
+    Encodeur différé : le PCM est écrit dans un spool puis encodé par un EncodePool.
+
+    write_frames() ne fait qu'ajouter les données au spool ; close() le
+    synchronise et le soumet au pool sans attendre l'encodage.
+    """
+
+    def __init__(
+        self,
+        output_file: Path,
+        encode_pool: EncodePool,
+        output_format: str = "mp3",
+        sample_rate: int = 44100,
+        channels: int = 2,
+        sample_width: int = 2,
+        bitrate: Optional[str] = None,
+        sync_interval: float = 1.0
+    ):
+        """
+        Initialise l'encodeur différé.
+
+        Args:
+            output_file: Chemin du fichier final
+            encode_pool: Pool chargé de l'encodage
+            output_format: Format du fichier final (voir OUTPUT_FORMATS)
+            sample_rate: Taux d'échantillonnage en Hz (par défaut 44100)
+            channels: Nombre de canaux audio (1=mono, 2=stéréo)
+            sample_width: Largeur d'échantillon en octets (2 pour 16-bit)
+            bitrate: Bitrate des formats avec perte (optionnel)
+            sync_interval: Intervalle maximal entre deux fsync du spool en secondes
+        """
+        super().__init__(output_file, sample_rate, channels, sample_width)
+        self.encode_pool = encode_pool
+        self.spool = PCMSpool(
+            output_file,
+            metadata={
+                'output_format': output_format,
+                'sample_rate': sample_rate,
+                'channels': channels,
+                'sample_width': sample_width,
+                'bitrate': bitrate,
+            },
+            sync_interval=sync_interval
+        )
+        self.future: Optional[Future] = None
+
+    def write_frames(self, frames: bytes):
+        """
+        Ajoute des frames audio au spool.
+
+        Args:
+            frames: Données audio brutes
+
+        Raises:
+            RuntimeError: Si l'encodeur a déjà été fermé
+        """
+        if self._is_closed:
+            raise RuntimeError("L'encodeur différé a déjà été fermé")
+        self.spool.write(frames)
+
+    def close(self):
+        """Ferme le spool et le soumet au pool (sans attendre l'encodage)."""
+        if self._is_closed:
+            return
+        self._is_closed = True
+        self.spool.close()
+        if self.spool.bytes_written:
+            self.future = self.encode_pool.submit(self.spool.path)
@@ -0,0 +1,137 @@
+"""Module pour le choix de l'encodeur selon le format de sortie."""
+
+from pathlib import Path
+from typing import Dict, Optional, Type
+
+from src.audio_encoder import AudioEncoder
+from src.ffmpeg_encoder import FLACEncoder, OpusEncoder
+from src.mp3_encoder import MP3Encoder
+from src.wav_encoder import WAVEncoder
+
+# Encodeur associé à chaque format de sortie
+ENCODER_CLASSES: Dict[str, Type[AudioEncoder]] = {
+    'mp3': MP3Encoder,
+    'opus': OpusEncoder,
+    'flac': FLACEncoder,
+    'wav': WAVEncoder,
+}
+
+OUTPUT_FORMATS = tuple(ENCODER_CLASSES)
+
+# Bitrate par défaut des formats compressés avec perte
+DEFAULT_BITRATES = {
+    'mp3': "128k",
+    'opus': "32k",
+}
+
+# Taux de compression moyen du FLAC sur de la musique (taille FLAC / taille PCM)
+FLAC_SIZE_RATIO = 0.6
+
+
+def parse_bitrate(bitrate: str) -> int:
+    """
+    Convertit un bitrate FFmpeg (ex: "128k") en bits par seconde.
+
+    Args:
+        bitrate: Bitrate au format FFmpeg
+
+    Returns:
+        Bitrate en bits par seconde
+
+    Raises:
+        ValueError: Si le format n'est pas reconnu
+    """
+    value = bitrate.strip().lower()
+    multiplier = 1
+    if value.endswith('k'):
+        multiplier, value = 1000, value[:-1]
+    elif value.endswith('m'):
+        multiplier, value = 1000000, value[:-1]
+    try:
+        return int(float(value) * multiplier)
+    except ValueError:
+        raise ValueError(f"Bitrate invalide: {bitrate}")
+
+
+def get_encoder_class(output_format: str) -> Type[AudioEncoder]:
+    """
+    Retourne la classe d'encodeur d'un format de sortie.
+
+    Args:
+        output_format: Format de sortie (voir OUTPUT_FORMATS)
+
+    Returns:
+        Classe d'encodeur
+
+    Raises:
+        ValueError: Si le format est inconnu
+    """
+    try:
+        return ENCODER_CLASSES[output_format]
+    except KeyError:
+        raise ValueError(
+            f"Format de sortie inconnu: {output_format} "
+            f"(valeurs possibles: {', '.join(OUTPUT_FORMATS)})"
+        )
+
+
+def create_encoder(
+    output_format: str,
+    output_file: Path,
+    sample_rate: int = 44100,
+    channels: int = 2,
+    sample_width: int = 2,
+    bitrate: Optional[str] = None,
+    streaming: bool = True
+) -> AudioEncoder:
+    """
+    Crée l'encodeur d'un format de sortie.
+
+    Args:
+        output_format: Format de sortie (voir OUTPUT_FORMATS)
+        output_file: Chemin du fichier de sortie
+        sample_rate: Taux d'échantillonnage en Hz
+        channels: Nombre de canaux audio
+        sample_width: Largeur d'échantillon en octets
+        bitrate: Bitrate des formats avec perte (par défaut DEFAULT_BITRATES)
+        streaming: Encodage en continu (seul le MP3 supporte le mode bufferisé)
+
+    Returns:
+        Encodeur prêt à recevoir des frames
+
+    Raises:
+        ValueError: Si le format est inconnu
+    """
+    encoder_class = get_encoder_class(output_format)
+    options = {}
+    if output_format in DEFAULT_BITRATES:
+        options['bitrate'] = bitrate or DEFAULT_BITRATES[output_format]
+    if output_format == 'mp3':
+        options['streaming'] = streaming
+
+    return encoder_class(
+        output_file=output_file,
+        sample_rate=sample_rate,
+        channels=channels,
+        sample_width=sample_width,
+        **options
+    )
+
+
+def estimate_byte_rate(output_format: str, pcm_byte_rate: float, bitrate: Optional[str] = None) -> float:
+    """
+    Estime le débit du fichier produit, en octets par seconde.
+
+    Args:
+        output_format: Format de sortie (voir OUTPUT_FORMATS)
+        pcm_byte_rate: Débit du PCM capturé en octets par seconde
+        bitrate: Bitrate des formats avec perte (par défaut DEFAULT_BITRATES)
+
+    Returns:
+        Débit estimé en octets par seconde
+    """
+    if output_format in DEFAULT_BITRATES:
+        return parse_bitrate(bitrate or DEFAULT_BITRATES[output_format]) / 8
+    if output_format == 'flac':
+        return pcm_byte_rate * FLAC_SIZE_RATIO
+    return pcm_byte_rate
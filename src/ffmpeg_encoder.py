@@ -0,0 +1,186 @@
+"""Module pour les encodeurs en flux continu FLAC et Opus via FFmpeg."""
+
+from pathlib import Path
+from typing import List, Optional
+
+from pydub import AudioSegment
+
+from src.audio_encoder import FFMPEG_MISSING_MESSAGE, AudioEncoder
+from src.ffmpeg_pipe import FFmpegPipe, build_ffmpeg_command
+
+
+class FFmpegEncoder(AudioEncoder):
+    """
+    Encodeur générique alimentant un processus FFmpeg persistant.
+
+    Les sous-classes fournissent les arguments de codec (codec_args()).
+    Le processus n'est lancé qu'à la première écriture.
+    """
+
+    # Nom du format utilisé dans les messages d'erreur
+    codec_name = ""
+
+    def __init__(
+        self,
+        output_file: Path,
+        sample_rate: int = 44100,
+        channels: int = 2,
+        sample_width: int = 2,
+        converter: Optional[str] = None
+    ):
+        """
+        Initialise l'encodeur.
+
+        Args:
+            output_file: Chemin du fichier de sortie
+            sample_rate: Taux d'échantillonnage en Hz (par défaut 44100)
+            channels: Nombre de canaux audio (1=mono, 2=stéréo)
+            sample_width: Largeur d'échantillon en octets (2 pour 16-bit)
+            converter: Exécutable FFmpeg à utiliser (par défaut celui de
+                       pydub, AudioSegment.converter)
+        """
+        super().__init__(output_file, sample_rate, channels, sample_width)
+        self.converter = converter or AudioSegment.converter
+        self._pipe: Optional[FFmpegPipe] = None
+
+    def codec_args(self) -> List[str]:
+        """
+        Retourne les arguments de codec FFmpeg du format.
+
+        Returns:
+            Liste d'arguments (voir build_ffmpeg_command)
+        """
+        raise NotImplementedError
+
+    def _ffmpeg_command(self) -> List[str]:
+        """Construit la commande FFmpeg encodant le PCM de l'entrée standard."""
+        return build_ffmpeg_command(
+            output_file=self.output_file,
+            sample_rate=self.sample_rate,
+            channels=self.channels,
+            sample_width=self.sample_width,
+            codec_args=self.codec_args(),
+            converter=self.converter
+        )
+
+    def _start_pipe(self):
+        """Lance le processus FFmpeg."""
+        self._pipe = FFmpegPipe(self._ffmpeg_command())
+        try:
+            self._pipe.start()
+        except FileNotFoundError as e:
+            self._pipe = None
+            raise RuntimeError(FFMPEG_MISSING_MESSAGE) from e
+
+    def write_frames(self, frames: bytes):
+        """
+        Transmet des frames audio à FFmpeg.
+
+        Args:
+            frames: Données audio brutes à encoder
+
+        Raises:
+            RuntimeError: Si l'encodeur a déjà été fermé ou si FFmpeg échoue
+        """
+        if self._is_closed:
+            raise RuntimeError(f"L'encodeur {self.codec_name} a déjà été fermé")
+
+        if self._pipe is None:
+            self._start_pipe()
+        self._pipe.write(frames)
+
+    def close(self):
+        """
+        Termine le processus FFmpeg et finalise le fichier.
+
+        Raises:
+            RuntimeError: Si l'encodage échoue
+        """
+        if self._is_closed:
+            return
+
+        try:
+            if self._pipe is not None:
+                self._pipe.close()
+        except Exception as e:
+            raise RuntimeError(f"Erreur lors de l'encodage {self.codec_name}: {e}") from e
+        finally:
+            self._pipe = None
+            self._is_closed = True
+
+
+class FLACEncoder(FFmpegEncoder):
+    """Encodeur FLAC (compression sans perte) en flux continu."""
+
+    extension = "flac"
+    codec_name = "FLAC"
+
+    def __init__(
+        self,
+        output_file: Path,
+        sample_rate: int = 44100,
+        channels: int = 2,
+        sample_width: int = 2,
+        compression_level: int = 5,
+        converter: Optional[str] = None
+    ):
+        """
+        Initialise l'encodeur FLAC.
+
+        Args:
+            output_file: Chemin du fichier FLAC de sortie
+            sample_rate: Taux d'échantillonnage en Hz (par défaut 44100)
+            channels: Nombre de canaux audio (1=mono, 2=stéréo)
+            sample_width: Largeur d'échantillon en octets (2 pour 16-bit)
+            compression_level: Niveau de compression FLAC (0 = plus rapide, 12 = plus compact)
+            converter: Exécutable FFmpeg à utiliser (par défaut celui de pydub)
+        """
+        super().__init__(output_file, sample_rate, channels, sample_width, converter)
+        self.compression_level = compression_level
+
+    def codec_args(self) -> List[str]:
+        """Arguments FFmpeg du codec FLAC."""
+        return ['-codec:a', 'flac', '-compression_level', str(self.compression_level), '-f', 'flac']
+
+
+class OpusEncoder(FFmpegEncoder):
+    """Encodeur Opus dans un conteneur Ogg, adapté aux bas débits."""
+
+    extension = "opus"
+    codec_name = "Opus"
+
+    def __init__(
+        self,
+        output_file: Path,
+        sample_rate: int = 44100,
+        channels: int = 2,
+        sample_width: int = 2,
+        bitrate: str = "32k",
+        application: str = "audio",
+        converter: Optional[str] = None
+    ):
+        """
+        Initialise l'encodeur Opus.
+
+        Args:
+            output_file: Chemin du fichier Opus de sortie
+            sample_rate: Taux d'échantillonnage en Hz (FFmpeg rééchantillonne
+                         vers un taux supporté par Opus si nécessaire)
+            channels: Nombre de canaux audio (1=mono, 2=stéréo)
+            sample_width: Largeur d'échantillon en octets (2 pour 16-bit)
+            bitrate: Bitrate Opus (par défaut "32k")
+            application: Réglage de l'encodeur : "audio", "voip" ou "lowdelay"
+            converter: Exécutable FFmpeg à utiliser (par défaut celui de pydub)
+        """
+        super().__init__(output_file, sample_rate, channels, sample_width, converter)
+        self.bitrate = bitrate
+        self.application = application
+
+    def codec_args(self) -> List[str]:
+        """Arguments FFmpeg du codec Opus."""
+        return [
+            '-codec:a', 'libopus',
+            '-b:a', self.bitrate,
+            '-application', self.application,
+            '-f', 'ogg',
+        ]
@@ -0,0 +1,191 @@
+"""Module pour l'encodage en flux continu via un processus FFmpeg persistant."""
+
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, List, Optional
+
+# Format d'échantillon FFmpeg correspondant à la largeur d'échantillon (octets)
+SAMPLE_FORMATS = {
+    1: 'u8',
+    2: 's16le',
+    3: 's24le',
+    4: 's32le',
+}
+
+# Taille maximale de la fin de la sortie d'erreur de FFmpeg reprise dans les messages
+ERROR_TAIL_BYTES = 4096
+
+
+def build_ffmpeg_command(
+    output_file: Path,
+    sample_rate: int,
+    channels: int,
+    sample_width: int,
+    codec_args: List[str],
+    converter: str = "ffmpeg"
+) -> List[str]:
+    """
+    Construit la ligne de commande FFmpeg lisant du PCM brut sur l'entrée standard.
+
+    Args:
+        output_file: Fichier de sortie encodé
+        sample_rate: Taux d'échantillonnage en Hz
+        channels: Nombre de canaux audio
+        sample_width: Largeur d'échantillon en octets
+        codec_args: Arguments de codec FFmpeg (ex: ['-codec:a', 'libmp3lame', '-b:a', '128k'])
+        converter: Exécutable FFmpeg à utiliser
+
+    Returns:
+        Liste d'arguments pour subprocess
+
+    Raises:
+        ValueError: Si la largeur d'échantillon n'est pas supportée
+    """
+    if sample_width not in SAMPLE_FORMATS:
+        raise ValueError(f"Largeur d'échantillon non supportée: {sample_width}")
+
+    return [
+        converter,
+        '-hide_banner',
+        '-loglevel', 'error',
+        '-y',
+        '-f', SAMPLE_FORMATS[sample_width],
+        '-ar', str(sample_rate),
+        '-ac', str(channels),
+        '-i', 'pipe:0',
+        *codec_args,
+        str(output_file),
+    ]
+
+
+class FFmpegPipe:
+    """
+    Processus FFmpeg alimenté en PCM au fil de l'eau.
+
+    Les données écrites sont transmises immédiatement à FFmpeg qui écrit les
+    trames encodées sur le disque au fur et à mesure : la mémoire utilisée reste
+    bornée quelle que soit la durée de l'enregistrement.
+    """
+
+    def __init__(self, command: List[str]):
+        """
+        Initialise le pipe (le processus n'est lancé qu'à l'appel de start()).
+
+        Args:
+            command: Ligne de commande FFmpeg (voir build_ffmpeg_command)
+        """
+        self.command = command
+        self.process: Optional[subprocess.Popen] = None
+        self.bytes_written = 0
+        # Sortie d'erreur de FFmpeg : un fichier temporaire plutôt qu'un tube,
+        # qui bloquerait FFmpeg une fois plein puisqu'il n'est lu qu'à la fin
+        self._stderr: Optional[BinaryIO] = None
+
+    def start(self, stdin: Optional[BinaryIO] = None):
+        """
+        Lance le processus FFmpeg.
+
+        Args:
+            stdin: Fichier PCM lu directement par FFmpeg depuis sa position
+                   courante (optionnel). write() est alors indisponible et
+                   close() attend la fin de la lecture du fichier.
+
+        Raises:
+            FileNotFoundError: Si l'exécutable FFmpeg est introuvable
+        """
+        if self.process is not None:
+            return
+
+        self._stderr = tempfile.TemporaryFile()
+        try:
+            self.process = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE if stdin is None else stdin,
+                stdout=subprocess.DEVNULL,
+                stderr=self._stderr
+            )
+        except Exception:
+            self._close_stderr()
+            raise
+
+    def write(self, data):
+        """
+        Transmet des données PCM à FFmpeg.
+
+        Args:
+            data: Données audio brutes (bytes, bytearray ou memoryview)
+
+        Raises:
+            RuntimeError: Si le processus n'est pas démarré ou s'est arrêté
+        """
+        if self.process is None or self.process.stdin is None:
+            raise RuntimeError("Le processus FFmpeg n'est pas démarré")
+
+        try:
+            self.process.stdin.write(data)
+        except (BrokenPipeError, ValueError) as e:
+            raise RuntimeError(
+                f"FFmpeg s'est arrêté prématurément: {self._read_errors()}"
+            ) from e
+        self.bytes_written += len(data)
+
+    def close(self, timeout: Optional[float] = None):
+        """
+        Ferme l'entrée de FFmpeg et attend la fin de l'encodage.
+
+        Args:
+            timeout: Délai maximal d'attente en secondes (None = illimité)
+
+        Raises:
+            RuntimeError: Si FFmpeg se termine avec une erreur
+        """
+        if self.process is None:
+            return
+
+        process = self.process
+        self.process = None
+
+        try:
+            if process.stdin is not None:
+                process.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+
+        try:
+            returncode = process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            self._close_stderr()
+            raise RuntimeError("FFmpeg n'a pas terminé l'encodage dans le délai imparti")
+
+        errors = self._error_tail()
+        self._close_stderr()
+        if returncode != 0:
+            raise RuntimeError(f"FFmpeg a échoué (code {returncode}): {errors}")
+
+    def _read_errors(self) -> str:
+        """Récupère la sortie d'erreur de FFmpeg après un arrêt inattendu."""
+        if self.process is None:
+            return ""
+        try:
+            self.process.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            return ""
+        return self._error_tail()
+
+    def _error_tail(self) -> str:
+        """Retourne la fin de la sortie d'erreur de FFmpeg (ERROR_TAIL_BYTES au plus)."""
+        if self._stderr is None:
+            return ""
+        size = self._stderr.seek(0, os.SEEK_END)
+        self._stderr.seek(max(0, size - ERROR_TAIL_BYTES))
+        return self._stderr.read().decode('utf-8', errors='replace').strip()
+
+    def _close_stderr(self):
+        """Libère le fichier de la sortie d'erreur."""
+        if self._stderr is not None:
+            self._stderr.close()
+            self._stderr = None
@@ -0,0 +1,206 @@
+"""Module pour la mesure des niveaux audio (RMS, crête, écrêtage, silence)."""
+
+import math
+from typing import Dict, List
+
+import numpy as np
+
+from src.stream_mixer import SAMPLE_DTYPES
+
+# Plancher des niveaux exprimés en dBFS (silence numérique)
+MIN_DB = -120.0
+
+# Seuil par défaut sous lequel un bloc est considéré comme silencieux
+DEFAULT_SILENCE_THRESHOLD_DB = -60.0
+
+
+def to_db(level: float) -> float:
+    """
+    Convertit un niveau linéaire (1.0 = pleine échelle) en dBFS.
+
+    Args:
+        level: Niveau linéaire
+
+    Returns:
+        Niveau en dBFS, borné à MIN_DB
+    """
+    if level <= 0.0:
+        return MIN_DB
+    return max(MIN_DB, 20.0 * math.log10(level))
+
+
+class LevelMeter:
+    """
+    Mesure par canal des niveaux du PCM transmis à l'encodeur.
+
+    Chaque appel à process() calcule, pour chaque canal, le niveau RMS, la
+    crête et le nombre d'échantillons écrêtés (à pleine échelle) avec NumPy,
+    directement sur le PCM entier. Les calculs passent par des buffers de
+    travail alloués une fois pour toutes : les données sont traitées par
+    blocs de `block_frames` frames, quelle que soit la taille reçue.
+
+    Le silence est évalué bloc par bloc, indépendamment de la taille des
+    chunks reçus : un bloc dont tous les canaux sont sous
+    `silence_threshold_db` est silencieux. La durée du silence en cours
+    permet de détecter une capture muette pendant l'enregistrement.
+
+    Conçu pour un seul thread d'écriture (encodeur) ; get_levels() peut être
+    appelé depuis un autre thread.
+    """
+
+    def __init__(
+        self,
+        channels: int,
+        sample_width: int = 2,
+        sample_rate: int = 44100,
+        silence_threshold_db: float = DEFAULT_SILENCE_THRESHOLD_DB,
+        block_frames: int = 4096
+    ):
+        """
+        Initialise le mesureur.
+
+        Args:
+            channels: Nombre de canaux entrelacés
+            sample_width: Largeur d'échantillon en octets (2 ou 4)
+            sample_rate: Taux d'échantillonnage en Hz
+            silence_threshold_db: Niveau RMS (dBFS) sous lequel un bloc est silencieux
+            block_frames: Frames traitées par bloc (taille des buffers de travail
+                          et granularité de la détection de silence)
+
+        Raises:
+            ValueError: Si la largeur d'échantillon n'est pas supportée
+        """
+        if sample_width not in SAMPLE_DTYPES:
+            raise ValueError(f"Largeur d'échantillon non supportée pour la mesure: {sample_width}")
+
+        self.channels = channels
+        self.sample_width = sample_width
+        self.sample_rate = sample_rate
+        self.frame_size = channels * sample_width
+        self.silence_threshold_db = silence_threshold_db
+        self.block_frames = block_frames
+
+        self._dtype = SAMPLE_DTYPES[sample_width]
+        self._full_scale = float(2 ** (8 * sample_width - 1))
+        # Seuil de silence comparé à la somme des carrés d'un bloc complet
+        self._silence_squares = (10.0 ** (silence_threshold_db / 20.0) * self._full_scale) ** 2
+
+        # Buffers de travail
+        self._scratch = np.empty((block_frames, channels), dtype=np.float64)
+        self._clip_mask = np.empty((block_frames, channels), dtype=bool)
+        self._block_result = np.empty(channels, dtype=np.float64)
+        self._block_clipped = np.empty(channels, dtype=np.int64)
+        self._chunk_squares = np.empty(channels, dtype=np.float64)
+        self._chunk_peak = np.empty(channels, dtype=np.float64)
+
+        # Niveaux du dernier chunk (linéaires) et cumuls
+        self.rms = np.zeros(channels, dtype=np.float64)
+        self.peak = np.zeros(channels, dtype=np.float64)
+        self.max_peak = np.zeros(channels, dtype=np.float64)
+        self.clipped_samples = np.zeros(channels, dtype=np.int64)
+        self._total_squares = np.zeros(channels, dtype=np.float64)
+        self.frames = 0
+        self.silent_frames = 0
+        self.silence_run_frames = 0
+
+    def process(self, data):
+        """
+        Mesure un chunk de PCM entrelacé.
+
+        Args:
+            data: Données audio brutes (bytes, bytearray ou memoryview),
+                  alignées sur les frames
+        """
+        frame_count = len(data) // self.frame_size
+        if frame_count == 0:
+            return
+        frames = np.frombuffer(data, dtype=self._dtype, count=frame_count * self.channels)
+        frames = frames.reshape(frame_count, self.channels)
+
+        squares = self._chunk_squares
+        peak = self._chunk_peak
+        squares.fill(0.0)
+        peak.fill(0.0)
+        for start in range(0, frame_count, self.block_frames):
+            block = frames[start:start + self.block_frames]
+            scratch = self._scratch[:len(block)]
+            mask = self._clip_mask[:len(block)]
+
+            np.copyto(scratch, block)
+            np.abs(scratch, out=scratch)
+            np.max(scratch, axis=0, out=self._block_result)
+            np.maximum(peak, self._block_result, out=peak)
+            # Écrêtage : échantillons à pleine échelle (+max ou -max-1)
+            np.greater_equal(scratch, self._full_scale - 1.0, out=mask)
+            np.sum(mask, axis=0, out=self._block_clipped)
+            self.clipped_samples += self._block_clipped
+            np.multiply(scratch, scratch, out=scratch)
+            np.sum(scratch, axis=0, out=self._block_result)
+            squares += self._block_result
+
+            if self._block_result.max() < self._silence_squares * len(block):
+                self.silent_frames += len(block)
+                self.silence_run_frames += len(block)
+            else:
+                self.silence_run_frames = 0
+
+        self._total_squares += squares
+        np.divide(squares, frame_count * self._full_scale ** 2, out=self.rms)
+        np.sqrt(self.rms, out=self.rms)
+        np.divide(peak, self._full_scale, out=self.peak)
+        np.maximum(self.max_peak, self.peak, out=self.max_peak)
+
+        self.frames += frame_count
+
+    @property
+    def is_silent(self) -> bool:
+        """Indique si le dernier bloc mesuré était silencieux."""
+        return self.silence_run_frames > 0
+
+    def get_levels(self) -> Dict:
+        """
+        Retourne les niveaux mesurés.
+
+        Returns:
+            Dictionnaire contenant: rms_db, peak_db (dernier chunk, par canal),
+            max_peak_db, average_rms_db, clipped_samples (cumuls par canal),
+            duration, silent_seconds (silence en cours), silence_ratio, silent
+        """
+        frames = self.frames
+        average = np.sqrt(self._total_squares / max(frames, 1)) / self._full_scale
+        return {
+            'rms_db': [to_db(level) for level in self.rms],
+            'peak_db': [to_db(level) for level in self.peak],
+            'max_peak_db': [to_db(level) for level in self.max_peak],
+            'average_rms_db': [to_db(level) for level in average],
+            'clipped_samples': [int(count) for count in self.clipped_samples],
+            'duration': frames / self.sample_rate,
+            'silent_seconds': self.silence_run_frames / self.sample_rate,
+            'silence_ratio': self.silent_frames / frames if frames else 0.0,
+            'silent': self.is_silent,
+        }
+
+
+def format_meter(levels: Dict, width: int = 20) -> str:
+    """
+    Met en forme une ligne de vumètre pour la console.
+
+    Args:
+        levels: Niveaux retournés par LevelMeter.get_levels()
+        width: Largeur de la barre de chaque canal en caractères
+
+    Returns:
+        Ligne du type "1 [######----] -12.0 dB  2 [#####-----] -14.5 dB"
+    """
+    parts: List[str] = []
+    for index, (rms_db, peak_db) in enumerate(zip(levels['rms_db'], levels['peak_db'])):
+        # Barre sur une échelle de -60 à 0 dBFS
+        filled = int(round(width * min(1.0, max(0.0, (rms_db + 60.0) / 60.0))))
+        bar = "#" * filled + "-" * (width - filled)
+        parts.append(f"{index + 1} [{bar}] {rms_db:6.1f} dB (crête {peak_db:6.1f})")
+    line = "  ".join(parts)
+    if any(levels['clipped_samples']):
+        line += "  ⚠ écrêtage"
+    if levels['silent_seconds'] >= 1.0:
+        line += f"  silence {levels['silent_seconds']:.0f} s"
+    return line
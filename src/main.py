@@ -5,9 +5,10 @@ import signal
 import threading
 import argparse
 from pathlib import Path
+from typing import Callable, Optional
 
-from src.audio_recorder import AudioRecorder
-from src.audio_devices import print_available_devices
+# Les modules audio (PyAudio, pydub) sont importés dans main() au moment où
+# ils sont nécessaires : --help ne charge ainsi aucune bibliothèque native.
 
 
 def signal_handler(signum, frame):
@@ -16,12 +17,13 @@ def signal_handler(signum, frame):
     sys.exit(0)
 
 
-def wait_for_exit_command(stop_event: threading.Event):
+def wait_for_exit_command(stop_event: threading.Event, on_save: Optional[Callable[[], None]] = None):
     """
     Attend que l'utilisateur tape 'exit' pour arrêter l'enregistrement.
 
     Args:
         stop_event: Event utilisé pour signaler l'arrêt
+        on_save: Appelée quand l'utilisateur tape 'save' (optionnel, mode relecture)
     """
     while not stop_event.is_set():
         try:
@@ -29,6 +31,8 @@ def wait_for_exit_command(stop_event: threading.Event):
             if user_input == "exit":
                 stop_event.set()
                 break
+            if user_input == "save" and on_save is not None:
+                on_save()
         except EOFError:
             # Fin du flux d'entrée (peut arriver dans certains environnements)
             break
@@ -38,18 +42,245 @@ def wait_for_exit_command(stop_event: threading.Event):
             break
 
 
+def transcribe_recordings(output_dir: Path, args) -> int:
+    """
+    Transcrit les enregistrements du répertoire qui ne l'ont pas encore été.
+
+    Args:
+        output_dir: Répertoire des enregistrements
+        args: Arguments CLI (langue, concurrence, débit, service HTTP)
+
+    Returns:
+        Code de sortie (0 si tous les enregistrements ont été transcrits)
+    """
+    from src.batch_transcription import GoogleAsyncRecognizer, HTTPRecognizer, transcribe_archive
+
+    if args.stt_url:
+        recognizer = HTTPRecognizer(args.stt_url)
+    else:
+        recognizer = GoogleAsyncRecognizer(language_code=args.language)
+
+    def report(path: Path, error):
+        if error is None:
+            print(f"✓ {path.name}")
+        else:
+            print(f"✗ {path.name}: {error}", file=sys.stderr)
+
+    stats = transcribe_archive(
+        output_dir, recognizer,
+        concurrency=args.transcribe_jobs,
+        rate=args.transcribe_rate,
+        on_progress=report
+    )
+    print(f"{stats['transcribed']} enregistrement(s) transcrit(s), "
+          f"{stats['skipped']} déjà fait(s), {stats['failed']} échec(s) sur {stats['total']}")
+    return 1 if stats['failed'] else 0
+
+
+def print_transcription_result(result):
+    """
+    Affiche un résultat de transcription en direct.
+
+    Les résultats provisoires sont réécrits sur la même ligne ; un résultat
+    définitif la remplace et passe à la ligne suivante.
+
+    Args:
+        result: TranscriptionResult reçu du service de reconnaissance
+    """
+    if result.is_final:
+        print(f"\r[{result.end_time:7.1f} s] {result.text.strip()}\033[K")
+    else:
+        print(f"\r… {result.text.strip()}\033[K", end="", flush=True)
+
+
+def create_transcriber(args):
+    """
+    Crée le transcripteur en direct demandé par --transcribe.
+
+    Args:
+        args: Arguments CLI
+
+    Returns:
+        StreamingTranscriber, ou None si la transcription n'est pas demandée
+    """
+    if not args.transcribe:
+        return None
+    from src.transcription import GoogleSpeechBackend, StreamingTranscriber
+    return StreamingTranscriber(
+        GoogleSpeechBackend(language_code=args.language),
+        on_result=print_transcription_result
+    )
+
+
+def recorder_options(args, output_dir: Path) -> dict:
+    """
+    Traduit les arguments CLI en options de AudioRecorder.
+
+    Args:
+        args: Arguments CLI
+        output_dir: Répertoire de sortie
+
+    Returns:
+        Arguments nommés de AudioRecorder (sans pool d'encodage ni transcripteur)
+    """
+    return dict(
+        output_dir=str(output_dir),
+        sample_rate=args.sample_rate,
+        bitrate=args.bitrate,
+        output_format=args.format,
+        device_indexes=args.device,
+        mix_mode=args.mix_mode,
+        streaming=not args.buffered,
+        parallel_encode=args.parallel_encode,
+        buffer_backend=args.buffer_backend,
+        capture_mode=args.capture_mode,
+        count_xruns=args.count_xruns,
+        capture_backend=args.backend,
+        pulse_source=args.pulse_source,
+        fragment_seconds=args.fragment_ms / 1000,
+        segment_duration=args.segment_minutes * 60 if args.segment_minutes else None,
+        segment_max_bytes=int(args.segment_size * 1024 * 1024) if args.segment_size else None,
+        spool=args.spool,
+        spool_sync_interval=args.spool_sync,
+        silence_threshold_db=args.silence_threshold,
+        gate_threshold_db=args.gate,
+        gate_hangover=args.gate_hangover,
+        gate_preroll=args.gate_preroll,
+        replay_seconds=args.replay_minutes * 60 if args.replay_minutes else None,
+    )
+
+
+def start_device_monitor(args):
+    """
+    Démarre le suivi des périphériques PulseAudio demandé par --follow-devices.
+
+    Args:
+        args: Arguments CLI
+
+    Returns:
+        PulseDeviceMonitor démarré, ou None si le suivi n'est pas demandé
+    """
+    if not args.follow_devices:
+        return None
+    from src.pulse_monitor import PulseDeviceMonitor
+    monitor = PulseDeviceMonitor()
+    monitor.start()
+    return monitor
+
+
+def run_daemon(args, output_dir: Path) -> int:
+    """
+    Lance le démon d'enregistrement piloté par socket (voir src.recorderctl).
+
+    Chaque commande start crée un enregistreur avec les options de la ligne
+    de commande ; PortAudio reste initialisé entre les enregistrements.
+
+    Args:
+        args: Arguments CLI
+        output_dir: Répertoire de sortie
+
+    Returns:
+        Code de sortie
+    """
+    from src.audio_recorder import AudioRecorder
+    from src.recorder_daemon import RecorderDaemon
+
+    encode_pool = None
+    if args.encode_workers:
+        from src.encode_pool import EncodePool
+        encode_pool = EncodePool(max_workers=args.encode_workers)
+    options = recorder_options(args, output_dir)
+
+    device_monitor = None
+    try:
+        # Une seule connexion PulseAudio suivie pendant toute la vie du démon
+        device_monitor = start_device_monitor(args)
+        daemon = RecorderDaemon(
+            lambda device_index: AudioRecorder(
+                **options,
+                device_index=device_index,
+                encode_pool=encode_pool,
+                transcriber=create_transcriber(args),
+                device_monitor=device_monitor
+            ),
+            socket_path=args.socket
+        )
+        daemon.start()
+    except RuntimeError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        if device_monitor:
+            device_monitor.stop()
+        if encode_pool:
+            encode_pool.shutdown()
+        return 1
+    print(f"Démon d'enregistrement prêt sur {daemon.socket_path}")
+    print("Commandes: python -m src.recorderctl start|stop|status|rotate|save|refresh|shutdown")
+    try:
+        daemon.serve_forever()
+    finally:
+        if device_monitor:
+            device_monitor.stop()
+        if encode_pool:
+            encode_pool.shutdown()
+    print("Démon arrêté")
+    return 0
+
+
+def recover_recordings(output_dir: Path) -> int:
+    """
+    Encode les enregistrements interrompus à partir de leurs spools.
+
+    Args:
+        output_dir: Répertoire des enregistrements
+
+    Returns:
+        Code de sortie (0 si tous les spools ont été récupérés)
+    """
+    from src.pcm_spool import find_spools, recover_spool
+
+    spools = find_spools(output_dir)
+    if not spools:
+        print(f"Aucun enregistrement interrompu dans {output_dir}")
+        return 0
+
+    failures = 0
+    for spool_path in spools:
+        try:
+            output_file = recover_spool(spool_path)
+        except (ValueError, RuntimeError, OSError) as e:
+            failures += 1
+            print(f"✗ {spool_path.name}: {e}", file=sys.stderr)
+            continue
+        if output_file is None:
+            print(f"✓ {spool_path.name}: vide, supprimé")
+        else:
+            print(f"✓ Récupéré: {output_file}")
+    return 1 if failures else 0
+
+
 def main():
     """Fonction principale pour démarrer l'enregistreur audio."""
     # Parser les arguments CLI
     parser = argparse.ArgumentParser(
-        description="Enregistreur audio en continu avec encodage MP3",
+        description="Enregistreur audio en continu (MP3, Opus, FLAC ou WAV)",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Exemples d'utilisation:
   %(prog)s                        # Enregistrer avec détection automatique
   %(prog)s --list-devices         # Lister les périphériques disponibles
   %(prog)s --device 5             # Enregistrer avec le périphérique #5
+  %(prog)s --device 5 --device 2  # Mixer deux périphériques (ex: loopback + micro)
   %(prog)s --output ~/recordings  # Enregistrer dans ~/recordings
+  %(prog)s --segment-minutes 60   # Un fichier par heure (capture 24/7)
+  %(prog)s --format flac          # Archivage sans perte
+  %(prog)s --spool                # Journal PCM récupérable après un arrêt brutal
+  %(prog)s --recover              # Encoder les enregistrements interrompus
+  %(prog)s --meter                # Vumètre en direct
+  %(prog)s --gate -45             # Ignorer les silences, un fichier par passage actif
+  %(prog)s --replay-minutes 5     # Veille : 'save' enregistre les 5 dernières minutes
+  %(prog)s --transcribe           # Transcription en direct (Google Speech-to-Text)
+  %(prog)s --transcribe-archive   # Transcrire les enregistrements existants
+  %(prog)s --daemon               # Démon piloté par python -m src.recorderctl
         """
     )
     parser.add_argument(
@@ -61,7 +292,16 @@ Exemples d'utilisation:
         '--device',
         type=int,
         metavar='INDEX',
-        help="Spécifier l'index du périphérique audio à utiliser (voir --list-devices)"
+        action='append',
+        help="Spécifier l'index du périphérique audio à utiliser (voir --list-devices). "
+             "Répéter l'option pour capturer plusieurs périphériques simultanément"
+    )
+    parser.add_argument(
+        '--mix-mode',
+        choices=['mix', 'interleave'],
+        default='mix',
+        help="Combinaison de plusieurs périphériques: somme des sources ou canaux "
+             "juxtaposés (défaut: mix)"
     )
     parser.add_argument(
         '--output',
@@ -70,12 +310,221 @@ Exemples d'utilisation:
         default=str(Path.home() / "audio" / "enregistrements"),
         help="Répertoire de sortie pour les fichiers audio (défaut: ~/audio/enregistrements)"
     )
+    parser.add_argument(
+        '--format',
+        choices=['mp3', 'opus', 'flac', 'wav'],
+        default='mp3',
+        help="Format des fichiers: mp3, opus (bas débit), flac (sans perte) ou "
+             "wav (PCM brut, aucun coût d'encodage) (défaut: mp3)"
+    )
+    parser.add_argument(
+        '--sample-rate',
+        type=int,
+        metavar='HZ',
+        help="Taux d'échantillonnage des fichiers (défaut: taux natif du périphérique). "
+             "La capture reste au taux natif, la conversion est faite par le programme"
+    )
     parser.add_argument(
         '--bitrate',
         type=str,
         metavar='RATE',
-        default='128k',
-        help="Bitrate MP3 (défaut: 128k)"
+        help="Bitrate des formats avec perte (défaut: 128k en MP3, 32k en Opus)"
+    )
+    parser.add_argument(
+        '--buffered',
+        action='store_true',
+        help="Conserver l'audio en mémoire et l'encoder seulement à l'arrêt, en MP3 "
+             "(par défaut l'encodage se fait en continu pendant la capture)"
+    )
+    parser.add_argument(
+        '--parallel-encode',
+        type=int,
+        metavar='N',
+        help="Avec --buffered, encoder le MP3 à l'arrêt par morceaux dans N processus "
+             "FFmpeg en parallèle"
+    )
+    parser.add_argument(
+        '--buffer-backend',
+        choices=['memory', 'mmap'],
+        default='memory',
+        help="Avec --buffered ou --replay-minutes, conserver le PCM en mémoire ou dans un "
+             "fichier temporaire du répertoire de sortie (mmap : mémoire résidente bornée) "
+             "(défaut: memory)"
+    )
+    parser.add_argument(
+        '--capture-mode',
+        choices=['blocking', 'callback'],
+        default='blocking',
+        help="Moteur de capture PyAudio: boucle de lecture bloquante ou callback PortAudio "
+             "(défaut: blocking)"
+    )
+    parser.add_argument(
+        '--count-xruns',
+        action='store_true',
+        help="En mode blocking, compter les débordements d'entrée PortAudio (le chunk "
+             "débordé est alors perdu en entier ; le mode callback les compte toujours)"
+    )
+    parser.add_argument(
+        '--backend',
+        choices=['pyaudio', 'pulse'],
+        default='pyaudio',
+        help="Moteur de capture: PyAudio/PortAudio, ou pulse pour ouvrir directement une "
+             "source PulseAudio/PipeWire par son nom avec parec (défaut: pyaudio)"
+    )
+    parser.add_argument(
+        '--pulse-source',
+        type=str,
+        metavar='NOM',
+        help="Avec --backend pulse, source à capturer (défaut: Monitor de la sortie par défaut, "
+             "voir pactl list short sources)"
+    )
+    parser.add_argument(
+        '--fragment-ms',
+        type=int,
+        metavar='MS',
+        default=200,
+        help="Avec --backend pulse, durée d'audio remise à chaque réveil de la capture "
+             "(défaut: 200)"
+    )
+    parser.add_argument(
+        '--follow-devices',
+        action='store_true',
+        help="Avec --backend pulse, suivre les événements PulseAudio : si la source "
+             "disparaît (casque débranché) ou si la sortie par défaut change, la capture "
+             "passe au nouveau Monitor sans changer de fichier"
+    )
+    parser.add_argument(
+        '--segment-minutes',
+        type=float,
+        metavar='N',
+        help="Découper l'enregistrement en fichiers de N minutes, sans perte entre les segments"
+    )
+    parser.add_argument(
+        '--segment-size',
+        type=float,
+        metavar='MB',
+        help="Découper l'enregistrement en fichiers d'environ MB mégaoctets"
+    )
+    parser.add_argument(
+        '--replay-minutes',
+        type=float,
+        metavar='N',
+        help="Capturer en veille sans encoder en gardant les N dernières minutes ; "
+             "'save' (ou recorderctl save) les enregistre, suivies de l'audio jusqu'à l'arrêt"
+    )
+
+    parser.add_argument(
+        '--spool',
+        action='store_true',
+        help="Copier aussi le PCM capturé dans un fichier .spool sur le disque, "
+             "récupérable avec --recover après un arrêt brutal"
+    )
+    parser.add_argument(
+        '--spool-sync',
+        type=float,
+        metavar='SECONDS',
+        default=1.0,
+        help="Intervalle maximal entre deux synchronisations du spool sur le disque "
+             "(défaut: 1.0)"
+    )
+    parser.add_argument(
+        '--encode-workers',
+        type=int,
+        metavar='N',
+        help="Encoder les fichiers terminés en arrière-plan dans N processus "
+             "(le PCM est écrit dans un spool pendant la capture)"
+    )
+    parser.add_argument(
+        '--meter',
+        action='store_true',
+        help="Afficher en continu le niveau de chaque canal (RMS, crête, écrêtage, silence)"
+    )
+    parser.add_argument(
+        '--silence-threshold',
+        type=float,
+        metavar='DB',
+        default=-60.0,
+        help="Niveau RMS en dBFS sous lequel l'audio est considéré comme silencieux "
+             "(défaut: -60)"
+    )
+    parser.add_argument(
+        '--gate',
+        type=float,
+        metavar='DB',
+        help="N'enregistrer que les passages actifs (niveau RMS au-dessus de DB dBFS, ex: -45) : "
+             "les silences ne sont pas encodés et chaque passage produit son propre fichier"
+    )
+    parser.add_argument(
+        '--gate-hangover',
+        type=float,
+        metavar='SECONDS',
+        default=1.5,
+        help="Avec --gate, durée de silence avant de clore un passage (défaut: 1.5)"
+    )
+    parser.add_argument(
+        '--gate-preroll',
+        type=float,
+        metavar='SECONDS',
+        default=0.3,
+        help="Avec --gate, audio conservé avant le début d'un passage (défaut: 0.3)"
+    )
+    parser.add_argument(
+        '--transcribe',
+        action='store_true',
+        help="Transcrire l'audio pendant l'enregistrement (Google Cloud Speech-to-Text, "
+             "résultats provisoires en direct)"
+    )
+    parser.add_argument(
+        '--language',
+        type=str,
+        metavar='CODE',
+        default='fr-FR',
+        help="Langue de l'audio pour --transcribe et --transcribe-archive (défaut: fr-FR)"
+    )
+    parser.add_argument(
+        '--transcribe-archive',
+        action='store_true',
+        help="Transcrire les enregistrements du répertoire de sortie qui ne l'ont pas "
+             "encore été (fichier .txt à côté de chaque enregistrement) et quitter"
+    )
+    parser.add_argument(
+        '--transcribe-jobs',
+        type=int,
+        metavar='N',
+        default=4,
+        help="Avec --transcribe-archive, nombre de requêtes simultanées (défaut: 4)"
+    )
+    parser.add_argument(
+        '--transcribe-rate',
+        type=float,
+        metavar='R',
+        help="Avec --transcribe-archive, nombre maximal de requêtes par seconde"
+    )
+    parser.add_argument(
+        '--stt-url',
+        type=str,
+        metavar='URL',
+        help="Avec --transcribe-archive, service de transcription HTTP à utiliser "
+             "à la place de Google Cloud Speech-to-Text"
+    )
+    parser.add_argument(
+        '--recover',
+        action='store_true',
+        help="Encoder les enregistrements interrompus (fichiers .spool du répertoire "
+             "de sortie) et quitter"
+    )
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help="Rester en attente de commandes (start, stop, status, rotate, save, shutdown) sur un "
+             "socket Unix, envoyées avec python -m src.recorderctl ; PortAudio reste "
+             "initialisé entre les enregistrements"
+    )
+    parser.add_argument(
+        '--socket',
+        type=Path,
+        metavar='PATH',
+        help="Avec --daemon, socket de contrôle (défaut: $XDG_RUNTIME_DIR/audio-recorder.sock)"
     )
 
     args = parser.parse_args()
@@ -86,42 +535,108 @@ Exemples d'utilisation:
         print("PÉRIPHÉRIQUES AUDIO DISPONIBLES")
         print("=" * 80)
         print()
+        from src.audio_devices import print_available_devices
         print_available_devices()
         return 0
 
+    # Si --recover, encoder les spools laissés par des arrêts brutaux et quitter
+    if args.recover:
+        return recover_recordings(Path(args.output).expanduser())
+
+    # Si --transcribe-archive, transcrire les enregistrements existants et quitter
+    if args.transcribe_archive:
+        return transcribe_recordings(Path(args.output).expanduser(), args)
+
     # Configurer les gestionnaires de signaux
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
 
+    # Si --daemon, attendre les commandes du socket de contrôle
+    if args.daemon:
+        return run_daemon(args, Path(args.output).expanduser())
+
     print("=" * 60)
     print("ENREGISTREUR AUDIO EN CONTINU")
     print("=" * 60)
     print()
 
     # Créer l'enregistreur audio
+    from src.audio_recorder import AudioRecorder
+    try:
+        device_monitor = start_device_monitor(args)
+    except RuntimeError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return 1
+    encode_pool = None
+    if args.encode_workers:
+        from src.encode_pool import EncodePool
+        encode_pool = EncodePool(max_workers=args.encode_workers)
+    transcriber = create_transcriber(args)
     output_dir = Path(args.output).expanduser()
     recorder = AudioRecorder(
-        output_dir=str(output_dir),
-        bitrate=args.bitrate,
-        device_index=args.device
+        **recorder_options(args, output_dir),
+        encode_pool=encode_pool,
+        transcriber=transcriber,
+        device_monitor=device_monitor
     )
 
     print(f"Répertoire de sortie: {output_dir}")
-    print(f"Format d'encodage: MP3 ({args.bitrate})")
-    if args.device is not None:
-        print(f"Source audio: Périphérique spécifié (index {args.device})")
+    if recorder.bitrate:
+        print(f"Format d'encodage: {args.format.upper()} ({recorder.bitrate})")
+    else:
+        print(f"Format d'encodage: {args.format.upper()}")
+    if args.device and len(args.device) > 1:
+        indexes = ", ".join(str(index) for index in args.device)
+        print(f"Sources audio: {len(args.device)} périphériques ({args.mix_mode}, index {indexes})")
+    elif args.backend == "pulse":
+        print(f"Source audio: PulseAudio direct ({args.pulse_source or 'Monitor par défaut'}, "
+              f"fragments de {args.fragment_ms} ms)")
+    elif args.device:
+        print(f"Source audio: Périphérique spécifié (index {args.device[0]})")
     else:
         print(f"Source audio: Détection automatique (loopback)")
+    if args.segment_minutes:
+        print(f"Segmentation: un fichier toutes les {args.segment_minutes:g} minutes")
+    if args.segment_size:
+        print(f"Segmentation: un fichier tous les {args.segment_size:g} Mo")
+    if args.spool:
+        print(f"Spool PCM: activé (synchronisation toutes les {args.spool_sync:g} s)")
+    if args.buffered and args.parallel_encode:
+        print(f"Encodage à l'arrêt: {args.parallel_encode} morceaux en parallèle")
+    if args.replay_minutes:
+        print(f"Relecture: {args.replay_minutes:g} dernières minutes gardées en mémoire "
+              f"({args.buffer_backend})")
+    if args.gate is not None:
+        print(f"Détection d'activité: seuil {args.gate:g} dBFS, un fichier par passage")
+    if transcriber:
+        print(f"Transcription: en direct ({args.language})")
+    if encode_pool:
+        print(f"Encodage: en arrière-plan ({args.encode_workers} processus)")
+
+    from src.pcm_spool import find_spools
+    interrupted = find_spools(output_dir)
+    if interrupted:
+        print(f"⚠ {len(interrupted)} enregistrement(s) interrompu(s) trouvé(s): "
+              f"utilisez --recover pour les encoder")
     print()
 
     try:
         # Démarrer l'enregistrement
         output_file = recorder.start_recording()
-        print(f"✓ Enregistrement démarré")
-        print(f"✓ Fichier: {output_file.name}")
+        if output_file is None:
+            print(f"✓ Relecture en veille (aucun fichier avant 'save')")
+        else:
+            print(f"✓ Enregistrement démarré")
+            print(f"✓ Fichier: {output_file.name}")
         if recorder.device_name:
             print(f"✓ Périphérique: {recorder.device_name}")
+        capture_format = f"{recorder.capture_rate} Hz, {recorder.capture_channels} canal(aux)"
+        if recorder.resampler:
+            capture_format += f" → converti en {recorder.sample_rate} Hz"
+        print(f"✓ Format de capture: {capture_format}")
         print()
+        if output_file is None:
+            print("Tapez 'save' pour enregistrer les dernières minutes et la suite")
         print("Tapez 'exit' pour arrêter l'enregistrement, ou appuyez sur Ctrl+C")
         print("-" * 60)
         print()
@@ -129,23 +644,81 @@ Exemples d'utilisation:
         # Créer un Event pour signaler l'arrêt
         stop_event = threading.Event()
 
+        def save_replay():
+            try:
+                print(f"✓ Relecture enregistrée dans: {recorder.save_replay()}")
+            except RuntimeError as e:
+                print(f"✗ {e}")
+
         # Démarrer le thread d'écoute de la commande exit
         exit_thread = threading.Thread(
             target=wait_for_exit_command,
-            args=(stop_event,),
+            args=(stop_event, save_replay if output_file is None else None),
             daemon=True
         )
         exit_thread.start()
 
         # Attendre que l'utilisateur demande l'arrêt
-        stop_event.wait()
+        if args.meter:
+            from src.level_meter import format_meter
+            while not stop_event.wait(0.2):
+                levels = recorder.get_levels()
+                if levels:
+                    print(f"\r{format_meter(levels)}\033[K", end="", flush=True)
+            print()
+        else:
+            stop_event.wait()
 
         # Arrêter l'enregistrement
         print()
-        print("Arrêt de l'enregistrement et encodage MP3 en cours...")
-        recorder.stop_recording()
-        print("✓ Enregistrement terminé et encodé en MP3")
-        print(f"✓ Fichier disponible: {output_file}")
+        print("Arrêt de l'enregistrement et finalisation du fichier en cours...")
+        encode_batch = recorder.stop_recording()
+        if encode_batch is not None:
+            print(f"✓ Capture terminée, encodage de {len(encode_batch)} fichier(s) en arrière-plan...")
+            encode_batch.result()
+        if output_file is None and not recorder.segment_files:
+            print("✓ Relecture arrêtée sans enregistrement")
+        else:
+            print(f"✓ Enregistrement terminé et encodé en {args.format.upper()}")
+        capture_stats = recorder.get_capture_stats()
+        if capture_stats['dropped_frames']:
+            print(f"⚠ {capture_stats['dropped_frames']} frames perdues (encodeur trop lent)")
+        if capture_stats['xruns']:
+            print(f"⚠ {capture_stats['xruns']} débordement(s) d'entrée PortAudio")
+        if capture_stats['stall_gap']:
+            print(f"⚠ {capture_stats['stall_gap']:.1f} s de silence ajoutées aux sources "
+                  f"qui ne livraient plus de données")
+        for reroute in recorder.reroutes:
+            print(f"⚠ Source changée à {reroute['position']:.1f} s vers {reroute['source']} "
+                  f"({reroute['silence']:.2f} s de silence inséré)")
+        levels = recorder.get_levels()
+        if levels and levels['duration'] > 0:
+            if levels['silence_ratio'] >= 1.0:
+                print(f"⚠ Aucun son capturé (niveau sous {args.silence_threshold:g} dBFS): "
+                      f"vérifiez le périphérique source")
+            elif levels['silence_ratio'] > 0:
+                print(f"✓ Silence: {levels['silence_ratio']:.0%} de l'enregistrement")
+            if any(levels['clipped_samples']):
+                print(f"⚠ Écrêtage: {sum(levels['clipped_samples'])} échantillon(s) à pleine échelle")
+        gate_stats = recorder.get_gate_stats()
+        if gate_stats:
+            print(f"✓ {gate_stats['regions']} passage(s) actif(s) enregistré(s), "
+                  f"{gate_stats['silence_ratio']:.0%} de silence ignoré")
+            for path in recorder.segment_files:
+                print(f"  {path}")
+        else:
+            for path in recorder.segment_files:
+                print(f"✓ Fichier disponible: {path}")
+        if transcriber:
+            print("Attente des derniers résultats de transcription...")
+            try:
+                transcript = transcriber.wait(timeout=30.0)
+            except (TimeoutError, RuntimeError) as e:
+                print(f"⚠ Transcription incomplète: {e}")
+                transcript = transcriber.transcript
+            print("✓ Transcription:" if transcript else "⚠ Aucune parole transcrite")
+            if transcript:
+                print(transcript)
 
     except PermissionError as e:
         print(f"✗ Erreur de permissions: {e}", file=sys.stderr)
@@ -163,6 +736,10 @@ Exemples d'utilisation:
         sys.exit(1)
 
     finally:
+        if device_monitor:
+            device_monitor.stop()
+        if encode_pool:
+            encode_pool.shutdown()
         print()
         print("=" * 60)
         print("Programme terminé")
@@ -170,4 +747,4 @@ Exemples d'utilisation:
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -2,12 +2,26 @@
 
 import io
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Union
 from pydub import AudioSegment
 
+from src.audio_encoder import FFMPEG_MISSING_MESSAGE
+from src.ffmpeg_encoder import FFmpegEncoder
+from src.ffmpeg_pipe import FFmpegPipe
+from src.parallel_mp3 import encode_mp3_parallel
+from src.pcm_buffer import BUFFER_BACKENDS, MappedPCMBuffer
 
-class MP3Encoder:
-    """Classe pour gérer l'encodage audio en temps réel vers le format MP3."""
+
+class MP3Encoder(FFmpegEncoder):
+    """
+    Classe pour gérer l'encodage audio en temps réel vers le format MP3.
+
+    En mode streaming, l'encodage passe par le processus FFmpeg persistant de
+    FFmpegEncoder ; sinon le PCM est accumulé puis encodé à close().
+    """
+
+    extension = "mp3"
+    codec_name = "MP3"
 
     def __init__(
         self,
@@ -15,7 +29,11 @@ class MP3Encoder:
         sample_rate: int = 44100,
         channels: int = 2,
         sample_width: int = 2,
-        bitrate: str = "128k"
+        bitrate: str = "128k",
+        streaming: bool = False,
+        encode_jobs: Optional[int] = None,
+        buffer_backend: str = "memory",
+        converter: Optional[str] = None
     ):
         """
         Initialise l'encodeur MP3.
@@ -26,30 +44,58 @@ class MP3Encoder:
             channels: Nombre de canaux audio (1=mono, 2=stéréo)
             sample_width: Largeur d'échantillon en octets (2 pour 16-bit)
             bitrate: Bitrate MP3 (par défaut "128k")
+            streaming: Encoder au fil de l'eau via un processus FFmpeg persistant
+                      au lieu d'accumuler tout le PCM en mémoire jusqu'à close()
+            encode_jobs: En mode bufferisé, nombre de processus FFmpeg encodant
+                         le PCM par morceaux en parallèle à close() (optionnel,
+                         voir encode_mp3_parallel)
+            buffer_backend: En mode bufferisé, emplacement du PCM accumulé :
+                            "memory" (BytesIO) ou "mmap" (fichier temporaire
+                            dans le répertoire de sortie, remis à FFmpeg sans
+                            copie ; voir MappedPCMBuffer)
+            converter: Exécutable FFmpeg à utiliser (par défaut celui de pydub)
+
+        Raises:
+            ValueError: Si le backend de buffer est inconnu
         """
-        self.output_file = output_file
-        self.sample_rate = sample_rate
-        self.channels = channels
-        self.sample_width = sample_width
+        if buffer_backend not in BUFFER_BACKENDS:
+            raise ValueError(
+                f"Backend de buffer inconnu: {buffer_backend} "
+                f"(valeurs possibles: {', '.join(BUFFER_BACKENDS)})"
+            )
+        super().__init__(output_file, sample_rate, channels, sample_width, converter)
         self.bitrate = bitrate
-
-        # Buffer pour accumuler les frames audio
-        self.audio_buffer = io.BytesIO()
-        self._is_closed = False
+        self.streaming = streaming
+        self.encode_jobs = encode_jobs
+        self.buffer_backend = buffer_backend
+
+        # Buffer pour accumuler les frames audio (mode bufferisé uniquement)
+        self.audio_buffer: Optional[Union[io.BytesIO, MappedPCMBuffer]] = None
+        if not streaming:
+            if buffer_backend == "mmap":
+                self.audio_buffer = MappedPCMBuffer(self.output_file.parent)
+            else:
+                self.audio_buffer = io.BytesIO()
+
+    def codec_args(self) -> List[str]:
+        """Arguments FFmpeg du codec MP3."""
+        return ['-codec:a', 'libmp3lame', '-b:a', self.bitrate, '-f', 'mp3']
 
     def write_frames(self, frames: bytes):
         """
-        Écrit des frames audio dans le buffer.
+        Transmet des frames audio à FFmpeg (streaming) ou les ajoute au buffer.
 
         Args:
             frames: Données audio brutes à encoder
 
         Raises:
-            RuntimeError: Si l'encodeur a déjà été fermé
+            RuntimeError: Si l'encodeur a déjà été fermé ou si FFmpeg échoue
         """
+        if self.streaming:
+            super().write_frames(frames)
+            return
         if self._is_closed:
             raise RuntimeError("L'encodeur MP3 a déjà été fermé")
-
         self.audio_buffer.write(frames)
 
     def close(self):
@@ -62,6 +108,18 @@ class MP3Encoder:
         if self._is_closed:
             return
 
+        if self.streaming:
+            super().close()
+            return
+
+        if self.encode_jobs and self.encode_jobs > 1:
+            self._close_parallel()
+            return
+
+        if isinstance(self.audio_buffer, MappedPCMBuffer):
+            self._close_mapped()
+            return
+
         try:
             # Récupérer toutes les données audio du buffer
             audio_data = self.audio_buffer.getvalue()
@@ -87,24 +145,49 @@ class MP3Encoder:
             )
 
         except FileNotFoundError as e:
-            raise RuntimeError(
-                "FFmpeg n'est pas installé ou n'est pas dans le PATH. "
-                "Installez FFmpeg pour encoder en MP3:\n"
-                "  - Ubuntu/Debian: sudo apt-get install ffmpeg\n"
-                "  - macOS: brew install ffmpeg\n"
-                "  - Fedora: sudo dnf install ffmpeg"
-            ) from e
+            raise RuntimeError(FFMPEG_MISSING_MESSAGE) from e
         except Exception as e:
             raise RuntimeError(f"Erreur lors de l'encodage MP3: {e}") from e
         finally:
             self._is_closed = True
             self.audio_buffer.close()
 
-    def __enter__(self):
-        """Support du context manager."""
-        return self
+    def _close_parallel(self):
+        """Encode le PCM bufferisé par morceaux dans plusieurs processus FFmpeg."""
+        try:
+            # Vue sur le buffer : le PCM n'est pas copié
+            with self.audio_buffer.getbuffer() as audio_data:
+                encode_mp3_parallel(
+                    audio_data,
+                    self.output_file,
+                    sample_rate=self.sample_rate,
+                    channels=self.channels,
+                    sample_width=self.sample_width,
+                    bitrate=self.bitrate,
+                    jobs=self.encode_jobs,
+                    converter=self.converter
+                )
+        except FileNotFoundError as e:
+            raise RuntimeError(FFMPEG_MISSING_MESSAGE) from e
+        except Exception as e:
+            raise RuntimeError(f"Erreur lors de l'encodage MP3: {e}") from e
+        finally:
+            self._is_closed = True
+            self.audio_buffer.close()
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        """Ferme automatiquement l'encodeur lors de la sortie du context."""
-        self.close()
-        return False
+    def _close_mapped(self):
+        """Encode le PCM du fichier temporaire, lu directement par FFmpeg."""
+        try:
+            if self.audio_buffer.tell() == 0:
+                # Pas de données à encoder
+                return
+            pipe = FFmpegPipe(self._ffmpeg_command())
+            pipe.start(stdin=self.audio_buffer.as_file())
+            pipe.close()
+        except FileNotFoundError as e:
+            raise RuntimeError(FFMPEG_MISSING_MESSAGE) from e
+        except Exception as e:
+            raise RuntimeError(f"Erreur lors de l'encodage MP3: {e}") from e
+        finally:
+            self._is_closed = True
+            self.audio_buffer.close()
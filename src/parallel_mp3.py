@@ -0,0 +1,412 @@
+"""Module pour l'encodage MP3 parallèle par morceaux des longs enregistrements."""
+
+import os
+import struct
+import tempfile
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from src.ffmpeg_pipe import FFmpegPipe, build_ffmpeg_command
+
+# Délai introduit par LAME en tête de flux (échantillons), identique pour tous les morceaux
+ENCODER_DELAY = 576
+
+# Trames MP3 encodées avant (préchauffage) et après (anticipation) chaque
+# morceau puis écartées : l'état du banc de filtres et du modèle
+# psychoacoustique est alors celui d'un encodage continu à la frontière
+PREROLL_FRAMES = 4
+POSTROLL_FRAMES = 2
+
+# Durée minimale d'un morceau : en deçà, le coût de lancement de FFmpeg domine
+MIN_CHUNK_SECONDS = 30.0
+
+# Taille des copies lors de l'assemblage du fichier final
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Tables MPEG audio Layer III (index 0 = débit libre, non supporté)
+MPEG1_BITRATES = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+MPEG2_BITRATES = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+SAMPLE_RATES = {
+    3: (44100, 48000, 32000),  # MPEG-1
+    2: (22050, 24000, 16000),  # MPEG-2
+    0: (11025, 12000, 8000),   # MPEG-2.5
+}
+
+# Tag Info/LAME : en-tête Xing (120 octets) suivi de l'extension LAME (36 octets)
+INFO_TAG_SIZE = 156
+INFO_FLAGS = 0x0F  # nombre de trames, taille, table des matières, qualité
+LAME_VERSION = b"LAME3.100"
+# Octets du tag couverts par son CRC (tout sauf le CRC lui-même)
+LAME_TAG_CRC_OFFSET = 154
+
+FrameHeader = namedtuple(
+    'FrameHeader',
+    'raw version bitrate_index sample_rate_index padding channel_mode '
+    'bitrate sample_rate frame_length samples_per_frame'
+)
+
+
+def parse_frame_header(data, offset: int = 0) -> FrameHeader:
+    """
+    Décode l'en-tête d'une trame MPEG audio Layer III.
+
+    Args:
+        data: Flux MP3 (bytes, bytearray ou memoryview)
+        offset: Position de la trame dans le flux
+
+    Returns:
+        En-tête décodé (frame_length inclut l'octet de remplissage éventuel)
+
+    Raises:
+        ValueError: Si aucune trame Layer III valide ne commence à cette position
+    """
+    raw = bytes(data[offset:offset + 4])
+    if len(raw) < 4 or raw[0] != 0xFF or raw[1] & 0xE0 != 0xE0:
+        raise ValueError(f"Synchronisation MP3 absente à l'octet {offset}")
+
+    version = (raw[1] >> 3) & 0x03
+    layer = (raw[1] >> 1) & 0x03
+    bitrate_index = raw[2] >> 4
+    sample_rate_index = (raw[2] >> 2) & 0x03
+    if version not in SAMPLE_RATES or layer != 1:
+        raise ValueError(f"Trame MPEG non Layer III à l'octet {offset}")
+    if bitrate_index in (0, 15) or sample_rate_index == 3:
+        raise ValueError(f"En-tête de trame MP3 invalide à l'octet {offset}")
+
+    padding = (raw[2] >> 1) & 0x01
+    sample_rate = SAMPLE_RATES[version][sample_rate_index]
+    if version == 3:
+        bitrate = MPEG1_BITRATES[bitrate_index]
+        frame_length = 144000 * bitrate // sample_rate + padding
+        samples_per_frame = 1152
+    else:
+        bitrate = MPEG2_BITRATES[bitrate_index]
+        frame_length = 72000 * bitrate // sample_rate + padding
+        samples_per_frame = 576
+
+    return FrameHeader(
+        raw=raw,
+        version=version,
+        bitrate_index=bitrate_index,
+        sample_rate_index=sample_rate_index,
+        padding=padding,
+        channel_mode=raw[3] >> 6,
+        bitrate=bitrate,
+        sample_rate=sample_rate,
+        frame_length=frame_length,
+        samples_per_frame=samples_per_frame
+    )
+
+
+def frame_offsets(data) -> List[int]:
+    """
+    Liste les positions des trames d'un flux MP3 brut (sans tag ID3 ni trame Info).
+
+    Args:
+        data: Flux MP3
+
+    Returns:
+        Position de chaque trame, suivie de la taille du flux
+
+    Raises:
+        ValueError: Si le flux contient une trame invalide ou tronquée
+    """
+    offsets = []
+    position = 0
+    size = len(data)
+    while position < size:
+        offsets.append(position)
+        position += parse_frame_header(data, position).frame_length
+    if position != size:
+        raise ValueError("Dernière trame MP3 tronquée")
+    offsets.append(size)
+    return offsets
+
+
+def samples_per_frame(sample_rate: int) -> int:
+    """
+    Nombre d'échantillons d'une trame MP3 à un taux d'échantillonnage donné.
+
+    Args:
+        sample_rate: Taux d'échantillonnage en Hz
+
+    Returns:
+        1152 en MPEG-1 (32 kHz et plus), 576 en MPEG-2 et 2.5
+    """
+    return 1152 if sample_rate >= 32000 else 576
+
+
+def plan_chunks(
+    total_samples: int,
+    sample_rate: int,
+    jobs: int,
+    min_chunk_seconds: float = MIN_CHUNK_SECONDS
+) -> List[Tuple[int, int]]:
+    """
+    Découpe un enregistrement en morceaux alignés sur les trames MP3.
+
+    Args:
+        total_samples: Nombre d'échantillons par canal
+        sample_rate: Taux d'échantillonnage en Hz
+        jobs: Nombre de morceaux souhaité (un par encodeur parallèle)
+        min_chunk_seconds: Durée minimale d'un morceau en secondes
+
+    Returns:
+        Bornes (début, fin) de chaque morceau en échantillons ; chaque début
+        est un multiple de la taille de trame, le dernier morceau se termine
+        à total_samples
+    """
+    frame_samples = samples_per_frame(sample_rate)
+    total_frames = -(-total_samples // frame_samples)
+    min_frames = max(1, int(min_chunk_seconds * sample_rate) // frame_samples)
+    count = max(1, min(jobs, total_frames // min_frames))
+
+    bounds = [frame_samples * (total_frames * index // count) for index in range(count)]
+    bounds.append(total_samples)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def lame_crc16(data, crc: int = 0) -> int:
+    """
+    CRC-16 utilisé par le tag LAME (polynôme 0x8005, bits réfléchis).
+
+    Args:
+        data: Octets à couvrir
+        crc: Valeur initiale
+
+    Returns:
+        CRC sur 16 bits
+    """
+    for byte in bytes(data):
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc
+
+
+def _side_info_size(header: FrameHeader) -> int:
+    """Taille des informations annexes suivant l'en-tête d'une trame."""
+    mono = header.channel_mode == 3
+    if header.version == 3:
+        return 17 if mono else 32
+    return 9 if mono else 17
+
+
+def build_info_frame(
+    header: FrameHeader,
+    frame_count: int,
+    audio_bytes: int,
+    encoder_delay: int,
+    padding: int
+) -> bytes:
+    """
+    Construit la trame Info (tag Xing CBR et extension LAME) d'un fichier MP3.
+
+    La trame est décodée comme du silence par les lecteurs qui l'ignorent ;
+    les autres y lisent la durée exacte et, grâce au délai et au remplissage,
+    suppriment les échantillons ajoutés par l'encodeur (lecture sans blanc).
+
+    Args:
+        header: En-tête d'une trame audio du fichier (débit, fréquence, canaux)
+        frame_count: Nombre de trames audio (trame Info exclue)
+        audio_bytes: Taille des trames audio en octets
+        encoder_delay: Échantillons ajoutés en tête par l'encodeur
+        padding: Échantillons ajoutés en fin de flux
+
+    Returns:
+        Trame Info complète
+
+    Raises:
+        ValueError: Si aucun débit MPEG ne permet de loger le tag
+    """
+    tag_offset = 4 + _side_info_size(header)
+    bitrates = MPEG1_BITRATES if header.version == 3 else MPEG2_BITRATES
+    factor = 144000 if header.version == 3 else 72000
+
+    # Débit de la trame Info : celui du fichier s'il laisse la place au tag
+    for bitrate_index in range(header.bitrate_index, 15):
+        frame_length = factor * bitrates[bitrate_index] // header.sample_rate
+        if frame_length >= tag_offset + INFO_TAG_SIZE:
+            break
+    else:
+        raise ValueError("Trame trop petite pour le tag Info")
+
+    frame = bytearray(frame_length)
+    # Sans CRC, sans octet de remplissage ; mode de canaux inchangé
+    frame[0] = 0xFF
+    frame[1] = header.raw[1] | 0x01
+    frame[2] = (bitrate_index << 4) | (header.raw[2] & 0x0C)
+    frame[3] = header.raw[3]
+
+    total_bytes = frame_length + audio_bytes
+    toc = bytes(index * 256 // 100 for index in range(100))
+    struct.pack_into('>4sIII100sI', frame, tag_offset, b"Info", INFO_FLAGS, frame_count, total_bytes, toc, 0)
+
+    lame_offset = tag_offset + 120
+    delay_padding = (min(encoder_delay, 0xFFF) << 12) | min(max(padding, 0), 0xFFF)
+    struct.pack_into(
+        '>9sBB8xBB3sBBHIH',
+        frame, lame_offset,
+        LAME_VERSION,
+        0x01,                           # révision 0, méthode CBR
+        0,                              # fréquence de coupure inconnue
+        0,                              # drapeaux d'encodage et ATH
+        min(header.bitrate, 255),
+        delay_padding.to_bytes(3, 'big'),
+        0, 0, 0,                        # divers, gain MP3, preset
+        total_bytes,
+        0                               # CRC de la musique non calculé
+    )
+    crc_end = tag_offset + LAME_TAG_CRC_OFFSET
+    struct.pack_into('>H', frame, crc_end, lame_crc16(frame[:crc_end]))
+    return bytes(frame)
+
+
+def _encode_chunk(
+    pcm: memoryview,
+    output_file: Path,
+    sample_rate: int,
+    channels: int,
+    sample_width: int,
+    bitrate: str,
+    converter: str
+):
+    """Encode un morceau de PCM en trames MP3 brutes (sans réservoir de bits ni tag)."""
+    command = build_ffmpeg_command(
+        output_file=output_file,
+        sample_rate=sample_rate,
+        channels=channels,
+        sample_width=sample_width,
+        codec_args=[
+            '-codec:a', 'libmp3lame', '-b:a', bitrate,
+            # Trames indépendantes : concaténables sans dépendre du morceau voisin
+            '-reservoir', '0',
+            '-write_xing', '0', '-id3v2_version', '0',
+            '-f', 'mp3',
+        ],
+        converter=converter
+    )
+    pipe = FFmpegPipe(command)
+    pipe.start()
+    try:
+        pipe.write(pcm)
+    finally:
+        pipe.close()
+
+
+def encode_mp3_parallel(
+    pcm,
+    output_file: Path,
+    sample_rate: int = 44100,
+    channels: int = 2,
+    sample_width: int = 2,
+    bitrate: str = "128k",
+    jobs: Optional[int] = None,
+    converter: str = "ffmpeg",
+    min_chunk_seconds: float = MIN_CHUNK_SECONDS
+) -> int:
+    """
+    Encode du PCM en MP3 en répartissant le travail sur plusieurs processus FFmpeg.
+
+    Le PCM est découpé en morceaux alignés sur les trames MP3, chacun étendu
+    de quelques trames avant et après. Chaque morceau est encodé par son
+    propre processus FFmpeg (un cœur chacun), réservoir de bits désactivé ;
+    les trames de recouvrement sont écartées et les autres concaténées dans
+    l'ordre. Le fichier obtenu est continu (sans blanc aux frontières) et
+    commence par une trame Info portant la durée exacte.
+
+    Args:
+        pcm: PCM entrelacé (bytes, bytearray ou memoryview), lu sans copie
+        output_file: Fichier MP3 à produire
+        sample_rate: Taux d'échantillonnage en Hz
+        channels: Nombre de canaux audio
+        sample_width: Largeur d'échantillon en octets
+        bitrate: Bitrate MP3 (constant)
+        jobs: Nombre d'encodeurs simultanés (par défaut le nombre de cœurs)
+        converter: Exécutable FFmpeg à utiliser
+        min_chunk_seconds: Durée minimale d'un morceau en secondes
+
+    Returns:
+        Nombre de morceaux encodés (0 si le PCM est vide)
+
+    Raises:
+        FileNotFoundError: Si l'exécutable FFmpeg est introuvable
+        RuntimeError: Si un processus FFmpeg échoue
+        ValueError: Si un morceau encodé est invalide ou incomplet
+    """
+    view = memoryview(pcm).cast('B')
+    frame_size = channels * sample_width
+    total_samples = len(view) // frame_size
+    if total_samples == 0:
+        return 0
+
+    jobs = jobs or os.cpu_count() or 1
+    frame_samples = samples_per_frame(sample_rate)
+    chunks = plan_chunks(total_samples, sample_rate, jobs, min_chunk_seconds)
+    output_file = Path(output_file)
+
+    with tempfile.TemporaryDirectory(prefix=".mp3-", dir=output_file.parent) as temp_dir:
+        chunk_files = [Path(temp_dir) / f"{index:04d}.mp3" for index in range(len(chunks))]
+        # Trames à écarter en tête et trames à conserver pour chaque morceau
+        selections = []
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = []
+            for index, (start, end) in enumerate(chunks):
+                encode_start = max(0, start - PREROLL_FRAMES * frame_samples)
+                encode_end = min(total_samples, end + POSTROLL_FRAMES * frame_samples)
+                is_last = index == len(chunks) - 1
+                selections.append((
+                    (start - encode_start) // frame_samples,
+                    None if is_last else (end - start) // frame_samples
+                ))
+                # Le dernier morceau garde son vidage naturel, sans anticipation
+                if is_last:
+                    encode_end = total_samples
+                futures.append(executor.submit(
+                    _encode_chunk,
+                    view[encode_start * frame_size:encode_end * frame_size],
+                    chunk_files[index], sample_rate, channels, sample_width,
+                    bitrate, converter
+                ))
+            for future in futures:
+                future.result()
+
+        # Trames conservées de chaque morceau
+        ranges = []
+        frame_count = 0
+        audio_bytes = 0
+        first_header = None
+        for chunk_file, (skip, keep) in zip(chunk_files, selections):
+            data = chunk_file.read_bytes()
+            offsets = frame_offsets(data)
+            available = len(offsets) - 1 - skip
+            if keep is None:
+                keep = available
+            if keep <= 0 or available < keep:
+                raise ValueError(f"Morceau MP3 incomplet: {chunk_file.name}")
+            if first_header is None:
+                first_header = parse_frame_header(data, offsets[skip])
+            ranges.append((chunk_file, offsets[skip], offsets[skip + keep]))
+            frame_count += keep
+            audio_bytes += offsets[skip + keep] - offsets[skip]
+
+        padding = frame_count * frame_samples - ENCODER_DELAY - total_samples
+        info_frame = build_info_frame(first_header, frame_count, audio_bytes, ENCODER_DELAY, padding)
+
+        with open(output_file, 'wb') as output:
+            output.write(info_frame)
+            for chunk_file, start, end in ranges:
+                with open(chunk_file, 'rb') as source:
+                    source.seek(start)
+                    remaining = end - start
+                    while remaining > 0:
+                        block = source.read(min(COPY_CHUNK_SIZE, remaining))
+                        if not block:
+                            break
+                        output.write(block)
+                        remaining -= len(block)
+
+    return len(chunks)
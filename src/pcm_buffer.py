@@ -0,0 +1,93 @@
+"""Module pour le stockage du PCM bufferisé dans un fichier temporaire projetable en mémoire."""
+
+import mmap
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+# Emplacements possibles du PCM accumulé par un encodeur bufferisé
+BUFFER_BACKENDS = ("memory", "mmap")
+
+
+class MappedPCMBuffer:
+    """
+    Buffer PCM adossé à un fichier temporaire anonyme.
+
+    Les écritures vont dans le cache de pages du système plutôt que dans le
+    tas Python : la mémoire résidente du processus reste de l'ordre d'un
+    chunk quelle que soit la durée de l'enregistrement. Le contenu est
+    ensuite remis à l'encodeur sans copie, soit comme fichier (lu
+    directement par FFmpeg), soit comme memoryview sur une projection mmap.
+
+    Le fichier est supprimé dès sa création (il n'a pas de nom) : rien ne
+    reste sur le disque si le processus s'arrête brutalement.
+    """
+
+    def __init__(self, directory: Optional[Path] = None):
+        """
+        Crée le fichier temporaire.
+
+        Args:
+            directory: Répertoire du fichier (par défaut celui du système).
+                       Préférer un disque à un tmpfs, dont les pages
+                       comptent comme de la mémoire.
+        """
+        self._file: BinaryIO = tempfile.TemporaryFile(prefix=".pcm-", dir=directory)
+        self.size = 0
+
+    @property
+    def closed(self) -> bool:
+        """Indique si le buffer a été fermé."""
+        return self._file.closed
+
+    def write(self, data) -> int:
+        """
+        Ajoute des données PCM en fin de buffer.
+
+        Args:
+            data: Données audio brutes (bytes, bytearray ou memoryview)
+
+        Returns:
+            Nombre d'octets écrits
+        """
+        written = self._file.write(data)
+        self.size += written
+        return written
+
+    def tell(self) -> int:
+        """Nombre d'octets écrits (même sémantique que BytesIO.tell())."""
+        return self.size
+
+    def getbuffer(self) -> memoryview:
+        """
+        Projette le contenu en mémoire (lecture seule, sans copie).
+
+        Les pages sont chargées à la demande depuis le cache du système et
+        restent récupérables par celui-ci. La projection est libérée avec la
+        vue (release() ou bloc with).
+
+        Returns:
+            Vue sur l'ensemble des données écrites
+        """
+        self._file.flush()
+        if self.size == 0:
+            return memoryview(b'')
+        mapping = mmap.mmap(self._file.fileno(), self.size, access=mmap.ACCESS_READ)
+        if hasattr(mapping, 'madvise'):
+            mapping.madvise(mmap.MADV_SEQUENTIAL)
+        return memoryview(mapping)
+
+    def as_file(self) -> BinaryIO:
+        """
+        Retourne le fichier sous-jacent, positionné au début des données.
+
+        Returns:
+            Fichier à transmettre tel quel à un processus (entrée standard)
+        """
+        self._file.flush()
+        self._file.seek(0)
+        return self._file
+
+    def close(self):
+        """Ferme et libère le fichier temporaire."""
+        self._file.close()
@@ -0,0 +1,200 @@
+"""Module pour le journal PCM sur disque permettant de récupérer un enregistrement interrompu."""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional
+
+# Extension ajoutée au nom du fichier final pour former le nom du spool
+SPOOL_SUFFIX = ".spool"
+
+# Signature et taille de l'en-tête (métadonnées JSON complétées par des espaces)
+SPOOL_MAGIC = b"PCMSPOOL1\n"
+SPOOL_HEADER_SIZE = 4096
+
+# Taille des lectures lors de la récupération
+RECOVERY_CHUNK_SIZE = 1024 * 1024
+
+
+class PCMSpool:
+    """
+    Copie sur disque du PCM transmis à un encodeur.
+
+    Le PCM est ajouté au fil de l'eau à un fichier `<fichier final>.spool`
+    précédé d'un en-tête décrivant le format. Les données sont synchronisées
+    sur le disque (fsync) au plus toutes les `sync_interval` secondes : après
+    un arrêt brutal, seules les dernières secondes peuvent manquer.
+
+    Le spool est supprimé (discard()) une fois le fichier final encodé avec
+    succès ; sinon il reste sur le disque pour recover_spool().
+    """
+
+    def __init__(self, output_file: Path, metadata: Dict, sync_interval: float = 1.0):
+        """
+        Initialise le spool (le fichier n'est créé qu'à la première écriture).
+
+        Args:
+            output_file: Fichier final que l'encodeur doit produire
+            metadata: Format du PCM et de la sortie (sample_rate, channels,
+                      sample_width, output_format, bitrate)
+            sync_interval: Intervalle maximal entre deux fsync en secondes
+        """
+        self.output_file = Path(output_file)
+        self.path = self.output_file.with_name(self.output_file.name + SPOOL_SUFFIX)
+        self.metadata = dict(metadata)
+        self.sync_interval = sync_interval
+        self.bytes_written = 0
+        self.sync_count = 0
+
+        self._file: Optional[BinaryIO] = None
+        self._last_sync = 0.0
+
+    def _open(self):
+        """Crée le fichier du spool et écrit son en-tête."""
+        header = SPOOL_MAGIC + json.dumps(self.metadata).encode('utf-8')
+        if len(header) > SPOOL_HEADER_SIZE:
+            raise ValueError("Métadonnées du spool trop volumineuses")
+        self._file = open(self.path, 'wb')
+        self._file.write(header.ljust(SPOOL_HEADER_SIZE, b' '))
+        self._sync()
+
+    def write(self, data):
+        """
+        Ajoute des données PCM au spool.
+
+        Args:
+            data: Données audio brutes (bytes, bytearray ou memoryview)
+        """
+        if self._file is None:
+            self._open()
+        self._file.write(data)
+        self.bytes_written += len(data)
+        if time.monotonic() - self._last_sync >= self.sync_interval:
+            self._sync()
+
+    def _sync(self):
+        """Force l'écriture des données du spool sur le disque."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic()
+        self.sync_count += 1
+
+    def close(self):
+        """Synchronise et ferme le spool en le conservant sur le disque."""
+        if self._file is None:
+            return
+        try:
+            self._sync()
+        finally:
+            self._file.close()
+            self._file = None
+
+    def discard(self):
+        """Ferme et supprime le spool (le fichier final est complet)."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def read_spool_metadata(path: Path) -> Dict:
+    """
+    Lit l'en-tête d'un spool.
+
+    Args:
+        path: Chemin du spool
+
+    Returns:
+        Métadonnées enregistrées à la création du spool
+
+    Raises:
+        ValueError: Si le fichier n'est pas un spool valide
+    """
+    with open(path, 'rb') as spool_file:
+        header = spool_file.read(SPOOL_HEADER_SIZE)
+    if len(header) < SPOOL_HEADER_SIZE or not header.startswith(SPOOL_MAGIC):
+        raise ValueError(f"Fichier spool invalide: {path}")
+    try:
+        return json.loads(header[len(SPOOL_MAGIC):].decode('utf-8'))
+    except ValueError as e:
+        raise ValueError(f"En-tête de spool illisible: {path}") from e
+
+
+def recover_spool(path: Path) -> Optional[Path]:
+    """
+    Encode le contenu d'un spool vers son fichier final puis supprime le spool.
+
+    Un fichier final partiel (enregistrement interrompu) est remplacé. Une
+    frame incomplète en fin de spool (écriture interrompue) est ignorée.
+
+    Args:
+        path: Chemin du spool
+
+    Returns:
+        Chemin du fichier encodé, ou None si le spool ne contenait aucune frame
+
+    Raises:
+        ValueError: Si le spool est invalide
+        RuntimeError: Si l'encodage échoue (le spool est alors conservé)
+    """
+    # Import local : le choix de l'encodeur charge pydub
+    from src.encoders import create_encoder
+
+    path = Path(path)
+    metadata = read_spool_metadata(path)
+    output_file = path.with_name(path.name[:-len(SPOOL_SUFFIX)])
+    frame_size = metadata['channels'] * metadata['sample_width']
+
+    data_size = path.stat().st_size - SPOOL_HEADER_SIZE
+    data_size -= data_size % frame_size
+    if data_size <= 0:
+        path.unlink()
+        return None
+
+    encoder = create_encoder(
+        metadata['output_format'],
+        output_file=output_file,
+        sample_rate=metadata['sample_rate'],
+        channels=metadata['channels'],
+        sample_width=metadata['sample_width'],
+        bitrate=metadata.get('bitrate')
+    )
+    try:
+        with open(path, 'rb') as spool_file:
+            spool_file.seek(SPOOL_HEADER_SIZE)
+            remaining = data_size
+            while remaining > 0:
+                chunk = spool_file.read(min(RECOVERY_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                encoder.write_frames(chunk)
+                remaining -= len(chunk)
+    except Exception:
+        # Fermer l'encodeur pour ne pas laisser de processus FFmpeg derrière
+        # soi ; l'erreur d'origine prime et le spool est conservé
+        try:
+            encoder.close()
+        except Exception:
+            pass
+        raise
+    encoder.close()
+
+    path.unlink()
+    return output_file
+
+
+def find_spools(directory: Path) -> List[Path]:
+    """
+    Liste les spools laissés par des enregistrements interrompus.
+
+    Args:
+        directory: Répertoire des enregistrements
+
+    Returns:
+        Chemins des spools, triés par nom
+    """
+    return sorted(Path(directory).expanduser().glob(f"*{SPOOL_SUFFIX}"))
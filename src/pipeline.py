@@ -0,0 +1,353 @@
+"""Module pour la distribution du PCM capturé à plusieurs consommateurs indépendants."""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+# Comportement d'une file pleine : attendre de la place, retirer le bloc le
+# plus ancien, ou rejeter le nouveau bloc
+SINK_POLICIES = ("block", "drop-oldest", "drop-newest")
+
+
+class PipelineSink:
+    """
+    Consommateur du PCM alimenté par sa propre file et son propre thread.
+
+    Le consommateur suit l'interface de StreamingTranscriber : write() reçoit
+    chaque bloc (bytes immuable, partagé sans copie avec les autres
+    consommateurs), start() le format et finish() la fin de l'audio ; start()
+    et finish() sont facultatives. Tous les appels ont lieu dans le thread du
+    consommateur : un consommateur lent ou en erreur ne retarde que sa file.
+
+    Quand la file atteint `max_seconds` d'audio, la politique s'applique :
+    "drop-oldest" retire les blocs les plus anciens (pour un affichage en
+    direct), "drop-newest" rejette les nouveaux blocs, et "block" fait
+    attendre le producteur qu'une place se libère (pas de perte tant que le
+    consommateur suit, pour l'archivage). Cette attente est bornée : au-delà
+    de `block_timeout`, le consommateur est considéré comme bloqué et ses
+    blocs sont rejetés sans attente jusqu'à ce que sa file se vide, pour
+    qu'un consommateur figé ne retienne pas le producteur (ni, à travers
+    lui, la capture et les autres consommateurs). Les blocs retirés ou
+    rejetés sont comptés (voir get_stats()).
+    """
+
+    def __init__(
+        self,
+        consumer,
+        name: str,
+        policy: str = "drop-oldest",
+        max_seconds: float = 10.0,
+        block_timeout: float = 1.0
+    ):
+        """
+        Initialise le consommateur (le thread n'est lancé qu'à start()).
+
+        Args:
+            consumer: Objet offrant write(data), et éventuellement
+                      start(sample_rate, channels, sample_width) et finish()
+            name: Nom du consommateur dans les statistiques
+            policy: Politique de la file pleine (voir SINK_POLICIES)
+            max_seconds: Durée d'audio maximale en attente dans la file
+            block_timeout: Avec "block", attente maximale du producteur pour
+                           un bloc, en secondes
+
+        Raises:
+            ValueError: Si la politique est inconnue
+        """
+        if policy not in SINK_POLICIES:
+            raise ValueError(
+                f"Politique de file inconnue: {policy} "
+                f"(valeurs possibles: {', '.join(SINK_POLICIES)})"
+            )
+        self.consumer = consumer
+        self.name = name
+        self.policy = policy
+        self.max_seconds = max_seconds
+        self.block_timeout = block_timeout
+
+        self.byte_rate = 0
+        self.max_bytes = 0
+        self.error: Optional[Exception] = None
+
+        # File de (bloc, instant d'arrivée), protégée par _condition
+        self._queue: deque = deque()
+        self._queued_bytes = 0
+        self._condition = threading.Condition()
+        self._finishing = False
+        # Consommateur "block" ayant dépassé block_timeout, jusqu'à ce que sa file ait de la place
+        self._stalled = False
+        self._thread: Optional[threading.Thread] = None
+        self._format = None
+
+        self.high_water_mark = 0
+        self.dropped_blocks = 0
+        self.dropped_bytes = 0
+        self.written_bytes = 0
+        self.blocked_time = 0.0
+        self.stalls = 0
+
+    def start(self, sample_rate: int, channels: int, sample_width: int = 2):
+        """
+        Démarre le thread du consommateur.
+
+        Args:
+            sample_rate: Taux d'échantillonnage du PCM en Hz
+            channels: Nombre de canaux du PCM
+            sample_width: Largeur d'échantillon en octets
+        """
+        # Fin de l'enregistrement précédent : sa file doit être vidée
+        if self._thread is not None:
+            self.finish()
+            self._thread.join()
+        self.byte_rate = sample_rate * channels * sample_width
+        self.max_bytes = int(self.max_seconds * self.byte_rate)
+        self._format = (sample_rate, channels, sample_width)
+        with self._condition:
+            self._queue.clear()
+            self._queued_bytes = 0
+            self._finishing = False
+            self._stalled = False
+            self.error = None
+            self.high_water_mark = 0
+            self.dropped_blocks = 0
+            self.dropped_bytes = 0
+            self.written_bytes = 0
+            self.blocked_time = 0.0
+            self.stalls = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def put(self, block: bytes):
+        """
+        Ajoute un bloc à la file en appliquant la politique si elle est pleine.
+
+        Args:
+            block: Données audio (partagées avec les autres consommateurs)
+        """
+        size = len(block)
+        with self._condition:
+            if self._finishing or self.error is not None:
+                self._drop(size)
+                return
+            # Un bloc plus grand que la file est accepté quand elle est vide
+            if self._queue and self._queued_bytes + size > self.max_bytes:
+                if self.policy == "drop-newest":
+                    self._drop(size)
+                    return
+                if self.policy == "drop-oldest":
+                    while self._queue and self._queued_bytes + size > self.max_bytes:
+                        oldest, _ = self._queue.popleft()
+                        self._queued_bytes -= len(oldest)
+                        self._drop(len(oldest))
+                else:
+                    if self._stalled:
+                        self._drop(size)
+                        return
+                    wait_start = time.monotonic()
+                    ready = self._condition.wait_for(
+                        lambda: (not self._queue or self._queued_bytes + size <= self.max_bytes
+                                 or self.error is not None or self._finishing),
+                        timeout=self.block_timeout
+                    )
+                    self.blocked_time += time.monotonic() - wait_start
+                    if not ready:
+                        self._stalled = True
+                        self.stalls += 1
+                    if not ready or self.error is not None or self._finishing:
+                        self._drop(size)
+                        return
+            self._stalled = False
+            self._queue.append((block, time.monotonic()))
+            self._queued_bytes += size
+            if self._queued_bytes > self.high_water_mark:
+                self.high_water_mark = self._queued_bytes
+            self._condition.notify_all()
+
+    def _drop(self, size: int):
+        """Compte un bloc perdu (appelé sous verrou)."""
+        self.dropped_blocks += 1
+        self.dropped_bytes += size
+
+    def finish(self):
+        """Signale la fin de l'audio : le consommateur vide sa file puis reçoit finish()."""
+        with self._condition:
+            self._finishing = True
+            self._condition.notify_all()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attend que le consommateur ait traité sa file après finish().
+
+        Args:
+            timeout: Délai maximal d'attente en secondes (None = illimité)
+
+        Returns:
+            True si le thread du consommateur est terminé
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        return True
+
+    def _run(self):
+        """Boucle du consommateur (exécutée dans un thread séparé)."""
+        try:
+            start = getattr(self.consumer, 'start', None)
+            if start is not None:
+                start(*self._format)
+            while True:
+                with self._condition:
+                    self._condition.wait_for(lambda: self._queue or self._finishing)
+                    if not self._queue:
+                        break
+                    block, _ = self._queue.popleft()
+                    self._queued_bytes -= len(block)
+                    # Place libérée pour un producteur en attente
+                    self._condition.notify_all()
+                self.consumer.write(block)
+                self.written_bytes += len(block)
+            finish = getattr(self.consumer, 'finish', None)
+            if finish is not None:
+                finish()
+        except Exception as e:
+            logging.debug(f"Erreur du consommateur {self.name}: {e}")
+            with self._condition:
+                self.error = e
+                # Plus rien ne sera lu : libérer la file et le producteur
+                for block, _ in self._queue:
+                    self._drop(len(block))
+                self._queue.clear()
+                self._queued_bytes = 0
+                self._condition.notify_all()
+
+    def get_stats(self) -> Dict:
+        """
+        Retourne les compteurs et le retard du consommateur.
+
+        Returns:
+            Dictionnaire contenant: policy, queued_bytes, lag (secondes
+            d'audio en attente), delay (âge en secondes du plus ancien bloc en
+            attente), high_water_mark, dropped_blocks, dropped_bytes,
+            written_bytes, blocked_time (secondes d'attente du producteur),
+            stalls (attentes abandonnées après block_timeout), error
+            (message, ou None)
+        """
+        with self._condition:
+            queued_bytes = self._queued_bytes
+            oldest = self._queue[0][1] if self._queue else None
+        return {
+            'policy': self.policy,
+            'queued_bytes': queued_bytes,
+            'lag': queued_bytes / self.byte_rate if self.byte_rate else 0.0,
+            'delay': time.monotonic() - oldest if oldest is not None else 0.0,
+            'high_water_mark': self.high_water_mark,
+            'dropped_blocks': self.dropped_blocks,
+            'dropped_bytes': self.dropped_bytes,
+            'written_bytes': self.written_bytes,
+            'blocked_time': self.blocked_time,
+            'stalls': self.stalls,
+            'error': str(self.error) if self.error is not None else None,
+        }
+
+
+class FanoutStage:
+    """
+    Étage du pipeline distribuant chaque bloc de PCM à plusieurs consommateurs.
+
+    L'étage suit lui-même l'interface start()/write()/finish() : il se
+    branche comme un consommateur de l'enregistreur (voir
+    AudioRecorder.add_sink). Chaque bloc reçu n'est copié qu'une fois, dans
+    un bytes immuable partagé par les files de tous les consommateurs.
+    """
+
+    def __init__(self):
+        """Initialise l'étage sans consommateur."""
+        self.sinks: List[PipelineSink] = []
+
+    def add_sink(
+        self,
+        consumer,
+        name: Optional[str] = None,
+        policy: str = "drop-oldest",
+        max_seconds: float = 10.0,
+        block_timeout: float = 1.0
+    ) -> PipelineSink:
+        """
+        Ajoute un consommateur (avant le démarrage de l'enregistrement).
+
+        Les consommateurs "block" sont servis après les autres : leur attente
+        ne retarde pas la remise des blocs aux consommateurs sans attente.
+
+        Args:
+            consumer: Objet offrant write(data), et éventuellement start() et finish()
+            name: Nom dans les statistiques (par défaut le nom de la classe
+                  du consommateur)
+            policy: Politique de la file pleine (voir SINK_POLICIES)
+            max_seconds: Durée d'audio maximale en attente dans la file
+            block_timeout: Avec "block", attente maximale du producteur pour
+                           un bloc, en secondes (voir PipelineSink)
+
+        Returns:
+            Consommateur ajouté
+
+        Raises:
+            ValueError: Si la politique est inconnue ou si le nom est déjà utilisé
+        """
+        name = name or type(consumer).__name__
+        if any(sink.name == name for sink in self.sinks):
+            raise ValueError(f"Consommateur déjà présent: {name}")
+        sink = PipelineSink(consumer, name, policy, max_seconds, block_timeout)
+        # Liste remplacée plutôt que modifiée : le thread d'encodage la parcourt sans verrou
+        self.sinks = sorted(self.sinks + [sink], key=lambda other: other.policy == "block")
+        return sink
+
+    def start(self, sample_rate: int, channels: int, sample_width: int = 2):
+        """
+        Démarre le thread de chaque consommateur.
+
+        Args:
+            sample_rate: Taux d'échantillonnage du PCM en Hz
+            channels: Nombre de canaux du PCM
+            sample_width: Largeur d'échantillon en octets
+        """
+        for sink in self.sinks:
+            sink.start(sample_rate, channels, sample_width)
+
+    def write(self, data):
+        """
+        Distribue un bloc à tous les consommateurs.
+
+        Args:
+            data: Données audio brutes, valides seulement pendant l'appel
+        """
+        block = bytes(data)
+        for sink in self.sinks:
+            sink.put(block)
+
+    def finish(self):
+        """Signale la fin de l'audio à tous les consommateurs."""
+        for sink in self.sinks:
+            sink.finish()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attend que tous les consommateurs aient traité leur file.
+
+        Args:
+            timeout: Délai maximal d'attente par consommateur en secondes
+
+        Returns:
+            True si tous les consommateurs ont terminé
+        """
+        return all([sink.wait(timeout) for sink in self.sinks])
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """
+        Retourne les statistiques de chaque consommateur.
+
+        Returns:
+            Dictionnaire {nom: statistiques (voir PipelineSink.get_stats)}
+        """
+        return {sink.name: sink.get_stats() for sink in self.sinks}
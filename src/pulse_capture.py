@@ -0,0 +1,200 @@
+"""Module pour la capture directe d'une source PulseAudio/PipeWire (parec)."""
+
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import BinaryIO, List, Optional
+
+# Moteurs de capture disponibles : PortAudio (PyAudio) ou serveur de son direct
+CAPTURE_BACKENDS = ("pyaudio", "pulse")
+
+# Client d'enregistrement PulseAudio (paquet pulseaudio-utils, fourni aussi
+# par pipewire-pulse)
+PAREC = "parec"
+
+# Durée par défaut d'un fragment lu d'un seul tenant
+DEFAULT_FRAGMENT_SECONDS = 0.2
+
+# Formats d'échantillon parec par largeur en octets
+PULSE_FORMATS = {2: "s16le", 4: "s32le"}
+
+# Taille maximale de la fin de la sortie d'erreur de parec reprise dans les messages
+ERROR_TAIL_BYTES = 4096
+
+
+class PulseCapture:
+    """
+    Capture d'une source PulseAudio désignée par son nom, sans PortAudio.
+
+    Le flux est ouvert par un processus parec qui se connecte directement au
+    serveur de son (PulseAudio ou pipewire-pulse) : pas de couche ALSA ni de
+    plugin "pulse", et n'importe quelle source, en particulier un Monitor,
+    est accessible par son nom (voir find_default_sink_monitor).
+
+    Le serveur remet l'audio par fragments de `fragment_seconds` (latence
+    et temps de traitement demandés à parec) : le thread de capture ne se
+    réveille qu'une fois par fragment, quelle que soit la taille des chunks
+    PyAudio.
+    """
+
+    def __init__(
+        self,
+        source: Optional[str],
+        sample_rate: int,
+        channels: int,
+        sample_width: int = 2,
+        fragment_seconds: float = DEFAULT_FRAGMENT_SECONDS,
+        client_name: str = "audio-recorder",
+        executable: Optional[str] = None
+    ):
+        """
+        Initialise la capture (le processus n'est lancé qu'à start()).
+
+        Args:
+            source: Nom de la source PulseAudio (None = source par défaut)
+            sample_rate: Taux d'échantillonnage demandé en Hz
+            channels: Nombre de canaux demandé
+            sample_width: Largeur d'échantillon en octets (2 ou 4)
+            fragment_seconds: Durée d'audio remise à chaque lecture
+            client_name: Nom du client affiché par le serveur de son
+            executable: Exécutable parec à utiliser (par défaut PAREC)
+
+        Raises:
+            ValueError: Si la largeur d'échantillon n'est pas supportée
+        """
+        if sample_width not in PULSE_FORMATS:
+            raise ValueError(f"Largeur d'échantillon non supportée par parec: {sample_width}")
+
+        self.source = source
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self.frame_size = channels * sample_width
+        self.fragment_seconds = fragment_seconds
+        self.fragment_frames = max(1, int(sample_rate * fragment_seconds))
+        self.client_name = client_name
+        self.executable = executable or PAREC
+
+        self._process: Optional[subprocess.Popen] = None
+        # Sortie d'erreur de parec : un fichier temporaire plutôt qu'un tube,
+        # qui bloquerait parec une fois plein puisqu'il n'est lu qu'à la fin
+        self._stderr: Optional[BinaryIO] = None
+        self._fragment = bytearray(self.fragment_frames * self.frame_size)
+        self._view = memoryview(self._fragment)
+        self.reads = 0
+
+    def command(self) -> List[str]:
+        """
+        Construit la ligne de commande parec.
+
+        Returns:
+            Arguments du processus de capture
+        """
+        latency_ms = max(1, int(self.fragment_seconds * 1000))
+        command = [
+            self.executable,
+            '--raw',
+            f'--format={PULSE_FORMATS[self.sample_width]}',
+            f'--rate={self.sample_rate}',
+            f'--channels={self.channels}',
+            f'--latency-msec={latency_ms}',
+            f'--process-time-msec={latency_ms}',
+            f'--client-name={self.client_name}',
+        ]
+        if self.source:
+            command.append(f'--device={self.source}')
+        return command
+
+    def start(self):
+        """
+        Lance le processus de capture.
+
+        Raises:
+            RuntimeError: Si parec est introuvable
+        """
+        if shutil.which(self.executable) is None:
+            raise RuntimeError(
+                f"{self.executable} est introuvable. Installez-le pour la capture PulseAudio directe:\n"
+                f"  Ubuntu/Debian: sudo apt install pulseaudio-utils\n"
+                f"  Fedora: sudo dnf install pulseaudio-utils"
+            )
+        self._stderr = tempfile.TemporaryFile()
+        self._process = subprocess.Popen(
+            self.command(),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=self._stderr,
+            bufsize=0
+        )
+
+    def read_fragment(self) -> memoryview:
+        """
+        Lit un fragment complet (bloquant).
+
+        Returns:
+            Vue sur le buffer interne (valide jusqu'à la lecture suivante) ;
+            plus courte qu'un fragment, voire vide, à la fin du flux
+
+        Raises:
+            RuntimeError: Si la capture n'est pas démarrée
+        """
+        if self._process is None:
+            raise RuntimeError("La capture PulseAudio n'est pas démarrée")
+        stdout = self._process.stdout
+        filled = 0
+        size = len(self._fragment)
+        while filled < size:
+            count = stdout.readinto(self._view[filled:])
+            if not count:
+                break
+            filled += count
+        self.reads += 1
+        # Fin du flux : ignorer une frame incomplète
+        return self._view[:filled - filled % self.frame_size]
+
+    def error_message(self) -> str:
+        """
+        Retourne le message d'erreur de parec après la fin du flux.
+
+        Returns:
+            Fin de la sortie d'erreur du processus (ERROR_TAIL_BYTES au
+            plus), ou une chaîne vide
+        """
+        if self._process is None:
+            return ""
+        try:
+            self._process.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            return ""
+        size = self._stderr.seek(0, os.SEEK_END)
+        self._stderr.seek(max(0, size - ERROR_TAIL_BYTES))
+        return self._stderr.read().decode(errors='replace').strip()
+
+    def stop(self):
+        """
+        Arrête le processus de capture.
+
+        Les données déjà produites restent lisibles jusqu'à la fin du flux :
+        un thread bloqué dans read_fragment() est ainsi réveillé.
+        """
+        process = self._process
+        if process is None or process.poll() is not None:
+            return
+        process.terminate()
+        try:
+            process.wait(timeout=2.0)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    def close(self):
+        """Arrête le processus et libère ses tubes."""
+        process = self._process
+        if process is None:
+            return
+        self.stop()
+        self._process = None
+        process.stdout.close()
+        self._stderr.close()
+        self._stderr = None
@@ -0,0 +1,249 @@
+"""Module pour le suivi en continu des périphériques PulseAudio/PipeWire."""
+
+import logging
+import threading
+from collections import namedtuple
+from typing import Callable, Dict, List, Optional
+
+from src import audio_devices
+from src.audio_devices import source_format
+
+# Changement du modèle de périphériques signalé aux abonnés : nom du Monitor
+# par défaut avant/après, et sources apparues/disparues (ensembles de noms)
+DeviceChange = namedtuple(
+    'DeviceChange', ['previous_monitor', 'default_monitor', 'added_sources', 'removed_sources']
+)
+
+# Catégories d'événements PulseAudio suivies
+EVENT_FACILITIES = ('sink', 'source', 'server')
+
+
+class PulseDeviceMonitor:
+    """
+    Modèle en mémoire des sources PulseAudio, tenu à jour par les événements du serveur.
+
+    Contrairement à find_default_sink_monitor(), qui ouvre une connexion à
+    chaque appel, une seule connexion persistante est abonnée aux événements
+    sink/source/server : le modèle est relu à chaque ajout, retrait ou
+    changement (sortie par défaut comprise) et les abonnés (add_listener)
+    reçoivent un DeviceChange. Le thread d'écoute ne se réveille que sur
+    événement ; si le serveur redémarre, la connexion est rétablie.
+    """
+
+    def __init__(
+        self,
+        client_name: str = "audio-recorder-monitor",
+        pulse_module=None,
+        reconnect_delay: float = 1.0
+    ):
+        """
+        Initialise le suivi (la connexion n'est ouverte qu'à start()).
+
+        Args:
+            client_name: Nom du client affiché par le serveur de son
+            pulse_module: Module fournissant Pulse et PulseLoopStop (par
+                          défaut pulsectl)
+            reconnect_delay: Délai avant une nouvelle connexion après la perte
+                             du serveur, en secondes
+        """
+        self.client_name = client_name
+        self.pulse_module = pulse_module
+        self.reconnect_delay = reconnect_delay
+
+        self._lock = threading.Lock()
+        self._sources: Dict[str, Dict] = {}
+        self._default_sink: Optional[str] = None
+        self._default_monitor: Optional[str] = None
+        self._listeners: List[Callable[[DeviceChange], None]] = []
+
+        self._pulse = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self.refreshes = 0
+
+    def start(self):
+        """
+        Ouvre la connexion, lit le modèle initial et démarre l'écoute.
+
+        Raises:
+            RuntimeError: Si pulsectl n'est pas installé
+        """
+        if self.pulse_module is None:
+            if not audio_devices.PULSECTL_AVAILABLE:
+                raise RuntimeError(
+                    "pulsectl n'est pas disponible. Installez-le pour suivre les "
+                    "périphériques PulseAudio:\n  uv add pulsectl"
+                )
+            self.pulse_module = audio_devices.pulsectl
+        self._stopping.clear()
+        self._pulse = self._connect()
+        self._refresh()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Arrête l'écoute et ferme la connexion."""
+        self._stopping.set()
+        thread = self._thread
+        self._thread = None
+        # event_listen_stop() est la seule méthode de pulsectl utilisable
+        # depuis un autre thread, et n'a d'effet que pendant l'écoute
+        for _ in range(20):
+            if thread is None or not thread.is_alive():
+                break
+            pulse = self._pulse
+            if pulse is not None:
+                pulse.event_listen_stop()
+            thread.join(timeout=0.1)
+        if self._pulse is not None:
+            self._pulse.close()
+            self._pulse = None
+
+    def add_listener(self, listener: Callable[[DeviceChange], None]):
+        """
+        Abonne une fonction aux changements de périphériques.
+
+        Args:
+            listener: Appelée depuis le thread d'écoute avec un DeviceChange
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[DeviceChange], None]):
+        """
+        Désabonne une fonction ajoutée avec add_listener().
+
+        Args:
+            listener: Fonction à désabonner
+        """
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def sources(self) -> List[Dict]:
+        """
+        Retourne toutes les sources connues.
+
+        Returns:
+            Liste de dictionnaires (name, description, index, monitor_of_sink,
+            is_monitor, sample_rate, channels)
+        """
+        with self._lock:
+            return list(self._sources.values())
+
+    def monitors(self) -> List[Dict]:
+        """
+        Retourne les sources Monitor connues.
+
+        Returns:
+            Liste de dictionnaires (voir sources())
+        """
+        return [source for source in self.sources() if source['is_monitor']]
+
+    def get_source(self, name: str) -> Optional[Dict]:
+        """
+        Retourne une source par son nom.
+
+        Args:
+            name: Nom PulseAudio de la source
+
+        Returns:
+            Dictionnaire de la source, ou None si elle n'existe pas (ou plus)
+        """
+        with self._lock:
+            return self._sources.get(name)
+
+    def default_monitor(self) -> Optional[Dict]:
+        """
+        Retourne le Monitor de la sortie par défaut.
+
+        Returns:
+            Dictionnaire de la source (voir sources()), ou None s'il n'existe pas
+        """
+        with self._lock:
+            return self._sources.get(self._default_monitor)
+
+    def _connect(self):
+        """Ouvre une connexion abonnée aux événements des périphériques."""
+        pulse = self.pulse_module.Pulse(self.client_name)
+        pulse.event_mask_set(*EVENT_FACILITIES)
+        pulse.event_callback_set(self._on_event)
+        return pulse
+
+    def _on_event(self, event):
+        """
+        Callback pulsectl : interrompt l'écoute pour relire le modèle.
+
+        Aucune requête n'est possible depuis le callback : le modèle est relu
+        par la boucle d'écoute, une fois event_listen() terminé.
+        """
+        raise self.pulse_module.PulseLoopStop
+
+    def _run(self):
+        """Boucle d'écoute des événements (exécutée dans un thread séparé)."""
+        while not self._stopping.is_set():
+            try:
+                if self._pulse is None:
+                    self._pulse = self._connect()
+                    self._refresh()
+                self._pulse.event_listen()
+                if self._stopping.is_set():
+                    break
+                self._refresh()
+            except Exception as e:
+                # Serveur de son redémarré ou connexion perdue
+                logging.debug(f"Connexion PulseAudio perdue: {e}")
+                if self._pulse is not None:
+                    try:
+                        self._pulse.close()
+                    except Exception:
+                        pass
+                    self._pulse = None
+                self._stopping.wait(self.reconnect_delay)
+
+    def _refresh(self):
+        """Relit les sinks et sources et signale les changements aux abonnés."""
+        pulse = self._pulse
+        default_sink = pulse.server_info().default_sink_name
+        sinks = {sink.name: sink.index for sink in pulse.sink_list()}
+
+        sources = {}
+        default_monitor = None
+        for source in pulse.source_list():
+            monitor_of_sink = getattr(source, 'monitor_of_sink', None)
+            proplist = getattr(source, 'proplist', {}) or {}
+            sources[source.name] = {
+                'name': source.name,
+                'description': source.description,
+                'index': source.index,
+                'monitor_of_sink': monitor_of_sink,
+                'is_monitor': (monitor_of_sink is not None or 'monitor' in source.name.lower()
+                               or proplist.get('device.class') == 'monitor'),
+                **source_format(source)
+            }
+            if default_sink in sinks and monitor_of_sink == sinks[default_sink]:
+                default_monitor = source.name
+
+        with self._lock:
+            previous_sources = set(self._sources)
+            change = DeviceChange(
+                previous_monitor=self._default_monitor,
+                default_monitor=default_monitor,
+                added_sources=frozenset(set(sources) - previous_sources),
+                removed_sources=frozenset(previous_sources - set(sources)),
+            )
+            initial = self.refreshes == 0
+            self._sources = sources
+            self._default_sink = default_sink
+            self._default_monitor = default_monitor
+            self.refreshes += 1
+            listeners = list(self._listeners)
+
+        if initial or (change.previous_monitor == change.default_monitor
+                       and not change.added_sources and not change.removed_sources):
+            return
+        for listener in listeners:
+            try:
+                listener(change)
+            except Exception as e:
+                logging.debug(f"Erreur d'un abonné aux changements de périphériques: {e}")
@@ -0,0 +1,275 @@
+"""Module pour le démon d'enregistrement piloté par un socket de contrôle Unix."""
+
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from src.audio_devices import DeviceRegistry, find_loopback_device, get_device_registry
+from src.audio_recorder import AudioRecorder
+from src.recorderctl import COMMANDS, MAX_MESSAGE_BYTES, default_socket_path
+
+
+def _json_default(value):
+    """Convertit les scalaires NumPy des statistiques pour json.dumps."""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def _report_encode_error(future):
+    """Signale l'échec d'un encodage en arrière-plan terminé après la réponse à stop."""
+    error = future.exception()
+    if error is not None:
+        print(f"✗ Encodage en arrière-plan échoué: {error}", file=sys.stderr)
+
+
+class _ControlHandler(socketserver.StreamRequestHandler):
+    """Traite les requêtes d'une connexion : une ligne JSON par commande."""
+
+    def handle(self):
+        while True:
+            line = self.rfile.readline(MAX_MESSAGE_BYTES)
+            if not line:
+                return
+            try:
+                request = json.loads(line)
+                response = self.server.recorder_daemon.handle_command(request.get('command'))
+            except (ValueError, AttributeError):
+                response = {'ok': False, 'error': "Requête invalide (JSON attendu)"}
+            self.wfile.write(json.dumps(response, default=_json_default).encode() + b"\n")
+
+
+class _ControlServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serveur du socket de contrôle (un thread par connexion)."""
+
+    daemon_threads = True
+
+
+class RecorderDaemon:
+    """
+    Démon gardant la pile audio initialisée entre les enregistrements.
+
+    PortAudio est initialisé, les périphériques énumérés et le périphérique
+    loopback résolu une seule fois, au lancement (voir DeviceRegistry) :
+    démarrer un enregistrement ne coûte plus que l'ouverture du flux. "refresh"
+    énumère à nouveau les périphériques après un branchement. Le démon est
+    piloté par des commandes JSON sur un socket Unix (une ligne par requête et
+    par réponse, voir src.recorderctl) :
+
+        {"command": "start"}   -> {"ok": true, "file": "..."}
+        {"command": "status"}  -> {"ok": true, "recording": true, ...}
+        {"command": "rotate"}  -> {"ok": true}
+        {"command": "save"}    -> {"ok": true, "file": "..."}
+        {"command": "stop"}    -> {"ok": true, "files": [...], "encoding": 0}
+        {"command": "refresh"} -> {"ok": true, "device_index": 3}
+        {"command": "shutdown"}
+
+    En mode relecture, "start" met la capture en veille ("file" vaut null) et
+    "save" enregistre les dernières minutes (voir AudioRecorder.save_replay).
+    Les commandes sont exécutées l'une après l'autre ; une erreur est
+    retournée au client ({"ok": false, "error": "..."}) sans arrêter le démon.
+    """
+
+    def __init__(
+        self,
+        recorder_factory: Callable[..., AudioRecorder],
+        socket_path: Optional[Path] = None,
+        device_registry: Optional[DeviceRegistry] = None
+    ):
+        """
+        Initialise le démon (le socket n'est ouvert qu'à start()).
+
+        Args:
+            recorder_factory: Crée l'enregistreur de chaque enregistrement
+                              (mêmes options à chaque fois) ; reçoit
+                              device_index, le périphérique loopback résolu
+                              au lancement (None si inconnu)
+            socket_path: Socket de contrôle (par défaut default_socket_path())
+            device_registry: Registre de périphériques à initialiser au
+                             lancement (par défaut le registre partagé)
+        """
+        self.recorder_factory = recorder_factory
+        self.socket_path = Path(socket_path or default_socket_path())
+        self.device_registry = device_registry or get_device_registry()
+
+        self.loopback_index: Optional[int] = None
+        self.recorder: Optional[AudioRecorder] = None
+        self.output_file: Optional[Path] = None
+        self.started_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._server: Optional[_ControlServer] = None
+        self._server_thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def warm_up(self):
+        """Initialise PortAudio, énumère les périphériques et résout le loopback."""
+        try:
+            self._resolve_devices()
+        except Exception as e:
+            # Le moteur "pulse" n'a pas besoin de PortAudio : l'erreur ne sera
+            # retournée qu'au démarrage d'un enregistrement PyAudio
+            print(f"⚠ Initialisation de PortAudio impossible: {e}")
+
+    def _resolve_devices(self):
+        """Énumère les périphériques et résout le loopback passé aux enregistreurs."""
+        self.loopback_index = None
+        self.device_registry.list_devices()
+        self.loopback_index = find_loopback_device(self.device_registry)
+
+    def _bind(self) -> _ControlServer:
+        """
+        Ouvre le socket de contrôle, accessible au seul utilisateur courant.
+
+        Raises:
+            RuntimeError: Si un autre démon écoute déjà sur le socket
+        """
+        if self.socket_path.exists():
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(str(self.socket_path))
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Socket laissé par un démon arrêté brutalement
+                self.socket_path.unlink(missing_ok=True)
+            else:
+                raise RuntimeError(f"Un démon d'enregistrement écoute déjà sur {self.socket_path}")
+            finally:
+                probe.close()
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        old_umask = os.umask(0o177)
+        try:
+            server = _ControlServer(str(self.socket_path), _ControlHandler)
+        finally:
+            os.umask(old_umask)
+        server.recorder_daemon = self
+        return server
+
+    def start(self):
+        """
+        Initialise la pile audio et commence à écouter en arrière-plan.
+
+        Raises:
+            RuntimeError: Si un autre démon écoute déjà sur le socket
+        """
+        self.warm_up()
+        self._server = self._bind()
+        self._stopped.clear()
+        self._server_thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._server_thread.start()
+
+    def serve_forever(self):
+        """Démarre le démon et bloque jusqu'à la commande shutdown (ou shutdown())."""
+        self.start()
+        try:
+            self._stopped.wait()
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        """Arrête l'enregistrement en cours, ferme le socket et le supprime."""
+        with self._lock:
+            if self.recorder is not None:
+                self._stop()
+            server, self._server = self._server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+            self.socket_path.unlink(missing_ok=True)
+        self._stopped.set()
+
+    def handle_command(self, command: str) -> Dict:
+        """
+        Exécute une commande de contrôle.
+
+        Args:
+            command: Commande (voir src.recorderctl.COMMANDS)
+
+        Returns:
+            Réponse à envoyer au client
+        """
+        if command not in COMMANDS:
+            return {'ok': False, 'error': f"Commande inconnue: {command}"}
+        if command == "shutdown":
+            # Le serveur ne peut pas attendre la fin de la connexion en cours
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {'ok': True}
+
+        with self._lock:
+            try:
+                return getattr(self, f"_{command}")()
+            except Exception as e:
+                return {'ok': False, 'error': str(e)}
+
+    def _start(self) -> Dict:
+        """Démarre un enregistrement (appelé sous verrou)."""
+        if self.recorder is not None:
+            if self.recorder.is_recording:
+                return {'ok': False, 'error': "L'enregistrement est déjà en cours"}
+            # Capture interrompue (périphérique perdu) : finaliser le fichier
+            self._stop()
+        recorder = self.recorder_factory(device_index=self.loopback_index)
+        self.output_file = recorder.start_recording()
+        self.recorder = recorder
+        self.started_at = time.monotonic()
+        return {'ok': True, 'file': str(self.output_file) if self.output_file else None}
+
+    def _stop(self) -> Dict:
+        """Arrête l'enregistrement et finalise les fichiers (appelé sous verrou)."""
+        recorder = self.recorder
+        if recorder is None:
+            return {'ok': False, 'error': "Aucun enregistrement en cours"}
+        self.recorder = None
+        # Avec un pool d'encodage, les fichiers sont encodés en arrière-plan :
+        # la réponse n'attend pas, les échecs sont signalés par le démon
+        batch = recorder.stop_recording()
+        encoding = 0
+        if batch is not None:
+            for future in batch.futures:
+                future.add_done_callback(_report_encode_error)
+            encoding = sum(not future.done() for future in batch.futures)
+        return {'ok': True, 'files': [str(path) for path in recorder.segment_files], 'encoding': encoding}
+
+    def _refresh(self) -> Dict:
+        """Énumère à nouveau les périphériques et résout le loopback (appelé sous verrou)."""
+        # Sans effet sur le flux en cours : PortAudio n'est terminé qu'à sa fermeture
+        self.device_registry.invalidate()
+        self._resolve_devices()
+        return {'ok': True, 'device_index': self.loopback_index}
+
+    def _rotate(self) -> Dict:
+        """Passe à un nouveau fichier sans interrompre la capture (appelé sous verrou)."""
+        if self.recorder is None or not self.recorder.is_recording:
+            return {'ok': False, 'error': "Aucun enregistrement en cours"}
+        self.recorder.rotate_segment()
+        return {'ok': True}
+
+    def _save(self) -> Dict:
+        """Enregistre la fenêtre de relecture de la capture en veille (appelé sous verrou)."""
+        if self.recorder is None or not self.recorder.is_recording:
+            return {'ok': False, 'error': "Aucun enregistrement en cours"}
+        self.output_file = self.recorder.save_replay()
+        return {'ok': True, 'file': str(self.output_file)}
+
+    def _status(self) -> Dict:
+        """Décrit l'enregistrement en cours (appelé sous verrou)."""
+        recorder = self.recorder
+        if recorder is None:
+            return {'ok': True, 'recording': False}
+        output_file = recorder.segment_files[-1] if recorder.segment_files else self.output_file
+        return {
+            'ok': True,
+            'recording': recorder.is_recording,
+            'file': str(output_file) if output_file else None,
+            'files': [str(path) for path in recorder.segment_files],
+            'device': recorder.device_name,
+            'elapsed': time.monotonic() - self.started_at,
+            'capture': recorder.get_capture_stats(),
+            'levels': recorder.get_levels(),
+            'replay': recorder.get_replay_stats(),
+        }
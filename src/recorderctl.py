@@ -0,0 +1,168 @@
+"""Client du démon d'enregistrement (socket de contrôle Unix).
+
+Ce module n'importe que la bibliothèque standard : une commande envoyée au
+démon ne charge ni PyAudio ni NumPy et s'exécute en quelques millisecondes.
+
+Exemple:
+    python -m src.recorderctl start
+    python -m src.recorderctl status
+    python -m src.recorderctl stop
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+# Commandes acceptées par le démon
+COMMANDS = ("start", "stop", "status", "rotate", "save", "refresh", "shutdown")
+
+# Taille maximale d'une requête ou d'une réponse (une ligne JSON)
+MAX_MESSAGE_BYTES = 1024 * 1024
+
+
+def default_socket_path() -> Path:
+    """
+    Retourne le chemin par défaut du socket de contrôle.
+
+    Returns:
+        `$XDG_RUNTIME_DIR/audio-recorder.sock` (répertoire privé de
+        l'utilisateur), sinon un chemin par utilisateur dans le répertoire
+        temporaire
+    """
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return Path(runtime_dir) / "audio-recorder.sock"
+    return Path(tempfile.gettempdir()) / f"audio-recorder-{os.getuid()}.sock"
+
+
+def send_command(command: str, socket_path: Optional[Path] = None, timeout: float = 30.0) -> Dict:
+    """
+    Envoie une commande au démon et retourne sa réponse.
+
+    Args:
+        command: Commande (voir COMMANDS)
+        socket_path: Socket de contrôle du démon (par défaut default_socket_path())
+        timeout: Délai maximal de la réponse en secondes (l'arrêt attend la
+                 finalisation du fichier)
+
+    Returns:
+        Réponse du démon : {'ok': True, ...} ou {'ok': False, 'error': str}
+
+    Raises:
+        RuntimeError: Si aucun démon n'écoute sur le socket
+        TimeoutError: Si le démon ne répond pas à temps
+    """
+    socket_path = Path(socket_path or default_socket_path())
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        try:
+            client.connect(str(socket_path))
+        except (FileNotFoundError, ConnectionRefusedError):
+            raise RuntimeError(
+                f"Aucun démon d'enregistrement sur {socket_path}.\n"
+                f"Lancez-le avec: python -m src.main --daemon"
+            )
+        client.sendall(json.dumps({'command': command}).encode() + b"\n")
+        with client.makefile('rb') as reader:
+            line = reader.readline(MAX_MESSAGE_BYTES)
+    if not line:
+        raise RuntimeError("Le démon a fermé la connexion sans répondre")
+    return json.loads(line)
+
+
+def format_response(command: str, response: Dict) -> str:
+    """
+    Met en forme la réponse du démon pour la console.
+
+    Args:
+        command: Commande envoyée
+        response: Réponse du démon
+
+    Returns:
+        Texte à afficher
+    """
+    if not response.get('ok'):
+        return f"✗ {response.get('error', 'Erreur inconnue')}"
+    if command == "start":
+        if response['file'] is None:
+            return "✓ Relecture en veille (save pour enregistrer les dernières minutes)"
+        return f"✓ Enregistrement démarré: {response['file']}"
+    if command == "save":
+        return f"✓ Relecture enregistrée dans: {response['file']}"
+    if command == "stop":
+        lines = ["✓ Enregistrement arrêté"]
+        lines.extend(f"  {path}" for path in response['files'])
+        if response.get('encoding'):
+            lines.append(f"  Encodage de {response['encoding']} fichier(s) en arrière-plan")
+        return "\n".join(lines)
+    if command == "rotate":
+        return "✓ Nouveau fichier demandé"
+    if command == "refresh":
+        if response['device_index'] is None:
+            return "✓ Périphériques énumérés (aucun loopback détecté)"
+        return f"✓ Périphériques énumérés, loopback: index {response['device_index']}"
+    if command == "shutdown":
+        return "✓ Démon arrêté"
+    if not response['recording']:
+        return "Aucun enregistrement en cours"
+    replay = response.get('replay')
+    if replay is not None:
+        return (
+            f"◌ Relecture en veille depuis {response['elapsed']:.0f} s\n"
+            f"  Fenêtre: {replay['buffered']:.0f} s sur {replay['capacity']:.0f} s\n"
+            f"  Périphérique: {response['device']}"
+        )
+    return (
+        f"● Enregistrement en cours depuis {response['elapsed']:.0f} s\n"
+        f"  Fichier: {response['file']}\n"
+        f"  Périphérique: {response['device']}\n"
+        f"  Segments: {len(response['files'])}, "
+        f"frames perdues: {response['capture']['dropped_frames']}"
+    )
+
+
+def main(argv=None) -> int:
+    """
+    Point d'entrée du client en ligne de commande.
+
+    Args:
+        argv: Arguments (par défaut sys.argv[1:])
+
+    Returns:
+        Code de sortie (0 si le démon a accepté la commande)
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src.recorderctl",
+        description="Piloter le démon d'enregistrement (python -m src.main --daemon)"
+    )
+    parser.add_argument('command', choices=COMMANDS, help="Commande à envoyer au démon")
+    parser.add_argument(
+        '--socket',
+        type=Path,
+        metavar='PATH',
+        help=f"Socket de contrôle du démon (défaut: {default_socket_path()})"
+    )
+    parser.add_argument('--json', action='store_true', help="Afficher la réponse JSON brute")
+    args = parser.parse_args(argv)
+
+    try:
+        response = send_command(args.command, args.socket)
+    except (RuntimeError, TimeoutError, OSError) as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return 2
+
+    if args.json:
+        print(json.dumps(response, ensure_ascii=False))
+    else:
+        print(format_response(args.command, response),
+              file=sys.stdout if response.get('ok') else sys.stderr)
+    return 0 if response.get('ok') else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""Module pour la fenêtre de relecture : les dernières minutes de PCM capturé, sans encodage."""
+
+import mmap
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional
+
+from src.pcm_buffer import BUFFER_BACKENDS
+
+
+class ReplayBuffer:
+    """
+    Buffer circulaire à capacité fixe conservant le PCM le plus récent.
+
+    Contrairement à RingBuffer, qui rejette les données quand il est plein
+    pour ne rien perdre, l'écriture écrase ici les données les plus
+    anciennes : le buffer contient toujours les `capacity` derniers octets
+    écrits. Il n'est utilisé que par le thread d'encodage (écriture en veille
+    puis lecture à l'enregistrement), aucun verrou n'est donc nécessaire.
+
+    Avec le backend "mmap", la zone est un fichier temporaire anonyme projeté
+    en mémoire : la fenêtre ne compte pas dans le tas Python et ses pages
+    restent récupérables par le système.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        frame_size: int = 1,
+        backend: str = "memory",
+        directory: Optional[Path] = None
+    ):
+        """
+        Alloue la fenêtre de relecture.
+
+        Args:
+            capacity: Capacité en octets (arrondie à un multiple de frame_size)
+            frame_size: Taille d'une frame en octets (canaux × largeur d'échantillon)
+            backend: "memory" (bytearray) ou "mmap" (fichier temporaire projeté)
+            directory: Avec le backend "mmap", répertoire du fichier temporaire
+                       (par défaut celui du système)
+
+        Raises:
+            ValueError: Si la capacité est inférieure à une frame ou si le
+                        backend est inconnu
+        """
+        if frame_size <= 0:
+            raise ValueError("La taille de frame doit être positive")
+        capacity -= capacity % frame_size
+        if capacity <= 0:
+            raise ValueError("La capacité doit contenir au moins une frame")
+        if backend not in BUFFER_BACKENDS:
+            raise ValueError(
+                f"Backend de buffer inconnu: {backend} "
+                f"(valeurs possibles: {', '.join(BUFFER_BACKENDS)})"
+            )
+
+        self.capacity = capacity
+        self.frame_size = frame_size
+        self.backend = backend
+
+        self._file: Optional[BinaryIO] = None
+        self._mapping: Optional[mmap.mmap] = None
+        if backend == "mmap":
+            self._file = tempfile.TemporaryFile(prefix=".replay-", dir=directory)
+            self._file.truncate(capacity)
+            self._mapping = mmap.mmap(self._file.fileno(), capacity)
+            self._view = memoryview(self._mapping)
+        else:
+            self._view = memoryview(bytearray(capacity))
+
+        # Nombre total d'octets écrits depuis la création (compteur monotone)
+        self._write_pos = 0
+
+    @property
+    def size(self) -> int:
+        """Nombre d'octets conservés dans la fenêtre."""
+        return min(self._write_pos, self.capacity)
+
+    @property
+    def overwritten(self) -> int:
+        """Nombre d'octets écrasés (sortis de la fenêtre) depuis la création."""
+        return max(0, self._write_pos - self.capacity)
+
+    def write(self, data):
+        """
+        Ajoute des données en écrasant les plus anciennes si la fenêtre est pleine.
+
+        Args:
+            data: Données brutes (bytes, bytearray ou memoryview), en frames entières
+        """
+        source = memoryview(data).cast('B')
+        size = len(source)
+        if size > self.capacity:
+            # Seule la fin des données tient dans la fenêtre
+            self._write_pos += size - self.capacity
+            source = source[size - self.capacity:]
+            size = self.capacity
+
+        start = self._write_pos % self.capacity
+        first = min(size, self.capacity - start)
+        self._view[start:start + first] = source[:first]
+        if first < size:
+            self._view[:size - first] = source[first:]
+        self._write_pos += size
+
+    def views(self) -> List[memoryview]:
+        """
+        Retourne des vues sur le contenu de la fenêtre, du plus ancien au plus récent.
+
+        Les vues pointent directement dans le buffer : elles doivent être
+        consommées avant la prochaine écriture.
+
+        Returns:
+            Une ou deux vues (la fenêtre peut franchir la fin du buffer),
+            aucune si le buffer est vide
+        """
+        if self._write_pos <= self.capacity:
+            return [self._view[:self._write_pos]] if self._write_pos else []
+        start = self._write_pos % self.capacity
+        return [view for view in (self._view[start:], self._view[:start]) if len(view)]
+
+    def clear(self):
+        """Vide la fenêtre (la mémoire reste allouée)."""
+        self._write_pos = 0
+
+    def close(self):
+        """Libère la mémoire ou le fichier temporaire."""
+        self._view.release()
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def get_stats(self) -> Dict:
+        """
+        Retourne les compteurs de la fenêtre.
+
+        Returns:
+            Dictionnaire contenant: capacity, size, overwritten (en octets)
+        """
+        return {
+            'capacity': self.capacity,
+            'size': self.size,
+            'overwritten': self.overwritten,
+        }
@@ -0,0 +1,191 @@
+"""Module pour la conversion de taux d'échantillonnage et de canaux du PCM (NumPy)."""
+
+import math
+from typing import Optional
+
+import numpy as np
+
+from src.stream_mixer import SAMPLE_DTYPES
+
+# Passages par zéro du sinus cardinal de chaque côté du filtre, à la
+# fréquence la plus basse (qualité de l'anti-repliement)
+DEFAULT_ZERO_CROSSINGS = 16
+
+# Fréquence de coupure relative à la plus basse des deux fréquences de Nyquist
+DEFAULT_ROLLOFF = 0.94
+
+# Paramètre de la fenêtre de Kaiser (atténuation d'environ 80 dB hors bande)
+KAISER_BETA = 8.0
+
+
+def convert_channels(frames: np.ndarray, channels: int) -> np.ndarray:
+    """
+    Convertit des frames (frames x canaux) vers un autre nombre de canaux.
+
+    La réduction en mono fait la moyenne des canaux, un signal mono est
+    dupliqué sur tous les canaux ; sinon les premiers canaux sont conservés.
+
+    Args:
+        frames: Échantillons en virgule flottante, une ligne par frame
+        channels: Nombre de canaux voulu
+
+    Returns:
+        Frames sur `channels` canaux
+    """
+    source_channels = frames.shape[1]
+    if source_channels == channels:
+        return frames
+    if channels == 1:
+        return frames.mean(axis=1, keepdims=True)
+    if source_channels == 1:
+        return np.repeat(frames, channels, axis=1)
+    return frames[:, :channels]
+
+
+def design_polyphase_filter(up: int, down: int, zero_crossings: int, rolloff: float) -> np.ndarray:
+    """
+    Calcule le filtre passe-bas polyphase d'un rapport de conversion up/down.
+
+    Args:
+        up: Facteur de suréchantillonnage
+        down: Facteur de sous-échantillonnage
+        zero_crossings: Passages par zéro de chaque côté
+        rolloff: Coupure relative à la plus basse des deux fréquences de Nyquist
+
+    Returns:
+        Tableau (up x taps) : coefficients de chaque phase, dans l'ordre
+        des échantillons d'entrée les plus anciens aux plus récents
+    """
+    taps = 2 * zero_crossings * max(1, math.ceil(down / up))
+    length = taps * up
+    cutoff = rolloff * 0.5 / max(up, down)
+    t = np.arange(length) - (length - 1) / 2.0
+    prototype = 2.0 * cutoff * np.sinc(2.0 * cutoff * t) * np.kaiser(length, KAISER_BETA)
+    # Phase p : coefficients h[p + k*up], appliqués de l'échantillon le plus
+    # récent (k = 0) au plus ancien ; retournés pour le produit avec une fenêtre
+    polyphase = prototype.reshape(taps, up).T[:, ::-1].copy()
+    # Gain unitaire en continu pour chaque phase
+    polyphase /= polyphase.sum(axis=1, keepdims=True)
+    return polyphase
+
+
+class Resampler:
+    """
+    Conversion en continu du PCM entrelacé vers un autre taux et nombre de canaux.
+
+    Le rapport de taux est réduit à une fraction up/down et appliqué par un
+    filtre polyphase (sinus cardinal fenêtré, anti-repliement) entièrement
+    vectorisé : chaque appel calcule toutes les frames de sortie d'un chunk
+    en une opération NumPy. Les dernières frames de chaque chunk sont
+    conservées pour le suivant : découper l'entrée ne change pas la sortie.
+
+    La réduction de canaux est faite avant le filtrage (moins de calcul),
+    l'augmentation après. Le filtre retarde le signal d'environ
+    `zero_crossings` frames à la plus basse des deux fréquences.
+    """
+
+    def __init__(
+        self,
+        input_rate: int,
+        output_rate: int,
+        input_channels: int,
+        output_channels: Optional[int] = None,
+        sample_width: int = 2,
+        zero_crossings: int = DEFAULT_ZERO_CROSSINGS,
+        rolloff: float = DEFAULT_ROLLOFF
+    ):
+        """
+        Initialise le convertisseur.
+
+        Args:
+            input_rate: Taux d'échantillonnage reçu en Hz
+            output_rate: Taux d'échantillonnage produit en Hz
+            input_channels: Nombre de canaux reçus
+            output_channels: Nombre de canaux produits (par défaut inchangé)
+            sample_width: Largeur d'échantillon en octets (2 ou 4), en entrée et en sortie
+            zero_crossings: Longueur du filtre (voir DEFAULT_ZERO_CROSSINGS)
+            rolloff: Coupure relative à la fréquence de Nyquist la plus basse
+
+        Raises:
+            ValueError: Si la largeur d'échantillon n'est pas supportée
+        """
+        if sample_width not in SAMPLE_DTYPES:
+            raise ValueError(f"Largeur d'échantillon non supportée pour la conversion: {sample_width}")
+
+        self.input_rate = input_rate
+        self.output_rate = output_rate
+        self.input_channels = input_channels
+        self.output_channels = output_channels or input_channels
+        self.sample_width = sample_width
+        self.input_frame_size = input_channels * sample_width
+        self.output_frame_size = self.output_channels * sample_width
+
+        self._dtype = SAMPLE_DTYPES[sample_width]
+        info = np.iinfo(self._dtype)
+        self._min, self._max = float(info.min), float(info.max)
+        # Canaux traités par le filtre
+        self._filter_channels = min(self.input_channels, self.output_channels)
+
+        divisor = math.gcd(input_rate, output_rate)
+        self.up = output_rate // divisor
+        self.down = input_rate // divisor
+        if self.up == self.down:
+            self._filter = None
+            self._history = None
+        else:
+            self._filter = design_polyphase_filter(self.up, self.down, zero_crossings, rolloff)
+            taps = self._filter.shape[1]
+            self._history = np.zeros((taps - 1, self._filter_channels), dtype=np.float64)
+        # Frames d'entrée déjà consommées et index de la prochaine frame de sortie
+        self._consumed = 0
+        self._next_output = 0
+
+    def _filter_frames(self, frames: np.ndarray) -> np.ndarray:
+        """Applique le filtre polyphase à des frames en virgule flottante."""
+        filter_bank = self._filter
+        taps = filter_bank.shape[1]
+        buffer = np.concatenate((self._history, frames))
+        total = self._consumed + len(frames)
+
+        # Frames de sortie dont la dernière frame d'entrée nécessaire est disponible
+        end = -(-total * self.up // self.down)
+        positions = np.arange(self._next_output, end, dtype=np.int64) * self.down
+        phases = positions % self.up
+        # Début de la fenêtre de chaque frame de sortie dans le buffer
+        starts = positions // self.up - self._consumed
+
+        windows = np.lib.stride_tricks.sliding_window_view(buffer, taps, axis=0)
+        # (frames x canaux x taps) @ (frames x taps x 1)
+        output = np.matmul(windows[starts], filter_bank[phases][:, :, np.newaxis])[:, :, 0]
+
+        self._history = buffer[len(buffer) - (taps - 1):]
+        self._consumed = total
+        self._next_output = end
+        return output
+
+    def process(self, data) -> bytes:
+        """
+        Convertit un chunk de PCM entrelacé.
+
+        Args:
+            data: Données audio brutes alignées sur les frames
+
+        Returns:
+            PCM converti (peut être vide si le chunk est trop court)
+        """
+        frame_count = len(data) // self.input_frame_size
+        if frame_count == 0:
+            return b''
+        samples = np.frombuffer(data, dtype=self._dtype, count=frame_count * self.input_channels)
+        frames = samples.reshape(frame_count, self.input_channels).astype(np.float64)
+
+        if self.output_channels < self.input_channels:
+            frames = convert_channels(frames, self.output_channels)
+        if self._filter is not None:
+            frames = self._filter_frames(frames)
+        if self.output_channels > frames.shape[1]:
+            frames = convert_channels(frames, self.output_channels)
+
+        np.rint(frames, out=frames)
+        np.clip(frames, self._min, self._max, out=frames)
+        return frames.astype(self._dtype).tobytes()
@@ -0,0 +1,197 @@
+"""Module pour le buffer circulaire entre le thread de capture et l'encodeur."""
+
+import threading
+from typing import Dict, Optional
+
+
+class RingBuffer:
+    """
+    Buffer circulaire d'octets à capacité fixe, préalloué.
+
+    Conçu pour un seul producteur (thread de capture) et un seul consommateur
+    (thread d'encodage) : chaque position n'est modifiée que par un seul côté,
+    aucun verrou n'est donc nécessaire sur le chemin de données. Le consommateur
+    lit des vues (memoryview) directement dans le buffer, sans copie.
+
+    Lorsque le buffer est plein, les nouvelles données sont rejetées et comptées
+    dans dropped_frames plutôt que de bloquer le producteur.
+    """
+
+    def __init__(self, capacity: int, frame_size: int = 1):
+        """
+        Initialise le buffer circulaire.
+
+        Args:
+            capacity: Capacité en octets (arrondie à un multiple de frame_size)
+            frame_size: Taille d'une frame en octets (canaux × largeur d'échantillon)
+
+        Raises:
+            ValueError: Si la capacité est inférieure à une frame
+        """
+        if frame_size <= 0:
+            raise ValueError("La taille de frame doit être positive")
+        capacity -= capacity % frame_size
+        if capacity <= 0:
+            raise ValueError("La capacité doit contenir au moins une frame")
+
+        self.capacity = capacity
+        self.frame_size = frame_size
+
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+
+        # Compteurs monotones : _write_pos n'est modifié que par le producteur,
+        # _read_pos uniquement par le consommateur
+        self._write_pos = 0
+        self._read_pos = 0
+
+        self.high_water_mark = 0
+        self.dropped_frames = 0
+        self._closed = False
+        self._data_available = threading.Event()
+
+    @property
+    def fill_level(self) -> int:
+        """Nombre d'octets en attente de lecture."""
+        return self._write_pos - self._read_pos
+
+    @property
+    def free_space(self) -> int:
+        """Nombre d'octets pouvant encore être écrits."""
+        return self.capacity - self.fill_level
+
+    @property
+    def closed(self) -> bool:
+        """Indique si le producteur a signalé la fin du flux."""
+        return self._closed
+
+    def write(self, data) -> bool:
+        """
+        Copie des données dans le buffer (côté producteur).
+
+        Args:
+            data: Données brutes (bytes, bytearray ou memoryview)
+
+        Returns:
+            True si les données ont été écrites, False si elles ont été
+            rejetées faute de place (comptabilisées dans dropped_frames)
+        """
+        size = len(data)
+        if size == 0:
+            return True
+
+        if size > self.free_space:
+            self.dropped_frames += size // self.frame_size
+            return False
+
+        source = memoryview(data).cast('B')
+        start = self._write_pos % self.capacity
+        first = min(size, self.capacity - start)
+        self._view[start:start + first] = source[:first]
+        if first < size:
+            self._view[:size - first] = source[first:]
+
+        self._write_pos += size
+
+        fill = self.fill_level
+        if fill > self.high_water_mark:
+            self.high_water_mark = fill
+
+        self._data_available.set()
+        return True
+
+    def peek(self, max_bytes: Optional[int] = None) -> memoryview:
+        """
+        Retourne une vue sur la zone contiguë lisible (côté consommateur).
+
+        La vue pointe directement dans le buffer : elle doit être consommée
+        avant l'appel à advance(). Sa taille est un multiple de frame_size.
+
+        Args:
+            max_bytes: Taille maximale de la vue (optionnel)
+
+        Returns:
+            Vue mémoire sur les données disponibles (éventuellement vide)
+        """
+        available = self.fill_level
+        if max_bytes is not None:
+            available = min(available, max_bytes - max_bytes % self.frame_size)
+
+        start = self._read_pos % self.capacity
+        size = min(available, self.capacity - start)
+        return self._view[start:start + size]
+
+    def copy_into(self, destination, size: int) -> int:
+        """
+        Copie des données lisibles dans un buffer externe sans les libérer (côté consommateur).
+
+        Contrairement à peek(), la copie franchit la fin du buffer circulaire.
+
+        Args:
+            destination: Buffer modifiable (bytearray, memoryview, tableau NumPy...)
+            size: Nombre maximal d'octets à copier
+
+        Returns:
+            Nombre d'octets copiés (multiple de frame_size)
+        """
+        size = min(size, self.fill_level)
+        size -= size % self.frame_size
+        target = memoryview(destination).cast('B')
+        start = self._read_pos % self.capacity
+        first = min(size, self.capacity - start)
+        target[:first] = self._view[start:start + first]
+        if first < size:
+            target[first:size] = self._view[:size - first]
+        return size
+
+    def advance(self, size: int):
+        """
+        Libère des octets déjà lus (côté consommateur).
+
+        Args:
+            size: Nombre d'octets à libérer
+
+        Raises:
+            ValueError: Si size dépasse le nombre d'octets disponibles
+        """
+        if size > self.fill_level:
+            raise ValueError("Impossible de libérer plus d'octets que disponibles")
+        self._read_pos += size
+
+    def wait_for_data(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attend que des données soient disponibles ou que le flux soit fermé.
+
+        Args:
+            timeout: Délai maximal d'attente en secondes
+
+        Returns:
+            True si des données sont disponibles
+        """
+        if self.fill_level > 0:
+            return True
+        self._data_available.clear()
+        # Revérifier après clear() pour ne pas manquer une écriture concurrente
+        if self.fill_level > 0 or self._closed:
+            return self.fill_level > 0
+        self._data_available.wait(timeout)
+        return self.fill_level > 0
+
+    def close(self):
+        """Signale la fin du flux au consommateur (côté producteur)."""
+        self._closed = True
+        self._data_available.set()
+
+    def get_stats(self) -> Dict:
+        """
+        Retourne les compteurs du buffer.
+
+        Returns:
+            Dictionnaire contenant: capacity, fill_level, high_water_mark, dropped_frames
+        """
+        return {
+            'capacity': self.capacity,
+            'fill_level': self.fill_level,
+            'high_water_mark': self.high_water_mark,
+            'dropped_frames': self.dropped_frames,
+        }
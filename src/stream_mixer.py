@@ -0,0 +1,480 @@
+"""Module pour le mixage de plusieurs flux de capture en une seule entrée d'encodeur."""
+
+import math
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.ring_buffer import RingBuffer
+
+# Modes de combinaison des sources
+MIX_MODES = ("mix", "interleave")
+
+# Type NumPy correspondant à la largeur d'échantillon (octets)
+SAMPLE_DTYPES = {
+    2: np.int16,
+    4: np.int32,
+}
+
+# Écart d'horloge maximal corrigé entre deux périphériques (0,5 %)
+MAX_DRIFT = 0.005
+
+# Durée d'audio minimale avant d'estimer la dérive d'une horloge (secondes)
+DRIFT_MIN_SECONDS = 2.0
+
+# Délai sans données après lequel une source est considérée comme bloquée (secondes)
+DEFAULT_STALL_TIMEOUT = 1.0
+
+
+class SourceClock:
+    """
+    Estimation du débit réel d'une source à partir de l'horodatage de ses buffers.
+
+    Le débit est la pente de la régression linéaire des frames reçues en
+    fonction du temps, mise à jour en O(1) à chaque buffer : la gigue
+    d'ordonnancement des arrivées est lissée sur toute la durée de l'enregistrement.
+    """
+
+    def __init__(self, nominal_rate: int):
+        """
+        Initialise l'estimateur.
+
+        Args:
+            nominal_rate: Taux d'échantillonnage demandé en Hz
+        """
+        self.nominal_rate = nominal_rate
+        self.start_time: Optional[float] = None
+        self.frames = 0
+        self._origin: Optional[float] = None
+        self._count = 0
+        self._sum_t = 0.0
+        self._sum_f = 0.0
+        self._sum_tt = 0.0
+        self._sum_tf = 0.0
+
+    def add(self, frames: int, timestamp: float):
+        """
+        Enregistre l'arrivée d'un buffer.
+
+        Args:
+            frames: Nombre de frames du buffer
+            timestamp: Instant d'arrivée (fin du buffer) sur l'horloge monotone, en secondes
+        """
+        if self._origin is None:
+            self._origin = timestamp
+        if self.start_time is None:
+            # Instant estimé du premier échantillon capturé
+            self.start_time = timestamp - frames / self.nominal_rate
+
+        self.frames += frames
+        t = timestamp - self._origin
+        f = float(self.frames)
+        self._count += 1
+        self._sum_t += t
+        self._sum_f += f
+        self._sum_tt += t * t
+        self._sum_tf += t * f
+
+    def restart(self):
+        """Repart d'une nouvelle observation (après une interruption), sans changer start_time."""
+        self.frames = 0
+        self._origin = None
+        self._count = 0
+        self._sum_t = 0.0
+        self._sum_f = 0.0
+        self._sum_tt = 0.0
+        self._sum_tf = 0.0
+
+    def rate(self) -> float:
+        """
+        Retourne le débit estimé en frames par seconde.
+
+        Returns:
+            Débit mesuré, ou le débit nominal tant que l'observation est trop courte
+        """
+        if self._count < 3 or self.frames < DRIFT_MIN_SECONDS * self.nominal_rate:
+            return float(self.nominal_rate)
+
+        denominator = self._count * self._sum_tt - self._sum_t * self._sum_t
+        if denominator <= 0:
+            return float(self.nominal_rate)
+        slope = (self._count * self._sum_tf - self._sum_t * self._sum_f) / denominator
+        return slope if slope > 0 else float(self.nominal_rate)
+
+
+class StreamMixer:
+    """
+    Combine plusieurs flux de capture en un seul flux PCM, à l'échantillon près.
+
+    Chaque source écrit dans son propre buffer circulaire (push(), côté capture)
+    en horodatant ses buffers. Le consommateur (read(), côté encodage) :
+
+    - aligne les débuts des sources d'après l'instant de leur premier échantillon ;
+    - corrige la dérive d'horloge des sources par rapport à la première (la
+      référence) en les rééchantillonnant par interpolation linéaire ;
+    - les additionne (mode "mix") ou juxtapose leurs canaux (mode "interleave").
+
+    Une source qui ne reçoit plus rien pendant `stall_timeout` sans être
+    fermée (périphérique débranché, sortie suspendue) n'arrête pas le mixage :
+    elle est complétée par du silence (compté dans padded_frames) jusqu'à ce
+    que ses données reviennent, pour que les buffers des autres sources ne
+    débordent pas.
+
+    Tous les calculs sont vectorisés avec NumPy sur des blocs de frames.
+    """
+
+    def __init__(
+        self,
+        source_channels: Sequence[int],
+        channels: int,
+        sample_rate: int,
+        sample_width: int = 2,
+        mode: str = "mix",
+        gains: Optional[Sequence[float]] = None,
+        buffer_seconds: float = 10.0,
+        block_frames: int = 1024,
+        stall_timeout: float = DEFAULT_STALL_TIMEOUT
+    ):
+        """
+        Initialise le mixeur.
+
+        Args:
+            source_channels: Nombre de canaux capturés par chaque source
+            channels: Nombre de canaux de sortie en mode "mix"
+            sample_rate: Taux d'échantillonnage commun en Hz
+            sample_width: Largeur d'échantillon en octets (2 ou 4)
+            mode: "mix" (somme des sources) ou "interleave" (canaux juxtaposés)
+            gains: Gain appliqué à chaque source (par défaut 1.0)
+            buffer_seconds: Durée d'audio que le buffer de chaque source peut absorber
+            block_frames: Nombre maximal de frames produites par read()
+            stall_timeout: Délai sans données après lequel une source ouverte
+                           est complétée par du silence (secondes)
+
+        Raises:
+            ValueError: Si un paramètre n'est pas supporté
+        """
+        if mode not in MIX_MODES:
+            raise ValueError(
+                f"Mode de mixage inconnu: {mode} (valeurs possibles: {', '.join(MIX_MODES)})"
+            )
+        if sample_width not in SAMPLE_DTYPES:
+            raise ValueError(f"Largeur d'échantillon non supportée pour le mixage: {sample_width}")
+        if not source_channels:
+            raise ValueError("Au moins une source est nécessaire")
+        if gains is not None and len(gains) != len(source_channels):
+            raise ValueError("Un gain doit être fourni pour chaque source")
+
+        self.source_channels = list(source_channels)
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.mode = mode
+        self.block_frames = block_frames
+        self.stall_timeout = stall_timeout
+        self.output_channels = channels if mode == "mix" else sum(self.source_channels)
+        self.frame_size = self.output_channels * sample_width
+        self.gains = list(gains) if gains is not None else [1.0] * len(self.source_channels)
+
+        self.dtype = np.dtype(SAMPLE_DTYPES[sample_width])
+        limits = np.iinfo(self.dtype)
+        self._min, self._max = float(limits.min), float(limits.max)
+        # float32 est exact pour 16 bits ; les échantillons 32 bits sont mixés en float64
+        self._work_dtype = np.dtype(np.float32 if sample_width == 2 else np.float64)
+
+        self.buffers = [
+            RingBuffer(
+                capacity=int(sample_rate * buffer_seconds) * source * sample_width,
+                frame_size=source * sample_width
+            )
+            for source in self.source_channels
+        ]
+        self.clocks = [SourceClock(sample_rate) for _ in self.source_channels]
+        self.ratios = [1.0] * len(self.source_channels)
+        # Frames de silence ajoutées pour chaque source bloquée
+        self.padded_frames = [0] * len(self.source_channels)
+
+        # Instant (horloge monotone) du premier buffer reçu et du dernier buffer de chaque source
+        self._first_arrival: Optional[float] = None
+        self._last_arrivals: List[Optional[float]] = [None] * len(self.source_channels)
+
+        # Position fractionnaire de lecture de chaque source (rééchantillonnage)
+        self._phases = [0.0] * len(self.source_channels)
+        # Frames à ignorer au début de chaque source pour l'alignement (None = non calculé)
+        self._skip: Optional[List[int]] = None
+
+        # Buffers de travail préalloués
+        input_frames = int(block_frames * (1 + MAX_DRIFT)) + 3
+        self._inputs = [np.zeros((input_frames, source), dtype=self.dtype) for source in self.source_channels]
+        self._ramp = np.arange(block_frames, dtype=np.float64)
+        self._mix = np.zeros((block_frames, self.output_channels), dtype=self._work_dtype)
+        self._output = np.zeros((block_frames, self.output_channels), dtype=self.dtype)
+
+        self._data_available = threading.Event()
+
+    @property
+    def closed(self) -> bool:
+        """Indique si toutes les sources ont signalé la fin de leur flux."""
+        return all(buffer.closed for buffer in self.buffers)
+
+    def push(self, source: int, data, timestamp: Optional[float] = None) -> bool:
+        """
+        Ajoute un buffer capturé par une source (côté capture).
+
+        Args:
+            source: Numéro de la source
+            data: Données brutes de la source
+            timestamp: Instant d'arrivée du buffer (par défaut time.monotonic())
+
+        Returns:
+            True si les données ont été écrites, False si elles ont été rejetées
+        """
+        now = time.monotonic()
+        if timestamp is None:
+            timestamp = now
+        last_arrival = self._last_arrivals[source]
+        if last_arrival is not None and now - last_arrival > self.stall_timeout:
+            # Reprise après une interruption : la pente mesurée avant n'est plus valable
+            self.clocks[source].restart()
+        if self._first_arrival is None:
+            self._first_arrival = now
+        self._last_arrivals[source] = now
+        buffer = self.buffers[source]
+        # L'horloge compte aussi les frames rejetées : elles ont bien été produites
+        self.clocks[source].add(len(data) // buffer.frame_size, timestamp)
+        written = buffer.write(data)
+        self._data_available.set()
+        return written
+
+    def close(self, source: Optional[int] = None):
+        """
+        Signale la fin du flux d'une source, ou de toutes.
+
+        Args:
+            source: Numéro de la source (None = toutes les sources)
+        """
+        buffers = self.buffers if source is None else [self.buffers[source]]
+        for buffer in buffers:
+            buffer.close()
+        self._data_available.set()
+
+    def wait_for_data(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attend qu'une source reçoive des données ou que toutes soient fermées.
+
+        Args:
+            timeout: Délai maximal d'attente en secondes
+
+        Returns:
+            True si des données sont disponibles
+        """
+        if self._has_data():
+            return True
+        self._data_available.clear()
+        if self._has_data() or self.closed:
+            return self._has_data()
+        self._data_available.wait(timeout)
+        return self._has_data()
+
+    def _has_data(self) -> bool:
+        """Indique si au moins une source a des données en attente."""
+        return any(buffer.fill_level > 0 for buffer in self.buffers)
+
+    def read(self) -> memoryview:
+        """
+        Produit le prochain bloc mixé (côté encodage).
+
+        La vue retournée pointe dans un buffer de travail réutilisé : elle doit
+        être consommée avant l'appel suivant.
+
+        Returns:
+            Frames PCM de sortie (éventuellement vide si les sources n'ont pas
+            encore assez de données)
+        """
+        flushing = self.closed
+        stalled = [False] * len(self.buffers) if flushing else self._stalled_sources()
+        if not self._align(flushing, stalled):
+            return memoryview(b'')
+
+        self._update_ratios()
+
+        counts = [self._readable_frames(source, flushing) for source in range(len(self.buffers))]
+        # Ne pas attendre les sources bloquées : elles seront complétées par du silence
+        live = [count for count, stalled_source in zip(counts, stalled) if not stalled_source]
+        frames = max(counts) if flushing or not live else min(live)
+        frames = min(frames, self.block_frames)
+        if frames == 0:
+            if flushing:
+                # Reliquat inférieur à une frame de sortie
+                for buffer in self.buffers:
+                    buffer.advance(buffer.fill_level)
+            return memoryview(b'')
+
+        mix = self._mix[:frames]
+        mix.fill(0.0)
+        column = 0
+        for source, buffer in enumerate(self.buffers):
+            count = min(frames, counts[source])
+            if stalled[source]:
+                self.padded_frames[source] += frames - count
+            samples = self._resample(source, count)
+            width = samples.shape[1]
+            if self.mode == "interleave":
+                mix[:count, column:column + width] = samples
+                column += width
+            elif width == 1 or width == self.output_channels:
+                mix[:count] += samples
+            elif self.output_channels == 1:
+                mix[:count] += samples.mean(axis=1, keepdims=True)
+            elif width > self.output_channels:
+                mix[:count] += samples[:, :self.output_channels]
+            else:
+                mix[:count, :width] += samples
+
+        np.rint(mix, out=mix)
+        np.clip(mix, self._min, self._max, out=mix)
+        output = self._output[:frames]
+        np.copyto(output, mix, casting='unsafe')
+        return memoryview(output).cast('B')
+
+    def _stalled_sources(self) -> List[bool]:
+        """
+        Repère les sources qui ne reçoivent plus de données.
+
+        Returns:
+            Pour chaque source, True si elle est fermée ou sans buffer depuis
+            plus de stall_timeout (depuis le premier buffer de toutes les
+            sources si elle n'a encore rien reçu)
+        """
+        if self._first_arrival is None:
+            return [False] * len(self.buffers)
+        now = time.monotonic()
+        return [
+            buffer.closed or now - (last_arrival or self._first_arrival) > self.stall_timeout
+            for buffer, last_arrival in zip(self.buffers, self._last_arrivals)
+        ]
+
+    def _align(self, flushing: bool, stalled: List[bool]) -> bool:
+        """
+        Ignore le début des sources démarrées avant les autres.
+
+        Args:
+            flushing: True si toutes les sources sont fermées
+            stalled: Sources bloquées (voir _stalled_sources), qui ne sont pas attendues
+
+        Returns:
+            True si toutes les sources sont alignées
+        """
+        if self._skip is None:
+            starts = [clock.start_time for clock in self.clocks]
+            waiting = [start is None and not stalled[source] for source, start in enumerate(starts)]
+            if any(waiting) and not flushing:
+                return False
+            known = [start for start in starts if start is not None]
+            latest = max(known) if known else 0.0
+            self._skip = [
+                int(round((latest - start) * self.sample_rate)) if start is not None else 0
+                for start in starts
+            ]
+
+        aligned = True
+        for source, buffer in enumerate(self.buffers):
+            skip = self._skip[source]
+            if skip <= 0:
+                continue
+            available = buffer.fill_level // buffer.frame_size
+            dropped = min(skip, available)
+            buffer.advance(dropped * buffer.frame_size)
+            self._skip[source] = skip - dropped
+            if self._skip[source] > 0 and not (flushing or stalled[source]):
+                aligned = False
+        return aligned
+
+    def _update_ratios(self):
+        """Met à jour le rapport de débit de chaque source par rapport à la référence."""
+        reference = self.clocks[0].rate()
+        for source in range(1, len(self.clocks)):
+            ratio = self.clocks[source].rate() / reference
+            self.ratios[source] = min(max(ratio, 1.0 - MAX_DRIFT), 1.0 + MAX_DRIFT)
+
+    def _readable_frames(self, source: int, flushing: bool) -> int:
+        """
+        Calcule le nombre de frames de sortie productibles pour une source.
+
+        Args:
+            source: Numéro de la source
+            flushing: True si toutes les sources sont fermées
+
+        Returns:
+            Nombre de frames de sortie
+        """
+        buffer = self.buffers[source]
+        available = buffer.fill_level // buffer.frame_size
+        if source == 0:
+            return available
+        # L'interpolation de la position p nécessite les frames floor(p) et floor(p) + 1,
+        # sauf en fin de flux où la dernière frame est répétée
+        last = available if flushing else available - 1
+        span = (last - self._phases[source]) / self.ratios[source]
+        return max(0, math.ceil(span))
+
+    def _resample(self, source: int, count: int) -> np.ndarray:
+        """
+        Lit et consomme les frames d'une source correspondant à count frames de sortie.
+
+        Args:
+            source: Numéro de la source
+            count: Nombre de frames de sortie
+
+        Returns:
+            Tableau (count, canaux de la source) en virgule flottante, gain appliqué
+        """
+        buffer = self.buffers[source]
+        scratch = self._inputs[source]
+        gain = self.gains[source]
+
+        if source == 0:
+            copied = buffer.copy_into(scratch, count * buffer.frame_size)
+            buffer.advance(copied)
+            samples = scratch[:count].astype(self._work_dtype)
+        else:
+            phase = self._phases[source]
+            ratio = self.ratios[source]
+            positions = phase + self._ramp[:count] * ratio
+            needed = int(positions[-1]) + 2 if count else 0
+            copied = buffer.copy_into(scratch, needed * buffer.frame_size) // buffer.frame_size
+
+            indexes = positions.astype(np.intp)
+            fractions = (positions - indexes).astype(self._work_dtype)[:, None]
+            lower = scratch[indexes].astype(self._work_dtype)
+            upper = scratch[np.minimum(indexes + 1, copied - 1)].astype(self._work_dtype)
+            samples = lower + (upper - lower) * fractions
+
+            end = phase + count * ratio
+            consumed = min(int(end), buffer.fill_level // buffer.frame_size)
+            buffer.advance(consumed * buffer.frame_size)
+            self._phases[source] = end - consumed
+
+        if gain != 1.0:
+            samples *= gain
+        return samples
+
+    def get_stats(self) -> Dict:
+        """
+        Retourne les compteurs agrégés des buffers des sources.
+
+        Returns:
+            Dictionnaire contenant: capacity, fill_level, high_water_mark,
+            dropped_frames (comme RingBuffer.get_stats), drift_ppm (écart
+            d'horloge corrigé pour chaque source, en parties par million) et
+            padded_frames (silence ajouté pour chaque source bloquée)
+        """
+        stats = [buffer.get_stats() for buffer in self.buffers]
+        return {
+            'capacity': sum(stat['capacity'] for stat in stats),
+            'fill_level': sum(stat['fill_level'] for stat in stats),
+            'high_water_mark': max(stat['high_water_mark'] for stat in stats),
+            'dropped_frames': sum(stat['dropped_frames'] for stat in stats),
+            'drift_ppm': [(ratio - 1.0) * 1e6 for ratio in self.ratios],
+            'padded_frames': list(self.padded_frames),
+        }
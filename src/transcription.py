@@ -0,0 +1,365 @@
+"""Module pour la transcription en continu de l'audio capturé."""
+
+import threading
+import time
+from collections import namedtuple
+from typing import Callable, Dict, Iterator, List, Optional
+
+from src.resample import Resampler
+from src.ring_buffer import RingBuffer
+
+# Résultat de reconnaissance : texte, définitif ou provisoire, stabilité
+# (0 à 1, résultats provisoires) et fin du passage reconnu en secondes
+# depuis le début de l'audio transmis
+TranscriptionResult = namedtuple('TranscriptionResult', 'text is_final stability end_time')
+
+# Durée maximale d'un flux de reconnaissance avant d'en ouvrir un nouveau
+# (l'API Speech-to-Text limite un flux à environ 5 minutes)
+MAX_STREAM_SECONDS = 290.0
+
+# Format transmis par défaut au service : suffisant pour la parole et six
+# fois moins volumineux que du stéréo 48 kHz
+SPEECH_SAMPLE_RATE = 16000
+SPEECH_CHANNELS = 1
+
+GOOGLE_SPEECH_MISSING_MESSAGE = (
+    "google-cloud-speech n'est pas installé. "
+    "Installez-le pour la transcription: uv pip install google-cloud-speech"
+)
+
+
+class SpeechBackend:
+    """
+    Interface commune des services de reconnaissance vocale en continu.
+
+    Une sous-classe implémente streaming_recognize() : elle consomme les
+    chunks PCM au fur et à mesure et produit les résultats dès qu'ils sont
+    disponibles, sans attendre la fin de l'audio.
+    """
+
+    def streaming_recognize(
+        self,
+        audio_chunks: Iterator[bytes],
+        sample_rate: int,
+        channels: int
+    ) -> Iterator[TranscriptionResult]:
+        """
+        Reconnaît un flux PCM 16 bits entrelacé.
+
+        Args:
+            audio_chunks: Chunks PCM, produits jusqu'à la fin du flux
+            sample_rate: Taux d'échantillonnage en Hz
+            channels: Nombre de canaux
+
+        Yields:
+            Résultats provisoires et définitifs, end_time relatif au début du flux
+        """
+        raise NotImplementedError
+
+
+def load_speech():
+    """Importe le client Google Cloud Speech (chargement coûteux, à la demande)."""
+    try:
+        from google.cloud import speech
+    except ImportError as e:
+        raise RuntimeError(GOOGLE_SPEECH_MISSING_MESSAGE) from e
+    return speech
+
+
+class GoogleSpeechBackend(SpeechBackend):
+    """Reconnaissance en continu via l'API Google Cloud Speech-to-Text (streaming_recognize)."""
+
+    def __init__(
+        self,
+        language_code: str = "fr-FR",
+        model: str = "default",
+        interim_results: bool = True,
+        client=None
+    ):
+        """
+        Initialise le service (le client n'est créé qu'au premier flux).
+
+        Args:
+            language_code: Langue de l'audio (par défaut "fr-FR")
+            model: Modèle de reconnaissance
+            interim_results: Produire des résultats provisoires pendant la parole
+            client: SpeechClient existant à réutiliser (optionnel)
+        """
+        self.language_code = language_code
+        self.model = model
+        self.interim_results = interim_results
+        self.client = client
+
+    def streaming_recognize(
+        self,
+        audio_chunks: Iterator[bytes],
+        sample_rate: int,
+        channels: int
+    ) -> Iterator[TranscriptionResult]:
+        """
+        Reconnaît un flux PCM 16 bits entrelacé (voir SpeechBackend).
+
+        Raises:
+            RuntimeError: Si google-cloud-speech n'est pas installé
+        """
+        speech = load_speech()
+        if self.client is None:
+            self.client = speech.SpeechClient()
+
+        config = speech.RecognitionConfig(
+            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+            sample_rate_hertz=sample_rate,
+            audio_channel_count=channels,
+            language_code=self.language_code,
+            enable_automatic_punctuation=True,
+            model=self.model,
+        )
+        streaming_config = speech.StreamingRecognitionConfig(
+            config=config,
+            interim_results=self.interim_results,
+        )
+        requests = (speech.StreamingRecognizeRequest(audio_content=chunk) for chunk in audio_chunks)
+        responses = self.client.streaming_recognize(config=streaming_config, requests=requests)
+
+        for response in responses:
+            for result in response.results:
+                if not result.alternatives:
+                    continue
+                end_time = result.result_end_time
+                yield TranscriptionResult(
+                    text=result.alternatives[0].transcript,
+                    is_final=result.is_final,
+                    stability=result.stability,
+                    end_time=end_time.total_seconds() if end_time else 0.0
+                )
+
+
+class StreamingTranscriber:
+    """
+    Transcription de l'audio au fil de l'enregistrement.
+
+    write() copie le PCM dans un buffer circulaire sans jamais bloquer
+    l'appelant (thread d'encodage de l'enregistreur) ; un thread dédié
+    transmet l'audio au service de reconnaissance par chunks de
+    `chunk_seconds` et reçoit les résultats pendant la capture. Les
+    flux de reconnaissance sont renouvelés toutes les `max_stream_seconds`
+    secondes d'audio, sans perte.
+
+    Le PCM reçu est converti (taux et canaux) vers le format demandé par
+    le service avant d'entrer dans le buffer, par défaut 16 kHz mono.
+    """
+
+    def __init__(
+        self,
+        backend: SpeechBackend,
+        sample_rate: Optional[int] = SPEECH_SAMPLE_RATE,
+        channels: Optional[int] = SPEECH_CHANNELS,
+        chunk_seconds: float = 0.1,
+        buffer_seconds: float = 30.0,
+        max_stream_seconds: float = MAX_STREAM_SECONDS,
+        on_result: Optional[Callable[[TranscriptionResult], None]] = None
+    ):
+        """
+        Initialise le transcripteur (le thread n'est lancé qu'à start()).
+
+        Args:
+            backend: Service de reconnaissance
+            sample_rate: Taux d'échantillonnage transmis au service
+                         (None : celui de l'audio reçu)
+            channels: Nombre de canaux transmis au service
+                      (None : celui de l'audio reçu)
+            chunk_seconds: Durée d'audio par requête envoyée au service
+            buffer_seconds: Retard maximal du service absorbé par le buffer
+                            (au-delà, l'audio est perdu et compté)
+            max_stream_seconds: Durée d'audio maximale d'un flux de reconnaissance
+            on_result: Fonction appelée (depuis le thread de transcription)
+                       pour chaque résultat, provisoire ou définitif
+        """
+        self.backend = backend
+        self.target_rate = sample_rate
+        self.target_channels = channels
+        self.chunk_seconds = chunk_seconds
+        self.buffer_seconds = buffer_seconds
+        self.max_stream_seconds = max_stream_seconds
+        self.on_result = on_result
+
+        self.sample_rate: Optional[int] = None
+        self.channels: Optional[int] = None
+        self.results: List[TranscriptionResult] = []
+        self.partial: Optional[TranscriptionResult] = None
+        self.error: Optional[Exception] = None
+        self.streams = 0
+        self.bytes_sent = 0
+        self.first_result_latency: Optional[float] = None
+
+        self._resampler: Optional[Resampler] = None
+        self._ring_buffer: Optional[RingBuffer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._frame_size = 0
+        self._finished = False
+        self._started_at = 0.0
+
+    def start(self, sample_rate: int, channels: int, sample_width: int = 2):
+        """
+        Démarre le thread de transcription.
+
+        Après finish(), un nouvel appel démarre une nouvelle transcription
+        (enregistrement suivant) : le thread précédent est attendu et les
+        résultats et compteurs sont remis à zéro.
+
+        Args:
+            sample_rate: Taux d'échantillonnage du PCM reçu en Hz
+            channels: Nombre de canaux du PCM reçu
+            sample_width: Largeur d'échantillon en octets (2 : PCM 16 bits)
+
+        Raises:
+            RuntimeError: Si le transcripteur est déjà démarré (sans finish())
+            ValueError: Si le PCM n'est pas en 16 bits
+        """
+        if self._thread is not None:
+            if not self._ring_buffer.closed:
+                raise RuntimeError("La transcription est déjà démarrée")
+            # Fin de la transcription précédente : ses derniers résultats arrivent
+            self._thread.join()
+            self._thread = None
+        if sample_width != 2:
+            raise ValueError("La transcription nécessite du PCM 16 bits")
+
+        self.results = []
+        self.partial = None
+        self.error = None
+        self.streams = 0
+        self.bytes_sent = 0
+        self.first_result_latency = None
+
+        self.sample_rate = self.target_rate or sample_rate
+        self.channels = self.target_channels or channels
+        self._resampler = None
+        if (self.sample_rate, self.channels) != (sample_rate, channels):
+            self._resampler = Resampler(sample_rate, self.sample_rate, channels, self.channels)
+        self._frame_size = self.channels * sample_width
+        # Le buffer contient le PCM converti : il est dimensionné au taux transmis au service
+        self._ring_buffer = RingBuffer(
+            capacity=int(self.sample_rate * self.buffer_seconds) * self._frame_size,
+            frame_size=self._frame_size
+        )
+        self._finished = False
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, data) -> bool:
+        """
+        Transmet du PCM au transcripteur sans bloquer.
+
+        Args:
+            data: Données audio brutes (format indiqué à start())
+
+        Returns:
+            True si les données ont été acceptées, False si le buffer était plein
+        """
+        if self._ring_buffer is None:
+            return False
+        if self._resampler:
+            data = self._resampler.process(data)
+        return self._ring_buffer.write(data)
+
+    def finish(self):
+        """Signale la fin de l'audio (les derniers résultats arrivent ensuite)."""
+        if self._ring_buffer is not None:
+            self._ring_buffer.close()
+
+    def wait(self, timeout: Optional[float] = None) -> str:
+        """
+        Attend les derniers résultats après finish().
+
+        Args:
+            timeout: Délai maximal d'attente en secondes (None = illimité)
+
+        Returns:
+            Transcription complète (résultats définitifs)
+
+        Raises:
+            TimeoutError: Si la transcription n'est pas terminée dans le délai
+            RuntimeError: Si le service de reconnaissance a échoué
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                raise TimeoutError("Transcription toujours en cours")
+        if self.error is not None:
+            raise RuntimeError(f"Erreur de transcription: {self.error}") from self.error
+        return self.transcript
+
+    @property
+    def transcript(self) -> str:
+        """Texte des résultats définitifs reçus jusqu'ici."""
+        return " ".join(result.text.strip() for result in self.results if result.text.strip())
+
+    def _audio_chunks(self) -> Iterator[bytes]:
+        """Chunks PCM d'un flux de reconnaissance (exécuté dans le thread de transcription)."""
+        ring_buffer = self._ring_buffer
+        chunk_bytes = max(1, int(self.sample_rate * self.chunk_seconds)) * self._frame_size
+        stream_limit = int(self.sample_rate * self.max_stream_seconds) * self._frame_size
+        stream_bytes = 0
+        while stream_bytes < stream_limit:
+            if not ring_buffer.wait_for_data(timeout=0.1):
+                if ring_buffer.closed:
+                    self._finished = True
+                    return
+                continue
+            # Regrouper l'audio en requêtes de chunk_seconds
+            if ring_buffer.fill_level < chunk_bytes and not ring_buffer.closed:
+                time.sleep(self.chunk_seconds / 4)
+                continue
+            view = ring_buffer.peek(min(chunk_bytes, stream_limit - stream_bytes))
+            chunk = bytes(view)
+            view.release()
+            ring_buffer.advance(len(chunk))
+            stream_bytes += len(chunk)
+            self.bytes_sent += len(chunk)
+            yield chunk
+
+    def _run(self):
+        """Boucle de transcription : un flux de reconnaissance après l'autre."""
+        byte_rate = self.sample_rate * self._frame_size
+        try:
+            while not self._finished:
+                offset = self.bytes_sent / byte_rate
+                self.streams += 1
+                for result in self.backend.streaming_recognize(
+                    self._audio_chunks(), self.sample_rate, self.channels
+                ):
+                    self._deliver(result._replace(end_time=result.end_time + offset))
+        except Exception as e:
+            self.error = e
+            print(f"Erreur de transcription: {e}")
+
+    def _deliver(self, result: TranscriptionResult):
+        """Enregistre un résultat et le transmet à on_result."""
+        if self.first_result_latency is None:
+            self.first_result_latency = time.monotonic() - self._started_at
+        if result.is_final:
+            self.results.append(result)
+            self.partial = None
+        else:
+            self.partial = result
+        if self.on_result:
+            self.on_result(result)
+
+    def get_stats(self) -> Dict:
+        """
+        Retourne les statistiques de la transcription.
+
+        Returns:
+            Dictionnaire contenant: streams, sent_seconds, dropped_frames,
+            final_results, first_result_latency
+        """
+        sent_seconds = self.bytes_sent / (self.sample_rate * self._frame_size) if self._frame_size else 0.0
+        return {
+            'streams': self.streams,
+            'sent_seconds': sent_seconds,
+            'dropped_frames': self._ring_buffer.dropped_frames if self._ring_buffer else 0,
+            'final_results': len(self.results),
+            'first_result_latency': self.first_result_latency,
+        }
@@ -0,0 +1,201 @@
+"""Module pour la détection d'activité audio (VAD énergétique) et l'élimination des silences."""
+
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from src.stream_mixer import SAMPLE_DTYPES
+
+# Événements produits par VoiceGate.process()
+REGION_START = "start"
+REGION_END = "end"
+AUDIO = "audio"
+
+# Seuil d'ouverture par défaut et écart d'hystérésis pour la fermeture (dBFS)
+DEFAULT_GATE_THRESHOLD_DB = -45.0
+DEFAULT_GATE_HYSTERESIS_DB = 6.0
+
+
+class VoiceGate:
+    """
+    Porte de bruit à détection d'activité énergétique.
+
+    Le PCM est découpé en blocs de `block_frames` frames dont l'énergie RMS
+    (canal le plus fort) est comparée à deux seuils :
+    - porte fermée, un bloc au-dessus de `threshold_db` ouvre une région
+      d'activité ; les `preroll` secondes précédentes, conservées dans un
+      buffer circulaire préalloué, sont restituées en tête de région pour
+      ne pas couper l'attaque ;
+    - porte ouverte, la région est prolongée tant que l'énergie reste
+      au-dessus de `threshold_db - hysteresis_db`, puis pendant `hangover`
+      secondes de silence avant de se refermer.
+
+    Les blocs reçus porte fermée (hors pré-roll) sont écartés.
+    """
+
+    def __init__(
+        self,
+        channels: int,
+        sample_width: int = 2,
+        sample_rate: int = 44100,
+        threshold_db: float = DEFAULT_GATE_THRESHOLD_DB,
+        hysteresis_db: float = DEFAULT_GATE_HYSTERESIS_DB,
+        hangover: float = 1.5,
+        preroll: float = 0.3,
+        block_frames: int = 1024
+    ):
+        """
+        Initialise la porte (fermée).
+
+        Args:
+            channels: Nombre de canaux entrelacés
+            sample_width: Largeur d'échantillon en octets (2 ou 4)
+            sample_rate: Taux d'échantillonnage en Hz
+            threshold_db: Niveau RMS (dBFS) ouvrant une région d'activité
+            hysteresis_db: Écart sous le seuil d'ouverture en deçà duquel
+                           un bloc compte comme silence pendant une région
+            hangover: Durée de silence en secondes avant de fermer une région
+            preroll: Durée en secondes restituée avant le début d'une région
+            block_frames: Frames par bloc d'analyse
+
+        Raises:
+            ValueError: Si la largeur d'échantillon n'est pas supportée
+        """
+        if sample_width not in SAMPLE_DTYPES:
+            raise ValueError(f"Largeur d'échantillon non supportée pour la détection: {sample_width}")
+
+        self.channels = channels
+        self.sample_width = sample_width
+        self.sample_rate = sample_rate
+        self.frame_size = channels * sample_width
+        self.block_frames = block_frames
+        self.threshold_db = threshold_db
+        self.hysteresis_db = hysteresis_db
+        self.hangover_frames = int(hangover * sample_rate)
+
+        self._dtype = SAMPLE_DTYPES[sample_width]
+        full_scale = float(2 ** (8 * sample_width - 1))
+        # Seuils exprimés en carré moyen d'échantillon
+        self._open_level = (10.0 ** (threshold_db / 20.0) * full_scale) ** 2
+        self._close_level = (10.0 ** ((threshold_db - hysteresis_db) / 20.0) * full_scale) ** 2
+
+        self._scratch = np.empty((block_frames, channels), dtype=np.float64)
+        self._block_squares = np.empty(channels, dtype=np.float64)
+
+        # Pré-roll : buffer circulaire des dernières frames reçues porte fermée
+        self._preroll = bytearray(int(preroll * sample_rate) * self.frame_size)
+        self._preroll_view = memoryview(self._preroll)
+        self._preroll_pos = 0
+        self._preroll_fill = 0
+
+        self.is_open = False
+        self._silence_frames = 0
+
+        # Statistiques
+        self.regions = 0
+        self.active_frames = 0
+        self.dropped_frames = 0
+
+    def _block_level(self, block: np.ndarray) -> float:
+        """Carré moyen des échantillons du canal le plus fort d'un bloc."""
+        scratch = self._scratch[:len(block)]
+        np.copyto(scratch, block)
+        np.multiply(scratch, scratch, out=scratch)
+        np.sum(scratch, axis=0, out=self._block_squares)
+        return float(self._block_squares.max()) / len(block)
+
+    def _remember(self, data: memoryview):
+        """Ajoute des frames écartées au pré-roll (les plus anciennes sont oubliées)."""
+        capacity = len(self._preroll)
+        if capacity == 0:
+            return
+        if len(data) >= capacity:
+            self._preroll_view[:] = data[len(data) - capacity:]
+            self._preroll_pos = 0
+            self._preroll_fill = capacity
+            return
+        first = min(len(data), capacity - self._preroll_pos)
+        self._preroll_view[self._preroll_pos:self._preroll_pos + first] = data[:first]
+        self._preroll_view[:len(data) - first] = data[first:]
+        self._preroll_pos = (self._preroll_pos + len(data)) % capacity
+        self._preroll_fill = min(capacity, self._preroll_fill + len(data))
+
+    def _drain_preroll(self) -> Iterator[memoryview]:
+        """Restitue le contenu du pré-roll dans l'ordre chronologique puis le vide."""
+        capacity = len(self._preroll)
+        start = (self._preroll_pos - self._preroll_fill) % capacity if capacity else 0
+        first = min(self._preroll_fill, capacity - start)
+        if first:
+            yield self._preroll_view[start:start + first]
+        if self._preroll_fill > first:
+            yield self._preroll_view[:self._preroll_fill - first]
+        self._preroll_fill = 0
+        self._preroll_pos = 0
+
+    def process(self, data) -> Iterator[Tuple[str, Optional[memoryview]]]:
+        """
+        Filtre un chunk de PCM entrelacé.
+
+        Les vues produites pointent dans `data` ou dans le pré-roll : elles
+        doivent être consommées avant de reprendre l'itération.
+
+        Args:
+            data: Données audio brutes alignées sur les frames
+
+        Yields:
+            (REGION_START, None) à l'ouverture d'une région, (AUDIO, vue)
+            pour chaque portion à encoder, (REGION_END, None) à la fermeture
+        """
+        view = memoryview(data).cast('B')
+        frame_count = len(view) // self.frame_size
+        samples = np.frombuffer(view, dtype=self._dtype, count=frame_count * self.channels)
+        samples = samples.reshape(frame_count, self.channels)
+
+        for start in range(0, frame_count, self.block_frames):
+            block = samples[start:start + self.block_frames]
+            length = len(block)
+            block_bytes = view[start * self.frame_size:(start + length) * self.frame_size]
+            level = self._block_level(block)
+
+            if not self.is_open:
+                if level < self._open_level:
+                    self._remember(block_bytes)
+                    self.dropped_frames += length
+                    continue
+                self.is_open = True
+                self.regions += 1
+                self._silence_frames = 0
+                yield REGION_START, None
+                preroll_frames = self._preroll_fill // self.frame_size
+                for chunk in self._drain_preroll():
+                    yield AUDIO, chunk
+                # Les frames du pré-roll avaient été comptées comme écartées
+                self.dropped_frames -= preroll_frames
+                self.active_frames += preroll_frames
+
+            yield AUDIO, block_bytes
+            self.active_frames += length
+            if level >= self._close_level:
+                self._silence_frames = 0
+                continue
+            self._silence_frames += length
+            if self._silence_frames >= self.hangover_frames:
+                self.is_open = False
+                yield REGION_END, None
+
+    def get_stats(self) -> Dict:
+        """
+        Retourne les statistiques de la porte.
+
+        Returns:
+            Dictionnaire contenant: regions, active_seconds, dropped_seconds,
+            silence_ratio (part de l'audio écartée), open
+        """
+        total = self.active_frames + self.dropped_frames
+        return {
+            'regions': self.regions,
+            'active_seconds': self.active_frames / self.sample_rate,
+            'dropped_seconds': self.dropped_frames / self.sample_rate,
+            'silence_ratio': self.dropped_frames / total if total else 0.0,
+            'open': self.is_open,
+        }
@@ -0,0 +1,129 @@
+"""Module pour l'écriture de fichiers WAV (PCM brut, sans encodage)."""
+
+import struct
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from src.audio_encoder import AudioEncoder
+
+# Taille de l'en-tête RIFF/WAVE canonique (chunks "RIFF", "fmt " et "data")
+WAV_HEADER_SIZE = 44
+
+# Taille maximale représentable dans un champ de taille RIFF (32 bits)
+RIFF_MAX_SIZE = 0xFFFFFFFF
+
+
+def build_wav_header(sample_rate: int, channels: int, sample_width: int, data_size: int) -> bytes:
+    """
+    Construit l'en-tête d'un fichier WAV PCM.
+
+    Args:
+        sample_rate: Taux d'échantillonnage en Hz
+        channels: Nombre de canaux audio
+        sample_width: Largeur d'échantillon en octets
+        data_size: Taille des données PCM en octets
+
+    Returns:
+        En-tête de WAV_HEADER_SIZE octets
+    """
+    block_align = channels * sample_width
+    data_size = min(data_size, RIFF_MAX_SIZE - (WAV_HEADER_SIZE - 8))
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF',
+        WAV_HEADER_SIZE - 8 + data_size + data_size % 2,
+        b'WAVE',
+        b'fmt ',
+        16,
+        1,  # PCM
+        channels,
+        sample_rate,
+        sample_rate * block_align,
+        block_align,
+        sample_width * 8,
+        b'data',
+        data_size,
+    )
+
+
+class WAVEncoder(AudioEncoder):
+    """
+    Écrit le PCM directement sur le disque dans un conteneur WAV.
+
+    Aucun encodage n'est effectué : le coût CPU se limite à l'écriture du
+    fichier. L'en-tête est écrit avec des tailles provisoires puis corrigé
+    à la fermeture.
+    """
+
+    extension = "wav"
+
+    def __init__(
+        self,
+        output_file: Path,
+        sample_rate: int = 44100,
+        channels: int = 2,
+        sample_width: int = 2
+    ):
+        """
+        Initialise l'encodeur WAV (le fichier n'est créé qu'à la première écriture).
+
+        Args:
+            output_file: Chemin du fichier WAV de sortie
+            sample_rate: Taux d'échantillonnage en Hz (par défaut 44100)
+            channels: Nombre de canaux audio (1=mono, 2=stéréo)
+            sample_width: Largeur d'échantillon en octets (2 pour 16-bit)
+        """
+        super().__init__(output_file, sample_rate, channels, sample_width)
+        self._file: Optional[BinaryIO] = None
+        self.data_size = 0
+
+    def write_frames(self, frames: bytes):
+        """
+        Écrit des frames audio à la suite du fichier.
+
+        Args:
+            frames: Données audio brutes à écrire
+
+        Raises:
+            RuntimeError: Si l'encodeur a déjà été fermé ou si l'écriture échoue
+        """
+        if self._is_closed:
+            raise RuntimeError("L'encodeur WAV a déjà été fermé")
+
+        try:
+            if self._file is None:
+                self._file = open(self.output_file, 'wb')
+                self._file.write(build_wav_header(
+                    self.sample_rate, self.channels, self.sample_width, 0
+                ))
+            self._file.write(frames)
+        except OSError as e:
+            raise RuntimeError(f"Erreur lors de l'écriture WAV: {e}") from e
+        self.data_size += len(frames)
+
+    def close(self):
+        """
+        Corrige l'en-tête avec les tailles définitives et ferme le fichier.
+
+        Raises:
+            RuntimeError: Si l'écriture de l'en-tête échoue
+        """
+        if self._is_closed:
+            return
+
+        try:
+            if self._file is not None:
+                # Les chunks RIFF doivent avoir une taille paire
+                if self.data_size % 2:
+                    self._file.write(b'\x00')
+                self._file.seek(0)
+                self._file.write(build_wav_header(
+                    self.sample_rate, self.channels, self.sample_width, self.data_size
+                ))
+        except OSError as e:
+            raise RuntimeError(f"Erreur lors de l'écriture WAV: {e}") from e
+        finally:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._is_closed = True
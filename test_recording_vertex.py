@@ -1,13 +1,18 @@
 #!/usr/bin/env python3
-"""Script de test pour enregistrer de l'audio et extraire les paroles avec Vertex AI."""
+"""Script de test pour enregistrer de l'audio et extraire les paroles avec Vertex AI.
+
+Les paroles sont transcrites pendant l'enregistrement (reconnaissance en
+continu) : les résultats provisoires s'affichent au fil de la capture.
+"""
 
-import os
 import time
 import signal
 import sys
 from pathlib import Path
 
 from src.audio_recorder import AudioRecorder
+from src.pulse_monitor import PulseDeviceMonitor
+from src.transcription import GoogleSpeechBackend, StreamingTranscriber
 from google.cloud import speech
 
 
@@ -21,6 +26,9 @@ def transcribe_audio_with_vertex(audio_file_path: Path) -> str:
     """
     Transcrit un fichier audio en texte en utilisant Google Cloud Speech-to-Text API.
 
+    Reconnaissance synchrone d'un fichier déjà enregistré (audio court) ;
+    pendant l'enregistrement, préférer StreamingTranscriber.
+
     Args:
         audio_file_path: Chemin vers le fichier audio à transcrire
 
@@ -56,6 +64,14 @@ def transcribe_audio_with_vertex(audio_file_path: Path) -> str:
     return transcription.strip()
 
 
+def print_result(result):
+    """Affiche un résultat de transcription (provisoire ou définitif) en direct."""
+    if result.is_final:
+        print(f"\r  ✓ {result.text.strip()}\033[K")
+    else:
+        print(f"\r  … {result.text.strip()}\033[K", end='', flush=True)
+
+
 def main():
     """Fonction principale pour tester l'enregistrement avec Vertex AI."""
     # Configurer les gestionnaires de signaux
@@ -67,14 +83,24 @@ def main():
     print("=" * 60)
     print()
 
-    # Configurer la variable d'environnement pour utiliser le bon monitor
-    os.environ['PULSE_SOURCE'] = 'bluez_output.80_C3_BA_0E_F4_09.1.monitor'
-
     # Créer l'enregistreur audio
     output_dir = Path.home() / "audio" / "enregistrements"
+    # Fichier au format natif du périphérique, transcription en 16 kHz mono
+    transcriber = StreamingTranscriber(
+        GoogleSpeechBackend(language_code="fr-FR"),
+        on_result=print_result
+    )
+    device_monitor = PulseDeviceMonitor()
+    device_monitor.start()
     recorder = AudioRecorder(
         output_dir=str(output_dir),
         bitrate='128k',
+        transcriber=transcriber,
+        # Monitor ouvert directement par son nom, sans passer par PortAudio ;
+        # si le casque se déconnecte, la capture passe au Monitor par défaut
+        capture_backend="pulse",
+        pulse_source='bluez_output.80_C3_BA_0E_F4_09.1.monitor',
+        device_monitor=device_monitor,
     )
 
     print(f"Répertoire de sortie: {output_dir}")
@@ -90,12 +116,10 @@ def main():
         if recorder.device_name:
             print(f"✓ Périphérique: {recorder.device_name}")
         print()
-        print("Enregistrement en cours...")
+        print("Enregistrement en cours (paroles transcrites en direct)...")
 
         # Enregistrer pendant 10 secondes
-        for i in range(10, 0, -1):
-            print(f"  {i} secondes restantes...", end='\r')
-            time.sleep(1)
+        time.sleep(10)
 
         print("\n")
         print("Arrêt de l'enregistrement et encodage MP3 en cours...")
@@ -109,20 +133,27 @@ def main():
             file_size = output_file.stat().st_size
             print(f"✓ Fichier créé avec succès ({file_size / 1024:.1f} KB)")
 
-            if file_size < 10000:  # Moins de 10 KB est suspect
-                print("⚠ ATTENTION: Le fichier semble très petit, il pourrait être vide ou corrompu")
+            levels = recorder.get_levels()
+            if levels and levels['silence_ratio'] >= 1.0:
+                print(f"⚠ ATTENTION: Aucun son capturé (niveau moyen "
+                      f"{max(levels['average_rms_db']):.1f} dBFS), l'enregistrement est silencieux")
             else:
-                print("✓ Taille du fichier semble correcte")
+                if levels:
+                    print(f"✓ Niveau moyen: {max(levels['average_rms_db']):.1f} dBFS "
+                          f"(silence: {levels['silence_ratio']:.0%})")
                 print()
 
-                # Extraction des paroles avec Vertex AI
+                # Derniers résultats de la transcription en continu
                 print("=" * 60)
                 print("EXTRACTION DES PAROLES AVEC VERTEX AI")
                 print("=" * 60)
                 print()
 
                 try:
-                    transcription = transcribe_audio_with_vertex(output_file)
+                    transcription = transcriber.wait(timeout=30.0)
+                    stats = transcriber.get_stats()
+                    if stats['first_result_latency'] is not None:
+                        print(f"✓ Premier résultat {stats['first_result_latency']:.1f} s après le début")
 
                     if transcription:
                         print("✓ Transcription réussie !")
@@ -154,6 +185,7 @@ def main():
         return 1
 
     finally:
+        device_monitor.stop()
         print()
         print("=" * 60)
         print("TEST TERMINÉ")
@@ -0,0 +1,139 @@
+"""Faux processus et serveurs partagés par les tests de capture PulseAudio."""
+
+import json
+import queue
+import sys
+import time
+import types
+
+
+def fake_parec(directory, frames: int, frame_size: int = 4, wait: bool = True, lost_sources=()):
+    """
+    Crée un faux parec : écrit `frames` frames de PCM, enregistre ensuite ses
+    arguments dans `args.json` puis attend d'être arrêté, ou se termine en
+    erreur (si `wait` est faux ou si la source fait partie de `lost_sources`).
+    """
+    lost = [f"--device={source}" for source in lost_sources]
+    script = directory / "parec"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import json, os, sys, time\n"
+        f"sys.stdout.buffer.write(b'\\x01' * {frames * frame_size})\n"
+        "sys.stdout.buffer.flush()\n"
+        f"with open({str(directory / 'args.tmp')!r}, 'w') as f:\n"
+        "    json.dump(sys.argv[1:], f)\n"
+        f"os.replace({str(directory / 'args.tmp')!r}, {str(directory / 'args.json')!r})\n"
+        f"if {wait!r} and sys.argv[-1] not in {lost!r}:\n"
+        "    time.sleep(30)\n"
+        "sys.stderr.write('Connexion refusée')\n"
+        "sys.exit(1)\n"
+    )
+    script.chmod(0o755)
+    return script
+
+
+def recorded_args(directory, timeout: float = 2.0):
+    """Attend que le faux parec ait écrit son PCM et retourne ses arguments."""
+    path = directory / "args.json"
+    deadline = time.monotonic() + timeout
+    while not path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return json.loads(path.read_text())
+
+
+BLUEZ_SINK = "bluez_output.80_C3_BA_0E_F4_09.1"
+ALSA_SINK = "alsa_output.pci-0000_00_1f.3.analog-stereo"
+
+
+class PulseLoopStop(Exception):
+    """Équivalent de pulsectl.PulseLoopStop."""
+
+
+class FakePulseServer:
+    """
+    Serveur PulseAudio simulé : un Monitor par sink, un micro, et des
+    événements émis à la demande vers les connexions ouvertes.
+    """
+
+    def __init__(self, sinks=(ALSA_SINK, BLUEZ_SINK), default_sink=BLUEZ_SINK):
+        self.sinks = list(sinks)
+        self.default_sink = default_sink
+        self.connections = []
+        self.fail_next_listen = False
+        self.module = types.SimpleNamespace(Pulse=self.connect, PulseLoopStop=PulseLoopStop)
+
+    def connect(self, client_name):
+        connection = FakePulse(self)
+        self.connections.append(connection)
+        return connection
+
+    def emit(self, facility, kind):
+        """Envoie un événement à toutes les connexions."""
+        for connection in self.connections:
+            connection.events.put(types.SimpleNamespace(facility=facility, t=kind))
+
+    def remove_sink(self, name, new_default):
+        """Retire un sink (et son Monitor) et change la sortie par défaut."""
+        self.sinks.remove(name)
+        self.default_sink = new_default
+        self.emit('sink', 'remove')
+        self.emit('source', 'remove')
+        self.emit('server', 'change')
+
+
+class FakePulse:
+    """Connexion pulsectl simulée (API d'événements et de listes)."""
+
+    def __init__(self, server):
+        self.server = server
+        self.events = queue.Queue()
+        self.callback = None
+        self.mask = None
+        self.closed = False
+
+    def event_mask_set(self, *facilities):
+        self.mask = facilities
+
+    def event_callback_set(self, callback):
+        self.callback = callback
+
+    def event_listen(self):
+        while True:
+            event = self.events.get()
+            if event is None:
+                return
+            if self.server.fail_next_listen:
+                self.server.fail_next_listen = False
+                raise ConnectionError("Connexion perdue")
+            try:
+                self.callback(event)
+            except PulseLoopStop:
+                return
+
+    def event_listen_stop(self):
+        self.events.put(None)
+
+    def server_info(self):
+        return types.SimpleNamespace(default_sink_name=self.server.default_sink)
+
+    def sink_list(self):
+        return [types.SimpleNamespace(name=name, index=index)
+                for index, name in enumerate(self.server.sinks)]
+
+    def source_list(self):
+        sources = [
+            types.SimpleNamespace(
+                name=f"{name}.monitor", description=f"Monitor of {name}", index=100 + index,
+                monitor_of_sink=index, proplist={'device.class': 'monitor'},
+                sample_spec=types.SimpleNamespace(rate=44100, channels=2)
+            )
+            for index, name in enumerate(self.server.sinks)
+        ]
+        sources.append(types.SimpleNamespace(
+            name="alsa_input.mic", description="Micro", index=200, monitor_of_sink=None,
+            proplist={'device.class': 'sound'}, sample_spec=types.SimpleNamespace(rate=48000, channels=1)
+        ))
+        return sources
+
+    def close(self):
+        self.closed = True
@@ -0,0 +1,151 @@
+"""Tests pour la façade asyncio de l'enregistreur."""
+
+import asyncio
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.async_recorder import AsyncAudioRecorder, AudioChunkStream
+from src.audio_devices import get_device_registry
+
+# 1024 frames stéréo 16 bits par chunk, à 1024 Hz : une seconde par chunk
+DEVICE_INFO = {'name': 'Loopback', 'maxInputChannels': 2, 'defaultSampleRate': 1024.0}
+CHUNK_BYTES = 4096
+
+
+@pytest.fixture(autouse=True)
+def mock_pyaudio():
+    """PyAudio simulé : le callback PortAudio est appelé directement par les tests."""
+    get_device_registry().invalidate()
+    with patch('src.audio_recorder.get_device_info', return_value=DEVICE_INFO), \
+            patch('src.audio_recorder.pyaudio.PyAudio') as mock_pyaudio_class:
+        mock_pyaudio_instance = Mock()
+        mock_pyaudio_class.return_value = mock_pyaudio_instance
+        mock_pyaudio_instance.get_sample_size.return_value = 2
+        yield mock_pyaudio_instance
+    get_device_registry().invalidate()
+
+
+def make_recorder(tmp_path, **options) -> AsyncAudioRecorder:
+    """Crée une façade sur un enregistreur WAV en mode callback."""
+    return AsyncAudioRecorder(
+        output_dir=str(tmp_path), output_format="wav", device_index=3, capture_mode="callback",
+        **options
+    )
+
+
+def capture(mock_pyaudio, values):
+    """Simule la capture d'un chunk par valeur."""
+    callback = mock_pyaudio.open.call_args[1]['stream_callback']
+    for value in values:
+        callback(bytes([value]) * CHUNK_BYTES, 1024, {}, 0)
+
+
+class TestAsyncAudioRecorder:
+    """Tests pour la classe AsyncAudioRecorder."""
+
+    def test_chunks_until_stop(self, tmp_path, mock_pyaudio):
+        """Teste la remise de l'audio à une coroutine puis la fin du flux à l'arrêt."""
+        recorder = make_recorder(tmp_path)
+
+        async def run():
+            stream = recorder.chunks()
+            output_file = await recorder.start()
+            assert recorder.is_recording
+
+            received = []
+
+            async def consume():
+                async for chunk in stream:
+                    received.append(chunk)
+
+            consumer = asyncio.create_task(consume())
+            capture(mock_pyaudio, [1, 2, 3])
+            await recorder.stop()
+            await asyncio.wait_for(consumer, timeout=2.0)
+            return output_file, b''.join(received)
+
+        output_file, received = asyncio.run(run())
+
+        assert received == b'\x01' * CHUNK_BYTES + b'\x02' * CHUNK_BYTES + b'\x03' * CHUNK_BYTES
+        assert output_file.read_bytes()[44:] == received
+        assert recorder.streams == []
+
+    def test_slow_consumer_never_stalls_capture(self, tmp_path, mock_pyaudio):
+        """Teste qu'un flux en retard perd des chunks sans affecter les autres flux."""
+        recorder = make_recorder(tmp_path, buffer_seconds=2)
+
+        async def run():
+            await recorder.start()
+            slow = recorder.chunks()
+            fast = recorder.chunks(max_bytes=1000, buffer_seconds=10)
+            capture(mock_pyaudio, [1, 2, 3, 4])
+            await recorder.stop()
+            return slow, [chunk async for chunk in fast]
+
+        slow, fast_chunks = asyncio.run(run())
+
+        assert b''.join(fast_chunks) == b''.join(bytes([value]) * CHUNK_BYTES for value in [1, 2, 3, 4])
+        assert max(len(chunk) for chunk in fast_chunks) == 1000
+        stats = slow.get_stats()
+        assert (stats['lag'], stats['dropped_frames']) == (2.0, 2048)
+
+    def test_cancelled_consumer_unsubscribes(self, tmp_path, mock_pyaudio):
+        """Teste qu'un consommateur annulé en attente ne reçoit plus de chunks."""
+        recorder = make_recorder(tmp_path)
+
+        async def run():
+            await recorder.start()
+            stream = recorder.chunks()
+
+            async def consume():
+                async for _ in stream:
+                    pass
+
+            consumer = asyncio.create_task(consume())
+            await asyncio.sleep(0.01)
+            consumer.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await consumer
+            subscribed = recorder.streams
+            capture(mock_pyaudio, [1])
+            await recorder.stop()
+            return stream, subscribed
+
+        stream, subscribed = asyncio.run(run())
+
+        assert subscribed == []
+        assert stream.lag == 0.0
+
+    def test_context_manager_stops(self, tmp_path, mock_pyaudio):
+        """Teste l'arrêt à la sortie du context manager asynchrone."""
+        async def run():
+            async with make_recorder(tmp_path) as recorder:
+                output_file = await recorder.start()
+                capture(mock_pyaudio, [5])
+            return recorder, output_file
+
+        recorder, output_file = asyncio.run(run())
+
+        assert not recorder.is_recording
+        assert output_file.read_bytes()[44:] == b'\x05' * CHUNK_BYTES
+
+
+class TestAudioChunkStream:
+    """Tests pour la classe AudioChunkStream."""
+
+    def test_wakes_loop_only_when_waiting(self):
+        """Teste qu'aucun appel inter-threads n'est fait tant que le consommateur a du retard."""
+        loop = Mock()
+        stream = AudioChunkStream(loop, buffer_seconds=10.0)
+        stream._open(sample_rate=100, frame_size=4)
+
+        for _ in range(5):
+            stream._push(b'\x00' * 40)
+        loop.call_soon_threadsafe.assert_not_called()
+
+        stream._waiting = True
+        stream._push(b'\x00' * 40)
+        stream._push(b'\x00' * 40)
+        loop.call_soon_threadsafe.assert_called_once()
+        assert stream.lag == pytest.approx(0.7)
@@ -3,13 +3,26 @@
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from src.audio_devices import (
+    DeviceRegistry,
+    get_device_registry,
     list_audio_devices,
     find_loopback_device,
     get_device_info,
-    print_available_devices
+    map_pulseaudio_sources,
+    map_pulseaudio_to_pyaudio,
+    print_available_devices,
+    rank_pyaudio_candidates
 )
 
 
+@pytest.fixture(autouse=True)
+def reset_device_registry():
+    """Vide le registre partagé pour que chaque test énumère ses propres mocks."""
+    get_device_registry().invalidate()
+    yield
+    get_device_registry().invalidate()
+
+
 class TestListAudioDevices:
     """Tests pour la fonction list_audio_devices."""
 
@@ -44,7 +57,25 @@ class TestListAudioDevices:
         assert devices[0]['maxInputChannels'] == 2
         assert devices[1]['index'] == 1
         assert devices[1]['name'] == 'Monitor of Built-in Audio'
-        mock_pa.terminate.assert_called_once()
+        # L'instance PyAudio est conservée par le registre partagé
+        mock_pa.terminate.assert_not_called()
+
+    @patch('src.audio_devices.pyaudio.PyAudio')
+    def test_list_audio_devices_enumerates_once(self, mock_pyaudio_class):
+        """Test que les appels successifs réutilisent l'énumération en cache."""
+        mock_pa = Mock()
+        mock_pyaudio_class.return_value = mock_pa
+        mock_pa.get_device_count.return_value = 1
+        mock_pa.get_device_info_by_index.return_value = {
+            'name': 'Microphone', 'maxInputChannels': 2, 'defaultSampleRate': 44100.0
+        }
+
+        list_audio_devices()
+        list_audio_devices()
+        get_device_info(0)
+
+        mock_pyaudio_class.assert_called_once()
+        mock_pa.get_device_count.assert_called_once()
 
     @patch('src.audio_devices.pyaudio.PyAudio')
     def test_list_audio_devices_empty(self, mock_pyaudio_class):
@@ -59,7 +90,7 @@ class TestListAudioDevices:
 
         # Vérifier
         assert devices == []
-        mock_pa.terminate.assert_called_once()
+        mock_pa.terminate.assert_not_called()
 
     @patch('src.audio_devices.pyaudio.PyAudio')
     def test_list_audio_devices_with_errors(self, mock_pyaudio_class):
@@ -173,6 +204,7 @@ class TestGetDeviceInfo:
         # Configurer le mock
         mock_pa = Mock()
         mock_pyaudio_class.return_value = mock_pa
+        mock_pa.get_device_count.return_value = 2
         mock_pa.get_device_info_by_index.return_value = {
             'name': 'Test Device',
             'maxInputChannels': 2,
@@ -191,7 +223,7 @@ class TestGetDeviceInfo:
         assert info['name'] == 'Test Device'
         assert info['maxInputChannels'] == 2
         assert info['maxOutputChannels'] == 2
-        mock_pa.terminate.assert_called_once()
+        assert info['defaultLowInputLatency'] == 0.01
 
     @patch('src.audio_devices.pyaudio.PyAudio')
     def test_get_device_info_not_found(self, mock_pyaudio_class):
@@ -199,6 +231,7 @@ class TestGetDeviceInfo:
         # Configurer le mock
         mock_pa = Mock()
         mock_pyaudio_class.return_value = mock_pa
+        mock_pa.get_device_count.return_value = 1
         mock_pa.get_device_info_by_index.side_effect = Exception("Device not found")
 
         # Exécuter
@@ -206,8 +239,72 @@ class TestGetDeviceInfo:
 
         # Vérifier
         assert info is None
+
+
+class TestDeviceRegistry:
+    """Tests pour la classe DeviceRegistry."""
+
+    def _make_pyaudio(self):
+        mock_pa = Mock()
+        mock_pa.get_device_count.return_value = 2
+        mock_pa.get_device_info_by_index.side_effect = lambda i: [
+            {'name': 'Microphone', 'maxInputChannels': 2, 'defaultSampleRate': 44100.0},
+            {'name': 'Monitor of Built-in Audio', 'maxInputChannels': 2, 'defaultSampleRate': 48000.0},
+        ][i]
+        return mock_pa
+
+    @patch('src.audio_devices.pyaudio.PyAudio')
+    def test_indexes_by_index_and_name(self, mock_pyaudio_class):
+        """Test que les périphériques sont indexés par index et par nom."""
+        mock_pyaudio_class.return_value = self._make_pyaudio()
+        registry = DeviceRegistry()
+
+        assert registry.get_device(1)['name'] == 'Monitor of Built-in Audio'
+        assert registry.get_device(5) is None
+        assert [d['index'] for d in registry.find_by_name('MICROPHONE')] == [0]
+        assert registry.find_by_name('inconnu') == []
+
+    @patch('src.audio_devices.pyaudio.PyAudio')
+    def test_invalidate_reenumerates(self, mock_pyaudio_class):
+        """Test qu'invalidate() force une nouvelle initialisation de PortAudio."""
+        first, second = self._make_pyaudio(), self._make_pyaudio()
+        mock_pyaudio_class.side_effect = [first, second]
+        registry = DeviceRegistry()
+
+        registry.list_devices()
+        registry.invalidate()
+        registry.list_devices()
+
+        first.terminate.assert_called_once()
+        assert mock_pyaudio_class.call_count == 2
+        assert registry.get_pyaudio() is second
+
+    @patch('src.audio_devices.pyaudio.PyAudio')
+    def test_invalidate_defers_terminate_while_acquired(self, mock_pyaudio_class):
+        """Test que PortAudio n'est pas terminé tant qu'un flux utilise l'instance."""
+        mock_pa = self._make_pyaudio()
+        mock_pyaudio_class.return_value = mock_pa
+        registry = DeviceRegistry()
+
+        instance = registry.acquire()
+        registry.invalidate()
+        mock_pa.terminate.assert_not_called()
+
+        registry.release(instance)
         mock_pa.terminate.assert_called_once()
 
+    @patch('src.audio_devices._load_pulsectl', return_value=None)
+    @patch('src.audio_devices.pyaudio.PyAudio')
+    def test_lookups_use_given_registry(self, mock_pyaudio_class, _mock_pulsectl):
+        """Test que la détection interroge le registre fourni plutôt que le registre partagé."""
+        mock_pyaudio_class.return_value = self._make_pyaudio()
+        registry = DeviceRegistry()
+
+        assert find_loopback_device(registry) == 1
+        assert get_device_info(1, registry)['name'] == 'Monitor of Built-in Audio'
+        assert mock_pyaudio_class.call_count == 1
+        assert get_device_registry()._devices is None
+
 
 class TestPrintAvailableDevices:
     """Tests pour la fonction print_available_devices."""
@@ -256,3 +353,44 @@ class TestPrintAvailableDevices:
         # Vérifier qu'on mentionne l'absence de loopback
         calls = [str(call) for call in mock_print.call_args_list]
         assert any('aucun' in str(call).lower() for call in calls)
+
+
+class TestMapPulseaudio:
+    """Tests pour la correspondance PulseAudio -> PyAudio."""
+
+    DEVICES = [
+        {'index': 0, 'name': 'Microphone', 'maxInputChannels': 2, 'defaultSampleRate': 44100},
+        {'index': 4, 'name': 'alsa_output.pci.analog-stereo.monitor', 'maxInputChannels': 2, 'defaultSampleRate': 44100},
+        {'index': 12, 'name': 'pulse', 'maxInputChannels': 32, 'defaultSampleRate': 44100},
+    ]
+
+    @patch('src.audio_devices.list_audio_devices')
+    def test_map_pulseaudio_to_pyaudio_returns_best_candidate(self, mock_list_devices):
+        """Test que map_pulseaudio_to_pyaudio retourne l'index du meilleur candidat."""
+        mock_list_devices.return_value = self.DEVICES
+
+        assert map_pulseaudio_to_pyaudio('alsa_output.pci.analog-stereo.monitor') == 4
+        assert map_pulseaudio_to_pyaudio('bluez_output.monitor') == 12
+
+    @patch('src.audio_devices.list_audio_devices')
+    def test_map_pulseaudio_sources_batch(self, mock_list_devices):
+        """Test que toutes les sources sont classées en un seul lot."""
+        mock_list_devices.return_value = self.DEVICES
+
+        mapping = map_pulseaudio_sources([
+            {'name': 'alsa_output.pci.analog-stereo.monitor', 'description': 'Monitor of Analog'},
+            {'name': 'bluez_output.monitor', 'description': 'Casque'},
+        ])
+
+        assert [m.index for m in mapping['alsa_output.pci.analog-stereo.monitor']] == [4, 12]
+        assert mapping['bluez_output.monitor'][0].strategy == 'pulse_fallback'
+
+    @patch('src.audio_devices.list_audio_devices')
+    def test_rank_pyaudio_candidates_scores(self, mock_list_devices):
+        """Test que les candidats sont triés par score décroissant."""
+        mock_list_devices.return_value = self.DEVICES
+
+        candidates = rank_pyaudio_candidates('alsa_output.pci.analog-stereo.monitor')
+
+        assert candidates[0].score == 1.0
+        assert [c.score for c in candidates] == sorted((c.score for c in candidates), reverse=True)
@@ -1,12 +1,25 @@
 """Tests unitaires pour le module audio_recorder."""
 
 import os
+import time
 import pytest
+import pyaudio
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime
 
+from src.audio_devices import get_device_registry
 from src.audio_recorder import AudioRecorder
+from src.pulse_monitor import PulseDeviceMonitor
+from tests.fakes import ALSA_SINK, BLUEZ_SINK, FakePulseServer, fake_parec, recorded_args
+
+
+@pytest.fixture(autouse=True)
+def reset_device_registry():
+    """Vide le registre partagé pour que chaque test utilise son propre mock PyAudio."""
+    get_device_registry().invalidate()
+    yield
+    get_device_registry().invalidate()
 
 
 class TestAudioRecorder:
@@ -25,7 +38,7 @@ class TestAudioRecorder:
         assert recorder.is_recording is False
         assert recorder.pyaudio_instance is None
         assert recorder.stream is None
-        assert recorder.mp3_encoder is None
+        assert recorder.encoder is None
 
     def test_init_custom_values(self):
         """Teste l'initialisation avec des valeurs personnalisées."""
@@ -91,6 +104,7 @@ class TestAudioRecorder:
         mock_pyaudio_instance = Mock()
         mock_pyaudio_class.return_value = mock_pyaudio_instance
         mock_stream = Mock()
+        mock_stream.read.return_value = b'\x00' * 4096
         mock_pyaudio_instance.open.return_value = mock_stream
         mock_pyaudio_instance.get_sample_size.return_value = 2
         mock_mp3_encoder = Mock()
@@ -106,6 +120,8 @@ class TestAudioRecorder:
         assert output_file.name.endswith('.mp3')
         assert recorder.device_index == 1
         assert recorder.device_name == 'Monitor Device'
+        mock_find_loopback.assert_called_once_with(recorder.device_registry)
+        mock_get_device_info.assert_any_call(1, recorder.device_registry)
         mock_pyaudio_instance.open.assert_called_once()
         mock_mp3_encoder_class.assert_called_once()
 
@@ -162,6 +178,7 @@ class TestAudioRecorder:
         mock_pyaudio_instance = Mock()
         mock_pyaudio_class.return_value = mock_pyaudio_instance
         mock_stream = Mock()
+        mock_stream.read.return_value = b'\x00' * 4096
         mock_pyaudio_instance.open.return_value = mock_stream
         mock_pyaudio_instance.get_sample_size.return_value = 2
         mock_mp3_encoder = Mock()
@@ -176,7 +193,41 @@ class TestAudioRecorder:
         mock_stream.stop_stream.assert_called_once()
         mock_stream.close.assert_called_once()
         mock_mp3_encoder.close.assert_called_once()
-        mock_pyaudio_instance.terminate.assert_called_once()
+        # L'instance PyAudio partagée est rendue au registre, pas terminée
+        assert recorder.pyaudio_instance is None
+        mock_pyaudio_instance.terminate.assert_not_called()
+
+    @patch('src.audio_recorder.find_loopback_device')
+    @patch('src.audio_recorder.get_device_info')
+    @patch('src.audio_recorder.MP3Encoder')
+    @patch('src.audio_recorder.pyaudio.PyAudio')
+    def test_stop_recording_waits_for_slow_encoder(
+        self, mock_pyaudio_class, mock_mp3_encoder_class, mock_get_device_info, mock_find_loopback, tmp_path
+    ):
+        """Teste que l'encodeur n'est fermé qu'après avoir reçu tout l'audio en attente."""
+        recorder = AudioRecorder(output_dir=str(tmp_path))
+        events = []
+
+        mock_find_loopback.return_value = 1
+        mock_get_device_info.return_value = {'name': 'Monitor Device'}
+        mock_pyaudio_instance = Mock()
+        mock_pyaudio_class.return_value = mock_pyaudio_instance
+        mock_stream = Mock()
+        mock_stream.read.side_effect = [b'\x00\x00' * 2048] * 3 + [OSError("Fin du flux")]
+        mock_pyaudio_instance.open.return_value = mock_stream
+        mock_pyaudio_instance.get_sample_size.return_value = 2
+        mock_mp3_encoder = Mock()
+        mock_mp3_encoder.write_frames.side_effect = lambda view: (time.sleep(0.1), events.append(len(view)))
+        mock_mp3_encoder.close.side_effect = lambda: events.append('close')
+        mock_mp3_encoder_class.return_value = mock_mp3_encoder
+
+        recorder.start_recording()
+        recorder.recording_thread.join(timeout=2.0)
+        recorder.stop_recording()
+
+        assert events[-1] == 'close'
+        assert sum(events[:-1]) == 3 * 4096
+        assert not recorder.encoder_thread.is_alive()
 
     def test_stop_recording_when_not_recording(self):
         """Teste que stop_recording ne fait rien si pas d'enregistrement en cours."""
@@ -198,6 +249,7 @@ class TestAudioRecorder:
         mock_pyaudio_instance = Mock()
         mock_pyaudio_class.return_value = mock_pyaudio_instance
         mock_stream = Mock()
+        mock_stream.read.return_value = b'\x00' * 4096
         mock_pyaudio_instance.open.return_value = mock_stream
         mock_pyaudio_instance.get_sample_size.return_value = 2
         mock_mp3_encoder = Mock()
@@ -228,6 +280,7 @@ class TestAudioRecorder:
         mock_pyaudio_instance = Mock()
         mock_pyaudio_class.return_value = mock_pyaudio_instance
         mock_stream = Mock()
+        mock_stream.read.return_value = b'\x00' * 4096
         mock_stream.stop_stream.side_effect = Exception("Erreur de fermeture")
         mock_pyaudio_instance.open.return_value = mock_stream
         mock_pyaudio_instance.get_sample_size.return_value = 2
@@ -241,7 +294,7 @@ class TestAudioRecorder:
 
         # Vérifier que les ressources sont à None malgré les exceptions
         assert recorder.stream is None
-        assert recorder.mp3_encoder is None
+        assert recorder.encoder is None
         assert recorder.pyaudio_instance is None
 
     @patch('src.audio_recorder.find_loopback_device')
@@ -269,6 +322,7 @@ class TestAudioRecorder:
         mock_pyaudio_instance = Mock()
         mock_pyaudio_class.return_value = mock_pyaudio_instance
         mock_stream = Mock()
+        mock_stream.read.return_value = b'\x00' * 4096
         mock_pyaudio_instance.open.return_value = mock_stream
         mock_pyaudio_instance.get_sample_size.return_value = 2
         mock_mp3_encoder = Mock()
@@ -283,3 +337,990 @@ class TestAudioRecorder:
 
         # Nettoyer
         recorder.stop_recording()
+
+    @patch('src.audio_recorder.find_loopback_device')
+    @patch('src.audio_recorder.get_device_info')
+    @patch('src.audio_recorder.MP3Encoder')
+    @patch('src.audio_recorder.pyaudio.PyAudio')
+    def test_capture_feeds_encoder_through_ring_buffer(
+        self, mock_pyaudio_class, mock_mp3_encoder_class, mock_get_device_info, mock_find_loopback, tmp_path
+    ):
+        """Teste que les données capturées atteignent l'encodeur via le buffer circulaire."""
+        recorder = AudioRecorder(output_dir=str(tmp_path))
+
+        mock_find_loopback.return_value = 1
+        mock_get_device_info.return_value = {'name': 'Monitor Device'}
+        mock_pyaudio_instance = Mock()
+        mock_pyaudio_class.return_value = mock_pyaudio_instance
+        mock_stream = Mock()
+        chunks = [b'\x01\x00' * 2048, b'\x02\x00' * 2048]
+        mock_stream.read.side_effect = chunks + [OSError("Fin du flux")]
+        mock_pyaudio_instance.open.return_value = mock_stream
+        mock_pyaudio_instance.get_sample_size.return_value = 2
+
+        written = []
+        mock_mp3_encoder = Mock()
+        mock_mp3_encoder.write_frames.side_effect = lambda view: written.append(bytes(view))
+        mock_mp3_encoder_class.return_value = mock_mp3_encoder
+
+        recorder.start_recording()
+        recorder.recording_thread.join(timeout=2.0)
+        recorder.encoder_thread.join(timeout=2.0)
+
+        assert b''.join(written) == b''.join(chunks)
+        stats = recorder.get_buffer_stats()
+        assert stats['fill_level'] == 0
+        assert stats['dropped_frames'] == 0
+        assert stats['high_water_mark'] > 0
+
+        recorder.stop_recording()
+
+    def test_init_invalid_capture_mode(self):
+        """Teste qu'un mode de capture inconnu est refusé."""
+        with pytest.raises(ValueError, match="Mode de capture inconnu"):
+            AudioRecorder(capture_mode="polling")
+
+    @patch('src.audio_recorder.find_loopback_device')
+    @patch('src.audio_recorder.get_device_info')
+    @patch('src.audio_recorder.MP3Encoder')
+    @patch('src.audio_recorder.pyaudio.PyAudio')
+    def test_start_recording_callback_mode(
+        self, mock_pyaudio_class, mock_mp3_encoder_class, mock_get_device_info, mock_find_loopback, tmp_path
+    ):
+        """Teste que le mode callback ouvre un flux avec callback sans thread de lecture."""
+        recorder = AudioRecorder(output_dir=str(tmp_path), capture_mode="callback")
+
+        mock_find_loopback.return_value = 1
+        mock_get_device_info.return_value = {'name': 'Monitor Device'}
+        mock_pyaudio_instance = Mock()
+        mock_pyaudio_class.return_value = mock_pyaudio_instance
+        mock_stream = Mock()
+        mock_pyaudio_instance.open.return_value = mock_stream
+        mock_pyaudio_instance.get_sample_size.return_value = 2
+        mock_mp3_encoder_class.return_value = Mock()
+
+        recorder.start_recording()
+
+        open_kwargs = mock_pyaudio_instance.open.call_args[1]
+        assert open_kwargs['stream_callback'] == recorder._stream_callback
+        assert open_kwargs['start'] is False
+        mock_stream.start_stream.assert_called_once()
+        assert recorder.recording_thread is None
+
+        # Simuler deux appels de PortAudio, dont un signalant un débordement
+        result = recorder._stream_callback(b'\x00\x00' * 2048, 1024, {}, 0)
+        assert result == (None, pyaudio.paContinue)
+        recorder._stream_callback(b'\x00\x00' * 2048, 1024, {}, pyaudio.paInputOverflow)
+
+        stats = recorder.get_capture_stats()
+        assert stats['capture_mode'] == "callback"
+        assert stats['wakeups'] == 2
+        assert stats['xruns'] == 1
+
+        recorder.stop_recording()
+        assert recorder._stream_callback(b'\x00\x00', 1, {}, 0) == (None, pyaudio.paComplete)
+
+    @patch('src.audio_recorder.find_loopback_device')
+    @patch('src.audio_recorder.get_device_info')
+    @patch('src.audio_recorder.MP3Encoder')
+    @patch('src.audio_recorder.pyaudio.PyAudio')
+    def test_blocking_mode_counts_overflows(
+        self, mock_pyaudio_class, mock_mp3_encoder_class, mock_get_device_info, mock_find_loopback, tmp_path
+    ):
+        """Teste que les débordements d'entrée sont comptés en mode bloquant avec count_xruns."""
+        recorder = AudioRecorder(output_dir=str(tmp_path), count_xruns=True)
+
+        mock_find_loopback.return_value = 1
+        mock_get_device_info.return_value = {'name': 'Monitor Device'}
+        mock_pyaudio_instance = Mock()
+        mock_pyaudio_class.return_value = mock_pyaudio_instance
+        mock_stream = Mock()
+        mock_stream.read.side_effect = [
+            b'\x00\x00' * 2048,
+            OSError(pyaudio.paInputOverflowed, "Input overflowed"),
+            b'\x00\x00' * 2048,
+            OSError("Fin du flux"),
+        ]
+        mock_pyaudio_instance.open.return_value = mock_stream
+        mock_pyaudio_instance.get_sample_size.return_value = 2
+        mock_mp3_encoder_class.return_value = Mock()
+
+        recorder.start_recording()
+        recorder.recording_thread.join(timeout=2.0)
+
+        stats = recorder.get_capture_stats()
+        assert stats['xruns'] == 1
+        assert stats['wakeups'] == 2
+
+        recorder.stop_recording()
+
+    @patch('src.audio_recorder.find_loopback_device')
+    @patch('src.audio_recorder.get_device_info')
+    @patch('src.audio_recorder.MP3Encoder')
+    @patch('src.audio_recorder.pyaudio.PyAudio')
+    def test_blocking_mode_keeps_overflowed_chunks(
+        self, mock_pyaudio_class, mock_mp3_encoder_class, mock_get_device_info, mock_find_loopback, tmp_path
+    ):
+        """Teste que, par défaut, la lecture bloquante ne perd aucun chunk sur débordement."""
+        recorder = AudioRecorder(output_dir=str(tmp_path))
+
+        mock_find_loopback.return_value = 1
+        mock_get_device_info.return_value = {'name': 'Monitor Device'}
+        mock_pyaudio_instance = Mock()
+        mock_pyaudio_class.return_value = mock_pyaudio_instance
+        mock_stream = Mock()
+        mock_stream.read.side_effect = [b'\x00\x00' * 2048, b'\x00\x00' * 2048, OSError("Fin du flux")]
+        mock_pyaudio_instance.open.return_value = mock_stream
+        mock_pyaudio_instance.get_sample_size.return_value = 2
+        mock_mp3_encoder_class.return_value = Mock()
+
+        recorder.start_recording()
+        recorder.recording_thread.join(timeout=2.0)
+
+        mock_stream.read.assert_called_with(1024, exception_on_overflow=False)
+        stats = recorder.get_capture_stats()
+        assert (stats['xruns'], stats['wakeups']) == (0, 2)
+
+        recorder.stop_recording()
+
+
+class TestAudioRecorderSegmentation:
+    """Tests pour la segmentation des enregistrements."""
+
+    def test_compute_segment_limit_duration(self):
+        """Teste la conversion de la durée de segment en octets PCM."""
+        recorder = AudioRecorder(sample_rate=1000, segment_duration=2.0)
+
+        assert recorder._compute_segment_limit(frame_size=4) == 8000
+
+    def test_compute_segment_limit_size(self):
+        """Teste que la taille maximale est convertie en durée via le bitrate."""
+        # 16000 octets à 128 kbps = 1 seconde
+        recorder = AudioRecorder(sample_rate=1000, bitrate="128k", segment_max_bytes=16000)
+
+        assert recorder._compute_segment_limit(frame_size=4) == 4000
+
+    def test_compute_segment_limit_disabled(self):
+        """Teste qu'aucune limite n'est appliquée par défaut."""
+        recorder = AudioRecorder()
+
+        assert recorder._compute_segment_limit(frame_size=4) is None
+
+    @patch('src.audio_recorder.find_loopback_device')
+    @patch('src.audio_recorder.get_device_info')
+    @patch('src.audio_recorder.MP3Encoder')
+    @patch('src.audio_recorder.pyaudio.PyAudio')
+    def test_segments_roll_over_without_gaps(
+        self, mock_pyaudio_class, mock_mp3_encoder_class, mock_get_device_info, mock_find_loopback, tmp_path
+    ):
+        """Teste que les segments se suivent sans perte et que les précédents sont finalisés."""
+        # 1 seconde = 1000 frames de 4 octets
+        recorder = AudioRecorder(output_dir=str(tmp_path), sample_rate=1000, segment_duration=1.0)
+
+        mock_find_loopback.return_value = 1
+        mock_get_device_info.return_value = {'name': 'Monitor Device'}
+        mock_pyaudio_instance = Mock()
+        mock_pyaudio_class.return_value = mock_pyaudio_instance
+        mock_stream = Mock()
+        chunks = [bytes([i]) * 3000 for i in range(1, 5)]
+        mock_stream.read.side_effect = chunks + [OSError("Fin du flux")]
+        mock_pyaudio_instance.open.return_value = mock_stream
+        mock_pyaudio_instance.get_sample_size.return_value = 2
+
+        encoders = []
+
+        def create_encoder(**kwargs):
+            encoder = Mock()
+            encoder.output_file = kwargs['output_file']
+            encoder.data = bytearray()
+            encoder.write_frames.side_effect = lambda view: encoder.data.extend(view)
+            encoders.append(encoder)
+            return encoder
+
+        mock_mp3_encoder_class.side_effect = create_encoder
+
+        with patch('src.audio_recorder.datetime') as mock_datetime:
+            mock_datetime.now.return_value = datetime(2025, 10, 10, 14, 30, 45)
+            recorder.start_recording()
+            recorder.recording_thread.join(timeout=2.0)
+            recorder.encoder_thread.join(timeout=2.0)
+        recorder.stop_recording()
+
+        # 12000 octets => 3 segments de 4000 octets
+        assert [len(encoder.data) for encoder in encoders] == [4000, 4000, 4000]
+        assert b''.join(bytes(encoder.data) for encoder in encoders) == b''.join(chunks)
+        assert all(encoder.close.called for encoder in encoders)
+        assert len(set(recorder.segment_files)) == 3
+        assert recorder.segment_files[1].name == "2025-10-10_14-30-45_001.mp3"
+
+
+class TestAudioRecorderOutputFormat:
+    """Tests pour le choix du format de sortie."""
+
+    def test_init_unknown_format(self):
+        """Teste qu'un format de sortie inconnu est refusé."""
+        with pytest.raises(ValueError, match="Format de sortie inconnu"):
+            AudioRecorder(output_format="aac")
+
+    def test_default_bitrate_depends_on_format(self):
+        """Teste que le bitrate par défaut dépend du format."""
+        assert AudioRecorder().bitrate == "128k"
+        assert AudioRecorder(output_format="opus").bitrate == "32k"
+        assert AudioRecorder(output_format="wav").bitrate is None
+
+    def test_filename_extension_follows_format(self, tmp_path):
+        """Teste que l'extension des fichiers correspond au format."""
+        recorder = AudioRecorder(output_dir=str(tmp_path), output_format="flac")
+
+        assert recorder._generate_filename().suffix == ".flac"
+
+    def test_segment_size_uses_pcm_rate_for_wav(self):
+        """Teste que la taille des segments WAV est calculée d'après le débit PCM."""
+        recorder = AudioRecorder(
+            sample_rate=44100, output_format="wav", segment_max_bytes=44100 * 4 * 60
+        )
+
+        assert recorder._compute_segment_limit(4) == 44100 * 4 * 60
+
+    @patch('src.audio_recorder.find_loopback_device')
+    @patch('src.audio_recorder.get_device_info')
+    @patch('src.audio_recorder.pyaudio.PyAudio')
+    def test_wav_recording_writes_pcm_file(
+        self, mock_pyaudio_class, mock_get_device_info, mock_find_loopback, tmp_path
+    ):
+        """Teste qu'un enregistrement WAV écrit le PCM capturé sur le disque."""
+        recorder = AudioRecorder(output_dir=str(tmp_path), output_format="wav")
+
+        mock_find_loopback.return_value = 1
+        mock_get_device_info.return_value = {'name': 'Monitor Device'}
+        mock_pyaudio_instance = Mock()
+        mock_pyaudio_class.return_value = mock_pyaudio_instance
+        mock_stream = Mock()
+        mock_stream.read.side_effect = [b'\x01\x00' * 2048, OSError("Fin du flux")]
+        mock_pyaudio_instance.open.return_value = mock_stream
+        mock_pyaudio_instance.get_sample_size.return_value = 2
+
+        output_file = recorder.start_recording()
+        recorder.recording_thread.join(timeout=2.0)
+        recorder.stop_recording()
+
+        assert output_file.suffix == ".wav"
+        data = output_file.read_bytes()
+        assert data[:4] == b'RIFF'
+        assert data[44:] == b'\x01\x00' * 2048
+
+
+    @patch('src.audio_recorder.MP3Encoder')
+    def test_encode_jobs_passed_to_mp3_encoder(self, mock_mp3_encoder_class, tmp_path):
+        """Teste que l'encodage parallèle est transmis à l'encodeur MP3 bufferisé."""
+        recorder = AudioRecorder(output_dir=str(tmp_path), streaming=False, parallel_encode=4)
+        recorder.sample_width = 2
+
+        recorder._create_encoder(tmp_path / "test.mp3")
+
+        kwargs = mock_mp3_encoder_class.call_args[1]
+        assert kwargs['streaming'] is False
+        assert kwargs['encode_jobs'] == 4
+
+    def test_init_unknown_buffer_backend(self):
+        """Teste qu'un backend de buffer inconnu est refusé."""
+        with pytest.raises(ValueError, match="Backend de buffer inconnu"):
+            AudioRecorder(streaming=False, buffer_backend="disk")
+
+    @patch('src.audio_recorder.MP3Encoder')
+    def test_buffer_backend_passed_to_mp3_encoder(self, mock_mp3_encoder_class, tmp_path):
+        """Teste que le backend de buffer est transmis à l'encodeur MP3."""
+        recorder = AudioRecorder(output_dir=str(tmp_path), streaming=False, buffer_backend="mmap")
+        recorder.sample_width = 2
+
+        recorder._create_encoder(tmp_path / "test.mp3")
+
+        assert mock_mp3_encoder_class.call_args[1]['buffer_backend'] == "mmap"
+
+
+class TestAudioRecorderMetering:
+    """Tests pour la mesure des niveaux de l'audio enregistré."""
+
+    @patch('src.audio_recorder.find_loopback_device')
+    @patch('src.audio_recorder.get_device_info')
+    @patch('src.audio_recorder.pyaudio.PyAudio')
+    def test_levels_measured_during_recording(
+        self, mock_pyaudio_class, mock_get_device_info, mock_find_loopback, tmp_path
+    ):
+        """Teste que les niveaux de l'audio capturé sont disponibles après l'arrêt."""
+        recorder = AudioRecorder(output_dir=str(tmp_path), output_format="wav")
+
+        mock_find_loopback.return_value = 1
+        mock_get_device_info.return_value = {'name': 'Monitor Device'}
+        mock_pyaudio_instance = Mock()
+        mock_pyaudio_class.return_value = mock_pyaudio_instance
+        mock_stream = Mock()
+        # 1024 frames stéréo à mi-échelle puis 1024 frames de silence
+        mock_stream.read.side_effect = [
+            b'\x00\x40' * 2048, b'\x00\x00' * 2048, OSError("Fin du flux")
+        ]
+        mock_pyaudio_instance.open.return_value = mock_stream
+        mock_pyaudio_instance.get_sample_size.return_value = 2
+
+        assert recorder.get_levels() is None
+        recorder.start_recording()
+        recorder.recording_thread.join(timeout=2.0)
+        recorder.stop_recording()
+
+        levels = recorder.get_levels()
+        assert levels['duration'] == pytest.approx(2048 / 44100)
+        assert levels['max_peak_db'][0] == pytest.approx(-6.02, abs=0.01)
+        assert levels['silence_ratio'] == 0.5
+
+    def test_metering_disabled(self):
+        """Teste qu'aucun mesureur n'est créé si la mesure est désactivée."""
+        recorder = AudioRecorder(metering=False)
+        recorder.sample_width = 2
+
+        assert recorder._create_level_meter() is None
+        assert recorder.get_levels() is None
+
+
+class TestAudioRecorderVoiceGate:
+    """Tests pour l'enregistrement déclenché par la détection d'activité."""
+
+    @patch('src.audio_recorder.find_loopback_device')
+    @patch('src.audio_recorder.get_device_info')
+    @patch('src.audio_recorder.pyaudio.PyAudio')
+    def test_each_region_in_its_own_file(
+        self, mock_pyaudio_class, mock_get_device_info, mock_find_loopback, tmp_path
+    ):
+        """Teste que les silences sont écartés et que chaque région produit un fichier."""
+        recorder = AudioRecorder(
+            output_dir=str(tmp_path), output_format="wav",
+            gate_threshold_db=-30.0, gate_hangover=0.05, gate_preroll=0.0
+        )
+
+        mock_find_loopback.return_value = 1
+        mock_get_device_info.return_value = {'name': 'Monitor Device'}
+        mock_pyaudio_instance = Mock()
+        mock_pyaudio_class.return_value = mock_pyaudio_instance
+        mock_stream = Mock()
+        loud = b'\x00\x40' * 2048
+        silent = b'\x00\x00' * 2048
+        # Deux régions séparées par quatre chunks de silence (hangover : 3 chunks)
+        mock_stream.read.side_effect = [
+            silent, loud, loud, silent, silent, silent, silent, loud, OSError("Fin du flux")
+        ]
+        mock_pyaudio_instance.open.return_value = mock_stream
+        mock_pyaudio_instance.get_sample_size.return_value = 2
+
+        recorder.start_recording()
+        recorder.recording_thread.join(timeout=2.0)
+        recorder.stop_recording()
+
+        assert len(recorder.segment_files) == 2
+        first, second = recorder.segment_files
+        assert first.read_bytes()[44:] == loud * 2 + silent * 3
+        assert second.read_bytes()[44:] == loud
+        stats = recorder.get_gate_stats()
+        assert stats['regions'] == 2
+        assert stats['dropped_seconds'] == pytest.approx(2 * 1024 / 44100)
+
+    @patch('src.audio_recorder.find_loopback_device')
+    @patch('src.audio_recorder.get_device_info')
+    @patch('src.audio_recorder.pyaudio.PyAudio')
+    def test_silent_recording_produces_no_file(
+        self, mock_pyaudio_class, mock_get_device_info, mock_find_loopback, tmp_path
+    ):
+        """Teste qu'un enregistrement entièrement silencieux ne crée aucun fichier."""
+        recorder = AudioRecorder(output_dir=str(tmp_path), output_format="wav", gate_threshold_db=-30.0)
+
+        mock_find_loopback.return_value = 1
+        mock_get_device_info.return_value = {'name': 'Monitor Device'}
+        mock_pyaudio_instance = Mock()
+        mock_pyaudio_class.return_value = mock_pyaudio_instance
+        mock_stream = Mock()
+        mock_stream.read.side_effect = [b'\x00\x00' * 2048, OSError("Fin du flux")]
+        mock_pyaudio_instance.open.return_value = mock_stream
+        mock_pyaudio_instance.get_sample_size.return_value = 2
+
+        recorder.start_recording()
+        recorder.recording_thread.join(timeout=2.0)
+        recorder.stop_recording()
+
+        assert recorder.segment_files == []
+        assert list(tmp_path.iterdir()) == []
+
+    def test_gate_disabled_by_default(self):
+        """Teste que la détection d'activité est désactivée par défaut."""
+        recorder = AudioRecorder()
+
+        assert recorder._create_voice_gate() is None
+        assert recorder.get_gate_stats() is None
+
+
+class TestAudioRecorderFormatNegotiation:
+    """Tests pour la capture au format natif du périphérique."""
+
+    def _record(self, recorder, device_info, chunks):
+        """Enregistre des chunks avec un périphérique simulé et retourne le fichier et le mock PyAudio."""
+        with patch('src.audio_recorder.get_device_info', return_value=device_info), \
+                patch('src.audio_recorder.pyaudio.PyAudio') as mock_pyaudio_class:
+            mock_pyaudio_instance = Mock()
+            mock_pyaudio_class.return_value = mock_pyaudio_instance
+            mock_stream = Mock()
+            mock_stream.read.side_effect = chunks + [OSError("Fin du flux")]
+            mock_pyaudio_instance.open.return_value = mock_stream
+            mock_pyaudio_instance.get_sample_size.return_value = 2
+
+            output_file = recorder.start_recording()
+            recorder.recording_thread.join(timeout=2.0)
+            recorder.stop_recording()
+        return output_file, mock_pyaudio_instance
+
+    def test_captures_at_native_rate_and_channels(self, tmp_path):
+        """Teste l'ouverture du flux au taux et aux canaux natifs du périphérique."""
+        recorder = AudioRecorder(output_dir=str(tmp_path), output_format="wav", device_index=3)
+        device_info = {'name': 'USB Mic', 'maxInputChannels': 1, 'defaultSampleRate': 48000.0}
+
+        output_file, mock_pyaudio_instance = self._record(recorder, device_info, [b'\x01\x00' * 1024])
+
+        _, kwargs = mock_pyaudio_instance.open.call_args
+        assert (kwargs['rate'], kwargs['channels']) == (48000, 1)
+        assert recorder.resampler is None
+        header = output_file.read_bytes()[:44]
+        assert int.from_bytes(header[22:24], 'little') == 1
+        assert int.from_bytes(header[24:28], 'little') == 48000
+        assert output_file.stat().st_size == 44 + 2048
+
+    def test_resamples_to_requested_rate(self, tmp_path):
+        """Teste la conversion dans le pipeline quand le taux demandé diffère du taux natif."""
+        recorder = AudioRecorder(
+            output_dir=str(tmp_path), output_format="wav", device_index=3, sample_rate=16000
+        )
+        device_info = {'name': 'Loopback', 'maxInputChannels': 2, 'defaultSampleRate': 48000.0}
+
+        output_file, mock_pyaudio_instance = self._record(recorder, device_info, [b'\x00\x10' * 2048] * 3)
+
+        _, kwargs = mock_pyaudio_instance.open.call_args
+        assert (kwargs['rate'], kwargs['channels']) == (48000, 2)
+        assert int.from_bytes(output_file.read_bytes()[24:28], 'little') == 16000
+        # 3072 frames à 48 kHz -> 1024 frames stéréo à 16 kHz
+        assert output_file.stat().st_size == 44 + 1024 * 4
+        stats = recorder.get_capture_stats()
+        assert (stats['capture_rate'], stats['sample_rate']) == (48000, 16000)
+
+
+class TestAudioRecorderReplay:
+    """Tests pour le mode relecture (fenêtre des dernières secondes, sans encodage en veille)."""
+
+    # 1024 frames stéréo 16 bits par chunk, à 1024 Hz : une seconde par chunk
+    DEVICE_INFO = {'name': 'Loopback', 'maxInputChannels': 2, 'defaultSampleRate': 1024.0}
+
+    def _start(self, recorder):
+        """Démarre la capture en mode callback et retourne le callback PortAudio."""
+        with patch('src.audio_recorder.get_device_info', return_value=self.DEVICE_INFO), \
+                patch('src.audio_recorder.pyaudio.PyAudio') as mock_pyaudio_class:
+            mock_pyaudio_instance = Mock()
+            mock_pyaudio_class.return_value = mock_pyaudio_instance
+            mock_pyaudio_instance.get_sample_size.return_value = 2
+            output_file = recorder.start_recording()
+        callback = mock_pyaudio_instance.open.call_args[1]['stream_callback']
+        return output_file, callback
+
+    def _capture(self, recorder, callback, values):
+        """Capture un chunk par valeur et attend que l'encodeur les ait lus."""
+        for value in values:
+            callback(bytes([value]) * 4096, 1024, {}, 0)
+        deadline = time.monotonic() + 2.0
+        while recorder.ring_buffer.fill_level and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_save_writes_window_then_live_audio(self, tmp_path):
+        """Teste l'enregistrement des dernières secondes suivies de l'audio capturé ensuite."""
+        recorder = AudioRecorder(
+            output_dir=str(tmp_path), output_format="wav", device_index=3,
+            capture_mode="callback", replay_seconds=2
+        )
+        output_file, callback = self._start(recorder)
+        self._capture(recorder, callback, [1, 2, 3])
+
+        assert output_file is None and recorder.encoder is None
+        assert recorder.get_levels() is None
+        assert recorder.get_replay_stats() == {'capacity': 2.0, 'buffered': 2.0, 'overwritten': 1.0}
+        assert list(tmp_path.iterdir()) == []
+
+        saved_file = recorder.save_replay()
+        with pytest.raises(RuntimeError, match="relecture"):
+            recorder.save_replay()
+        self._capture(recorder, callback, [4])
+        recorder.stop_recording()
+
+        assert recorder.segment_files == [saved_file]
+        assert saved_file.read_bytes()[44:] == b'\x02' * 4096 + b'\x03' * 4096 + b'\x04' * 4096
+        assert recorder.get_replay_stats() is None
+        assert recorder.get_levels()['duration'] == 3.0
+
+    def test_save_just_before_stop(self, tmp_path):
+        """Teste que la fenêtre est écrite même si aucun chunk ne suit la demande."""
+        recorder = AudioRecorder(
+            output_dir=str(tmp_path), output_format="wav", device_index=3,
+            capture_mode="callback", replay_seconds=5, buffer_backend="mmap"
+        )
+        _, callback = self._start(recorder)
+        self._capture(recorder, callback, [7])
+
+        saved_file = recorder.save_replay()
+        recorder.stop_recording()
+
+        assert saved_file.read_bytes()[44:] == b'\x07' * 4096
+
+    def test_stop_in_standby_produces_no_file(self, tmp_path):
+        """Teste qu'un arrêt en veille ne produit aucun fichier."""
+        recorder = AudioRecorder(
+            output_dir=str(tmp_path), output_format="wav", device_index=3,
+            capture_mode="callback", replay_seconds=2
+        )
+        _, callback = self._start(recorder)
+        self._capture(recorder, callback, [1])
+        recorder.stop_recording()
+
+        assert recorder.segment_files == []
+        assert recorder.replay_buffer is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_save_requires_replay_mode(self, tmp_path):
+        """Teste le refus de save_replay() hors du mode relecture."""
+        recorder = AudioRecorder(output_dir=str(tmp_path))
+
+        with pytest.raises(RuntimeError, match="relecture"):
+            recorder.save_replay()
+
+
+class TestAudioRecorderPulseBackend:
+    """Tests pour le moteur de capture PulseAudio directe (faux parec)."""
+
+    def _wait_wakeups(self, recorder, count):
+        """Attend que la capture ait lu `count` fragments."""
+        deadline = time.monotonic() + 2.0
+        while recorder.capture_wakeups < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_records_named_source(self, tmp_path):
+        """Teste la capture d'une source nommée, par fragments, sans PortAudio."""
+        script = fake_parec(tmp_path, frames=3 * 4410)
+        recorder = AudioRecorder(
+            output_dir=str(tmp_path), output_format="wav", capture_backend="pulse",
+            pulse_source="bluez_output.monitor", fragment_seconds=0.1
+        )
+
+        with patch('src.pulse_capture.PAREC', str(script)), \
+                patch('src.audio_recorder.pyaudio.PyAudio') as mock_pyaudio_class:
+            output_file = recorder.start_recording()
+            self._wait_wakeups(recorder, 3)
+            args = recorded_args(tmp_path)
+            recorder.stop_recording()
+
+        mock_pyaudio_class.assert_not_called()
+        assert "--device=bluez_output.monitor" in args
+        assert output_file.stat().st_size == 44 + 3 * 4410 * 4
+        stats = recorder.get_capture_stats()
+        assert (stats['capture_backend'], stats['wakeups']) == ("pulse", 3)
+        assert recorder.pulse_capture is None
+
+    def test_default_monitor_native_format(self, tmp_path):
+        """Teste la capture du Monitor par défaut à son format natif."""
+        script = fake_parec(tmp_path, frames=4800)
+        monitor = {'name': 'alsa_output.pci.monitor', 'sample_rate': 48000, 'channels': 2}
+        recorder = AudioRecorder(
+            output_dir=str(tmp_path), output_format="wav", capture_backend="pulse", sample_rate=16000,
+            fragment_seconds=0.1
+        )
+
+        with patch('src.pulse_capture.PAREC', str(script)), \
+                patch('src.audio_recorder.find_default_sink_monitor', return_value=monitor):
+            output_file = recorder.start_recording()
+            self._wait_wakeups(recorder, 1)
+            args = recorded_args(tmp_path)
+            recorder.stop_recording()
+
+        assert "--rate=48000" in args and "--device=alsa_output.pci.monitor" in args
+        assert recorder.device_name == "alsa_output.pci.monitor"
+        assert int.from_bytes(output_file.read_bytes()[24:28], 'little') == 16000
+
+    def test_stream_interrupted(self, tmp_path, capsys):
+        """Teste qu'une fin inattendue du flux arrête l'enregistrement avec le message de parec."""
+        script = fake_parec(tmp_path, frames=100, wait=False)
+        recorder = AudioRecorder(
+            output_dir=str(tmp_path), output_format="wav", capture_backend="pulse", pulse_source="absente"
+        )
+
+        with patch('src.pulse_capture.PAREC', str(script)):
+            recorder.start_recording()
+            recorder.recording_thread.join(timeout=2.0)
+
+        assert not recorder.is_recording
+        assert "Flux PulseAudio interrompu: Connexion refusée" in capsys.readouterr().out
+        recorder.stop_recording()
+
+    def test_invalid_backend(self, tmp_path):
+        """Teste le refus d'un moteur de capture inconnu."""
+        with pytest.raises(ValueError, match="Backend de capture inconnu"):
+            AudioRecorder(output_dir=str(tmp_path), capture_backend="alsa")
+
+
+class TestAudioRecorderReroute:
+    """Tests pour le changement de source PulseAudio pendant l'enregistrement."""
+
+    def _record(self, tmp_path, change, **options):
+        """Enregistre avec un faux serveur PulseAudio, applique `change` puis arrête."""
+        server = FakePulseServer()
+        monitor = PulseDeviceMonitor(pulse_module=server.module)
+        monitor.start()
+        script = fake_parec(tmp_path, frames=4410, lost_sources=[f"{BLUEZ_SINK}.monitor"])
+        recorder = AudioRecorder(
+            output_dir=str(tmp_path), output_format="wav", capture_backend="pulse",
+            fragment_seconds=0.1, device_monitor=monitor, **options
+        )
+        try:
+            with patch('src.pulse_capture.PAREC', str(script)):
+                output_file = recorder.start_recording()
+                change(recorder, server)
+                deadline = time.monotonic() + 2.0
+                while recorder.is_recording and recorder.capture_wakeups < 2 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                recorder.stop_recording()
+        finally:
+            monitor.stop()
+        return recorder, output_file
+
+    def test_reroutes_when_source_removed(self, tmp_path):
+        """Teste la reprise sur le nouveau Monitor quand le casque disparaît, sans changer de fichier."""
+        def disconnect(recorder, server):
+            # parec s'arrête avec la source, puis le serveur signale le retrait
+            recorder.recording_thread.join(timeout=0.3)
+            server.remove_sink(BLUEZ_SINK, new_default=ALSA_SINK)
+
+        recorder, output_file = self._record(tmp_path, disconnect, pulse_source=f"{BLUEZ_SINK}.monitor")
+
+        assert recorder.device_name == f"{ALSA_SINK}.monitor"
+        assert [reroute['source'] for reroute in recorder.reroutes] == [f"{ALSA_SINK}.monitor"]
+        reroute = recorder.reroutes[0]
+        assert reroute['position'] == pytest.approx(0.1)
+        assert 0 < reroute['silence'] <= reroute['gap']
+        # Un seul fichier : les deux flux et le silence intercalé
+        silence_frames = round(reroute['silence'] * 44100)
+        assert recorder.segment_files == [output_file]
+        assert output_file.stat().st_size == 44 + (2 * 4410 + silence_frames) * 4
+        stats = recorder.get_capture_stats()
+        assert stats['reroutes'] == 1 and stats['reroute_gap'] == reroute['silence']
+
+    def _wait_first_fragment(self, recorder):
+        """Attend que la première source ait été lue."""
+        deadline = time.monotonic() + 2.0
+        while recorder.capture_wakeups < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_follows_default_sink(self, tmp_path):
+        """Teste le passage au Monitor de la nouvelle sortie par défaut."""
+        def switch_default(recorder, server):
+            self._wait_first_fragment(recorder)
+            server.default_sink = ALSA_SINK
+            server.emit('server', 'change')
+
+        recorder, output_file = self._record(tmp_path, switch_default)
+
+        assert recorder.device_name == f"{ALSA_SINK}.monitor"
+        assert [reroute['source'] for reroute in recorder.reroutes] == [f"{ALSA_SINK}.monitor"]
+
+    def test_gap_bounded(self, tmp_path, capsys):
+        """Teste l'arrêt de la capture si aucune source ne remplace celle perdue à temps."""
+        recorder, _ = self._record(
+            tmp_path, lambda recorder, server: recorder.recording_thread.join(timeout=2.0),
+            pulse_source=f"{BLUEZ_SINK}.monitor", max_reroute_gap=0.2
+        )
+
+        assert recorder.reroutes == []
+        assert "Flux PulseAudio interrompu" in capsys.readouterr().out
+
+
+class TestAudioRecorderTranscription:
+    """Tests pour la transcription pendant l'enregistrement."""
+
+    @patch('src.audio_recorder.find_loopback_device')
+    @patch('src.audio_recorder.get_device_info')
+    @patch('src.audio_recorder.pyaudio.PyAudio')
+    def test_transcriber_receives_captured_audio(
+        self, mock_pyaudio_class, mock_get_device_info, mock_find_loopback, tmp_path
+    ):
+        """Teste que le transcripteur reçoit l'audio encodé puis la fin du flux."""
+        transcriber = Mock()
+        received = []
+        transcriber.write.side_effect = lambda view: received.append(bytes(view))
+        recorder = AudioRecorder(output_dir=str(tmp_path), output_format="wav", transcriber=transcriber)
+
+        mock_find_loopback.return_value = 1
+        mock_get_device_info.return_value = {'name': 'Monitor Device'}
+        mock_pyaudio_instance = Mock()
+        mock_pyaudio_class.return_value = mock_pyaudio_instance
+        mock_stream = Mock()
+        mock_stream.read.side_effect = [b'\x01\x00' * 2048, b'\x02\x00' * 2048, OSError("Fin du flux")]
+        mock_pyaudio_instance.open.return_value = mock_stream
+        mock_pyaudio_instance.get_sample_size.return_value = 2
+
+        output_file = recorder.start_recording()
+        recorder.recording_thread.join(timeout=2.0)
+        recorder.stop_recording()
+
+        transcriber.start.assert_called_once_with(44100, 2, 2)
+        transcriber.finish.assert_called_once()
+        assert b"".join(received) == output_file.read_bytes()[44:]
+
+
+    @patch('src.audio_recorder.find_loopback_device')
+    @patch('src.audio_recorder.get_device_info')
+    @patch('src.audio_recorder.pyaudio.PyAudio')
+    def test_taps_receive_audio_and_end_of_capture(
+        self, mock_pyaudio_class, mock_get_device_info, mock_find_loopback, tmp_path
+    ):
+        """Teste que les consommateurs ajoutés reçoivent l'audio, et la fin dès l'arrêt de la capture."""
+        tap, removed = Mock(), Mock()
+        received = []
+        tap.write.side_effect = lambda view: received.append(bytes(view))
+        recorder = AudioRecorder(output_dir=str(tmp_path), output_format="wav")
+        recorder.add_tap(tap)
+        recorder.add_tap(removed)
+        recorder.remove_tap(removed)
+
+        mock_find_loopback.return_value = 1
+        mock_get_device_info.return_value = {'name': 'Monitor Device'}
+        mock_pyaudio_instance = Mock()
+        mock_pyaudio_class.return_value = mock_pyaudio_instance
+        mock_stream = Mock()
+        mock_stream.read.side_effect = [b'\x03\x00' * 2048, OSError("Fin du flux")]
+        mock_pyaudio_instance.open.return_value = mock_stream
+        mock_pyaudio_instance.get_sample_size.return_value = 2
+
+        recorder.start_recording()
+        recorder.recording_thread.join(timeout=2.0)
+        recorder.encoder_thread.join(timeout=2.0)
+
+        # Capture interrompue : la fin est signalée sans attendre stop_recording()
+        tap.finish.assert_called_once()
+        recorder.stop_recording()
+
+        tap.finish.assert_called_once()
+        tap.start.assert_called_once_with(44100, 2, 2)
+        assert b"".join(received) == b'\x03\x00' * 2048
+        removed.start.assert_not_called()
+
+
+class TestAudioRecorderSinks:
+    """Tests pour la distribution de l'audio encodé à des consommateurs à file."""
+
+    @patch('src.audio_recorder.find_loopback_device')
+    @patch('src.audio_recorder.get_device_info')
+    @patch('src.audio_recorder.pyaudio.PyAudio')
+    def test_sinks_receive_audio_before_stop_returns(
+        self, mock_pyaudio_class, mock_get_device_info, mock_find_loopback, tmp_path
+    ):
+        """Teste que chaque consommateur reçoit tout l'audio et sa fin avant le retour de l'arrêt."""
+        network, failing = Mock(), Mock()
+        received = []
+        network.write.side_effect = lambda data: received.append(data)
+        failing.write.side_effect = OSError("Connexion perdue")
+        recorder = AudioRecorder(output_dir=str(tmp_path), output_format="wav")
+        recorder.add_sink(network, "network", policy="block")
+        recorder.add_sink(failing, "failing")
+
+        mock_find_loopback.return_value = 1
+        mock_get_device_info.return_value = {'name': 'Monitor Device'}
+        mock_pyaudio_instance = Mock()
+        mock_pyaudio_class.return_value = mock_pyaudio_instance
+        mock_stream = Mock()
+        mock_stream.read.side_effect = [b'\x01\x00' * 2048, b'\x02\x00' * 2048, OSError("Fin du flux")]
+        mock_pyaudio_instance.open.return_value = mock_stream
+        mock_pyaudio_instance.get_sample_size.return_value = 2
+
+        output_file = recorder.start_recording()
+        recorder.recording_thread.join(timeout=2.0)
+        recorder.stop_recording()
+
+        network.start.assert_called_once_with(44100, 2, 2)
+        network.finish.assert_called_once()
+        assert b"".join(received) == output_file.read_bytes()[44:]
+        stats = recorder.get_sink_stats()
+        assert stats['network']['written_bytes'] == 2 * 4096
+        assert stats['failing']['error'] == "Connexion perdue"
+
+    def test_no_sinks(self):
+        """Teste l'absence de statistiques sans consommateur ajouté."""
+        assert AudioRecorder().get_sink_stats() is None
+
+
+class TestAudioRecorderSpool:
+    """Tests pour le spool PCM de l'enregistreur."""
+
+    def _start(self, recorder, mock_pyaudio_class, mock_get_device_info, mock_find_loopback):
+        """Démarre un enregistrement capturant un seul chunk."""
+        mock_find_loopback.return_value = 1
+        mock_get_device_info.return_value = {'name': 'Monitor Device'}
+        mock_pyaudio_instance = Mock()
+        mock_pyaudio_class.return_value = mock_pyaudio_instance
+        mock_stream = Mock()
+        mock_stream.read.side_effect = [b'\x01\x00' * 2048, OSError("Fin du flux")]
+        mock_pyaudio_instance.open.return_value = mock_stream
+        mock_pyaudio_instance.get_sample_size.return_value = 2
+
+        output_file = recorder.start_recording()
+        recorder.recording_thread.join(timeout=2.0)
+        recorder.encoder_thread.join(timeout=2.0)
+        return output_file
+
+    @patch('src.audio_recorder.find_loopback_device')
+    @patch('src.audio_recorder.get_device_info')
+    @patch('src.audio_recorder.MP3Encoder')
+    @patch('src.audio_recorder.pyaudio.PyAudio')
+    def test_spool_removed_after_successful_encoding(
+        self, mock_pyaudio_class, mock_mp3_encoder_class, mock_get_device_info, mock_find_loopback, tmp_path
+    ):
+        """Teste que le spool reçoit le PCM et disparaît une fois le fichier encodé."""
+        recorder = AudioRecorder(output_dir=str(tmp_path), spool=True)
+        mock_mp3_encoder_class.return_value = Mock()
+
+        output_file = self._start(recorder, mock_pyaudio_class, mock_get_device_info, mock_find_loopback)
+        spool_path = recorder.spool.path
+        assert spool_path == output_file.with_name(output_file.name + ".spool")
+        assert spool_path.exists()
+        assert recorder.spool.bytes_written == 4096
+
+        recorder.stop_recording()
+
+        assert not spool_path.exists()
+
+    @patch('src.audio_recorder.find_loopback_device')
+    @patch('src.audio_recorder.get_device_info')
+    @patch('src.audio_recorder.MP3Encoder')
+    @patch('src.audio_recorder.pyaudio.PyAudio')
+    def test_spool_kept_when_encoding_fails(
+        self, mock_pyaudio_class, mock_mp3_encoder_class, mock_get_device_info, mock_find_loopback, tmp_path
+    ):
+        """Teste que le spool est conservé pour --recover si l'encodage échoue."""
+        recorder = AudioRecorder(output_dir=str(tmp_path), spool=True)
+        mock_mp3_encoder = Mock()
+        mock_mp3_encoder.close.side_effect = RuntimeError("FFmpeg absent")
+        mock_mp3_encoder_class.return_value = mock_mp3_encoder
+
+        output_file = self._start(recorder, mock_pyaudio_class, mock_get_device_info, mock_find_loopback)
+        recorder.stop_recording()
+
+        spool_path = output_file.with_name(output_file.name + ".spool")
+        assert spool_path.exists()
+        assert spool_path.stat().st_size > 4096
+
+    def test_spool_disabled_by_default(self, tmp_path):
+        """Teste qu'aucun spool n'est créé sans l'option."""
+        recorder = AudioRecorder(output_dir=str(tmp_path))
+
+        assert recorder._create_spool(tmp_path / "rec.mp3") is None
+
+
+class TestAudioRecorderEncodePool:
+    """Tests pour l'encodage en arrière-plan des enregistrements."""
+
+    @patch('src.audio_recorder.find_loopback_device')
+    @patch('src.audio_recorder.get_device_info')
+    @patch('src.audio_recorder.MP3Encoder')
+    @patch('src.audio_recorder.pyaudio.PyAudio')
+    def test_stop_returns_batch_without_encoding(
+        self, mock_pyaudio_class, mock_mp3_encoder_class, mock_get_device_info, mock_find_loopback, tmp_path
+    ):
+        """Teste que stop_recording soumet le spool au pool au lieu d'encoder."""
+        encode_pool = Mock()
+        recorder = AudioRecorder(output_dir=str(tmp_path), encode_pool=encode_pool)
+
+        mock_find_loopback.return_value = 1
+        mock_get_device_info.return_value = {'name': 'Monitor Device'}
+        mock_pyaudio_instance = Mock()
+        mock_pyaudio_class.return_value = mock_pyaudio_instance
+        mock_stream = Mock()
+        mock_stream.read.side_effect = [b'\x01\x00' * 2048, OSError("Fin du flux")]
+        mock_pyaudio_instance.open.return_value = mock_stream
+        mock_pyaudio_instance.get_sample_size.return_value = 2
+
+        output_file = recorder.start_recording()
+        recorder.recording_thread.join(timeout=2.0)
+        batch = recorder.stop_recording()
+
+        mock_mp3_encoder_class.assert_not_called()
+        spool_path = output_file.with_name(output_file.name + ".spool")
+        encode_pool.submit.assert_called_once_with(spool_path)
+        assert batch.futures == [encode_pool.submit.return_value]
+        assert spool_path.stat().st_size > 4096
+
+    def test_stop_without_pool_returns_none(self):
+        """Teste que stop_recording ne retourne rien sans pool d'encodage."""
+        recorder = AudioRecorder()
+
+        assert recorder.stop_recording() is None
+
+
+class TestAudioRecorderMultiSource:
+    """Tests pour la capture simultanée de plusieurs périphériques."""
+
+    def test_init_invalid_mix_mode(self):
+        """Teste qu'un mode de mixage inconnu est refusé."""
+        with pytest.raises(ValueError, match="Mode de mixage inconnu"):
+            AudioRecorder(device_indexes=[1, 2], mix_mode="average")
+
+    def test_single_device_in_list_is_manual_device(self):
+        """Teste qu'une liste d'un seul périphérique équivaut à device_index."""
+        recorder = AudioRecorder(device_indexes=[3])
+
+        assert recorder.manual_device_index == 3
+
+    @patch('src.audio_recorder.get_device_info')
+    @patch('src.audio_recorder.MP3Encoder')
+    @patch('src.audio_recorder.pyaudio.PyAudio')
+    def test_two_devices_are_mixed_into_one_encoder(
+        self, mock_pyaudio_class, mock_mp3_encoder_class, mock_get_device_info, tmp_path
+    ):
+        """Teste que deux périphériques sont capturés et mixés dans un seul fichier."""
+        recorder = AudioRecorder(
+            output_dir=str(tmp_path), device_indexes=[1, 2], chunk_size=4, capture_mode="callback"
+        )
+
+        devices = {
+            1: {'name': 'Monitor Device', 'maxInputChannels': 2},
+            2: {'name': 'Microphone', 'maxInputChannels': 1},
+        }
+        mock_get_device_info.side_effect = devices.get
+        mock_pyaudio_instance = Mock()
+        mock_pyaudio_class.return_value = mock_pyaudio_instance
+        mock_pyaudio_instance.get_sample_size.return_value = 2
+        monitor_stream = Mock()
+        microphone_stream = Mock()
+        mock_pyaudio_instance.open.side_effect = [monitor_stream, microphone_stream]
+
+        written = []
+        mock_mp3_encoder = Mock()
+        mock_mp3_encoder.write_frames.side_effect = lambda view: written.append(bytes(view))
+        mock_mp3_encoder_class.return_value = mock_mp3_encoder
+
+        recorder.start_recording()
+        callbacks = [call[1]['stream_callback'] for call in mock_pyaudio_instance.open.call_args_list]
+        # Horodatages identiques : les deux sources ont démarré au même instant
+        with patch('src.audio_recorder.time.monotonic', return_value=100.0):
+            for _ in range(3):
+                callbacks[0](b'\x0a\x00\x14\x00' * 4, 4, {}, 0)
+                callbacks[1](b'\x01\x00' * 4, 4, {}, 0)
+        recorder.stop_recording()
+
+        # Le microphone mono est ouvert avec un seul canal
+        channels = [call[1]['channels'] for call in mock_pyaudio_instance.open.call_args_list]
+        assert channels == [2, 1]
+        assert recorder.device_name == "Monitor Device + Microphone"
+        assert mock_mp3_encoder_class.call_args[1]['channels'] == 2
+
+        # Chaque frame stéréo (10, 20) reçoit l'échantillon mono (1) sur les deux canaux
+        mixed = b''.join(written)
+        assert len(mixed) == 12 * 4
+        assert mixed == b'\x0b\x00\x15\x00' * 12
+        monitor_stream.close.assert_called_once()
+        microphone_stream.close.assert_called_once()
@@ -0,0 +1,279 @@
+"""Tests pour le module de transcription par lots."""
+
+import asyncio
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.batch_transcription import (
+    CHECKPOINT_NAME,
+    AsyncRecognizer,
+    GoogleAsyncRecognizer,
+    HTTPRecognizer,
+    RateLimiter,
+    TranscriptionCheckpoint,
+    find_recordings,
+    transcribe_archive,
+    transcribe_directory,
+    transcript_path,
+)
+
+
+class FakeRecognizer(AsyncRecognizer):
+    """Service local : transcrit le contenu du fichier, en comptant les requêtes simultanées."""
+
+    def __init__(self, delay: float = 0.01, failures: int = 0):
+        self.delay = delay
+        self.failures = failures
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.closed = False
+
+    async def transcribe(self, audio_file: Path) -> str:
+        self.calls.append(audio_file.name)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("service indisponible")
+            return audio_file.read_text()
+        finally:
+            self.active -= 1
+
+    async def close(self):
+        self.closed = True
+
+
+def _recordings(directory: Path, count: int):
+    """Crée `count` faux enregistrements MP3 dont le contenu sert de texte."""
+    for index in range(count):
+        (directory / f"2025-01-01_00-00-{index:02d}.mp3").write_text(f"texte {index}")
+
+
+class StubSpeechHandler(BaseHTTPRequestHandler):
+    """Serveur de transcription local : répond avec la taille et le type reçus."""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if self.headers['X-Filename'].startswith("erreur"):
+            self.send_error(503, "Surcharge")
+            return
+        payload = json.dumps({'text': f"{len(body)} octets {self.headers['Content-Type']}"}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """Serveur HTTP de transcription local sur un port libre."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubSpeechHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/transcribe"
+    server.shutdown()
+    server.server_close()
+
+
+class TestFindRecordings:
+    """Tests pour la fonction find_recordings."""
+
+    def test_skips_hidden_spooled_and_other_files(self, tmp_path):
+        """Teste que seuls les enregistrements terminés sont retenus."""
+        (tmp_path / "a.mp3").write_bytes(b"")
+        (tmp_path / "b.flac").write_bytes(b"")
+        (tmp_path / "b.txt").write_text("transcription")
+        (tmp_path / "en-cours.mp3").write_bytes(b"")
+        (tmp_path / "en-cours.mp3.spool").write_bytes(b"")
+        (tmp_path / ".mp3-tmp").mkdir()
+        (tmp_path / ".mp3-tmp" / "chunk.mp3").write_bytes(b"")
+        (tmp_path / "2025").mkdir()
+        (tmp_path / "2025" / "c.wav").write_bytes(b"")
+
+        assert find_recordings(tmp_path) == [
+            tmp_path / "2025" / "c.wav", tmp_path / "a.mp3", tmp_path / "b.flac"
+        ]
+
+
+class TestTranscriptionCheckpoint:
+    """Tests pour la classe TranscriptionCheckpoint."""
+
+    def test_survives_reload_and_detects_changes(self, tmp_path):
+        """Teste la reprise depuis le journal et la détection d'un fichier modifié."""
+        recording = tmp_path / "a.mp3"
+        recording.write_bytes(b"audio")
+        transcript_path(recording).write_text("texte")
+        checkpoint = TranscriptionCheckpoint(tmp_path / CHECKPOINT_NAME, tmp_path)
+        checkpoint.mark_done(recording)
+        checkpoint.close()
+
+        # Ligne tronquée par un arrêt brutal
+        with open(tmp_path / CHECKPOINT_NAME, "a") as f:
+            f.write('{"file": "b.mp')
+
+        reloaded = TranscriptionCheckpoint(tmp_path / CHECKPOINT_NAME, tmp_path)
+        assert reloaded.is_done(recording)
+        recording.write_bytes(b"audio recupere")
+        assert not reloaded.is_done(recording)
+
+    def test_missing_transcript_not_done(self, tmp_path):
+        """Teste qu'une transcription supprimée est refaite."""
+        recording = tmp_path / "a.mp3"
+        recording.write_bytes(b"audio")
+        checkpoint = TranscriptionCheckpoint(tmp_path / CHECKPOINT_NAME, tmp_path)
+        checkpoint.mark_done(recording)
+        checkpoint.close()
+
+        assert not checkpoint.is_done(recording)
+
+
+class TestRateLimiter:
+    """Tests pour la classe RateLimiter."""
+
+    def test_spaces_requests(self):
+        """Teste que les requêtes sont espacées de 1/rate secondes."""
+        limiter = RateLimiter(rate=50.0)
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await asyncio.gather(*(limiter.acquire() for _ in range(5)))
+            return loop.time() - start
+
+        assert asyncio.run(run()) >= 4 / 50.0 - 0.005
+
+
+class TestTranscribeDirectory:
+    """Tests pour la fonction transcribe_directory."""
+
+    def test_concurrent_transcription_with_sidecars(self, tmp_path):
+        """Teste la transcription concurrente et l'écriture des fichiers texte voisins."""
+        _recordings(tmp_path, 10)
+        recognizer = FakeRecognizer()
+
+        stats = asyncio.run(transcribe_directory(tmp_path, recognizer, concurrency=3))
+
+        assert stats['transcribed'] == 10 and stats['failed'] == 0
+        assert recognizer.max_active == 3
+        assert (tmp_path / "2025-01-01_00-00-07.txt").read_text() == "texte 7\n"
+
+    def test_resumes_from_checkpoint(self, tmp_path):
+        """Teste qu'un second lot ne retranscrit que les nouveaux fichiers."""
+        _recordings(tmp_path, 3)
+        asyncio.run(transcribe_directory(tmp_path, FakeRecognizer()))
+        (tmp_path / "2025-01-01_00-00-99.mp3").write_text("nouveau")
+        recognizer = FakeRecognizer()
+
+        stats = asyncio.run(transcribe_directory(tmp_path, recognizer))
+
+        assert recognizer.calls == ["2025-01-01_00-00-99.mp3"]
+        assert stats['skipped'] == 3 and stats['transcribed'] == 1
+
+    def test_retries_then_reports_failure(self, tmp_path):
+        """Teste les nouvelles tentatives puis le signalement d'un échec persistant."""
+        _recordings(tmp_path, 1)
+        progress = []
+
+        stats = asyncio.run(transcribe_directory(
+            tmp_path, FakeRecognizer(failures=5), retries=2, retry_delay=0.0,
+            on_progress=lambda path, error: progress.append((path.name, error))
+        ))
+
+        assert stats['failed'] == 1
+        assert "indisponible" in list(stats['errors'].values())[0]
+        assert not transcript_path(tmp_path / "2025-01-01_00-00-00.mp3").exists()
+        assert isinstance(progress[0][1], ConnectionError)
+
+        # Un échec transitoire est absorbé par les nouvelles tentatives
+        stats = asyncio.run(transcribe_directory(
+            tmp_path, FakeRecognizer(failures=2), retries=2, retry_delay=0.0
+        ))
+        assert stats['transcribed'] == 1
+
+    def test_transcribe_archive_closes_recognizer(self, tmp_path):
+        """Teste que le point d'entrée synchrone ferme le service."""
+        _recordings(tmp_path, 2)
+        recognizer = FakeRecognizer()
+
+        stats = transcribe_archive(tmp_path, recognizer, concurrency=2)
+
+        assert stats['transcribed'] == 2
+        assert recognizer.closed
+
+
+class TestHTTPRecognizer:
+    """Tests pour la classe HTTPRecognizer avec un serveur local."""
+
+    def test_transcribes_through_stub_server(self, tmp_path, stub_server):
+        """Teste l'envoi des enregistrements au serveur et l'écriture des réponses."""
+        (tmp_path / "a.mp3").write_bytes(b"\xff" * 100)
+        (tmp_path / "b.wav").write_bytes(b"\x00" * 50)
+
+        stats = transcribe_archive(tmp_path, HTTPRecognizer(stub_server), concurrency=2)
+
+        assert stats['transcribed'] == 2
+        assert (tmp_path / "a.txt").read_text() == "100 octets audio/mpeg\n"
+        assert (tmp_path / "b.txt").read_text().startswith("50 octets audio/")
+
+    def test_http_error(self, tmp_path, stub_server):
+        """Teste qu'une erreur HTTP du service est signalée comme un échec."""
+        (tmp_path / "erreur.mp3").write_bytes(b"\xff")
+
+        stats = transcribe_archive(tmp_path, HTTPRecognizer(stub_server), retries=0)
+
+        assert stats['failed'] == 1
+        assert "503" in stats['errors'][str(tmp_path / "erreur.mp3")]
+
+
+class TestGoogleAsyncRecognizer:
+    """Tests pour la classe GoogleAsyncRecognizer."""
+
+    def test_streams_decoded_pcm_with_one_client(self, tmp_path):
+        """Teste l'envoi du PCM décodé en flux et la réutilisation du client."""
+        # Faux FFmpeg : une seconde de PCM mono 16 kHz sur la sortie standard
+        converter = tmp_path / "ffmpeg"
+        converter.write_text(
+            f"#!{sys.executable}\nimport sys\nsys.stdout.buffer.write(b'\\x00' * 32000)\n"
+        )
+        converter.chmod(0o755)
+        recording = tmp_path / "a.mp3"
+        recording.write_bytes(b"")
+
+        speech = Mock()
+        speech.StreamingRecognizeRequest.side_effect = lambda **kwargs: kwargs
+        received = []
+
+        async def streaming_recognize(requests):
+            async for request in requests:
+                received.append(request)
+
+            async def responses():
+                alternative = Mock(transcript=" bonjour ")
+                yield Mock(results=[Mock(is_final=True, alternatives=[alternative])])
+            return responses()
+
+        client = Mock()
+        client.streaming_recognize = streaming_recognize
+        recognizer = GoogleAsyncRecognizer(converter=str(converter), client=client)
+
+        async def run():
+            with patch('src.batch_transcription.load_speech', return_value=speech):
+                return [await recognizer.transcribe(recording) for _ in range(2)]
+
+        assert asyncio.run(run()) == ["bonjour", "bonjour"]
+        speech.SpeechAsyncClient.assert_not_called()
+        assert 'streaming_config' in received[0]
+        assert sum(len(request['audio_content']) for request in received[1:3]) == 32000
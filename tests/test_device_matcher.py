@@ -0,0 +1,84 @@
+"""Tests pour le module de correspondance des noms de périphériques."""
+
+from src.device_matcher import (
+    DeviceMatch,
+    DeviceNameIndex,
+    SubstringAutomaton,
+    best_match
+)
+
+
+DEVICES = [
+    {'index': 0, 'name': 'HDA Intel PCH: ALC257 Analog (hw:0,0)', 'maxInputChannels': 2},
+    {'index': 3, 'name': 'alsa_output.usb-momentum.monitor', 'maxInputChannels': 2},
+    {'index': 7, 'name': 'pulse', 'maxInputChannels': 32},
+    {'index': 9, 'name': 'Built-in Audio Analog Stereo', 'maxInputChannels': 2},
+]
+
+
+class TestSubstringAutomaton:
+    """Tests pour la classe SubstringAutomaton."""
+
+    def test_search_finds_all_patterns(self):
+        """Test que tous les motifs présents sont trouvés en une passe."""
+        automaton = SubstringAutomaton({'he': [1], 'she': [2], 'hers': [3], 'his': [4]})
+
+        assert automaton.search('ushers') == {1, 2, 3}
+        assert automaton.search('this') == {4}
+        assert automaton.search('xyz') == set()
+
+    def test_empty_patterns_ignored(self):
+        """Test qu'un motif vide ne correspond pas à tous les textes."""
+        automaton = SubstringAutomaton({'': [1], 'ab': [2]})
+
+        assert automaton.search('zzz') == set()
+
+
+class TestDeviceNameIndex:
+    """Tests pour la classe DeviceNameIndex."""
+
+    def test_exact_match_ranks_first(self):
+        """Test qu'une correspondance exacte (sans casse) a le meilleur score."""
+        index = DeviceNameIndex(DEVICES)
+
+        candidates = index.rank('ALSA_OUTPUT.USB-MOMENTUM.MONITOR')
+
+        assert candidates[0] == DeviceMatch(3, 1.0, 'exact')
+        # Le fallback "pulse" reste proposé en dernier recours
+        assert candidates[-1] == DeviceMatch(7, 0.1, 'pulse_fallback')
+
+    def test_substring_matches(self):
+        """Test les correspondances par inclusion dans les deux sens."""
+        index = DeviceNameIndex(DEVICES)
+
+        assert index.rank('usb-momentum')[0].strategy == 'pulse_in_device'
+        assert index.rank('pulse.monitor.of.everything')[0] == DeviceMatch(7, 0.8, 'device_in_pulse')
+
+    def test_keyword_match(self):
+        """Test la correspondance par mots-clés de la description."""
+        index = DeviceNameIndex(DEVICES)
+
+        candidates = index.rank('alsa_input.unknown', 'Monitor of Built-in Analog Stereo')
+
+        assert candidates[0].index == 9
+        assert candidates[0].strategy == 'keywords'
+        assert 0.5 < candidates[0].score < 0.8
+
+    def test_batch_matches_each_source(self):
+        """Test que plusieurs sources sont résolues en un seul appel."""
+        index = DeviceNameIndex(DEVICES)
+
+        results = index.match([
+            ('alsa_output.usb-momentum.monitor', 'MOMENTUM 4'),
+            ('bluez_output.headset.monitor', 'Casque Bluetooth'),
+        ])
+
+        assert best_match(results[0]) == 3
+        assert results[1] == [DeviceMatch(7, 0.1, 'pulse_fallback')]
+
+    def test_no_candidates(self):
+        """Test qu'aucun candidat n'est retourné sans correspondance ni fallback."""
+        index = DeviceNameIndex([{'index': 0, 'name': 'Microphone', 'maxInputChannels': 2}])
+
+        assert index.rank('alsa_output.monitor') == []
+        assert best_match([]) is None
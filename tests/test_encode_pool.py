@@ -0,0 +1,101 @@
+"""Tests pour le module d'encodage en arrière-plan."""
+
+import pytest
+from concurrent.futures import Future
+from pathlib import Path
+from unittest.mock import Mock
+
+from src.encode_pool import DeferredEncoder, EncodeBatch, EncodePool
+
+
+class TestEncodePool:
+    """Tests pour la classe EncodePool."""
+
+    def test_encodes_spools_in_worker_processes(self, tmp_path):
+        """Test que plusieurs spools sont encodés en parallèle par le pool."""
+        with EncodePool(max_workers=2) as pool:
+            encoders = []
+            for index in range(3):
+                encoder = DeferredEncoder(
+                    tmp_path / f"rec_{index}.wav", pool, output_format="wav",
+                    sample_rate=8000, channels=1, sample_width=2
+                )
+                encoder.write_frames(bytes([index, 0]) * 100)
+                encoder.close()
+                encoders.append(encoder)
+
+            batch = EncodeBatch([encoder.future for encoder in encoders])
+            files = batch.result(timeout=60)
+
+        assert files == [tmp_path / f"rec_{index}.wav" for index in range(3)]
+        for index, path in enumerate(files):
+            assert path.read_bytes()[44:] == bytes([index, 0]) * 100
+            assert not path.with_name(path.name + ".spool").exists()
+
+    def test_executor_started_lazily(self):
+        """Test qu'aucun processus n'est lancé tant qu'aucun travail n'est soumis."""
+        pool = EncodePool(max_workers=1)
+
+        assert pool._executor is None
+        pool.shutdown()
+
+
+class TestEncodeBatch:
+    """Tests pour la classe EncodeBatch."""
+
+    def test_done_and_result(self):
+        """Test l'état d'un lot selon ses travaux."""
+        first, second = Future(), Future()
+        batch = EncodeBatch([first, second])
+        first.set_result(Path("/tmp/a.mp3"))
+
+        assert len(batch) == 2
+        assert batch.done() is False
+        with pytest.raises(TimeoutError):
+            batch.result(timeout=0)
+
+        second.set_result(Path("/tmp/b.mp3"))
+        assert batch.done() is True
+        assert batch.result() == [Path("/tmp/a.mp3"), Path("/tmp/b.mp3")]
+
+    def test_result_raises_encoding_error(self):
+        """Test qu'un échec d'encodage est propagé."""
+        future = Future()
+        future.set_exception(RuntimeError("FFmpeg absent"))
+
+        with pytest.raises(RuntimeError, match="FFmpeg absent"):
+            EncodeBatch([future]).result()
+
+
+class TestDeferredEncoder:
+    """Tests pour la classe DeferredEncoder."""
+
+    def test_close_submits_spool_without_waiting(self, tmp_path):
+        """Test que close soumet le spool au pool et retourne immédiatement."""
+        pool = Mock()
+        encoder = DeferredEncoder(tmp_path / "rec.mp3", pool, bitrate="128k")
+        encoder.write_frames(b'\x00\x00\x00\x00')
+
+        encoder.close()
+
+        pool.submit.assert_called_once_with(tmp_path / "rec.mp3.spool")
+        assert encoder.future is pool.submit.return_value
+        assert encoder.spool.path.exists()
+
+    def test_close_without_data_submits_nothing(self, tmp_path):
+        """Test qu'aucun travail n'est soumis si rien n'a été capturé."""
+        pool = Mock()
+        encoder = DeferredEncoder(tmp_path / "rec.mp3", pool)
+
+        encoder.close()
+
+        pool.submit.assert_not_called()
+        assert encoder.future is None
+
+    def test_write_after_close_raises_error(self, tmp_path):
+        """Test que write_frames lève une erreur si l'encodeur est fermé."""
+        encoder = DeferredEncoder(tmp_path / "rec.mp3", Mock())
+        encoder.close()
+
+        with pytest.raises(RuntimeError, match="déjà été fermé"):
+            encoder.write_frames(b'\x00\x00')
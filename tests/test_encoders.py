@@ -0,0 +1,66 @@
+"""Tests pour le module de choix de l'encodeur."""
+
+import pytest
+from pathlib import Path
+
+from src.encoders import create_encoder, estimate_byte_rate, get_encoder_class, parse_bitrate
+from src.ffmpeg_encoder import FLACEncoder, OpusEncoder
+from src.mp3_encoder import MP3Encoder
+from src.wav_encoder import WAVEncoder
+
+
+class TestParseBitrate:
+    """Tests pour la fonction parse_bitrate."""
+
+    def test_parse_kilobits(self):
+        """Test la conversion d'un bitrate en kbit/s."""
+        assert parse_bitrate("128k") == 128000
+
+    def test_parse_invalid(self):
+        """Test qu'un bitrate invalide est refusé."""
+        with pytest.raises(ValueError, match="Bitrate invalide"):
+            parse_bitrate("rapide")
+
+
+class TestCreateEncoder:
+    """Tests pour les fonctions get_encoder_class et create_encoder."""
+
+    def test_get_encoder_class(self):
+        """Test que chaque format est associé à son encodeur."""
+        assert get_encoder_class("mp3") is MP3Encoder
+        assert get_encoder_class("opus") is OpusEncoder
+        assert get_encoder_class("flac") is FLACEncoder
+        assert get_encoder_class("wav") is WAVEncoder
+
+    def test_unknown_format(self):
+        """Test qu'un format inconnu est refusé."""
+        with pytest.raises(ValueError, match="Format de sortie inconnu"):
+            get_encoder_class("aac")
+
+    def test_create_mp3_encoder_keeps_options(self):
+        """Test que le bitrate et le mode bufferisé sont transmis à l'encodeur MP3."""
+        encoder = create_encoder("mp3", Path("/tmp/test.mp3"), bitrate="192k", streaming=False)
+
+        assert isinstance(encoder, MP3Encoder)
+        assert encoder.bitrate == "192k"
+        assert encoder.streaming is False
+
+    def test_create_opus_encoder_default_bitrate(self):
+        """Test que le bitrate par défaut dépend du format."""
+        encoder = create_encoder("opus", Path("/tmp/test.opus"))
+
+        assert encoder.bitrate == "32k"
+
+    def test_create_wav_encoder_ignores_bitrate(self):
+        """Test que le bitrate est ignoré pour les formats sans perte."""
+        encoder = create_encoder("wav", Path("/tmp/test.wav"), sample_rate=48000, bitrate="128k")
+
+        assert isinstance(encoder, WAVEncoder)
+        assert encoder.sample_rate == 48000
+
+    def test_estimate_byte_rate(self):
+        """Test l'estimation du débit des fichiers produits."""
+        assert estimate_byte_rate("mp3", 176400, "128k") == 16000
+        assert estimate_byte_rate("opus", 176400) == 4000
+        assert estimate_byte_rate("wav", 176400) == 176400
+        assert estimate_byte_rate("flac", 176400) < 176400
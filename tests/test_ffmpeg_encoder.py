@@ -0,0 +1,104 @@
+"""Tests pour les encodeurs FLAC et Opus."""
+
+import pytest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from src.ffmpeg_encoder import FLACEncoder, OpusEncoder
+
+
+class TestFLACEncoder:
+    """Tests pour la classe FLACEncoder."""
+
+    @patch('src.ffmpeg_encoder.FFmpegPipe')
+    def test_write_frames_feeds_flac_pipe(self, mock_pipe_class):
+        """Test que les frames sont transmises à un processus FFmpeg FLAC."""
+        mock_pipe = Mock()
+        mock_pipe_class.return_value = mock_pipe
+
+        encoder = FLACEncoder(output_file=Path("/tmp/test.flac"), compression_level=8)
+        encoder.write_frames(b'\x00\x01')
+        encoder.write_frames(b'\x02\x03')
+
+        mock_pipe_class.assert_called_once()
+        mock_pipe.start.assert_called_once()
+        assert mock_pipe.write.call_count == 2
+        command = mock_pipe_class.call_args[0][0]
+        assert command[command.index('-codec:a') + 1] == 'flac'
+        assert command[command.index('-compression_level') + 1] == '8'
+        assert command[-1] == '/tmp/test.flac'
+
+    @patch('src.ffmpeg_encoder.FFmpegPipe')
+    def test_close_without_data(self, mock_pipe_class):
+        """Test qu'aucun processus n'est lancé si aucune donnée n'a été écrite."""
+        encoder = FLACEncoder(output_file=Path("/tmp/test.flac"))
+        encoder.close()
+
+        mock_pipe_class.assert_not_called()
+        assert encoder._is_closed is True
+
+    @patch('src.ffmpeg_encoder.FFmpegPipe')
+    def test_ffmpeg_not_found(self, mock_pipe_class):
+        """Test que l'absence de FFmpeg est signalée dès la première écriture."""
+        mock_pipe = Mock()
+        mock_pipe.start.side_effect = FileNotFoundError("ffmpeg not found")
+        mock_pipe_class.return_value = mock_pipe
+
+        encoder = FLACEncoder(output_file=Path("/tmp/test.flac"))
+
+        with pytest.raises(RuntimeError, match="FFmpeg n'est pas installé"):
+            encoder.write_frames(b'\x00\x01')
+
+    @patch('src.ffmpeg_encoder.FFmpegPipe')
+    def test_close_error_is_reported(self, mock_pipe_class):
+        """Test qu'un échec de FFmpeg à la fermeture est signalé."""
+        mock_pipe = Mock()
+        mock_pipe.close.side_effect = RuntimeError("FFmpeg a échoué (code 1)")
+        mock_pipe_class.return_value = mock_pipe
+
+        encoder = FLACEncoder(output_file=Path("/tmp/test.flac"))
+        encoder.write_frames(b'\x00\x01')
+
+        with pytest.raises(RuntimeError, match="Erreur lors de l'encodage FLAC"):
+            encoder.close()
+        assert encoder._is_closed is True
+
+    def test_write_after_close_raises_error(self):
+        """Test que write_frames lève une erreur si l'encodeur est fermé."""
+        encoder = FLACEncoder(output_file=Path("/tmp/test.flac"))
+        encoder.close()
+
+        with pytest.raises(RuntimeError, match="déjà été fermé"):
+            encoder.write_frames(b'\x00\x01')
+
+
+    @patch('src.ffmpeg_encoder.AudioSegment')
+    def test_default_converter_is_pydub_converter(self, mock_audio_segment_class):
+        """Test que l'exécutable FFmpeg par défaut est celui configuré dans pydub."""
+        mock_audio_segment_class.converter = "/opt/ffmpeg/bin/ffmpeg"
+
+        assert FLACEncoder(output_file=Path("/tmp/test.flac")).converter == "/opt/ffmpeg/bin/ffmpeg"
+        assert FLACEncoder(output_file=Path("/tmp/test.flac"), converter="avconv").converter == "avconv"
+
+class TestOpusEncoder:
+    """Tests pour la classe OpusEncoder."""
+
+    @patch('src.ffmpeg_encoder.FFmpegPipe')
+    def test_codec_arguments(self, mock_pipe_class):
+        """Test que l'encodeur Opus utilise libopus dans un conteneur Ogg."""
+        mock_pipe_class.return_value = Mock()
+
+        encoder = OpusEncoder(output_file=Path("/tmp/test.opus"), bitrate="24k", application="voip")
+        encoder.write_frames(b'\x00\x01')
+
+        command = mock_pipe_class.call_args[0][0]
+        assert command[command.index('-codec:a') + 1] == 'libopus'
+        assert command[command.index('-b:a') + 1] == '24k'
+        assert command[command.index('-application') + 1] == 'voip'
+        assert command[command.index('-f', command.index('pipe:0')) + 1] == 'ogg'
+
+    def test_default_bitrate(self):
+        """Test que le bitrate par défaut est adapté aux bas débits."""
+        encoder = OpusEncoder(output_file=Path("/tmp/test.opus"))
+
+        assert encoder.bitrate == "32k"
@@ -0,0 +1,116 @@
+"""Tests pour le module d'encodage en flux continu via FFmpeg."""
+
+import sys
+import threading
+import pytest
+from pathlib import Path
+
+from src.ffmpeg_pipe import FFmpegPipe, build_ffmpeg_command
+
+
+def _copy_command(output_file: Path):
+    """Commande factice qui recopie l'entrée standard dans un fichier (remplace FFmpeg)."""
+    script = (
+        "import sys, shutil\n"
+        f"with open({str(output_file)!r}, 'wb') as f:\n"
+        "    shutil.copyfileobj(sys.stdin.buffer, f)\n"
+    )
+    return [sys.executable, '-c', script]
+
+
+class TestBuildFFmpegCommand:
+    """Tests pour la fonction build_ffmpeg_command."""
+
+    def test_build_command(self):
+        """Test que la commande décrit correctement l'entrée PCM."""
+        command = build_ffmpeg_command(
+            output_file=Path("/tmp/out.mp3"),
+            sample_rate=48000,
+            channels=1,
+            sample_width=2,
+            codec_args=['-codec:a', 'libmp3lame']
+        )
+
+        assert command[0] == 'ffmpeg'
+        assert command[command.index('-f') + 1] == 's16le'
+        assert command[command.index('-ar') + 1] == '48000'
+        assert command[command.index('-ac') + 1] == '1'
+        assert command[command.index('-i') + 1] == 'pipe:0'
+        assert command[-3:] == ['-codec:a', 'libmp3lame', '/tmp/out.mp3']
+
+    def test_build_command_invalid_sample_width(self):
+        """Test qu'une largeur d'échantillon inconnue est refusée."""
+        with pytest.raises(ValueError, match="non supportée"):
+            build_ffmpeg_command(Path("/tmp/out.mp3"), 44100, 2, 5, [])
+
+
+class TestFFmpegPipe:
+    """Tests pour la classe FFmpegPipe."""
+
+    def test_write_and_close(self, tmp_path):
+        """Test que les données sont transmises au processus au fil de l'eau."""
+        output_file = tmp_path / "out.raw"
+        pipe = FFmpegPipe(_copy_command(output_file))
+        pipe.start()
+
+        pipe.write(b'\x00\x01' * 100)
+        pipe.write(memoryview(b'\x02\x03' * 100))
+        pipe.close()
+
+        assert pipe.bytes_written == 400
+        assert output_file.read_bytes() == b'\x00\x01' * 100 + b'\x02\x03' * 100
+
+    def test_write_before_start_raises_error(self):
+        """Test qu'on ne peut pas écrire avant le démarrage du processus."""
+        pipe = FFmpegPipe(['ffmpeg'])
+
+        with pytest.raises(RuntimeError, match="n'est pas démarré"):
+            pipe.write(b'\x00')
+
+    def test_close_reports_failure(self):
+        """Test qu'un code de retour non nul est remonté avec la sortie d'erreur."""
+        pipe = FFmpegPipe([sys.executable, '-c', "import sys; sys.stderr.write('boom'); sys.exit(3)"])
+        pipe.start()
+
+        with pytest.raises(RuntimeError, match="boom"):
+            pipe.close()
+
+    def test_verbose_stderr_does_not_block_writes(self):
+        """Test qu'une sortie d'erreur abondante ne bloque pas FFmpeg, et que sa fin est remontée."""
+        pipe = FFmpegPipe([sys.executable, '-c', (
+            "import sys\n"
+            "for _ in range(20000):\n"
+            "    sys.stderr.write('avertissement\\n')\n"
+            "    sys.stdin.buffer.read(10)\n"
+            "sys.stderr.write('boom')\n"
+            "sys.exit(3)\n"
+        )])
+        pipe.start()
+        writer = threading.Thread(target=lambda: pipe.write(b'\x00' * 200000), daemon=True)
+        writer.start()
+        writer.join(timeout=5.0)
+
+        assert not writer.is_alive()
+        with pytest.raises(RuntimeError, match="boom") as error:
+            pipe.close()
+        assert len(str(error.value)) < 4200
+
+    def test_close_without_start(self):
+        """Test que close ne fait rien si le processus n'a jamais été lancé."""
+        pipe = FFmpegPipe(['ffmpeg'])
+        pipe.close()
+
+    def test_start_with_stdin_file(self, tmp_path):
+        """Test que FFmpeg peut lire directement un fichier PCM."""
+        source = tmp_path / "in.raw"
+        source.write_bytes(b'\x04\x05' * 100)
+        output_file = tmp_path / "out.raw"
+        pipe = FFmpegPipe(_copy_command(output_file))
+
+        with open(source, 'rb') as stdin:
+            pipe.start(stdin=stdin)
+            with pytest.raises(RuntimeError, match="pas démarré"):
+                pipe.write(b'\x00')
+            pipe.close()
+
+        assert output_file.read_bytes() == b'\x04\x05' * 100
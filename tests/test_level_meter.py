@@ -0,0 +1,117 @@
+"""Tests pour le module de mesure des niveaux audio."""
+
+import numpy as np
+import pytest
+
+from src.level_meter import MIN_DB, LevelMeter, format_meter, to_db
+
+
+def _pcm(*channels) -> bytes:
+    """Entrelace des canaux int16 en PCM brut."""
+    return np.stack(channels, axis=1).astype(np.int16).tobytes()
+
+
+class TestToDb:
+    """Tests pour la conversion en dBFS."""
+
+    def test_full_scale(self):
+        """Teste que la pleine échelle vaut 0 dBFS."""
+        assert to_db(1.0) == 0.0
+
+    def test_silence_floor(self):
+        """Teste que le silence numérique est borné au plancher."""
+        assert to_db(0.0) == MIN_DB
+
+
+class TestLevelMeter:
+    """Tests pour la classe LevelMeter."""
+
+    def test_invalid_sample_width(self):
+        """Teste qu'une largeur d'échantillon non supportée est refusée."""
+        with pytest.raises(ValueError, match="non supportée"):
+            LevelMeter(channels=2, sample_width=3)
+
+    def test_rms_and_peak_per_channel(self):
+        """Teste le calcul du RMS et de la crête de chaque canal."""
+        meter = LevelMeter(channels=2, sample_rate=1000)
+        left = np.full(1000, 16384)
+        right = np.where(np.arange(1000) % 2, 8192, -8192)
+
+        meter.process(_pcm(left, right))
+        levels = meter.get_levels()
+
+        assert levels['rms_db'][0] == pytest.approx(20 * np.log10(0.5), abs=0.01)
+        assert levels['rms_db'][1] == pytest.approx(20 * np.log10(0.25), abs=0.01)
+        assert levels['peak_db'][0] == pytest.approx(levels['rms_db'][0], abs=0.01)
+        assert levels['duration'] == 1.0
+        assert levels['clipped_samples'] == [0, 0]
+
+    def test_blocks_larger_than_scratch(self):
+        """Teste qu'un chunk plus grand que les buffers de travail est entièrement mesuré."""
+        meter = LevelMeter(channels=1, sample_rate=1000, block_frames=64)
+        samples = np.zeros(1000)
+        samples[999] = 32767
+
+        meter.process(_pcm(samples))
+
+        assert meter.get_levels()['peak_db'] == [pytest.approx(0.0, abs=0.01)]
+        assert meter.get_levels()['clipped_samples'] == [1]
+
+    def test_clipping_counts_both_polarities(self):
+        """Teste que les échantillons à pleine échelle sont comptés en positif et en négatif."""
+        meter = LevelMeter(channels=1)
+
+        meter.process(_pcm(np.array([32767, -32768, 100, -32768])))
+
+        assert meter.get_levels()['clipped_samples'] == [3]
+
+    def test_silence_detection(self):
+        """Teste le suivi de la durée de silence en cours et du taux de silence."""
+        meter = LevelMeter(channels=1, sample_rate=1000, silence_threshold_db=-60.0)
+
+        meter.process(_pcm(np.full(500, 10000)))
+        meter.process(_pcm(np.zeros(1000)))
+        meter.process(_pcm(np.full(500, 3)))  # environ -80 dBFS
+        levels = meter.get_levels()
+
+        assert levels['silent'] is True
+        assert levels['silent_seconds'] == 1.5
+        assert levels['silence_ratio'] == 0.75
+
+        meter.process(_pcm(np.full(100, 10000)))
+        assert meter.get_levels()['silent_seconds'] == 0.0
+
+    def test_average_and_max_peak_are_cumulative(self):
+        """Teste que la crête maximale et le RMS moyen portent sur tout l'enregistrement."""
+        meter = LevelMeter(channels=1, sample_rate=1000)
+
+        meter.process(_pcm(np.full(1000, 16384)))
+        meter.process(_pcm(np.zeros(1000)))
+        levels = meter.get_levels()
+
+        assert levels['peak_db'] == [MIN_DB]
+        assert levels['max_peak_db'][0] == pytest.approx(20 * np.log10(0.5), abs=0.01)
+        assert levels['average_rms_db'][0] == pytest.approx(20 * np.log10(0.5 / np.sqrt(2)), abs=0.01)
+
+    def test_int32_samples(self):
+        """Teste la mesure d'un PCM 32 bits."""
+        meter = LevelMeter(channels=1, sample_width=4)
+
+        meter.process(np.full(100, 2 ** 30, dtype=np.int32).tobytes())
+
+        assert meter.get_levels()['rms_db'][0] == pytest.approx(20 * np.log10(0.5), abs=0.01)
+
+
+class TestFormatMeter:
+    """Tests pour la mise en forme du vumètre."""
+
+    def test_format_meter(self):
+        """Teste la ligne affichée pour chaque canal et les alertes."""
+        meter = LevelMeter(channels=2, sample_rate=1000)
+        meter.process(_pcm(np.full(2000, 32767), np.zeros(2000)))
+
+        line = format_meter(meter.get_levels(), width=10)
+
+        assert "1 [##########]" in line
+        assert "2 [----------]" in line
+        assert "écrêtage" in line
@@ -198,3 +198,159 @@ class TestMP3Encoder:
         # Vérifier que le bon bitrate a été utilisé
         export_args = mock_segment.export.call_args
         assert export_args[1]['bitrate'] == '256k'
+
+
+class TestMP3EncoderStreaming:
+    """Tests pour le mode d'encodage en continu de MP3Encoder."""
+
+    def test_init_streaming_has_no_buffer(self):
+        """Test qu'aucun buffer mémoire n'est alloué en mode streaming."""
+        encoder = MP3Encoder(output_file=Path("/tmp/test.mp3"), streaming=True)
+
+        assert encoder.streaming is True
+        assert encoder.audio_buffer is None
+
+    @patch('src.ffmpeg_encoder.FFmpegPipe')
+    def test_write_frames_feeds_pipe(self, mock_pipe_class):
+        """Test que les frames sont transmises directement au processus FFmpeg."""
+        mock_pipe = Mock()
+        mock_pipe_class.return_value = mock_pipe
+
+        encoder = MP3Encoder(output_file=Path("/tmp/test.mp3"), streaming=True)
+        encoder.write_frames(b'\x00\x01')
+        encoder.write_frames(b'\x02\x03')
+
+        # Le processus n'est lancé qu'une seule fois
+        mock_pipe_class.assert_called_once()
+        mock_pipe.start.assert_called_once()
+        assert mock_pipe.write.call_count == 2
+
+        command = mock_pipe_class.call_args[0][0]
+        assert 'libmp3lame' in command
+        assert '128k' in command
+        assert command[-1] == '/tmp/test.mp3'
+
+    @patch('src.ffmpeg_encoder.FFmpegPipe')
+    def test_close_streaming(self, mock_pipe_class):
+        """Test que close termine le processus FFmpeg sans passer par pydub."""
+        mock_pipe = Mock()
+        mock_pipe_class.return_value = mock_pipe
+
+        with patch('src.mp3_encoder.AudioSegment') as mock_audio_segment_class:
+            encoder = MP3Encoder(output_file=Path("/tmp/test.mp3"), streaming=True)
+            encoder.write_frames(b'\x00\x01')
+            encoder.close()
+            mock_audio_segment_class.assert_not_called()
+
+        mock_pipe.close.assert_called_once()
+        assert encoder._is_closed is True
+
+    @patch('src.ffmpeg_encoder.FFmpegPipe')
+    def test_close_streaming_without_data(self, mock_pipe_class):
+        """Test qu'aucun processus n'est lancé si aucune donnée n'a été écrite."""
+        encoder = MP3Encoder(output_file=Path("/tmp/test.mp3"), streaming=True)
+        encoder.close()
+
+        mock_pipe_class.assert_not_called()
+        assert encoder._is_closed is True
+
+    @patch('src.ffmpeg_encoder.FFmpegPipe')
+    def test_streaming_ffmpeg_not_found(self, mock_pipe_class):
+        """Test que l'absence de FFmpeg est signalée dès la première écriture."""
+        mock_pipe = Mock()
+        mock_pipe.start.side_effect = FileNotFoundError("ffmpeg not found")
+        mock_pipe_class.return_value = mock_pipe
+
+        encoder = MP3Encoder(output_file=Path("/tmp/test.mp3"), streaming=True)
+
+        with pytest.raises(RuntimeError, match="FFmpeg n'est pas installé"):
+            encoder.write_frames(b'\x00\x01')
+
+
+class TestMP3EncoderParallel:
+    """Tests pour l'encodage parallèle par morceaux du mode bufferisé."""
+
+    @patch('src.mp3_encoder.encode_mp3_parallel')
+    def test_close_uses_parallel_encoding(self, mock_encode_parallel):
+        """Test que close encode le buffer par morceaux sans passer par pydub."""
+        captured = {}
+        mock_encode_parallel.side_effect = lambda pcm, *args, **kwargs: captured.update(
+            pcm=bytes(pcm), kwargs=kwargs
+        )
+
+        with patch('src.mp3_encoder.AudioSegment') as mock_audio_segment_class:
+            encoder = MP3Encoder(output_file=Path("/tmp/test.mp3"), encode_jobs=4)
+            encoder.write_frames(b'\x00\x01\x02\x03')
+            encoder.close()
+            mock_audio_segment_class.assert_not_called()
+
+        assert captured['pcm'] == b'\x00\x01\x02\x03'
+        assert captured['kwargs']['jobs'] == 4
+        assert captured['kwargs']['bitrate'] == "128k"
+        assert encoder._is_closed is True
+
+    @patch('src.mp3_encoder.encode_mp3_parallel')
+    def test_parallel_ffmpeg_not_found(self, mock_encode_parallel):
+        """Test que l'absence de FFmpeg est signalée par un message explicite."""
+        mock_encode_parallel.side_effect = FileNotFoundError("ffmpeg not found")
+
+        encoder = MP3Encoder(output_file=Path("/tmp/test.mp3"), encode_jobs=2)
+        encoder.write_frames(b'\x00\x01')
+
+        with pytest.raises(RuntimeError, match="FFmpeg n'est pas installé"):
+            encoder.close()
+        assert encoder._is_closed is True
+
+
+class TestMP3EncoderMappedBuffer:
+    """Tests pour le buffer PCM en fichier temporaire du mode bufferisé."""
+
+    def test_invalid_backend(self):
+        """Test qu'un backend de buffer inconnu est refusé."""
+        with pytest.raises(ValueError, match="Backend de buffer inconnu"):
+            MP3Encoder(output_file=Path("/tmp/test.mp3"), buffer_backend="disk")
+
+    @patch('src.mp3_encoder.FFmpegPipe')
+    def test_close_feeds_file_to_ffmpeg(self, mock_pipe_class, tmp_path):
+        """Test que FFmpeg lit le fichier temporaire sans passer par pydub."""
+        mock_pipe = Mock()
+        mock_pipe_class.return_value = mock_pipe
+        received = {}
+        mock_pipe.start.side_effect = lambda stdin: received.update(data=stdin.read())
+
+        with patch('src.mp3_encoder.AudioSegment') as mock_audio_segment_class:
+            encoder = MP3Encoder(output_file=tmp_path / "test.mp3", buffer_backend="mmap")
+            encoder.write_frames(b'\x00\x01')
+            encoder.write_frames(b'\x02\x03')
+            encoder.close()
+            mock_audio_segment_class.assert_not_called()
+
+        assert received['data'] == b'\x00\x01\x02\x03'
+        command = mock_pipe_class.call_args[0][0]
+        assert 'libmp3lame' in command
+        mock_pipe.close.assert_called_once()
+        assert encoder._is_closed is True
+        assert encoder.audio_buffer.closed
+
+    @patch('src.mp3_encoder.FFmpegPipe')
+    def test_close_empty_mapped_buffer(self, mock_pipe_class, tmp_path):
+        """Test qu'aucun processus n'est lancé sans données."""
+        encoder = MP3Encoder(output_file=tmp_path / "test.mp3", buffer_backend="mmap")
+        encoder.close()
+
+        mock_pipe_class.assert_not_called()
+        assert encoder._is_closed is True
+
+    @patch('src.mp3_encoder.encode_mp3_parallel')
+    def test_parallel_reads_mapped_view(self, mock_encode_parallel, tmp_path):
+        """Test que l'encodage parallèle reçoit une vue projetée du fichier."""
+        captured = {}
+        mock_encode_parallel.side_effect = lambda pcm, *args, **kwargs: captured.update(
+            readonly=pcm.readonly, pcm=bytes(pcm)
+        )
+
+        encoder = MP3Encoder(output_file=tmp_path / "test.mp3", buffer_backend="mmap", encode_jobs=2)
+        encoder.write_frames(b'\x00\x01\x02\x03')
+        encoder.close()
+
+        assert captured == {'readonly': True, 'pcm': b'\x00\x01\x02\x03'}
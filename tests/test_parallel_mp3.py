@@ -0,0 +1,221 @@
+"""Tests pour le module d'encodage MP3 parallèle."""
+
+import math
+import struct
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.parallel_mp3 import (
+    ENCODER_DELAY,
+    build_info_frame,
+    encode_mp3_parallel,
+    frame_offsets,
+    lame_crc16,
+    parse_frame_header,
+    plan_chunks,
+)
+
+# MPEG-1 Layer III, 128 kbit/s, 44100 Hz, sans CRC, mono
+MONO_HEADER = b'\xFF\xFB\x90\xC0'
+FRAME_LENGTH = 417
+
+
+class FakeLamePipe:
+    """
+    Processus FFmpeg simulé reproduisant le découpage en trames de LAME.
+
+    La trame j couvre les échantillons à partir de j × 1152 − ENCODER_DELAY ;
+    sa charge utile contient l'échantillon d'entrée j × 1152, ce qui permet
+    de vérifier quelles trames se retrouvent dans le fichier final.
+    """
+
+    commands = []
+
+    def __init__(self, command):
+        self.command = command
+        self.data = bytearray()
+        FakeLamePipe.commands.append(command)
+
+    def start(self):
+        pass
+
+    def write(self, data):
+        self.data += data
+
+    def close(self):
+        samples = len(self.data) // 2
+        frames = math.ceil((samples + ENCODER_DELAY) / 1152) + 1
+        output = bytearray()
+        for index in range(frames):
+            position = index * 1152
+            marker = struct.unpack_from('<H', self.data, position * 2)[0] if position < samples else 0xFFFF
+            frame = bytearray(FRAME_LENGTH)
+            frame[:4] = MONO_HEADER
+            struct.pack_into('>H', frame, 4 + 17, marker)
+            output += frame
+        Path(self.command[-1]).write_bytes(bytes(output))
+
+
+class TestFrameParsing:
+    """Tests pour le décodage des en-têtes de trames."""
+
+    def test_parse_mpeg1_header(self):
+        """Teste le décodage d'un en-tête MPEG-1 Layer III."""
+        header = parse_frame_header(b'\xFF\xFB\x92\x40')
+
+        assert header.bitrate == 128
+        assert header.sample_rate == 44100
+        assert header.padding == 1
+        assert header.frame_length == 418
+        assert header.samples_per_frame == 1152
+
+    def test_parse_mpeg2_header(self):
+        """Teste le décodage d'un en-tête MPEG-2 (576 échantillons par trame)."""
+        # MPEG-2, 64 kbit/s, 22050 Hz
+        header = parse_frame_header(b'\xFF\xF3\x80\x40')
+
+        assert header.bitrate == 64
+        assert header.sample_rate == 22050
+        assert header.frame_length == 72000 * 64 // 22050
+        assert header.samples_per_frame == 576
+
+    def test_parse_rejects_missing_sync(self):
+        """Teste qu'un octet hors trame est refusé."""
+        with pytest.raises(ValueError, match="Synchronisation"):
+            parse_frame_header(b'ID3\x04')
+
+    def test_frame_offsets(self):
+        """Teste le parcours des trames d'un flux."""
+        data = MONO_HEADER + bytes(FRAME_LENGTH - 4) + b'\xFF\xFB\x92\xC0' + bytes(FRAME_LENGTH - 3)
+
+        assert frame_offsets(data) == [0, FRAME_LENGTH, 2 * FRAME_LENGTH + 1]
+
+    def test_frame_offsets_truncated(self):
+        """Teste qu'une dernière trame tronquée est signalée."""
+        with pytest.raises(ValueError, match="tronquée"):
+            frame_offsets(MONO_HEADER + bytes(100))
+
+
+class TestPlanChunks:
+    """Tests pour le découpage en morceaux."""
+
+    def test_chunks_aligned_on_frames(self):
+        """Teste que les morceaux commencent sur des frontières de trames."""
+        chunks = plan_chunks(44100 * 600 + 7, 44100, jobs=4)
+
+        assert len(chunks) == 4
+        assert chunks[0][0] == 0
+        assert chunks[-1][1] == 44100 * 600 + 7
+        for (start, end), (next_start, _) in zip(chunks, chunks[1:]):
+            assert start % 1152 == 0
+            assert end == next_start
+
+    def test_short_input_single_chunk(self):
+        """Teste qu'un enregistrement court n'est pas découpé."""
+        assert plan_chunks(44100 * 20, 44100, jobs=8) == [(0, 44100 * 20)]
+
+    def test_chunk_count_limited_by_min_duration(self):
+        """Teste que les morceaux respectent la durée minimale."""
+        chunks = plan_chunks(44100 * 90, 44100, jobs=8, min_chunk_seconds=30.0)
+
+        assert len(chunks) == 3
+
+
+class TestInfoFrame:
+    """Tests pour la trame Info (tags Xing et LAME)."""
+
+    def test_lame_crc16(self):
+        """Teste le CRC-16 du tag LAME sur la valeur de contrôle standard."""
+        assert lame_crc16(b"123456789") == 0xBB3D
+
+    def test_info_frame_fields(self):
+        """Teste le contenu de la trame Info."""
+        header = parse_frame_header(b'\xFF\xFB\x90\x40')
+        frame = build_info_frame(header, frame_count=1000, audio_bytes=417000, encoder_delay=576, padding=1200)
+
+        assert len(frame) == FRAME_LENGTH
+        assert parse_frame_header(frame).frame_length == len(frame)
+        tag = 4 + 32
+        assert frame[tag:tag + 4] == b"Info"
+        flags, frames, size = struct.unpack_from('>III', frame, tag + 4)
+        assert (flags, frames, size) == (0x0F, 1000, 417000 + FRAME_LENGTH)
+        assert frame[tag + 120:tag + 129] == b"LAME3.100"
+        delay_padding = int.from_bytes(frame[tag + 141:tag + 144], 'big')
+        assert (delay_padding >> 12, delay_padding & 0xFFF) == (576, 1200)
+        crc = struct.unpack_from('>H', frame, tag + 154)[0]
+        assert crc == lame_crc16(frame[:tag + 154])
+
+    def test_info_frame_raises_bitrate_when_too_small(self):
+        """Teste qu'un débit trop faible pour loger le tag est relevé."""
+        # MPEG-1, 32 kbit/s, 48000 Hz : trames de 96 octets
+        header = parse_frame_header(b'\xFF\xFB\x14\x40')
+        frame = build_info_frame(header, frame_count=10, audio_bytes=960, encoder_delay=576, padding=0)
+
+        assert len(frame) >= 4 + 32 + 156
+        assert parse_frame_header(frame).frame_length == len(frame)
+
+
+class TestEncodeMP3Parallel:
+    """Tests pour l'encodage parallèle et l'assemblage des morceaux."""
+
+    def setup_method(self):
+        FakeLamePipe.commands = []
+
+    @staticmethod
+    def ramp_pcm(samples: int) -> bytes:
+        """PCM mono 16 bits dont chaque échantillon vaut l'index de sa trame."""
+        return b''.join(struct.pack('<H', index // 1152) for index in range(samples))
+
+    @patch('src.parallel_mp3.FFmpegPipe', FakeLamePipe)
+    def test_frames_are_contiguous(self, tmp_path):
+        """Teste que les trames conservées se suivent sans trou ni doublon."""
+        total_samples = 50 * 1152 + 100
+        output_file = tmp_path / "out.mp3"
+
+        chunks = encode_mp3_parallel(
+            self.ramp_pcm(total_samples), output_file, sample_rate=44100,
+            channels=1, jobs=4, min_chunk_seconds=0.1
+        )
+
+        assert chunks == 4
+        data = output_file.read_bytes()
+        offsets = frame_offsets(data)
+        # Trame Info puis trames audio
+        assert data[4 + 17:4 + 17 + 4] == b"Info"
+        markers = [struct.unpack_from('>H', data, offset + 4 + 17)[0] for offset in offsets[1:-1]]
+        assert markers[:51] == list(range(51))
+        assert all(marker == 0xFFFF for marker in markers[51:])
+
+        # Même nombre de trames qu'un encodage en un seul appel
+        assert len(markers) == math.ceil((total_samples + ENCODER_DELAY) / 1152) + 1
+        frame_count = struct.unpack_from('>I', data, 4 + 17 + 8)[0]
+        assert frame_count == len(markers)
+        delay_padding = int.from_bytes(data[4 + 17 + 141:4 + 17 + 144], 'big')
+        assert delay_padding & 0xFFF == len(markers) * 1152 - ENCODER_DELAY - total_samples
+
+    @patch('src.parallel_mp3.FFmpegPipe', FakeLamePipe)
+    def test_chunks_disable_bit_reservoir(self, tmp_path):
+        """Teste que chaque morceau est encodé sans réservoir de bits ni tag."""
+        encode_mp3_parallel(
+            self.ramp_pcm(20 * 1152), tmp_path / "out.mp3", channels=1,
+            jobs=2, min_chunk_seconds=0.1
+        )
+
+        assert len(FakeLamePipe.commands) == 2
+        for command in FakeLamePipe.commands:
+            assert command[command.index('-reservoir') + 1] == '0'
+            assert command[command.index('-write_xing') + 1] == '0'
+
+    @patch('src.parallel_mp3.FFmpegPipe', FakeLamePipe)
+    def test_temporary_files_removed(self, tmp_path):
+        """Teste que les morceaux intermédiaires sont supprimés."""
+        encode_mp3_parallel(self.ramp_pcm(10 * 1152), tmp_path / "out.mp3", channels=1, jobs=2)
+
+        assert [path.name for path in tmp_path.iterdir()] == ["out.mp3"]
+
+    def test_empty_pcm(self, tmp_path):
+        """Teste qu'aucun fichier n'est produit sans données."""
+        assert encode_mp3_parallel(b'', tmp_path / "out.mp3") == 0
+        assert not (tmp_path / "out.mp3").exists()
@@ -0,0 +1,43 @@
+"""Tests pour le module de buffer PCM projeté en mémoire."""
+
+from src.pcm_buffer import MappedPCMBuffer
+
+
+class TestMappedPCMBuffer:
+    """Tests pour la classe MappedPCMBuffer."""
+
+    def test_write_and_getbuffer(self, tmp_path):
+        """Teste que la vue projetée contient les données écrites."""
+        buffer = MappedPCMBuffer(tmp_path)
+        buffer.write(b'\x00\x01' * 100)
+        buffer.write(memoryview(b'\x02\x03' * 100))
+
+        assert buffer.tell() == 400
+        with buffer.getbuffer() as view:
+            assert view.readonly
+            assert view.tobytes() == b'\x00\x01' * 100 + b'\x02\x03' * 100
+        buffer.close()
+
+    def test_getbuffer_empty(self, tmp_path):
+        """Teste qu'un buffer vide donne une vue vide."""
+        buffer = MappedPCMBuffer(tmp_path)
+
+        assert len(buffer.getbuffer()) == 0
+        buffer.close()
+
+    def test_as_file_rewinds(self, tmp_path):
+        """Teste que le fichier est remis au début des données."""
+        buffer = MappedPCMBuffer(tmp_path)
+        buffer.write(b'abcdef')
+
+        assert buffer.as_file().read() == b'abcdef'
+        buffer.close()
+
+    def test_file_is_anonymous(self, tmp_path):
+        """Teste qu'aucun fichier visible ne reste dans le répertoire."""
+        buffer = MappedPCMBuffer(tmp_path)
+        buffer.write(b'\x00' * 4096)
+
+        assert list(tmp_path.iterdir()) == []
+        buffer.close()
+        assert buffer.closed
@@ -0,0 +1,163 @@
+"""Tests pour le module de spool PCM."""
+
+import pytest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from src.pcm_spool import (
+    SPOOL_HEADER_SIZE,
+    PCMSpool,
+    find_spools,
+    read_spool_metadata,
+    recover_spool
+)
+
+METADATA = {
+    'output_format': 'wav',
+    'sample_rate': 8000,
+    'channels': 2,
+    'sample_width': 2,
+    'bitrate': None,
+}
+
+
+class TestPCMSpool:
+    """Tests pour la classe PCMSpool."""
+
+    def test_write_creates_spool_with_header(self, tmp_path):
+        """Test que le spool est créé à côté du fichier final avec ses métadonnées."""
+        spool = PCMSpool(tmp_path / "rec.mp3", METADATA)
+        spool.write(b'\x01\x00\x02\x00')
+        spool.close()
+
+        assert spool.path == tmp_path / "rec.mp3.spool"
+        assert read_spool_metadata(spool.path) == METADATA
+        assert spool.path.read_bytes()[SPOOL_HEADER_SIZE:] == b'\x01\x00\x02\x00'
+
+    def test_no_file_without_data(self, tmp_path):
+        """Test qu'aucun spool n'est créé si rien n'a été écrit."""
+        spool = PCMSpool(tmp_path / "rec.mp3", METADATA)
+        spool.close()
+
+        assert not spool.path.exists()
+
+    def test_fsync_is_batched(self, tmp_path):
+        """Test que les synchronisations sont regroupées selon l'intervalle."""
+        spool = PCMSpool(tmp_path / "rec.mp3", METADATA, sync_interval=3600)
+
+        with patch('src.pcm_spool.os.fsync') as mock_fsync:
+            for _ in range(100):
+                spool.write(b'\x00' * 4)
+
+        # Une seule synchronisation : celle de la création de l'en-tête
+        assert mock_fsync.call_count == 1
+        spool.discard()
+
+    def test_fsync_interval_elapsed(self, tmp_path):
+        """Test qu'une synchronisation a lieu à chaque écriture si l'intervalle est nul."""
+        spool = PCMSpool(tmp_path / "rec.mp3", METADATA, sync_interval=0)
+
+        spool.write(b'\x00' * 4)
+        spool.write(b'\x00' * 4)
+
+        assert spool.sync_count == 3
+        spool.discard()
+
+    def test_discard_removes_spool(self, tmp_path):
+        """Test que discard supprime le spool."""
+        spool = PCMSpool(tmp_path / "rec.mp3", METADATA)
+        spool.write(b'\x00' * 4)
+        spool.discard()
+
+        assert not spool.path.exists()
+
+
+class TestRecoverSpool:
+    """Tests pour la récupération des spools."""
+
+    def test_recover_wav(self, tmp_path):
+        """Test qu'un spool est encodé vers son fichier final puis supprimé."""
+        spool = PCMSpool(tmp_path / "rec.wav", METADATA)
+        spool.write(b'\x01\x00\x02\x00' * 10)
+        # Frame incomplète laissée par un arrêt brutal
+        spool.write(b'\x03\x00')
+        spool.close()
+
+        output_file = recover_spool(spool.path)
+
+        assert output_file == tmp_path / "rec.wav"
+        assert not spool.path.exists()
+        assert output_file.read_bytes()[44:] == b'\x01\x00\x02\x00' * 10
+
+    def test_recover_uses_recorded_format(self, tmp_path):
+        """Test que l'encodeur est créé avec le format enregistré dans le spool."""
+        metadata = dict(METADATA, output_format='mp3', bitrate='192k')
+        spool = PCMSpool(tmp_path / "rec.mp3", metadata)
+        spool.write(b'\x00\x00\x00\x00' * 4)
+        spool.close()
+
+        with patch('src.encoders.create_encoder') as mock_create_encoder:
+            mock_encoder = Mock()
+            mock_create_encoder.return_value = mock_encoder
+            recover_spool(spool.path)
+
+        args, kwargs = mock_create_encoder.call_args
+        assert args[0] == 'mp3'
+        assert kwargs['bitrate'] == '192k'
+        assert kwargs['output_file'] == tmp_path / "rec.mp3"
+        mock_encoder.write_frames.assert_called_once_with(b'\x00' * 16)
+        mock_encoder.close.assert_called_once()
+
+    def test_recover_failure_keeps_spool(self, tmp_path):
+        """Test que le spool est conservé si l'encodage échoue."""
+        spool = PCMSpool(tmp_path / "rec.mp3", dict(METADATA, output_format='mp3'))
+        spool.write(b'\x00' * 4)
+        spool.close()
+
+        with patch('src.encoders.create_encoder') as mock_create_encoder:
+            mock_create_encoder.return_value.close.side_effect = RuntimeError("FFmpeg absent")
+            with pytest.raises(RuntimeError):
+                recover_spool(spool.path)
+
+        assert spool.path.exists()
+
+    def test_recover_write_failure_closes_encoder(self, tmp_path):
+        """Test que l'encodeur est fermé si l'écriture échoue, et que le spool est conservé."""
+        spool = PCMSpool(tmp_path / "rec.mp3", dict(METADATA, output_format='mp3'))
+        spool.write(b'\x00' * 4)
+        spool.close()
+
+        with patch('src.encoders.create_encoder') as mock_create_encoder:
+            mock_encoder = mock_create_encoder.return_value
+            mock_encoder.write_frames.side_effect = RuntimeError("FFmpeg s'est arrêté prématurément")
+            mock_encoder.close.side_effect = RuntimeError("FFmpeg a échoué (code 1)")
+            with pytest.raises(RuntimeError, match="prématurément"):
+                recover_spool(spool.path)
+
+        mock_encoder.close.assert_called_once()
+        assert spool.path.exists()
+
+    def test_recover_empty_spool(self, tmp_path):
+        """Test qu'un spool sans frame est simplement supprimé."""
+        spool = PCMSpool(tmp_path / "rec.wav", METADATA)
+        spool.write(b'\x00')
+        spool.close()
+
+        assert recover_spool(spool.path) is None
+        assert not spool.path.exists()
+
+    def test_invalid_spool(self, tmp_path):
+        """Test qu'un fichier qui n'est pas un spool est refusé."""
+        path = tmp_path / "rec.mp3.spool"
+        path.write_bytes(b'pas un spool')
+
+        with pytest.raises(ValueError, match="invalide"):
+            recover_spool(path)
+
+    def test_find_spools(self, tmp_path):
+        """Test que seuls les spools sont listés."""
+        (tmp_path / "b.mp3.spool").write_bytes(b'')
+        (tmp_path / "a.flac.spool").write_bytes(b'')
+        (tmp_path / "c.mp3").write_bytes(b'')
+
+        assert [path.name for path in find_spools(tmp_path)] == ["a.flac.spool", "b.mp3.spool"]
@@ -0,0 +1,216 @@
+"""Tests pour le module de distribution du PCM à plusieurs consommateurs."""
+
+import threading
+import time
+
+import pytest
+
+from src.pipeline import FanoutStage, PipelineSink
+
+# 100 frames mono 16 bits par seconde : un bloc de 200 octets dure une seconde
+SAMPLE_RATE = 100
+BLOCK = 200
+
+
+class RecordingConsumer:
+    """Consommateur simulé : conserve les blocs reçus, éventuellement après une attente."""
+
+    def __init__(self, release: threading.Event = None, fail: bool = False):
+        self.blocks = []
+        self.format = None
+        self.finished = False
+        self.release = release
+        self.fail = fail
+        self.receiving = threading.Event()
+
+    def start(self, sample_rate, channels, sample_width):
+        self.format = (sample_rate, channels, sample_width)
+
+    def write(self, data):
+        self.receiving.set()
+        if self.fail:
+            raise OSError("Connexion perdue")
+        if self.release is not None:
+            self.release.wait(timeout=2.0)
+        self.blocks.append(data)
+
+    def finish(self):
+        self.finished = True
+
+
+def block(value: int) -> bytes:
+    """Bloc d'une seconde rempli d'une valeur."""
+    return bytes([value]) * BLOCK
+
+
+def start_stalled_sink(policy: str, max_seconds: float = 2.0):
+    """Démarre un consommateur bloqué sur son premier bloc (le bloc 0, retiré de la file)."""
+    release = threading.Event()
+    consumer = RecordingConsumer(release)
+    sink = PipelineSink(consumer, "lent", policy=policy, max_seconds=max_seconds)
+    sink.start(SAMPLE_RATE, 1, 2)
+    sink.put(block(0))
+    assert consumer.receiving.wait(timeout=2.0)
+    return sink, consumer, release
+
+
+class TestPipelineSink:
+    """Tests pour la classe PipelineSink."""
+
+    def test_invalid_policy(self):
+        """Teste le refus d'une politique inconnue."""
+        with pytest.raises(ValueError, match="Politique"):
+            PipelineSink(RecordingConsumer(), "x", policy="drop-all")
+
+    def test_drop_oldest(self):
+        """Teste que la file pleine perd ses blocs les plus anciens."""
+        sink, consumer, release = start_stalled_sink("drop-oldest")
+        for value in (1, 2, 3, 4):
+            sink.put(block(value))
+
+        stats = sink.get_stats()
+        assert (stats['lag'], stats['dropped_blocks'], stats['dropped_bytes']) == (2.0, 2, 2 * BLOCK)
+        assert stats['delay'] > 0
+        release.set()
+        sink.finish()
+        assert sink.wait(timeout=2.0)
+        assert consumer.blocks == [block(0), block(3), block(4)]
+        assert consumer.finished
+
+    def test_drop_newest(self):
+        """Teste que la file pleine rejette les nouveaux blocs."""
+        sink, consumer, release = start_stalled_sink("drop-newest")
+        for value in (1, 2, 3, 4):
+            sink.put(block(value))
+        release.set()
+        sink.finish()
+        sink.wait(timeout=2.0)
+
+        assert consumer.blocks == [block(0), block(1), block(2)]
+        assert sink.get_stats()['dropped_blocks'] == 2
+
+    def test_block_waits_for_room(self):
+        """Teste que le producteur attend de la place sans perdre de bloc."""
+        sink, consumer, release = start_stalled_sink("block", max_seconds=1.0)
+        sink.put(block(1))
+
+        threading.Timer(0.05, release.set).start()
+        sink.put(block(2))
+        sink.finish()
+        sink.wait(timeout=2.0)
+
+        assert consumer.blocks == [block(0), block(1), block(2)]
+        stats = sink.get_stats()
+        assert stats['dropped_blocks'] == 0 and stats['blocked_time'] >= 0.04
+        assert stats['written_bytes'] == 3 * BLOCK
+
+    def test_stalled_consumer_releases_producer(self):
+        """Teste qu'un consommateur figé ne retient le producteur qu'une fois block_timeout."""
+        sink, consumer, release = start_stalled_sink("block", max_seconds=1.0)
+        sink.block_timeout = 0.05
+        sink.put(block(1))
+
+        started = time.monotonic()
+        for value in (2, 3, 4):
+            sink.put(block(value))
+        elapsed = time.monotonic() - started
+
+        stats = sink.get_stats()
+        assert elapsed < 0.5
+        assert (stats['stalls'], stats['dropped_blocks']) == (1, 3)
+        release.set()
+        sink.finish()
+        sink.wait(timeout=2.0)
+        assert consumer.blocks == [block(0), block(1)]
+
+    def test_finish_wakes_blocked_producer(self):
+        """Teste que finish() libère un producteur en attente de place."""
+        sink, consumer, release = start_stalled_sink("block", max_seconds=1.0)
+        sink.block_timeout = 10.0
+        sink.put(block(1))
+        producer = threading.Thread(target=sink.put, args=(block(2),))
+        producer.start()
+
+        time.sleep(0.05)
+        sink.finish()
+        producer.join(timeout=2.0)
+
+        assert not producer.is_alive()
+        assert sink.get_stats()['dropped_blocks'] == 1
+        release.set()
+        assert sink.wait(timeout=2.0)
+
+    def test_failing_consumer_releases_producer(self):
+        """Teste qu'un consommateur en erreur ne bloque plus le producteur."""
+        consumer = RecordingConsumer(fail=True)
+        sink = PipelineSink(consumer, "réseau", policy="block", max_seconds=1.0)
+        sink.start(SAMPLE_RATE, 1, 2)
+
+        for value in range(5):
+            sink.put(block(value))
+        sink.finish()
+
+        assert sink.wait(timeout=2.0)
+        stats = sink.get_stats()
+        assert stats['error'] == "Connexion perdue"
+        assert stats['dropped_blocks'] >= 3
+
+
+class TestFanoutStage:
+    """Tests pour la classe FanoutStage."""
+
+    def test_blocks_shared_between_sinks(self):
+        """Teste que chaque bloc est copié une seule fois puis partagé par tous les consommateurs."""
+        stage = FanoutStage()
+        archive, meter = RecordingConsumer(), RecordingConsumer()
+        stage.add_sink(archive, "archive", policy="block")
+        stage.add_sink(meter, "meter")
+        source = bytearray(block(7))
+
+        stage.start(SAMPLE_RATE, 1, 2)
+        stage.write(memoryview(source))
+        source[:] = block(8)
+        stage.finish()
+
+        assert stage.wait(timeout=2.0)
+        assert archive.blocks == [block(7)]
+        assert archive.blocks[0] is meter.blocks[0]
+        assert archive.format == (SAMPLE_RATE, 1, 2)
+        assert set(stage.get_stats()) == {"archive", "meter"}
+
+    def test_slow_sink_does_not_delay_others(self):
+        """Teste qu'un consommateur bloqué ne retarde pas les autres."""
+        stage = FanoutStage()
+        release = threading.Event()
+        slow, fast = RecordingConsumer(release), RecordingConsumer()
+        stage.add_sink(slow, "lent", max_seconds=1.0)
+        stage.add_sink(fast, "rapide")
+        stage.start(SAMPLE_RATE, 1, 2)
+
+        for value in range(5):
+            stage.write(block(value))
+        deadline = time.monotonic() + 2.0
+        while len(fast.blocks) < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert len(fast.blocks) == 5
+        assert stage.get_stats()['lent']['dropped_blocks'] >= 3
+        release.set()
+        stage.finish()
+        stage.wait(timeout=2.0)
+
+    def test_blocking_sinks_served_last(self):
+        """Teste que l'attente d'un consommateur "block" ne retarde pas les autres."""
+        stage = FanoutStage()
+        stage.add_sink(RecordingConsumer(), "archive", policy="block")
+        stage.add_sink(RecordingConsumer(), "meter")
+
+        assert [sink.name for sink in stage.sinks] == ["meter", "archive"]
+
+    def test_duplicate_name(self):
+        """Teste le refus de deux consommateurs de même nom."""
+        stage = FanoutStage()
+        stage.add_sink(RecordingConsumer())
+
+        with pytest.raises(ValueError, match="RecordingConsumer"):
+            stage.add_sink(RecordingConsumer())
@@ -0,0 +1,96 @@
+"""Tests pour le module de capture PulseAudio directe."""
+
+import sys
+import threading
+
+import pytest
+
+from src.pulse_capture import PulseCapture
+from tests.fakes import fake_parec, recorded_args
+
+
+class TestPulseCapture:
+    """Tests pour la classe PulseCapture."""
+
+    def test_command(self):
+        """Teste la ligne de commande : source nommée, format natif et fragments."""
+        capture = PulseCapture("alsa_output.monitor", 48000, 2, fragment_seconds=0.25)
+
+        assert capture.command() == [
+            "parec", "--raw", "--format=s16le", "--rate=48000", "--channels=2",
+            "--latency-msec=250", "--process-time-msec=250",
+            "--client-name=audio-recorder", "--device=alsa_output.monitor",
+        ]
+        assert "--device" not in " ".join(PulseCapture(None, 48000, 2).command())
+
+    def test_reads_whole_fragments(self, tmp_path):
+        """Teste la lecture par fragments complets puis la fin du flux, alignée sur les frames."""
+        script = fake_parec(tmp_path, frames=2500, wait=False)
+        capture = PulseCapture("source", 10000, 2, fragment_seconds=0.1, executable=str(script))
+        capture.start()
+
+        sizes = []
+        while True:
+            fragment = capture.read_fragment()
+            sizes.append(len(fragment))
+            if not fragment:
+                break
+
+        assert sizes == [4000, 4000, 2000, 0]
+        assert capture.reads == 4
+        assert capture.error_message() == "Connexion refusée"
+        assert recorded_args(tmp_path)[-1] == "--device=source"
+        capture.close()
+
+    def test_stop_wakes_blocked_reader(self, tmp_path):
+        """Teste que stop() termine une lecture bloquée sur un flux en attente."""
+        script = fake_parec(tmp_path, frames=100)
+        capture = PulseCapture(None, 10000, 2, fragment_seconds=0.1, executable=str(script))
+        capture.start()
+        recorded_args(tmp_path)
+        result = []
+        reader = threading.Thread(target=lambda: result.append(len(capture.read_fragment())))
+        reader.start()
+
+        capture.stop()
+        reader.join(timeout=2.0)
+
+        assert result == [400]
+        assert len(capture.read_fragment()) == 0
+        capture.close()
+
+    def test_verbose_stderr_does_not_stall_capture(self, tmp_path):
+        """Teste qu'une sortie d'erreur abondante ne bloque pas parec, et que sa fin est conservée."""
+        script = tmp_path / "parec"
+        script.write_text(
+            f"#!{sys.executable}\n"
+            "import sys\n"
+            "sys.stderr.write('avertissement\\n' * 20000 + 'Connexion perdue')\n"
+            "sys.stderr.flush()\n"
+            "sys.stdout.buffer.write(b'\\x01' * 4000)\n"
+        )
+        script.chmod(0o755)
+        capture = PulseCapture(None, 10000, 2, fragment_seconds=0.1, executable=str(script))
+        capture.start()
+        result = []
+        reader = threading.Thread(target=lambda: result.append(len(capture.read_fragment())), daemon=True)
+        reader.start()
+        reader.join(timeout=2.0)
+
+        assert result == [4000]
+        message = capture.error_message()
+        assert message.endswith("Connexion perdue")
+        assert len(message) <= 4096
+        capture.close()
+
+    def test_missing_executable(self):
+        """Teste le message d'erreur si parec n'est pas installé."""
+        capture = PulseCapture(None, 48000, 2, executable="parec-introuvable")
+
+        with pytest.raises(RuntimeError, match="pulseaudio-utils"):
+            capture.start()
+
+    def test_unsupported_sample_width(self):
+        """Teste le refus d'une largeur d'échantillon sans format parec."""
+        with pytest.raises(ValueError, match="non supportée"):
+            PulseCapture(None, 48000, 2, sample_width=3)
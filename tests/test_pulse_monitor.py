@@ -0,0 +1,99 @@
+"""Tests pour le module de suivi des périphériques PulseAudio."""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src import audio_devices
+from src.pulse_monitor import DeviceChange, PulseDeviceMonitor
+from tests.fakes import ALSA_SINK, BLUEZ_SINK, FakePulseServer
+
+
+def wait_until(condition, timeout: float = 2.0) -> bool:
+    """Attend qu'une condition soit vraie (thread d'écoute asynchrone)."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def server():
+    """Serveur PulseAudio simulé avec un casque Bluetooth par défaut."""
+    return FakePulseServer()
+
+
+@pytest.fixture
+def monitor(server):
+    """Suivi des périphériques démarré sur le serveur simulé."""
+    monitor = PulseDeviceMonitor(pulse_module=server.module, reconnect_delay=0.01)
+    monitor.start()
+    yield monitor
+    monitor.stop()
+
+
+class TestPulseDeviceMonitor:
+    """Tests pour la classe PulseDeviceMonitor."""
+
+    def test_initial_model(self, monitor, server):
+        """Teste le modèle lu au démarrage sur une connexion abonnée."""
+        assert monitor.default_monitor()['name'] == f"{BLUEZ_SINK}.monitor"
+        assert [source['name'] for source in monitor.monitors()] == [
+            f"{ALSA_SINK}.monitor", f"{BLUEZ_SINK}.monitor"
+        ]
+        assert monitor.get_source("alsa_input.mic")['sample_rate'] == 48000
+        assert server.connections[0].mask == ('sink', 'source', 'server')
+
+    def test_removal_and_default_change_notified(self, monitor, server):
+        """Teste la notification du retrait d'un casque et du nouveau Monitor par défaut."""
+        changes = []
+        notified = threading.Event()
+
+        def listener(change):
+            changes.append(change)
+            notified.set()
+
+        monitor.add_listener(listener)
+        server.remove_sink(BLUEZ_SINK, new_default=ALSA_SINK)
+
+        assert notified.wait(timeout=2.0)
+        assert changes[0] == DeviceChange(
+            previous_monitor=f"{BLUEZ_SINK}.monitor",
+            default_monitor=f"{ALSA_SINK}.monitor",
+            added_sources=frozenset(),
+            removed_sources=frozenset({f"{BLUEZ_SINK}.monitor"}),
+        )
+        assert monitor.get_source(f"{BLUEZ_SINK}.monitor") is None
+        # Les événements suivants ne changent plus rien : pas de notification
+        assert wait_until(lambda: monitor.refreshes == 4)
+        assert len(changes) == 1
+
+    def test_reconnects_after_connection_loss(self, monitor, server):
+        """Teste la reconnexion et la relecture du modèle après la perte du serveur."""
+        server.fail_next_listen = True
+        server.sinks.append("usb_output")
+        server.emit('sink', 'new')
+
+        assert wait_until(lambda: monitor.get_source("usb_output.monitor") is not None)
+        assert len(server.connections) == 2 and server.connections[0].closed
+
+    def test_stop_closes_connection(self, server):
+        """Teste l'arrêt de l'écoute et la fermeture de la connexion."""
+        monitor = PulseDeviceMonitor(pulse_module=server.module)
+        monitor.start()
+        thread = monitor._thread
+
+        monitor.stop()
+
+        assert not thread.is_alive()
+        assert server.connections[0].closed
+
+    def test_requires_pulsectl(self):
+        """Teste le message d'erreur si pulsectl n'est pas installé."""
+        with patch.object(audio_devices, '_load_pulsectl', return_value=None):
+            with pytest.raises(RuntimeError, match="pulsectl"):
+                PulseDeviceMonitor().start()
@@ -0,0 +1,242 @@
+"""Tests pour le démon d'enregistrement et son client."""
+
+import json
+import socket
+import time
+from concurrent.futures import Future
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.audio_recorder import AudioRecorder
+from src.encode_pool import EncodeBatch
+from src.recorder_daemon import RecorderDaemon
+from src.recorderctl import main as recorderctl_main, send_command
+from tests.fakes import fake_parec
+
+
+class FakeRecorder:
+    """Enregistreur simulé : enregistre les appels reçus du démon."""
+
+    def __init__(self, output_dir, device_index=None):
+        self.output_dir = output_dir
+        self.device_index = device_index
+        self.is_recording = False
+        self.segment_files = []
+        self.device_name = "Monitor simulé"
+        self.rotations = 0
+        self.encode_batch = None
+
+    def start_recording(self):
+        self.is_recording = True
+        self.segment_files = [self.output_dir / "a.wav"]
+        return self.segment_files[0]
+
+    def rotate_segment(self):
+        self.rotations += 1
+        self.segment_files.append(self.output_dir / f"a_{self.rotations:03d}.wav")
+
+    def stop_recording(self):
+        self.is_recording = False
+        return self.encode_batch
+
+    def save_replay(self):
+        raise RuntimeError("Aucune relecture en attente d'enregistrement")
+
+    def get_capture_stats(self):
+        return {'dropped_frames': 0}
+
+    def get_levels(self):
+        return None
+
+    def get_replay_stats(self):
+        return None
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """Démon écoutant sur un socket temporaire avec un enregistreur simulé."""
+    recorders = []
+
+    def factory(device_index):
+        recorders.append(FakeRecorder(tmp_path, device_index))
+        return recorders[-1]
+
+    registry = Mock()
+    daemon = RecorderDaemon(factory, socket_path=tmp_path / "ctl.sock", device_registry=registry)
+    daemon.recorders = recorders
+    with patch('src.recorder_daemon.find_loopback_device', return_value=3) as find_loopback:
+        daemon.start()
+        daemon.find_loopback = find_loopback
+        yield daemon
+    daemon.shutdown()
+
+
+class TestRecorderDaemon:
+    """Tests pour la classe RecorderDaemon."""
+
+    def test_start_status_rotate_stop(self, daemon, tmp_path):
+        """Teste le cycle complet d'un enregistrement piloté par le socket."""
+        socket_path = daemon.socket_path
+
+        assert send_command("start", socket_path) == {'ok': True, 'file': str(tmp_path / "a.wav")}
+        assert send_command("rotate", socket_path) == {'ok': True}
+        status = send_command("status", socket_path)
+        assert status['recording'] and status['device'] == "Monitor simulé"
+        assert status['file'] == str(tmp_path / "a_001.wav")
+        assert send_command("stop", socket_path) == {
+            'ok': True, 'files': [str(tmp_path / "a.wav"), str(tmp_path / "a_001.wav")], 'encoding': 0
+        }
+        assert send_command("status", socket_path) == {'ok': True, 'recording': False}
+        daemon.device_registry.list_devices.assert_called_once()
+
+    def test_loopback_resolved_once_and_refreshed(self, daemon):
+        """Teste que le loopback résolu au lancement est passé aux enregistreurs."""
+        socket_path = daemon.socket_path
+
+        send_command("start", socket_path)
+        send_command("stop", socket_path)
+        send_command("start", socket_path)
+        assert [recorder.device_index for recorder in daemon.recorders] == [3, 3]
+        daemon.find_loopback.assert_called_once_with(daemon.device_registry)
+
+        daemon.find_loopback.return_value = 5
+        assert send_command("refresh", socket_path) == {'ok': True, 'device_index': 5}
+        daemon.device_registry.invalidate.assert_called_once()
+        send_command("stop", socket_path)
+        send_command("start", socket_path)
+        assert daemon.recorders[-1].device_index == 5
+
+    def test_stop_reports_background_encoding(self, daemon, capsys):
+        """Teste que stop signale les encodages en cours et que leurs échecs sont affichés."""
+        send_command("start", daemon.socket_path)
+        pending, failed = Future(), Future()
+        daemon.recorders[0].encode_batch = EncodeBatch([pending, failed])
+
+        assert send_command("stop", daemon.socket_path)['encoding'] == 2
+        pending.set_result(daemon.recorders[0].segment_files[0])
+        failed.set_exception(RuntimeError("ffmpeg a échoué"))
+        assert "ffmpeg a échoué" in capsys.readouterr().err
+
+    def test_errors_keep_daemon_running(self, daemon):
+        """Teste que les erreurs sont retournées au client sans arrêter le démon."""
+        socket_path = daemon.socket_path
+
+        assert "Aucun enregistrement" in send_command("stop", socket_path)['error']
+        send_command("start", socket_path)
+        assert "déjà en cours" in send_command("start", socket_path)['error']
+        assert "inconnue" in send_command("pause", socket_path)['error']
+        assert "relecture" in send_command("save", socket_path)['error']
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(socket_path))
+            client.sendall(b"pas du json\n")
+            assert "invalide" in json.loads(client.makefile('rb').readline())['error']
+
+        assert send_command("status", socket_path)['recording']
+
+    def test_restart_after_capture_failure(self, daemon):
+        """Teste qu'une capture interrompue est finalisée avant un nouvel enregistrement."""
+        send_command("start", daemon.socket_path)
+        daemon.recorders[0].is_recording = False
+
+        assert send_command("start", daemon.socket_path)['ok']
+        assert len(daemon.recorders) == 2
+
+    def test_shutdown_removes_socket(self, daemon):
+        """Teste l'arrêt du démon par commande, enregistrement en cours compris."""
+        send_command("start", daemon.socket_path)
+
+        assert send_command("shutdown", daemon.socket_path) == {'ok': True}
+        assert daemon._stopped.wait(timeout=2.0)
+        assert not daemon.socket_path.exists()
+        assert not daemon.recorders[0].is_recording
+
+    def test_refuses_second_daemon_and_replaces_stale_socket(self, daemon, tmp_path):
+        """Teste le refus d'un socket actif et la reprise d'un socket abandonné."""
+        with pytest.raises(RuntimeError, match="écoute déjà"):
+            RecorderDaemon(Mock(), socket_path=daemon.socket_path, device_registry=Mock()).start()
+
+        stale_path = tmp_path / "stale.sock"
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(stale_path))
+        stale.close()
+        other = RecorderDaemon(Mock(), socket_path=stale_path, device_registry=Mock())
+        other.start()
+        assert send_command("status", stale_path)['ok']
+        assert stale_path.stat().st_mode & 0o077 == 0
+        other.shutdown()
+
+    def test_records_through_pulse_backend(self, tmp_path):
+        """Teste un enregistrement réel piloté par le démon (faux parec)."""
+        script = fake_parec(tmp_path, frames=4410)
+        daemon = RecorderDaemon(
+            lambda device_index: AudioRecorder(
+                output_dir=str(tmp_path), output_format="wav", capture_backend="pulse",
+                pulse_source="source", fragment_seconds=0.1
+            ),
+            socket_path=tmp_path / "ctl.sock", device_registry=Mock()
+        )
+        with patch('src.pulse_capture.PAREC', str(script)):
+            daemon.start()
+            output_file = send_command("start", daemon.socket_path)['file']
+            deadline = time.monotonic() + 2.0
+            while send_command("status", daemon.socket_path)['capture']['wakeups'] < 1:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+            files = send_command("stop", daemon.socket_path)['files']
+            daemon.shutdown()
+
+        assert files == [output_file]
+        with open(output_file, 'rb') as f:
+            assert len(f.read()) == 44 + 4410 * 4
+
+    def test_replay_standby_and_save(self, tmp_path, capsys):
+        """Teste la veille du mode relecture puis l'enregistrement de la fenêtre (faux parec)."""
+        script = fake_parec(tmp_path, frames=4410)
+        daemon = RecorderDaemon(
+            lambda device_index: AudioRecorder(
+                output_dir=str(tmp_path), output_format="wav", capture_backend="pulse",
+                pulse_source="source", fragment_seconds=0.1, replay_seconds=60
+            ),
+            socket_path=tmp_path / "ctl.sock", device_registry=Mock()
+        )
+        socket_arg = ["--socket", str(daemon.socket_path)]
+        with patch('src.pulse_capture.PAREC', str(script)):
+            daemon.start()
+            assert send_command("start", daemon.socket_path) == {'ok': True, 'file': None}
+            deadline = time.monotonic() + 2.0
+            while send_command("status", daemon.socket_path)['replay']['buffered'] < 0.1:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+            assert recorderctl_main(["status"] + socket_arg) == 0
+            assert "Relecture en veille" in capsys.readouterr().out
+            output_file = send_command("save", daemon.socket_path)['file']
+            files = send_command("stop", daemon.socket_path)['files']
+            daemon.shutdown()
+
+        assert files == [output_file]
+        with open(output_file, 'rb') as f:
+            assert len(f.read()) == 44 + 4410 * 4
+
+
+class TestRecorderctl:
+    """Tests pour le client en ligne de commande."""
+
+    def test_no_daemon(self, tmp_path, capsys):
+        """Teste le message d'erreur si aucun démon n'écoute."""
+        assert recorderctl_main(["status", "--socket", str(tmp_path / "absent.sock")]) == 2
+        assert "--daemon" in capsys.readouterr().err
+
+    def test_commands(self, daemon, capsys):
+        """Teste l'affichage des réponses et le code de sortie."""
+        socket_arg = ["--socket", str(daemon.socket_path)]
+
+        assert recorderctl_main(["start"] + socket_arg) == 0
+        assert "Enregistrement démarré" in capsys.readouterr().out
+        assert recorderctl_main(["start"] + socket_arg) == 1
+        assert "déjà en cours" in capsys.readouterr().err
+        assert recorderctl_main(["status", "--json"] + socket_arg) == 0
+        assert json.loads(capsys.readouterr().out)['recording']
+        assert recorderctl_main(["refresh"] + socket_arg) == 0
+        assert "loopback: index 3" in capsys.readouterr().out
@@ -0,0 +1,64 @@
+"""Tests pour le module de fenêtre de relecture."""
+
+import pytest
+
+from src.replay_buffer import ReplayBuffer
+
+
+def window(replay: ReplayBuffer) -> bytes:
+    """Retourne le contenu de la fenêtre, du plus ancien au plus récent."""
+    return b''.join(bytes(view) for view in replay.views())
+
+
+class TestReplayBuffer:
+    """Tests pour la classe ReplayBuffer."""
+
+    def test_init_rounds_capacity_to_frames(self):
+        """Teste que la capacité est arrondie à un multiple de la taille de frame."""
+        replay = ReplayBuffer(capacity=10, frame_size=4)
+
+        assert replay.capacity == 8
+        assert replay.size == 0
+        assert replay.views() == []
+
+    def test_init_invalid(self):
+        """Teste le refus d'une capacité inférieure à une frame ou d'un backend inconnu."""
+        with pytest.raises(ValueError):
+            ReplayBuffer(capacity=2, frame_size=4)
+        with pytest.raises(ValueError, match="Backend"):
+            ReplayBuffer(capacity=8, backend="disk")
+
+    @pytest.mark.parametrize("backend", ["memory", "mmap"])
+    def test_keeps_most_recent_data(self, backend, tmp_path):
+        """Teste que les données les plus anciennes sont écrasées, dans l'ordre chronologique."""
+        replay = ReplayBuffer(capacity=8, frame_size=2, backend=backend, directory=tmp_path)
+
+        replay.write(b'\x01\x01\x02\x02')
+        assert window(replay) == b'\x01\x01\x02\x02'
+        replay.write(b'\x03\x03\x04\x04\x05\x05')
+
+        assert window(replay) == b'\x02\x02\x03\x03\x04\x04\x05\x05'
+        assert len(replay.views()) == 2
+        assert replay.get_stats() == {'capacity': 8, 'size': 8, 'overwritten': 2}
+        replay.close()
+
+    def test_write_larger_than_capacity(self):
+        """Teste qu'une écriture plus grande que la fenêtre n'en garde que la fin."""
+        replay = ReplayBuffer(capacity=4, frame_size=2)
+        replay.write(b'\x09\x09')
+
+        replay.write(memoryview(b'\x01\x01\x02\x02\x03\x03'))
+
+        assert window(replay) == b'\x02\x02\x03\x03'
+        assert replay.overwritten == 4
+
+    def test_clear(self):
+        """Teste que la fenêtre vidée repart de zéro."""
+        replay = ReplayBuffer(capacity=4, frame_size=2)
+        replay.write(b'\x01\x01\x02\x02\x03\x03')
+
+        replay.clear()
+        replay.write(b'\x04\x04')
+
+        assert window(replay) == b'\x04\x04'
+        assert replay.overwritten == 0
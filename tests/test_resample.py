@@ -0,0 +1,115 @@
+"""Tests pour le module de conversion de taux d'échantillonnage."""
+
+import numpy as np
+import pytest
+
+from src.resample import Resampler, convert_channels, design_polyphase_filter
+
+
+def _tone(frequency: float, rate: int, seconds: float, channels: int = 1, amplitude: float = 0.5) -> bytes:
+    """Sinusoïde PCM 16 bits, identique sur tous les canaux."""
+    t = np.arange(int(rate * seconds)) / rate
+    samples = (amplitude * 32767 * np.sin(2 * np.pi * frequency * t)).astype('<i2')
+    return np.repeat(samples[:, None], channels, axis=1).tobytes()
+
+
+def _samples(data: bytes, channels: int = 1) -> np.ndarray:
+    """PCM 16 bits vers un tableau (frames x canaux) en virgule flottante."""
+    return np.frombuffer(data, dtype='<i2').reshape(-1, channels).astype(np.float64)
+
+
+def _dominant_frequency(signal: np.ndarray, rate: int) -> float:
+    """Fréquence du pic du spectre d'un signal mono."""
+    spectrum = np.abs(np.fft.rfft(signal * np.hanning(len(signal))))
+    return np.argmax(spectrum) * rate / len(signal)
+
+
+class TestConvertChannels:
+    """Tests pour la fonction convert_channels."""
+
+    def test_downmix_and_upmix(self):
+        """Teste la moyenne vers le mono et la duplication d'un signal mono."""
+        stereo = np.array([[100.0, 300.0], [-50.0, 50.0]])
+
+        assert convert_channels(stereo, 1).tolist() == [[200.0], [0.0]]
+        assert convert_channels(stereo[:, :1], 2).tolist() == [[100.0, 100.0], [-50.0, -50.0]]
+        assert convert_channels(stereo, 2) is stereo
+
+
+class TestDesignPolyphaseFilter:
+    """Tests pour la fonction design_polyphase_filter."""
+
+    def test_unit_gain_per_phase(self):
+        """Teste le gain unitaire en continu de chaque phase."""
+        bank = design_polyphase_filter(up=147, down=160, zero_crossings=16, rolloff=0.94)
+
+        assert bank.shape == (147, 64)
+        assert np.allclose(bank.sum(axis=1), 1.0)
+
+
+class TestResampler:
+    """Tests pour la classe Resampler."""
+
+    @pytest.mark.parametrize("input_rate,output_rate", [
+        (48000, 44100), (48000, 16000), (44100, 16000), (16000, 48000),
+    ])
+    def test_preserves_tone(self, input_rate, output_rate):
+        """Teste que la fréquence et l'amplitude d'une sinusoïde sont conservées."""
+        resampler = Resampler(input_rate, output_rate, input_channels=1)
+
+        output = _samples(resampler.process(_tone(1000.0, input_rate, 1.0)))[:, 0]
+
+        assert len(output) == output_rate
+        steady = output[output_rate // 10:]
+        assert _dominant_frequency(steady, output_rate) == pytest.approx(1000.0, abs=2.0)
+        assert steady.std() == pytest.approx(0.5 * 32767 / np.sqrt(2), rel=0.01)
+
+    def test_rejects_frequencies_above_output_nyquist(self):
+        """Teste l'anti-repliement : une fréquence inaudible en sortie est supprimée."""
+        resampler = Resampler(48000, 16000, input_channels=1)
+
+        output = _samples(resampler.process(_tone(10000.0, 48000, 1.0)))[1600:, 0]
+
+        # Plus de 60 dB sous le niveau d'entrée
+        assert output.std() < 0.5 * 32767 / np.sqrt(2) / 1000
+
+    def test_chunking_does_not_change_output(self):
+        """Teste que le découpage de l'entrée ne change pas le résultat."""
+        data = _tone(440.0, 44100, 0.5, channels=2)
+        whole = Resampler(44100, 16000, 2).process(data)
+
+        resampler = Resampler(44100, 16000, 2)
+        chunks = [resampler.process(data[offset:offset + 4000]) for offset in range(0, len(data), 4000)]
+
+        assert b"".join(chunks) == whole
+
+    def test_downmix_to_mono(self):
+        """Teste la conversion simultanée du taux et des canaux."""
+        resampler = Resampler(48000, 16000, input_channels=2, output_channels=1)
+
+        output = resampler.process(_tone(1000.0, 48000, 0.1, channels=2))
+
+        assert len(output) == 1600 * 2
+
+    def test_same_rate_only_converts_channels(self):
+        """Teste qu'aucun filtrage n'est appliqué à taux égal."""
+        resampler = Resampler(44100, 44100, input_channels=1, output_channels=2)
+        data = _tone(1000.0, 44100, 0.01)
+
+        output = _samples(resampler.process(data), channels=2)
+
+        assert (output[:, 0] == _samples(data)[:, 0]).all()
+        assert (output[:, 1] == output[:, 0]).all()
+
+    def test_clips_to_sample_range(self):
+        """Teste que le dépassement du filtre (Gibbs) est écrêté sans débordement."""
+        square = np.tile(np.repeat(np.array([32767, -32768], dtype='<i2'), 50), 100).tobytes()
+
+        output = _samples(Resampler(48000, 44100, 1).process(square))
+
+        assert output.max() <= 32767 and output.min() >= -32768
+
+    def test_invalid_sample_width(self):
+        """Teste qu'une largeur d'échantillon non supportée est refusée."""
+        with pytest.raises(ValueError, match="non supportée"):
+            Resampler(48000, 16000, 1, sample_width=3)
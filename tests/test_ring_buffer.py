@@ -0,0 +1,121 @@
+"""Tests pour le module de buffer circulaire."""
+
+import threading
+import time
+import pytest
+
+from src.ring_buffer import RingBuffer
+
+
+class TestRingBuffer:
+    """Tests pour la classe RingBuffer."""
+
+    def test_init_rounds_capacity_to_frames(self):
+        """Test que la capacité est arrondie à un multiple de la taille de frame."""
+        ring = RingBuffer(capacity=10, frame_size=4)
+
+        assert ring.capacity == 8
+        assert ring.fill_level == 0
+        assert ring.free_space == 8
+
+    def test_init_invalid_capacity(self):
+        """Test qu'une capacité inférieure à une frame est refusée."""
+        with pytest.raises(ValueError):
+            RingBuffer(capacity=2, frame_size=4)
+
+    def test_write_and_peek(self):
+        """Test que les données écrites sont lisibles sans copie."""
+        ring = RingBuffer(capacity=16, frame_size=2)
+
+        assert ring.write(b'\x00\x01\x02\x03') is True
+        view = ring.peek()
+
+        assert isinstance(view, memoryview)
+        assert bytes(view) == b'\x00\x01\x02\x03'
+        ring.advance(len(view))
+        assert ring.fill_level == 0
+
+    def test_wrap_around(self):
+        """Test que les écritures font le tour du buffer correctement."""
+        ring = RingBuffer(capacity=8, frame_size=2)
+        ring.write(b'abcdef')
+        ring.advance(6)
+
+        ring.write(b'ghijkl')
+
+        # La première vue s'arrête à la fin du buffer, la seconde reprend au début
+        first = ring.peek()
+        assert bytes(first) == b'gh'
+        ring.advance(len(first))
+        second = ring.peek()
+        assert bytes(second) == b'ijkl'
+
+    def test_copy_into_crosses_wrap_without_consuming(self):
+        """Test que copy_into copie au-delà de la fin du buffer sans libérer les données."""
+        ring = RingBuffer(capacity=8, frame_size=2)
+        ring.write(b'abcdef')
+        ring.advance(6)
+        ring.write(b'ghijkl')
+
+        destination = bytearray(8)
+        copied = ring.copy_into(destination, 7)
+
+        assert copied == 6
+        assert bytes(destination[:6]) == b'ghijkl'
+        assert ring.fill_level == 6
+
+    def test_peek_max_bytes_is_frame_aligned(self):
+        """Test que peek respecte max_bytes en restant aligné sur les frames."""
+        ring = RingBuffer(capacity=16, frame_size=4)
+        ring.write(b'\x00' * 12)
+
+        assert len(ring.peek(max_bytes=6)) == 4
+
+    def test_overflow_drops_and_counts_frames(self):
+        """Test qu'un buffer plein rejette les données et compte les frames perdues."""
+        ring = RingBuffer(capacity=8, frame_size=2)
+
+        assert ring.write(b'\x00' * 6) is True
+        assert ring.write(b'\x00' * 4) is False
+
+        assert ring.dropped_frames == 2
+        assert ring.fill_level == 6
+
+    def test_high_water_mark(self):
+        """Test que le niveau maximal de remplissage est conservé."""
+        ring = RingBuffer(capacity=16, frame_size=1)
+        ring.write(b'\x00' * 10)
+        ring.advance(10)
+        ring.write(b'\x00' * 3)
+
+        stats = ring.get_stats()
+        assert stats['high_water_mark'] == 10
+        assert stats['fill_level'] == 3
+        assert stats['capacity'] == 16
+
+    def test_producer_consumer_threads(self):
+        """Test un échange complet entre un producteur et un consommateur."""
+        ring = RingBuffer(capacity=64, frame_size=1)
+        payload = bytes(range(256)) * 20
+        received = bytearray()
+
+        def consume():
+            while True:
+                if not ring.wait_for_data(timeout=0.5):
+                    if ring.closed:
+                        break
+                    continue
+                view = ring.peek()
+                received.extend(view)
+                ring.advance(len(view))
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+
+        for offset in range(0, len(payload), 16):
+            while not ring.write(payload[offset:offset + 16]):
+                time.sleep(0.001)
+        ring.close()
+        consumer.join(timeout=5.0)
+
+        assert bytes(received) == payload
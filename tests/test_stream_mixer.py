@@ -0,0 +1,188 @@
+"""Tests pour le module de mixage multi-source."""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.stream_mixer import SourceClock, StreamMixer
+
+
+def read_all(mixer: StreamMixer, channels: int) -> np.ndarray:
+    """Lit tous les blocs disponibles et les retourne sous forme de tableau (frames, canaux)."""
+    blocks = []
+    while True:
+        block = mixer.read()
+        if len(block) == 0:
+            break
+        blocks.append(np.frombuffer(bytes(block), dtype=np.int16).reshape(-1, channels))
+    if not blocks:
+        return np.zeros((0, channels), dtype=np.int16)
+    return np.concatenate(blocks)
+
+
+class TestSourceClock:
+    """Tests pour la classe SourceClock."""
+
+    def test_rate_is_nominal_before_enough_data(self):
+        """Test que le débit nominal est utilisé tant que l'observation est trop courte."""
+        clock = SourceClock(1000)
+        clock.add(100, 0.1)
+        clock.add(100, 0.2)
+
+        assert clock.rate() == 1000.0
+        assert clock.start_time == pytest.approx(0.0)
+
+    def test_rate_follows_measured_clock(self):
+        """Test que le débit estimé suit l'horloge réelle de la source."""
+        clock = SourceClock(1000)
+        for step in range(1, 51):
+            clock.add(101, step * 0.1)
+
+        assert clock.rate() == pytest.approx(1010.0)
+
+
+class TestStreamMixer:
+    """Tests pour la classe StreamMixer."""
+
+    def test_init_invalid_mode(self):
+        """Test qu'un mode de mixage inconnu est refusé."""
+        with pytest.raises(ValueError, match="Mode de mixage inconnu"):
+            StreamMixer([2], channels=2, sample_rate=1000, mode="average")
+
+    def test_init_unsupported_sample_width(self):
+        """Test qu'une largeur d'échantillon non gérée est refusée."""
+        with pytest.raises(ValueError):
+            StreamMixer([2], channels=2, sample_rate=1000, sample_width=3)
+
+    def test_mix_sums_sources_and_upmixes_mono(self):
+        """Test que les sources sont additionnées, une source mono étant copiée sur chaque canal."""
+        mixer = StreamMixer([2, 1], channels=2, sample_rate=1000)
+        stereo = np.array([[100, 200]] * 10, dtype=np.int16)
+        mono = np.full((10, 1), 5, dtype=np.int16)
+
+        mixer.push(0, stereo.tobytes(), timestamp=1.0)
+        mixer.push(1, mono.tobytes(), timestamp=1.0)
+        output = read_all(mixer, 2)
+
+        # La source interpolée garde une frame d'avance pour l'interpolation
+        assert len(output) == 9
+        assert (output == [105, 205]).all()
+
+    def test_mix_clips_instead_of_wrapping(self):
+        """Test que la somme est saturée aux bornes du format."""
+        mixer = StreamMixer([1, 1], channels=1, sample_rate=1000)
+        loud = np.full((4, 1), 30000, dtype=np.int16)
+
+        mixer.push(0, loud.tobytes(), timestamp=1.0)
+        mixer.push(1, loud.tobytes(), timestamp=1.0)
+        mixer.close()
+        output = read_all(mixer, 1)
+
+        assert (output == 32767).all()
+
+    def test_interleave_keeps_source_channels(self):
+        """Test que le mode interleave juxtapose les canaux des sources."""
+        mixer = StreamMixer([1, 1], channels=2, sample_rate=1000, mode="interleave")
+        first = np.arange(8, dtype=np.int16).reshape(-1, 1)
+        second = -np.arange(8, dtype=np.int16).reshape(-1, 1)
+
+        mixer.push(0, first.tobytes(), timestamp=1.0)
+        mixer.push(1, second.tobytes(), timestamp=1.0)
+        mixer.close()
+        output = read_all(mixer, 2)
+
+        assert mixer.output_channels == 2
+        assert output[:, 0].tolist() == list(range(8))
+        assert output[:, 1].tolist() == [-value for value in range(8)]
+
+    def test_sources_are_aligned_on_start_time(self):
+        """Test que le début d'une source démarrée plus tôt est ignoré."""
+        mixer = StreamMixer([1, 1], channels=1, sample_rate=1000, mode="interleave")
+        early = np.arange(20, dtype=np.int16).reshape(-1, 1)
+        late = np.full((10, 1), 100, dtype=np.int16)
+
+        # La première source a commencé 10 ms (10 frames) avant la seconde
+        mixer.push(0, early.tobytes(), timestamp=1.02)
+        mixer.push(1, late.tobytes(), timestamp=1.02)
+        mixer.close()
+        output = read_all(mixer, 2)
+
+        assert output[0].tolist() == [10, 100]
+
+    def test_waits_for_every_source_before_mixing(self):
+        """Test qu'aucun bloc n'est produit tant qu'une source n'a rien envoyé."""
+        mixer = StreamMixer([1, 1], channels=1, sample_rate=1000)
+        mixer.push(0, np.zeros((10, 1), dtype=np.int16).tobytes(), timestamp=1.0)
+
+        assert len(mixer.read()) == 0
+
+    def test_stalled_source_is_padded_with_silence(self):
+        """Test qu'une source sans données au-delà du délai est complétée par du silence."""
+        mixer = StreamMixer([1, 1], channels=2, sample_rate=1000, mode="interleave", stall_timeout=0.05)
+        mixer.push(0, np.full((10, 1), 1, dtype=np.int16).tobytes(), timestamp=1.01)
+        mixer.push(1, np.full((10, 1), 2, dtype=np.int16).tobytes(), timestamp=1.01)
+        read_all(mixer, 2)
+
+        # La seconde source ne livre plus rien : rien n'est produit avant le délai
+        mixer.push(0, np.full((20, 1), 1, dtype=np.int16).tobytes(), timestamp=1.03)
+        assert len(mixer.read()) == 0
+        time.sleep(0.1)
+        mixer.push(0, np.full((20, 1), 1, dtype=np.int16).tobytes(), timestamp=1.05)
+        output = read_all(mixer, 2)
+
+        # Tout l'audio de la première source est mixé (41 frames : la seconde
+        # source retenait une frame pour l'interpolation)
+        assert output.tolist() == [[1, 0]] * 41
+        assert mixer.get_stats()['padded_frames'] == [0, 41]
+
+        # La source revient : ses données sont de nouveau mixées
+        mixer.push(0, np.full((10, 1), 1, dtype=np.int16).tobytes(), timestamp=1.06)
+        mixer.push(1, np.full((10, 1), 2, dtype=np.int16).tobytes(), timestamp=1.06)
+        assert read_all(mixer, 2).tolist() == [[1, 2]] * 10
+
+    def test_closed_source_does_not_stall_others(self):
+        """Test qu'une source fermée en cours de capture n'arrête pas le mixage des autres."""
+        mixer = StreamMixer([1, 1], channels=1, sample_rate=1000)
+        mixer.push(0, np.full((10, 1), 3, dtype=np.int16).tobytes(), timestamp=1.01)
+        mixer.push(1, np.full((10, 1), 4, dtype=np.int16).tobytes(), timestamp=1.01)
+        mixer.close(1)
+        mixer.push(0, np.full((10, 1), 3, dtype=np.int16).tobytes(), timestamp=1.02)
+
+        output = read_all(mixer, 1)
+
+        assert output[-10:, 0].tolist() == [3] * 10
+        assert mixer.get_stats()['padded_frames'][1] == 11
+
+    def test_drift_is_corrected_without_touching_reference(self):
+        """Test qu'une source plus rapide est rééchantillonnée sur l'horloge de référence."""
+        mixer = StreamMixer([1, 1], channels=2, sample_rate=1000, mode="interleave", block_frames=256)
+        reference = np.arange(4000, dtype=np.int16).reshape(-1, 1)
+        received = 0
+        output = []
+        for step in range(40):
+            timestamp = 1.0 + (step + 1) * 0.1
+            # La seconde source produit 0,2 % de frames en plus
+            fast = int(round(100.2 * (step + 1))) - received
+            received += fast
+            mixer.push(0, reference[step * 100:(step + 1) * 100].tobytes(), timestamp)
+            mixer.push(1, np.zeros((fast, 1), dtype=np.int16).tobytes(), timestamp)
+            output.append(read_all(mixer, 2))
+        output = np.concatenate(output)
+
+        # La référence est transmise à l'échantillon près
+        assert output[:, 0].tolist() == list(range(len(output)))
+        # La source rapide ne prend pas de retard dans son buffer
+        assert mixer.buffers[1].fill_level // mixer.buffers[1].frame_size < 50
+        assert mixer.get_stats()['drift_ppm'][1] == pytest.approx(2000, rel=0.2)
+
+    def test_get_stats_aggregates_sources(self):
+        """Test que les statistiques des buffers des sources sont agrégées."""
+        mixer = StreamMixer([1, 1], channels=1, sample_rate=1000, buffer_seconds=0.01)
+        mixer.push(0, b'\x00\x00' * 20, timestamp=1.0)
+
+        stats = mixer.get_stats()
+        assert stats['capacity'] == 40
+        assert stats['dropped_frames'] == 20
+        assert stats['drift_ppm'] == [0.0, 0.0]
+        assert stats['padded_frames'] == [0, 0]
@@ -0,0 +1,220 @@
+"""Tests pour le module de transcription en continu."""
+
+import sys
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.transcription import (
+    GoogleSpeechBackend,
+    SpeechBackend,
+    StreamingTranscriber,
+    TranscriptionResult,
+)
+
+SAMPLE_RATE = 1000
+
+
+class FakeSpeechBackend(SpeechBackend):
+    """
+    Service de reconnaissance local : un résultat provisoire par chunk reçu,
+    un résultat définitif tous les `final_every` chunks et en fin de flux.
+    """
+
+    def __init__(self, final_every: int = 5, fail_after: int = None):
+        self.final_every = final_every
+        self.fail_after = fail_after
+        self.streams = []
+        self.first_chunk = threading.Event()
+
+    def streaming_recognize(self, audio_chunks, sample_rate, channels):
+        received = []
+        self.streams.append(received)
+        words = []
+        for chunk in audio_chunks:
+            self.first_chunk.set()
+            received.append(chunk)
+            if self.fail_after is not None and len(received) > self.fail_after:
+                raise ConnectionError("flux interrompu")
+            words.append(f"mot{len(received)}")
+            end_time = sum(len(c) for c in received) / (sample_rate * channels * 2)
+            if len(received) % self.final_every == 0:
+                yield TranscriptionResult(" ".join(words), True, 0.0, end_time)
+                words = []
+            else:
+                yield TranscriptionResult(" ".join(words), False, 0.5, end_time)
+        if words:
+            end_time = sum(len(c) for c in received) / (sample_rate * channels * 2)
+            yield TranscriptionResult(" ".join(words), True, 0.0, end_time)
+
+
+def _pcm(seconds: float) -> bytes:
+    """PCM mono 16 bits à SAMPLE_RATE Hz."""
+    return b'\x01\x00' * int(seconds * SAMPLE_RATE)
+
+
+class TestStreamingTranscriber:
+    """Tests pour la classe StreamingTranscriber."""
+
+    def test_partial_results_while_writing(self):
+        """Teste que des résultats arrivent avant la fin de l'audio."""
+        received = threading.Event()
+        backend = FakeSpeechBackend()
+        transcriber = StreamingTranscriber(backend, sample_rate=None, on_result=lambda result: received.set())
+
+        transcriber.start(SAMPLE_RATE, channels=1)
+        transcriber.write(_pcm(0.3))
+
+        assert received.wait(timeout=2.0)
+        assert transcriber.partial is not None or transcriber.results
+        transcriber.finish()
+        transcriber.wait(timeout=2.0)
+
+    def test_all_audio_sent_in_chunks(self):
+        """Teste que tout l'audio est transmis, découpé en chunks de chunk_seconds."""
+        backend = FakeSpeechBackend()
+        transcriber = StreamingTranscriber(backend, sample_rate=None, chunk_seconds=0.1)
+
+        transcriber.start(SAMPLE_RATE, channels=1)
+        transcriber.write(_pcm(1.05))
+        transcriber.finish()
+        transcript = transcriber.wait(timeout=2.0)
+
+        chunks = backend.streams[0]
+        assert b"".join(chunks) == _pcm(1.05)
+        assert [len(chunk) for chunk in chunks[:10]] == [200] * 10
+        assert transcript.split() == [f"mot{i}" for i in range(1, 12)]
+        assert transcriber.get_stats()['sent_seconds'] == pytest.approx(1.05)
+
+    def test_streams_renewed_with_time_offset(self):
+        """Teste le renouvellement des flux et le décalage des horodatages."""
+        backend = FakeSpeechBackend(final_every=100)
+        transcriber = StreamingTranscriber(backend, sample_rate=None, chunk_seconds=0.1, max_stream_seconds=0.5)
+
+        transcriber.start(SAMPLE_RATE, channels=1)
+        transcriber.write(_pcm(1.2))
+        transcriber.finish()
+        transcriber.wait(timeout=2.0)
+
+        assert [sum(len(chunk) for chunk in stream) for stream in backend.streams] == [1000, 1000, 400]
+        assert [result.end_time for result in transcriber.results] == pytest.approx([0.5, 1.0, 1.2])
+        assert transcriber.get_stats()['streams'] == 3
+
+    def test_backend_error_raised_by_wait(self):
+        """Teste qu'une erreur du service est remontée par wait()."""
+        backend = FakeSpeechBackend(final_every=1, fail_after=2)
+        transcriber = StreamingTranscriber(backend, sample_rate=None, chunk_seconds=0.1)
+
+        transcriber.start(SAMPLE_RATE, channels=1)
+        transcriber.write(_pcm(1.0))
+        transcriber.finish()
+
+        with pytest.raises(RuntimeError, match="flux interrompu"):
+            transcriber.wait(timeout=2.0)
+        # Les résultats reçus avant l'erreur sont conservés
+        assert transcriber.transcript == "mot1 mot2"
+
+    def test_write_never_blocks_when_backend_stalls(self):
+        """Teste que l'audio au-delà du buffer est perdu sans bloquer l'appelant."""
+        release = threading.Event()
+
+        class StalledBackend(SpeechBackend):
+            def streaming_recognize(self, audio_chunks, sample_rate, channels):
+                release.wait(timeout=2.0)
+                for _ in audio_chunks:
+                    pass
+                return iter(())
+
+        transcriber = StreamingTranscriber(StalledBackend(), sample_rate=None, buffer_seconds=1.0)
+        transcriber.start(SAMPLE_RATE, channels=1)
+
+        assert transcriber.write(_pcm(0.8))
+        assert not transcriber.write(_pcm(0.8))
+        assert transcriber.get_stats()['dropped_frames'] == 800
+
+        release.set()
+        transcriber.finish()
+        transcriber.wait(timeout=2.0)
+
+    def test_converts_to_speech_format(self):
+        """Teste la conversion par défaut du PCM reçu en 16 kHz mono."""
+        backend = FakeSpeechBackend()
+        transcriber = StreamingTranscriber(backend)
+
+        transcriber.start(48000, channels=2)
+        transcriber.write(b'\x00\x10' * 2 * 48000)
+        transcriber.finish()
+        transcriber.wait(timeout=2.0)
+
+        assert (transcriber.sample_rate, transcriber.channels) == (16000, 1)
+        assert sum(len(chunk) for chunk in backend.streams[0]) == 16000 * 2
+
+    def test_requires_16_bit_pcm(self):
+        """Teste que seul le PCM 16 bits est accepté."""
+        transcriber = StreamingTranscriber(FakeSpeechBackend())
+
+        with pytest.raises(ValueError, match="16 bits"):
+            transcriber.start(SAMPLE_RATE, channels=1, sample_width=4)
+
+    def test_start_twice(self):
+        """Teste qu'un transcripteur en cours ne peut pas être redémarré."""
+        transcriber = StreamingTranscriber(FakeSpeechBackend())
+        transcriber.start(SAMPLE_RATE, channels=1)
+
+        with pytest.raises(RuntimeError, match="déjà démarrée"):
+            transcriber.start(SAMPLE_RATE, channels=1)
+        transcriber.finish()
+        transcriber.wait(timeout=2.0)
+
+    def test_restart_after_finish(self):
+        """Teste qu'un transcripteur terminé repart de zéro pour l'enregistrement suivant."""
+        backend = FakeSpeechBackend()
+        transcriber = StreamingTranscriber(backend, chunk_seconds=0.1)
+        transcriber.start(48000, channels=2)
+        transcriber.write(b'\x00\x10' * 2 * 4800)
+        transcriber.finish()
+        transcriber.wait(timeout=2.0)
+
+        transcriber.start(SAMPLE_RATE, channels=1)
+        transcriber.write(_pcm(0.2))
+        transcriber.finish()
+        transcript = transcriber.wait(timeout=2.0)
+
+        assert transcript == "mot1 mot2"
+        assert transcriber.get_stats()['streams'] == 1
+        # PCM 1 kHz mono converti en 16 kHz mono : buffer dimensionné au taux du service
+        assert transcriber._ring_buffer.capacity == 16000 * 30 * 2
+        assert sum(len(chunk) for chunk in backend.streams[1]) == pytest.approx(0.2 * 16000 * 2, abs=64)
+
+
+class TestGoogleSpeechBackend:
+    """Tests pour la classe GoogleSpeechBackend."""
+
+    def test_missing_library(self):
+        """Teste le message d'erreur si google-cloud-speech n'est pas installé."""
+        backend = GoogleSpeechBackend()
+
+        with patch.dict(sys.modules, {'google': None, 'google.cloud': None}):
+            with pytest.raises(RuntimeError, match="google-cloud-speech"):
+                list(backend.streaming_recognize(iter([b'']), SAMPLE_RATE, 1))
+
+    def test_converts_responses(self):
+        """Teste la conversion des réponses de l'API et la réutilisation du client."""
+        speech = Mock()
+        duration = Mock()
+        duration.total_seconds.return_value = 1.5
+        alternative = Mock(transcript="bonjour")
+        result = Mock(alternatives=[alternative], is_final=True, stability=0.0, result_end_time=duration)
+        client = Mock()
+        client.streaming_recognize.return_value = [Mock(results=[result, Mock(alternatives=[])])]
+        backend = GoogleSpeechBackend(client=client)
+
+        with patch('src.transcription.load_speech', return_value=speech):
+            results = list(backend.streaming_recognize(iter([b'\x00\x00']), SAMPLE_RATE, 1))
+
+        assert results == [TranscriptionResult("bonjour", True, 0.0, 1.5)]
+        speech.SpeechClient.assert_not_called()
+        _, kwargs = speech.RecognitionConfig.call_args
+        assert kwargs['sample_rate_hertz'] == SAMPLE_RATE
+        assert kwargs['language_code'] == "fr-FR"
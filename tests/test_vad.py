@@ -0,0 +1,104 @@
+"""Tests pour le module de détection d'activité audio."""
+
+import numpy as np
+import pytest
+
+from src.vad import AUDIO, REGION_END, REGION_START, VoiceGate
+
+BLOCK = 100
+
+
+def _blocks(*levels) -> bytes:
+    """PCM mono 16 bits : un bloc de BLOCK frames constant par niveau donné."""
+    return np.concatenate([np.full(BLOCK, level, dtype=np.int16) for level in levels]).tobytes()
+
+
+def _run(gate: VoiceGate, data: bytes):
+    """Passe des données dans la porte et retourne les événements (audio copié)."""
+    return [
+        (event, bytes(chunk) if chunk is not None else None)
+        for event, chunk in gate.process(data)
+    ]
+
+
+def _gate(**options) -> VoiceGate:
+    """Porte mono à 1000 Hz ouvrant à -20 dBFS (environ 3277)."""
+    settings = dict(
+        channels=1, sample_rate=1000, threshold_db=-20.0, hysteresis_db=6.0,
+        hangover=0.2, preroll=0.0, block_frames=BLOCK
+    )
+    settings.update(options)
+    return VoiceGate(**settings)
+
+
+class TestVoiceGate:
+    """Tests pour la classe VoiceGate."""
+
+    def test_invalid_sample_width(self):
+        """Teste qu'une largeur d'échantillon non supportée est refusée."""
+        with pytest.raises(ValueError, match="non supportée"):
+            VoiceGate(channels=1, sample_width=3)
+
+    def test_silence_is_dropped(self):
+        """Teste qu'aucun audio ne sort tant que la porte reste fermée."""
+        gate = _gate()
+
+        assert _run(gate, _blocks(0, 100, 0)) == []
+        assert gate.get_stats()['dropped_seconds'] == pytest.approx(0.3)
+
+    def test_region_with_hangover(self):
+        """Teste l'ouverture, la prolongation puis la fermeture d'une région."""
+        gate = _gate()
+
+        events = _run(gate, _blocks(0, 10000, 0, 0, 0))
+
+        assert [event for event, _ in events] == [REGION_START, AUDIO, AUDIO, AUDIO, REGION_END]
+        assert b''.join(chunk for event, chunk in events if event == AUDIO) == _blocks(10000, 0, 0)
+        stats = gate.get_stats()
+        assert stats['regions'] == 1
+        assert stats['open'] is False
+
+    def test_hysteresis_keeps_region_open(self):
+        """Teste qu'un niveau entre les deux seuils prolonge la région."""
+        gate = _gate()
+
+        # -23 dBFS : sous le seuil d'ouverture, au-dessus du seuil de fermeture
+        events = _run(gate, _blocks(10000, 2300, 2300, 2300, 0, 0))
+
+        assert REGION_END in [event for event, _ in events]
+        assert sum(len(chunk) for event, chunk in events if event == AUDIO) == 6 * BLOCK * 2
+        assert _run(_gate(), _blocks(2300, 2300)) == []
+
+    def test_preroll_restores_audio_before_onset(self):
+        """Teste que les frames précédant l'ouverture sont restituées dans l'ordre."""
+        gate = _gate(preroll=0.15)
+        quiet = np.arange(300, dtype=np.int16)
+
+        events = _run(gate, quiet.tobytes() + _blocks(10000))
+
+        audio = b''.join(chunk for event, chunk in events if event == AUDIO)
+        assert events[0] == (REGION_START, None)
+        assert audio == quiet[150:].tobytes() + _blocks(10000)
+        stats = gate.get_stats()
+        assert stats['active_seconds'] == pytest.approx(0.25)
+        assert stats['dropped_seconds'] == pytest.approx(0.15)
+
+    def test_preroll_across_calls(self):
+        """Teste que le pré-roll circulaire conserve les frames les plus récentes."""
+        gate = _gate(preroll=0.25)
+        for level in range(1, 6):
+            _run(gate, _blocks(level))
+
+        events = _run(gate, _blocks(10000))
+
+        audio = b''.join(chunk for event, chunk in events if event == AUDIO)
+        # 250 ms de pré-roll : la fin du bloc 3 puis les blocs 4 et 5
+        expected_preroll = np.full(50, 3, dtype=np.int16).tobytes() + _blocks(4, 5)
+        assert audio == expected_preroll + _blocks(10000)
+
+    def test_silence_ratio(self):
+        """Teste la part de l'audio écartée."""
+        gate = _gate()
+        _run(gate, _blocks(0, 0, 10000, 0, 0))
+
+        assert gate.get_stats()['silence_ratio'] == pytest.approx(0.4)
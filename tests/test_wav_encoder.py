@@ -0,0 +1,87 @@
+"""Tests pour le module d'écriture WAV."""
+
+import wave
+import pytest
+from pathlib import Path
+
+from src.wav_encoder import WAV_HEADER_SIZE, WAVEncoder, build_wav_header
+
+
+class TestBuildWavHeader:
+    """Tests pour la fonction build_wav_header."""
+
+    def test_header_size_and_fields(self):
+        """Test que l'en-tête décrit correctement le PCM."""
+        header = build_wav_header(sample_rate=48000, channels=2, sample_width=2, data_size=400)
+
+        assert len(header) == WAV_HEADER_SIZE
+        assert header[:4] == b'RIFF'
+        assert int.from_bytes(header[4:8], 'little') == 436
+        assert header[8:16] == b'WAVEfmt '
+        assert int.from_bytes(header[24:28], 'little') == 48000
+        assert int.from_bytes(header[40:44], 'little') == 400
+
+
+class TestWAVEncoder:
+    """Tests pour la classe WAVEncoder."""
+
+    def test_write_and_close_produces_valid_wav(self, tmp_path):
+        """Test que le fichier produit est lisible avec les bonnes tailles."""
+        output_file = tmp_path / "test.wav"
+        encoder = WAVEncoder(output_file=output_file, sample_rate=8000, channels=2, sample_width=2)
+
+        encoder.write_frames(b'\x01\x00\x02\x00' * 100)
+        encoder.write_frames(memoryview(b'\x03\x00\x04\x00' * 50))
+        encoder.close()
+
+        with wave.open(str(output_file), 'rb') as wav:
+            assert wav.getnchannels() == 2
+            assert wav.getsampwidth() == 2
+            assert wav.getframerate() == 8000
+            assert wav.getnframes() == 150
+            assert wav.readframes(150) == b'\x01\x00\x02\x00' * 100 + b'\x03\x00\x04\x00' * 50
+
+    def test_odd_data_size_is_padded(self, tmp_path):
+        """Test qu'un octet de bourrage est ajouté à un chunk de taille impaire."""
+        output_file = tmp_path / "test.wav"
+        encoder = WAVEncoder(output_file=output_file, sample_rate=8000, channels=1, sample_width=1)
+
+        encoder.write_frames(b'\x80' * 3)
+        encoder.close()
+
+        data = output_file.read_bytes()
+        assert len(data) == WAV_HEADER_SIZE + 4
+        assert int.from_bytes(data[40:44], 'little') == 3
+
+    def test_close_without_data_creates_no_file(self, tmp_path):
+        """Test qu'aucun fichier n'est créé si rien n'a été écrit."""
+        output_file = tmp_path / "test.wav"
+        encoder = WAVEncoder(output_file=output_file)
+
+        encoder.close()
+
+        assert not output_file.exists()
+
+    def test_write_after_close_raises_error(self, tmp_path):
+        """Test que write_frames lève une erreur si l'encodeur est fermé."""
+        encoder = WAVEncoder(output_file=tmp_path / "test.wav")
+        encoder.close()
+
+        with pytest.raises(RuntimeError, match="déjà été fermé"):
+            encoder.write_frames(b'\x00\x00')
+
+    def test_write_error_is_reported(self, tmp_path):
+        """Test qu'une erreur d'écriture est signalée clairement."""
+        encoder = WAVEncoder(output_file=tmp_path / "absent" / "test.wav")
+
+        with pytest.raises(RuntimeError, match="Erreur lors de l'écriture WAV"):
+            encoder.write_frames(b'\x00\x00')
+
+    def test_context_manager(self, tmp_path):
+        """Test que WAVEncoder fonctionne comme context manager."""
+        output_file = tmp_path / "test.wav"
+        with WAVEncoder(output_file=output_file) as encoder:
+            encoder.write_frames(b'\x00\x00\x00\x00')
+
+        assert encoder._is_closed is True
+        assert output_file.stat().st_size == WAV_HEADER_SIZE + 4